@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark: unified admin accounts listing (GET /api/admin/accounts) with many accounts.
+
+Builds a throwaway schema (`accounts_bench`) with all tables, adds --accounts accounts
+(40% vendors, 40% vehicle owners, 20% drivers) and times get_all_accounts_unified against
+the previous implementation (every account loaded into Python plus one credentials query
+per vendor / owner, counted and sliced in Python).
+
+Usage:
+    python "Testing code/bench_accounts.py" --accounts 100000 --runs 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.session import Base, DATABASE_URL
+from app.database.migrations import load_models
+from app.crud.admin_management import get_all_accounts_unified, encode_account_cursor
+from app.models.vendor import VendorCredentials
+from app.models.vendor_details import VendorDetails
+from app.models.vehicle_owner import VehicleOwnerCredentials
+from app.models.vehicle_owner_details import VehicleOwnerDetails
+from app.models.car_driver import CarDriver
+
+SCHEMA = "accounts_bench"
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'v' || g, 'x', (ARRAY['ACTIVE', 'INACTIVE', 'PENDING'])[1 + g % 3]::account_status_enum, 0
+FROM generate_series(1, :vendors) g;
+
+INSERT INTO vendor_details(id, vendor_id, full_name, primary_number, wallet_balance, bank_balance, gpay_number, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), id, 'Vendor ' || primary_number, primary_number, 0, 0, primary_number, primary_number, 'Street', 'Chennai', '600001'
+FROM vendor;
+
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'o' || g, 'x', (ARRAY['ACTIVE', 'INACTIVE', 'PENDING'])[1 + g % 3]::account_status_enum, 0
+FROM generate_series(1, :owners) g;
+
+INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), id, 'Owner ' || primary_number, primary_number, 0, primary_number, 'Street', 'Chennai', '600001'
+FROM vehicle_owner;
+
+INSERT INTO car_driver(id, vehicle_owner_id, full_name, primary_number, hashed_password, licence_number, address, city, pincode, driver_status, token_version)
+SELECT gen_random_uuid(), o.ids[1 + g % array_length(o.ids, 1)], 'Driver ' || g, 'd' || g, 'x', 'd' || g, 'Street', 'Chennai', '600001',
+       (ARRAY['ONLINE', 'OFFLINE', 'DRIVING', 'BLOCKED', 'PROCESSING'])[1 + g % 5]::driver_status_enum, 0
+FROM generate_series(1, :drivers) g, (SELECT array_agg(id) AS ids FROM vehicle_owner) o
+"""
+
+
+def legacy_accounts(db, skip, limit):
+    """The listing as it was: everything loaded, one credentials query per vendor / owner."""
+    accounts = []
+    for vendor in db.query(VendorDetails).join(VendorCredentials, VendorDetails.vendor_id == VendorCredentials.id).all():
+        cred = db.query(VendorCredentials).filter(VendorCredentials.id == vendor.vendor_id).first()
+        accounts.append({"id": vendor.vendor_id, "account_type": "vendor", "account_status": cred.account_status.value})
+    for owner in db.query(VehicleOwnerDetails).join(VehicleOwnerCredentials, VehicleOwnerDetails.vehicle_owner_id == VehicleOwnerCredentials.id).all():
+        cred = db.query(VehicleOwnerCredentials).filter(VehicleOwnerCredentials.id == owner.vehicle_owner_id).first()
+        accounts.append({"id": owner.vehicle_owner_id, "account_type": "vehicle_owner", "account_status": cred.account_status.value})
+    for driver in db.query(CarDriver).all():
+        accounts.append({"id": driver.id, "account_type": "driver", "account_status": driver.driver_status.value})
+    active = sum(1 for acc in accounts if acc["account_status"] in ("Active", "ONLINE", "DRIVING"))
+    return accounts[skip:skip + limit], len(accounts), active
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--legacy-runs", type=int, default=1)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA "{SCHEMA}"'))
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-c search_path={SCHEMA}"})
+
+    try:
+        load_models()
+        Base.metadata.create_all(bind=engine)
+
+        counts = {"vendors": args.accounts * 2 // 5, "owners": args.accounts * 2 // 5}
+        counts["drivers"] = args.accounts - counts["vendors"] - counts["owners"]
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            for statement in SEED_SQL.strip().split(";\n\n"):
+                conn.execute(text(statement), counts)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+        print(f"Seeded {args.accounts} accounts in {time.perf_counter() - started:.1f}s")
+
+        db = sessionmaker(bind=engine)()
+        try:
+            deep, *_ = get_all_accounts_unified(db, skip=args.accounts // 2 - 1, limit=1)
+            cursor = encode_account_cursor(deep[0])
+            cases = {
+                "first page (100)": (lambda: legacy_accounts(db, 0, 100), lambda: get_all_accounts_unified(db, 0, 100)),
+                f"skip {args.accounts // 2}": (
+                    lambda: legacy_accounts(db, args.accounts // 2, 100),
+                    lambda: get_all_accounts_unified(db, args.accounts // 2, 100),
+                ),
+                "cursor at the same page": (None, lambda: get_all_accounts_unified(db, 0, 100, cursor=cursor)),
+                "drivers, active": (None, lambda: get_all_accounts_unified(db, 0, 100, "driver", "active")),
+            }
+            print(f"\n{'case':30} {'before ms':>12} {'after ms':>10}")
+            for name, (before, after) in cases.items():
+                before_ms = f"{timed(before, args.legacy_runs):12.1f}" if before else f"{'-':>12}"
+                db.expunge_all()
+                print(f"{name:30} {before_ms} {timed(after, args.runs):10.1f}")
+        finally:
+            db.close()
+    finally:
+        engine.dispose()
+        if not args.keep:
+            with admin.begin() as conn:
+                conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        admin.dispose()
+
+
+if __name__ == "__main__":
+    main()
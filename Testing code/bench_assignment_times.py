@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: longest assignment window per trip type (GET /api/orders/max-assignment-times) with many orders.
+
+Builds a throwaway schema (`assignment_times_bench`) with all tables, adds --orders orders spread over the
+four trip types and times get_max_time_to_assign_by_trip_type (one GROUP BY, then the cache) against the
+previous implementation (every order of each trip type loaded into Python).
+
+Usage:
+    python "Testing code/bench_assignment_times.py" --orders 1000000 --runs 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.session import Base, DATABASE_URL
+from app.database.migrations import load_models
+from app.crud import orders
+from app.models.orders import Order
+from app.models.new_orders import OrderTypeEnum
+
+SCHEMA = "assignment_times_bench"
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+VALUES (gen_random_uuid(), 'bench-vendor', 'x', 'ACTIVE', 0);
+
+INSERT INTO orders(source, source_order_id, vendor_id, trip_type, car_type, pickup_drop_location, start_date_time,
+                   customer_name, customer_number, trip_status, created_at, max_time_to_assign_order)
+SELECT 'NEW_ORDERS', g, v.id, (ARRAY['ONEWAY', 'ROUND_TRIP', 'MULTY_CITY', 'HOURLY_RENTAL'])[1 + g % 4]::"ORDER_TYPE_ENUM",
+       'SEDAN_4_PLUS_1', '{"0": "Chennai", "1": "Madurai"}', now(), 'Customer', '9999999999', 'COMPLETED',
+       now() - g * interval '1 minute', now() - g * interval '1 minute' + (5 + g % 55) * interval '1 minute'
+FROM generate_series(1, :orders) g, (SELECT id FROM vendor) v
+"""
+
+
+def legacy_max_times(db):
+    """The lookup as it was: every order of each trip type loaded, the maximum taken in Python."""
+    max_times = {}
+    for trip_type in (OrderTypeEnum.ONEWAY, OrderTypeEnum.ROUND_TRIP, OrderTypeEnum.MULTY_CITY, OrderTypeEnum.HOURLY_RENTAL):
+        max_time_minutes = 0
+        for order in db.query(Order).filter(Order.trip_type == trip_type).all():
+            if order.max_time_to_assign_order and order.created_at:
+                max_time_minutes = max(max_time_minutes, int((order.max_time_to_assign_order - order.created_at).total_seconds() / 60))
+        max_times[trip_type.value] = max_time_minutes or 15
+        db.expunge_all()
+    return max_times
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def uncached(db):
+    orders._max_assign_time_cache.clear()
+    return orders.get_max_time_to_assign_by_trip_type(db)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--legacy-runs", type=int, default=1)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA "{SCHEMA}"'))
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-c search_path={SCHEMA}"})
+
+    try:
+        load_models()
+        Base.metadata.create_all(bind=engine)
+
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            for statement in SEED_SQL.strip().split(";\n\n"):
+                conn.execute(text(statement), {"orders": args.orders})
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM ANALYZE orders"))
+        print(f"Seeded {args.orders} orders in {time.perf_counter() - started:.1f}s")
+
+        db = sessionmaker(bind=engine)()
+        try:
+            assert legacy_max_times(db) == uncached(db)
+            cases = {
+                "before (orders loaded)": (lambda: legacy_max_times(db), args.legacy_runs),
+                "GROUP BY, cache empty": (lambda: uncached(db), args.runs),
+                "cached": (lambda: orders.get_max_time_to_assign_by_trip_type(db), args.runs),
+            }
+            print(f"\n{'case':30} {'median ms':>10}")
+            for name, (fn, runs) in cases.items():
+                print(f"{name:30} {timed(fn, runs):10.1f}")
+        finally:
+            db.close()
+    finally:
+        engine.dispose()
+        if not args.keep:
+            with admin.begin() as conn:
+                conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        admin.dispose()
+
+
+if __name__ == "__main__":
+    main()
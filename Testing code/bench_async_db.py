@@ -0,0 +1,74 @@
+"""
+Load benchmark: sync psycopg2 Session vs asyncpg AsyncSession inside async handlers.
+
+Both variants run in a single event loop, which is what one uvicorn worker does.
+The sync variant calls the crud function directly from a coroutine (as the old
+`async def` routes did), so every query blocks the loop. The async variant awaits
+the asyncpg based crud function.
+
+Usage:
+    python "Testing code/bench_async_db.py" --vendor-id <uuid> --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.session import SessionLocal, AsyncSessionLocal, async_engine
+from app.crud.orders import get_vendor_orders, get_vendor_orders_async
+
+
+async def run_sync(vendor_id, total, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            db = SessionLocal()
+            try:
+                get_vendor_orders(db, vendor_id)
+            finally:
+                db.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+
+async def run_async(vendor_id, total, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            async with AsyncSessionLocal() as db:
+                await get_vendor_orders_async(db, vendor_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vendor-id", required=True)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    # Warm up both pools
+    await run_sync(args.vendor_id, 5, 5)
+    await run_async(args.vendor_id, 5, 5)
+
+    sync_elapsed = await run_sync(args.vendor_id, args.requests, args.concurrency)
+    async_elapsed = await run_async(args.vendor_id, args.requests, args.concurrency)
+    await async_engine.dispose()
+
+    print(f"Requests: {args.requests}, concurrency: {args.concurrency}, workers: 1 event loop")
+    print(f"sync session (blocking):  {sync_elapsed:.2f}s  {args.requests / sync_elapsed:.1f} req/s")
+    print(f"async session (asyncpg):  {async_elapsed:.2f}s  {args.requests / async_elapsed:.1f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bytes stored and transferred per trip with the image pipeline (app/utils/images.py).
+
+A trip has two phone photos (start and end speedometer). Synthetic --width x --height JPEGs with
+camera-like texture and EXIF are uploaded through upload_image_to_gcs into the local storage
+backend (temporary directory), with IMAGE_PIPELINE_ENABLED off (before) and on (after). Reported:
+  - bytes stored per trip
+  - bytes an admin downloads to see the trip in the orders listing (full images before, thumbnails after)
+  - processing time per photo, and --trips trips uploaded from UPLOAD_CONCURRENCY threads (image pool bound)
+
+Usage:
+    python "Testing code/bench_images.py" --trips 20 --width 4032 --height 3024
+"""
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import UploadFile
+from PIL import Image
+
+from app.utils import gcs, images, storage
+
+
+def phone_photo(width, height, seed):
+    """Smooth gradients plus sensor noise: compresses like a real photo, not like a flat test card."""
+    image = Image.radial_gradient("L").resize((width, height)).convert("RGB")
+    # Detail at several scales, so some of it survives downsizing (as edges and texture in a real photo do)
+    for scale, weight in ((32, 0.45), (8, 0.3), (1, 0.25)):
+        noise = Image.effect_noise((width // scale, height // scale), 48 + seed % 8).resize((width, height)).convert("RGB")
+        image = Image.blend(image, noise, weight)
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"
+    exif[0x0112] = 6
+    exif[0x8825] = {2: (13.0, 4.0, 0.0)}
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=92, exif=exif)
+    return out.getvalue()
+
+
+def upload_trip(photos):
+    return [
+        gcs.upload_image_to_gcs(UploadFile(io.BytesIO(data), filename="speedometer.jpg"), f"trip_records/{i}/bench")
+        for i, data in enumerate(photos)
+    ]
+
+
+def object_size(url):
+    backend = storage.get_storage()
+    return backend.stat(backend.blob_name(url)).size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trips", type=int, default=20)
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_images_")
+    storage._backend = storage.LocalStorageBackend(root=root, base_url="http://localhost/api/storage", signing_key="bench")
+    try:
+        photos = [phone_photo(args.width, args.height, i) for i in range(2)]
+        print(f"2 photos per trip, {args.width}x{args.height} JPEG, {sum(map(len, photos)) / 2 / 1024:.0f} KB each; "
+              f"{images.IMAGE_FORMAT} q{images.IMAGE_QUALITY}, max {images.IMAGE_MAX_DIMENSION}px, {gcs.IMAGE_WORKERS} image workers\n")
+
+        results = {}
+        for label, enabled in (("before (stored as uploaded)", False), ("after (pipeline)", True)):
+            gcs.IMAGE_PIPELINE_ENABLED = enabled
+            started = time.perf_counter()
+            urls = upload_trip(photos)
+            per_photo_ms = (time.perf_counter() - started) * 1000 / len(photos)
+
+            stored = sum(object_size(url) for url in urls)
+            if enabled:
+                stored += sum(object_size(gcs.thumbnail_url(url)) for url in urls)
+            listing = sum(object_size(gcs.thumbnail_url(url)) for url in urls)
+            review = sum(object_size(url) for url in urls)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=gcs.UPLOAD_CONCURRENCY) as pool:
+                list(pool.map(lambda _: upload_trip(photos), range(args.trips)))
+            batch_s = time.perf_counter() - started
+            results[label] = (stored, listing, review, per_photo_ms, batch_s)
+
+        print(f"{'':28} {'stored/trip KB':>15} {'listing KB':>11} {'full view KB':>13} {'ms/photo':>9} {f'{args.trips} trips s':>12}")
+        for label, (stored, listing, review, per_photo_ms, batch_s) in results.items():
+            print(f"{label:28} {stored / 1024:15.0f} {listing / 1024:11.1f} {review / 1024:13.0f} {per_photo_ms:9.0f} {batch_s:12.1f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
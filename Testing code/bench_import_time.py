@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time to import app.main (worker startup) in a fresh interpreter.
+
+Each configuration runs --runs fresh `python -c "import app.main"` processes and reports the median wall time
+of the import and whether google-cloud-storage was loaded. Point --tree at another checkout (e.g. a
+`git worktree` of the commit before the storage backends) to get the numbers before the change.
+
+Usage:
+    python "Testing code/bench_import_time.py" --runs 7
+    python "Testing code/bench_import_time.py" --runs 7 --tree /tmp/before
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import app.main
+print((time.perf_counter() - started) * 1000, 'google.cloud.storage' in sys.modules)
+"""
+
+CONFIGURATIONS = {
+    "STORAGE_BACKEND=gcs": {"STORAGE_BACKEND": "gcs"},
+    "STORAGE_BACKEND=local": {"STORAGE_BACKEND": "local"},
+    "no GCP credentials": {"STORAGE_BACKEND": "local", "GOOGLE_APPLICATION_CREDENTIALS": None},
+}
+
+
+def run(tree, overrides):
+    env = dict(os.environ, PYTHONPATH=tree)
+    for key, value in overrides.items():
+        if value is None:
+            env.pop(key, None)
+        else:
+            env[key] = value
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=tree, env=env, capture_output=True, text=True)
+    if result.returncode:
+        return None, result.stderr.strip().splitlines()[-1]
+    elapsed, storage_loaded = result.stdout.split()[-2:]
+    return float(elapsed), storage_loaded == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--tree", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    args = parser.parse_args()
+
+    print(f"{args.tree}, median of {args.runs} runs\n")
+    print(f"{'configuration':24} {'import ms':>10}  google-cloud-storage loaded")
+    for name, overrides in CONFIGURATIONS.items():
+        samples, loaded, error = [], None, None
+        for _ in range(args.runs):
+            elapsed, detail = run(args.tree, overrides)
+            if elapsed is None:
+                error = detail
+                break
+            samples.append(elapsed)
+            loaded = detail
+        if error:
+            print(f"{name:24} {'failed':>10}  {error[:90]}")
+        else:
+            print(f"{name:24} {statistics.median(samples):10.0f}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: plain vs monthly-partitioned wallet_ledger with a year of synthetic data.
+
+Builds a throwaway schema (`partition_bench`) with all tables, fills wallet_ledger with
+--rows entries spread over the last 365 days, converts it with the same functions as
+run_partition_migration.py and then times the ledger queries against the old table
+(kept as wallet_ledger_unpartitioned) and the partitioned one.
+
+Usage:
+    python "Testing code/bench_partitions.py" --rows 1000000 --runs 20
+    python "Testing code/bench_partitions.py" --keep   # leave the schema for manual EXPLAINs
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+
+from app.database.session import Base, DATABASE_URL
+from app.database.migrations import load_models
+from app.database.partitions import prepare_conversion, copy_batch, swap_tables
+
+SCHEMA = "partition_bench"
+OWNERS = 500
+
+SEED_SQL = """
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'o' || g, 'x', 'ACTIVE', 0 FROM generate_series(1, :owners) g;
+
+INSERT INTO wallet_ledger(id, vehicle_owner_id, entry_type, amount, balance_before, balance_after, created_at)
+SELECT gen_random_uuid(), o.ids[1 + (g % :owners)], 'CREDIT', 100, 0, 100,
+       now() - (random() * interval '365 days')
+FROM generate_series(1, :rows) g, (SELECT array_agg(id) AS ids FROM vehicle_owner) o;
+"""
+
+QUERIES = {
+    "owner history, last 30 days": """
+        SELECT * FROM {table} WHERE vehicle_owner_id = :owner AND created_at >= now() - interval '30 days'
+        ORDER BY created_at DESC""",
+    "owner history, latest 50": """
+        SELECT * FROM {table} WHERE vehicle_owner_id = :owner ORDER BY created_at DESC LIMIT 50""",
+    "all owners, credits last 7 days": """
+        SELECT count(*), sum(amount) FROM {table} WHERE created_at >= now() - interval '7 days'""",
+    "all owners, previous calendar month": """
+        SELECT count(*), sum(amount) FROM {table}
+        WHERE created_at >= date_trunc('month', now()) - interval '1 month' AND created_at < date_trunc('month', now())""",
+}
+
+
+def timed(conn, sql, params, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        conn.execute(text(sql), params).all()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def scanned_relations(conn, sql, params):
+    plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql), params).scalar_one()[0]["Plan"]
+    found = set()
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Relation Name" in node:
+            found.add(node["Relation Name"])
+        stack.extend(node.get("Plans", []))
+    return len(found)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA "{SCHEMA}"'))
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-c search_path={SCHEMA}"})
+
+    try:
+        load_models()
+        Base.metadata.create_all(bind=engine)
+
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            for statement in SEED_SQL.strip().split(";\n"):
+                conn.execute(text(statement), {"owners": OWNERS, "rows": args.rows})
+        print(f"Seeded {args.rows} ledger rows in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            renames = prepare_conversion(conn, "wallet_ledger", drop_incoming_fks=True)
+        last_id = None
+        while True:
+            with engine.begin() as conn:
+                last_id, count = copy_batch(conn, "wallet_ledger", last_id, args.batch_size)
+            if not count:
+                break
+        with engine.begin() as conn:
+            swap_tables(conn, "wallet_ledger", renames, drop_incoming_fks=True)
+        print(f"Converted in {time.perf_counter() - started:.1f}s")
+
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+
+        with engine.connect() as conn:
+            owner = conn.execute(text("SELECT id FROM vehicle_owner LIMIT 1")).scalar_one()
+            params = {"owner": owner}
+            print(f"\n{'query':40} {'plain ms':>10} {'partitioned ms':>15} {'relations':>10}")
+            for name, sql in QUERIES.items():
+                plain = timed(conn, sql.format(table="wallet_ledger_unpartitioned"), params, args.runs)
+                partitioned = timed(conn, sql.format(table="wallet_ledger"), params, args.runs)
+                relations = scanned_relations(conn, sql.format(table="wallet_ledger"), params)
+                print(f"{name:40} {plain:10.2f} {partitioned:15.2f} {relations:10}")
+    finally:
+        engine.dispose()
+        if not args.keep:
+            with admin.begin() as conn:
+                conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        admin.dispose()
+
+
+if __name__ == "__main__":
+    main()
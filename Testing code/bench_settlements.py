@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark: trip settlements with the admin wallet on one row vs striped over ADMIN_WALLET_SHARDS rows.
+
+Builds a throwaway schema (`settlement_bench`) with all tables, one admin and --concurrency vehicle owners
+and vendors, then settles --trips trips from --concurrency threads. Each settlement is what end_trip does
+in one transaction: debit the vehicle owner, credit the vendor with the admin profit going to the admin
+wallet, then --work-ms of further work (assignment / driver updates) before the commit. Compared:
+  - before: admin looked up with db.query(Admin).first() per trip, ADMIN_WALLET_SHARDS=0 (admin row)
+  - after: get_platform_admin_id (cached), ADMIN_WALLET_SHARDS=--shards
+
+Usage:
+    python "Testing code/bench_settlements.py" --trips 1280 --concurrency 64 --shards 16 --work-ms 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.session import Base, DATABASE_URL
+from app.database.migrations import load_models
+from app.crud import admin_wallet
+from app.crud.wallet import debit_wallet
+from app.crud.vendor_wallet import credit_vendor_wallet
+from app.models.admin import Admin
+
+SCHEMA = "settlement_bench"
+VENDOR_PROFIT = 90
+ADMIN_PROFIT = 10
+
+SEED_SQL = """
+INSERT INTO admin(id, username, phone, organization_id, balance)
+VALUES (gen_random_uuid(), 'bench-admin', '9999999999', gen_random_uuid(), 0);
+
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'v' || g, 'x', 'ACTIVE', 0 FROM generate_series(1, :accounts) g;
+
+INSERT INTO vendor_details(id, vendor_id, full_name, primary_number, wallet_balance, bank_balance, gpay_number, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), id, 'Vendor ' || primary_number, primary_number, 0, 0, primary_number, primary_number, 'Street', 'Chennai', '600001'
+FROM vendor;
+
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'o' || g, 'x', 'ACTIVE', 0 FROM generate_series(1, :accounts) g;
+
+INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), id, 'Owner ' || primary_number, primary_number, 1000000, primary_number, 'Street', 'Chennai', '600001'
+FROM vehicle_owner
+"""
+
+
+def legacy_admin_id(db):
+    admin = db.query(Admin).first()
+    return str(admin.id) if admin else None
+
+
+def settle(Session, admin_id_lookup, owner_id, vendor_id, order_id, work_ms):
+    db = Session()
+    try:
+        started = time.perf_counter()
+        debit_wallet(db, owner_id, VENDOR_PROFIT + ADMIN_PROFIT, str(order_id), "TRIP_COMPLETION")
+        credit_vendor_wallet(
+            db, vendor_id=vendor_id, amount=VENDOR_PROFIT, order_id=order_id,
+            deduct_admin_profit=True, admin_profit=ADMIN_PROFIT, admin_id=admin_id_lookup(db),
+        )
+        time.sleep(work_ms / 1000)
+        db.commit()
+        return (time.perf_counter() - started) * 1000
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trips", type=int, default=1280)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--work-ms", type=float, default=5)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA "{SCHEMA}"'))
+    engine = create_engine(
+        DATABASE_URL, pool_size=args.concurrency, connect_args={"options": f"-c search_path={SCHEMA}"}
+    )
+
+    try:
+        load_models()
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        cases = (("before", 0, legacy_admin_id), ("after", args.shards, admin_wallet.get_platform_admin_id))
+
+        print(f"{args.trips} settlements, {args.concurrency} concurrent, {args.work_ms} ms of other work per transaction")
+        print(f"\n{'case':8} {'shards':>6} {'trips/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'admin balance':>14}")
+        for name, shards, lookup in cases:
+            with engine.begin() as conn:
+                conn.execute(text("TRUNCATE admin, vendor, vehicle_owner CASCADE"))
+                for statement in SEED_SQL.strip().split(";\n\n"):
+                    conn.execute(text(statement), {"accounts": args.concurrency})
+                owners = [str(i) for i in conn.execute(text("SELECT id FROM vehicle_owner ORDER BY id")).scalars()]
+                vendors = [str(i) for i in conn.execute(text("SELECT id FROM vendor ORDER BY id")).scalars()]
+            admin_wallet.ADMIN_WALLET_SHARDS = shards
+            admin_wallet._admin_id_cache.clear()
+
+            # Trip i belongs to owner / vendor i % concurrency, so only the admin wallet is shared
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                latencies = list(pool.map(
+                    lambda i: settle(Session, lookup, owners[i % len(owners)], vendors[i % len(vendors)], i, args.work_ms),
+                    range(args.trips),
+                ))
+            per_second = args.trips / (time.perf_counter() - started)
+
+            with Session() as db:
+                admin_id = admin_wallet.get_platform_admin_id(db)
+                admin_wallet.fold_admin_wallet_shards(db)
+                db.commit()
+                balance = admin_wallet.get_admin_balance(db, admin_id)
+            assert balance == args.trips * ADMIN_PROFIT, balance
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{name:8} {shards:6} {per_second:8.0f} {statistics.median(latencies):8.1f} {p95:8.1f} {balance:14}")
+    finally:
+        engine.dispose()
+        if not args.keep:
+            with admin.begin() as conn:
+                conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        admin.dispose()
+
+
+if __name__ == "__main__":
+    main()
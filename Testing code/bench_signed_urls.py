@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: signed URL generation for one admin page of images.
+
+The remote signer (IAM signBlob through impersonated credentials) is replaced by a fake
+that sleeps --latency-ms per signature. Compared:
+  - before: one blocking signature per image, no cache
+  - batch, cold cache: generate_signed_urls_from_gcs with every URL missing (parallel signing)
+  - batch, warm cache: the same page again within the URL lifetime
+  - local key: real V4 signatures with a throwaway RSA key (what GCS_SIGNING_KEY_FILE enables)
+
+Usage:
+    python "Testing code/bench_signed_urls.py" --urls 200 --latency-ms 60
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rsa
+from google.oauth2 import service_account
+
+from app.utils import gcs
+
+
+def fake_remote_signer(latency_ms):
+    def sign(blob_name, expiry_minutes):
+        time.sleep(latency_ms / 1000)
+        return f"https://storage.googleapis.com/{gcs.GCS_BUCKET_NAME}/{blob_name}?X-Goog-Signature=fake"
+    return sign
+
+
+def throwaway_signing_credentials():
+    _, private_key = rsa.newkeys(2048)
+    return service_account.Credentials.from_service_account_info({
+        "type": "service_account",
+        "client_email": "bench@example.iam.gserviceaccount.com",
+        "private_key": private_key.save_pkcs1().decode(),
+        "private_key_id": "bench",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    })
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{label:28} {elapsed:10.1f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--urls", type=int, default=200, help="images on the page (e.g. 100 orders x 2 end record images)")
+    parser.add_argument("--latency-ms", type=float, default=60, help="simulated signBlob round trip")
+    args = parser.parse_args()
+
+    prefix = f"https://storage.googleapis.com/{gcs.GCS_BUCKET_NAME}/"
+    urls = [f"{prefix}end_records/{i}.jpg" for i in range(args.urls)]
+    remote = fake_remote_signer(args.latency_ms)
+
+    print(f"{args.urls} images, {args.latency_ms:.0f} ms per remote signature, {gcs.SIGNED_URL_SIGN_WORKERS} sign workers\n")
+    timed("before (sequential, no cache)", lambda: [remote(url[len(prefix):], 2) for url in urls])
+
+    gcs._sign_blob = remote
+    gcs._signed_urls.clear()
+    timed("batch, cold cache", lambda: gcs.generate_signed_urls_from_gcs(urls))
+    timed("batch, warm cache", lambda: gcs.generate_signed_urls_from_gcs(urls))
+    timed("single calls, warm cache", lambda: [gcs.generate_signed_url_from_gcs(url) for url in urls])
+
+    credentials = throwaway_signing_credentials()
+    blob = gcs.get_storage().bucket.blob("end_records/0.jpg")
+    sign_locally = lambda: [
+        blob.generate_signed_url(version="v4", expiration=120, method="GET", credentials=credentials)
+        for _ in urls
+    ]
+    timed("local key, no cache", sign_locally)
+
+
+if __name__ == "__main__":
+    main()
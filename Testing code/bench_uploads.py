@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: image uploads of a 5-image car signup.
+
+GCS is replaced by a slow local stand-in that streams each file in UPLOAD_CHUNK_SIZE chunks to a
+temporary directory, sleeping --latency-ms per chunk (a mobile-sized photo over a slow link). Compared:
+  - before: the images uploaded one after another with the blocking upload_image_to_gcs on the event loop
+  - after: upload_images_to_gcs (concurrent, on the bounded upload pool)
+For each run the worst event loop stall is reported (a 10 ms ticker running next to the signup).
+
+Usage:
+    python "Testing code/bench_uploads.py" --images 5 --size-kb 3000 --latency-ms 150
+"""
+import argparse
+import asyncio
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import UploadFile
+
+from app.utils import gcs
+
+
+def local_stand_in(root, latency_ms):
+    def upload(file, folder):
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+        filename = f"{folder}/{uuid.uuid4()}{os.path.splitext(file.filename)[-1]}"
+        with open(os.path.join(root, filename), "wb") as out:
+            while chunk := file.file.read(gcs.UPLOAD_CHUNK_SIZE):
+                time.sleep(latency_ms / 1000)
+                out.write(chunk)
+        return f"https://storage.googleapis.com/{gcs.GCS_BUCKET_NAME}/{filename}"
+    return upload
+
+
+def signup_files(images, size_kb):
+    return {
+        f"image_{i}_url": (UploadFile(io.BytesIO(os.urandom(size_kb * 1024)), filename=f"{i}.jpg"), "car_details/bench")
+        for i in range(images)
+    }
+
+
+async def measure(signup):
+    """Run a signup next to a 10 ms ticker: (elapsed ms, worst event loop stall ms)."""
+    worst = 0.0
+
+    async def ticker():
+        nonlocal worst
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, (time.perf_counter() - before - 0.01) * 1000)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await signup()
+    elapsed = (time.perf_counter() - started) * 1000
+    await asyncio.sleep(0.02)  # let the ticker notice a stall that lasted until the end
+    task.cancel()
+    return elapsed, worst
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=5)
+    parser.add_argument("--size-kb", type=int, default=3000)
+    parser.add_argument("--latency-ms", type=float, default=150, help="simulated time per uploaded chunk")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_uploads_")
+    gcs.upload_image_to_gcs = local_stand_in(root, args.latency_ms)
+    try:
+        before_files = signup_files(args.images, args.size_kb)
+        after_files = signup_files(args.images, args.size_kb)
+
+        async def before():
+            for file, folder in before_files.values():
+                gcs.upload_image_to_gcs(file, folder)
+
+        async def after():
+            await gcs.upload_images_to_gcs(after_files)
+
+        chunks = -(-args.size_kb * 1024 // gcs.UPLOAD_CHUNK_SIZE)
+        print(f"{args.images} images x {args.size_kb} KB ({chunks} chunks, {args.latency_ms:.0f} ms each), "
+              f"{gcs.UPLOAD_CONCURRENCY} upload workers\n")
+        print(f"{'':28} {'signup ms':>10} {'worst loop stall ms':>20}")
+        for label, signup in (("before (serial, blocking)", before), ("after (concurrent, pooled)", after)):
+            elapsed, stall = asyncio.run(measure(signup))
+            print(f"{label:28} {elapsed:10.1f} {stall:20.1f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: wallet debits, previous read-modify-write vs the single UPDATE ... RETURNING + ledger INSERT statement.
+
+Builds a throwaway schema (`wallet_bench`) with all tables and --owners vehicle owners, then runs --debits
+debits of 1 from --workers threads (one session and commit per debit) with:
+  - before: SELECT the owner, write balance - amount back from Python, add the ledger entry (as debit_wallet was)
+  - after: debit_wallet (app/crud/wallet.py)
+Each run reports throughput, statements per debit and lost updates (debits committed minus balance actually taken).
+`--owners 1` is the hot case: every debit hits the same wallet.
+
+Usage:
+    python "Testing code/bench_wallet.py" --debits 2000 --workers 8 --owners 1
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core import db_metrics
+from app.database.session import Base, DATABASE_URL
+from app.database.migrations import load_models
+from app.crud.wallet import debit_wallet
+from app.models.vehicle_owner_details import VehicleOwnerDetails
+from app.models.wallet_ledger import WalletLedger, WalletEntryTypeEnum
+
+SCHEMA = "wallet_bench"
+START_BALANCE = 1_000_000
+
+SEED_SQL = """
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'o' || g, 'x', 'ACTIVE', 0
+FROM generate_series(1, :owners) g;
+
+INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), id, 'Owner ' || primary_number, primary_number, :balance, primary_number, 'Street', 'Chennai', '600001'
+FROM vehicle_owner
+"""
+
+
+def legacy_debit(db, vehicle_owner_id, amount, reference_id, reference_type, notes=None):
+    """debit_wallet as it was: the balance is read, checked and written back from Python."""
+    owner = db.execute(
+        select(VehicleOwnerDetails).where(VehicleOwnerDetails.vehicle_owner_id == vehicle_owner_id)
+    ).scalar_one()
+    current = owner.wallet_balance
+    if current < amount:
+        raise ValueError("Insufficient balance")
+    owner.wallet_balance = current - amount
+    entry = WalletLedger(
+        vehicle_owner_id=vehicle_owner_id, entry_type=WalletEntryTypeEnum.DEBIT, amount=amount,
+        balance_before=current, balance_after=current - amount, reference_id=reference_id,
+        reference_type=reference_type, notes=notes,
+    )
+    db.add(entry)
+    return owner.wallet_balance, entry
+
+
+def run(Session, debit, owner_ids, debits, workers):
+    """(debits per second, statements per debit)"""
+    def one(i):
+        db = Session()
+        try:
+            with db_metrics.track_queries() as stats:
+                debit(db, owner_ids[i % len(owner_ids)], 1, None, "BENCH")
+                db.commit()
+            return stats.count
+        finally:
+            db.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        statements = list(pool.map(one, range(debits)))
+    return debits / (time.perf_counter() - started), sum(statements) / debits
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--debits", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--owners", type=int, default=1)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA "{SCHEMA}"'))
+    engine = create_engine(
+        DATABASE_URL, pool_size=args.workers, connect_args={"options": f"-c search_path={SCHEMA}"}
+    )
+
+    try:
+        load_models()
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+
+        print(f"{args.debits} debits, {args.workers} workers, {args.owners} wallet(s)")
+        print(f"\n{'case':10} {'debits/s':>10} {'stmts/debit':>12} {'lost updates':>13}")
+        for name, debit in (("before", legacy_debit), ("after", debit_wallet)):
+            with engine.begin() as conn:
+                conn.execute(text("TRUNCATE wallet_ledger, vehicle_owner_details, vehicle_owner CASCADE"))
+                for statement in SEED_SQL.strip().split(";\n\n"):
+                    conn.execute(text(statement), {"owners": args.owners, "balance": START_BALANCE})
+                owner_ids = [str(row.id) for row in conn.execute(text("SELECT id FROM vehicle_owner ORDER BY id"))]
+
+            per_second, statements = run(Session, debit, owner_ids, args.debits, args.workers)
+
+            with engine.connect() as conn:
+                taken = conn.execute(text(
+                    "SELECT count(*) * :balance - sum(wallet_balance) FROM vehicle_owner_details"
+                ), {"balance": START_BALANCE}).scalar_one()
+            print(f"{name:10} {per_second:10.0f} {statements:12.1f} {args.debits - taken:13}")
+    finally:
+        engine.dispose()
+        if not args.keep:
+            with admin.begin() as conn:
+                conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        admin.dispose()
+
+
+if __name__ == "__main__":
+    main()
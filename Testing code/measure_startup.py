@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Measure application cold start cost of the schema step.
+
+Compares the old startup path (Base.metadata.create_all, which reflects every table)
+with the new one (compare the alembic_version row with the migration head).
+Each measurement runs in a fresh interpreter so nothing is cached between runs.
+
+Usage:
+    python "Testing code/measure_startup.py" --runs 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+CREATE_ALL = """
+import time
+from app.database.session import Base, engine
+from app.database.migrations import load_models
+load_models()
+t = time.perf_counter()
+Base.metadata.create_all(bind=engine)
+print(time.perf_counter() - t)
+"""
+
+REVISION_CHECK = """
+import time
+from app.database.session import engine
+from app.database.migrations import check_schema_revision
+t = time.perf_counter()
+check_schema_revision(engine)
+print(time.perf_counter() - t)
+"""
+
+IMPORT_APP = """
+import time
+t = time.perf_counter()
+import app.main
+print(time.perf_counter() - t)
+"""
+
+
+def run(snippet: str, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def report(label: str, timings: list) -> None:
+    print(f"{label:<32} median {statistics.median(timings) * 1000:8.1f} ms   min {min(timings) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    report("create_all (old startup)", run(CREATE_ALL, args.runs))
+    report("revision check (new startup)", run(REVISION_CHECK, args.runs))
+    report("import app.main (total)", run(IMPORT_APP, args.runs))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Move closed orders to the archive tables by hand (the app does it hourly when ARCHIVE_ENABLED=true).
+
+With --report, table sizes and hot query latency are printed before and after the move.
+--vacuum runs VACUUM ANALYZE on the hot tables afterwards so the freed space is reusable
+and the planner sees the new row counts.
+
+Usage:
+    alembic upgrade head
+    python "Testing code/run_order_archive.py" --older-than-days 180 --report --vacuum
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text, select, func
+
+from app.database.session import SessionLocal, engine
+from app.crud.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, archive_closed_orders
+from app.crud.orders import _vendor_orders_select
+from app.models.orders import Order
+
+TABLES = ["orders", "new_orders", "hourly_rental", "order_assignments", "end_records"]
+
+
+def table_sizes():
+    with engine.connect() as conn:
+        for table in TABLES:
+            for name in (table, f"{table}_archive"):
+                rows = conn.execute(text(f'SELECT count(*) FROM "{name}"')).scalar()
+                size = conn.execute(text("SELECT pg_size_pretty(pg_total_relation_size(to_regclass(:t)))"), {"t": name}).scalar()
+                print(f"  {name:28} {rows:>10} rows {size:>10}")
+
+
+def latency(runs: int):
+    db = SessionLocal()
+    try:
+        vendor_id = db.execute(
+            select(Order.vendor_id).group_by(Order.vendor_id).order_by(func.count().desc()).limit(1)
+        ).scalar()
+        if vendor_id is None:
+            print("  no orders")
+            return
+        # SQL only: the response mapping cost depends on the page size, not on the archive
+        checks = {
+            "vendor orders": lambda: db.execute(_vendor_orders_select(vendor_id)).all(),
+            "vendor orders (archive)": lambda: db.execute(_vendor_orders_select(vendor_id, archived=True)).all(),
+            "vendor pending orders": lambda: db.execute(_vendor_orders_select(vendor_id, pending_only=True)).all(),
+            "pending board scan": lambda: db.execute(select(Order.id).where(Order.trip_status == "PENDING")).all(),
+        }
+        for name, check in checks.items():
+            samples = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                check()
+                samples.append((time.perf_counter() - started) * 1000)
+            print(f"  {name:28} {statistics.median(samples):8.2f} ms")
+    finally:
+        db.close()
+
+
+def report(title: str, runs: int):
+    print(f"\n{title}")
+    table_sizes()
+    latency(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--older-than-days", type=int, default=ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--report", action="store_true")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--vacuum", action="store_true")
+    args = parser.parse_args()
+
+    if args.report:
+        report("Before", args.runs)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        moved = archive_closed_orders(db, args.older_than_days, args.batch_size, args.max_batches)
+    finally:
+        db.close()
+    print(f"\n✅ Archived in {time.perf_counter() - started:.1f}s: {moved or 'nothing to archive'}")
+
+    if args.vacuum:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in TABLES:
+                conn.execute(text(f'VACUUM ANALYZE "{table}"'))
+
+    if args.report:
+        report("After", args.runs)
+
+
+if __name__ == "__main__":
+    main()
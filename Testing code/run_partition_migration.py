@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Convert orders / order_assignments / ledger tables to monthly range partitions on created_at.
+
+For each table:
+1. create the partitioned shadow table `<table>_p` (monthly partitions from the oldest row
+   to PARTITION_MONTHS_AHEAD months ahead, a default partition, the same indexes and
+   foreign keys) and a trigger that mirrors new writes into it
+2. copy the existing rows in batches of --batch-size, one short transaction each
+3. swap the tables with a rename (brief ACCESS EXCLUSIVE lock); the old table is kept as
+   `<table>_unpartitioned` until you drop it
+
+Tables referenced by other tables' foreign keys (orders, wallet_ledger) are refused unless
+--drop-incoming-fks is given: a partitioned table's primary key is (id, created_at), so
+those foreign keys cannot be recreated. Tables with unique indexes (every ledger's id) are
+refused unless --weaken-unique-indexes is given: the unique indexes are then re-created with
+created_at added and only reject duplicates that share a created_at (see MIGRATION_README.md).
+
+Usage:
+    python "Testing code/run_partition_migration.py" order_assignments vendor_wallet_ledger admin_wallet_ledger --weaken-unique-indexes
+    python "Testing code/run_partition_migration.py" wallet_ledger --drop-incoming-fks --weaken-unique-indexes
+    python "Testing code/run_partition_migration.py" wallet_ledger --abort   # remove a half-finished shadow table
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+
+from app.database.session import engine
+from app.database.partitions import (
+    PARTITIONED_TABLES,
+    PARTITION_MONTHS_AHEAD,
+    prepare_conversion,
+    copy_batch,
+    swap_tables,
+    existing_partitions,
+)
+
+
+def abort(table: str) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP TRIGGER IF EXISTS "{table}_partition_sync" ON "{table}"'))
+        conn.execute(text(f'DROP FUNCTION IF EXISTS "{table}_partition_sync"()'))
+        conn.execute(text(f'DROP TABLE IF EXISTS "{table}_p" CASCADE'))
+    print(f"🧹 {table}: shadow table removed")
+
+
+def convert(table: str, batch_size: int, months_ahead: int, drop_incoming_fks: bool, weaken_unique_indexes: bool,
+            pause: float) -> None:
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        renames = prepare_conversion(conn, table, months_ahead, drop_incoming_fks, weaken_unique_indexes)
+        print(f"➡️  {table}: {len(existing_partitions(conn, f'{table}_p'))} partitions created")
+
+    copied = 0
+    last_id = None
+    while True:
+        with engine.begin() as conn:
+            last_id, count = copy_batch(conn, table, last_id, batch_size)
+        if not count:
+            break
+        copied += count
+        print(f"  {table}: {copied} rows copied")
+        if pause:
+            time.sleep(pause)
+
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL lock_timeout = '10s'"))
+        swap_tables(conn, table, renames, drop_incoming_fks)
+        old_count = conn.execute(text(f'SELECT count(*) FROM "{table}_unpartitioned"')).scalar()
+        new_count = conn.execute(text(f'SELECT count(*) FROM "{table}"')).scalar()
+        if old_count != new_count:
+            raise RuntimeError(f"{table}: {old_count} rows in the old table but {new_count} copied, swap rolled back")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f'ANALYZE "{table}"'))
+    print(f"✅ {table}: {new_count} rows partitioned in {time.perf_counter() - started:.1f}s "
+          f"(old table kept as {table}_unpartitioned)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tables", nargs="*", default=PARTITIONED_TABLES, help=f"default: {' '.join(PARTITIONED_TABLES)}")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    parser.add_argument("--drop-incoming-fks", action="store_true")
+    parser.add_argument("--weaken-unique-indexes", action="store_true")
+    parser.add_argument("--abort", action="store_true")
+    args = parser.parse_args()
+
+    for table in args.tables:
+        if args.abort:
+            abort(table)
+            continue
+        try:
+            convert(table, args.batch_size, args.months_ahead, args.drop_incoming_fks, args.weaken_unique_indexes, args.pause)
+        except ValueError as e:
+            print(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
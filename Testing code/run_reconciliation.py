@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Reconcile the stored wallet balances with the ledgers (app/crud/reconciliation.py).
+
+Reports every account whose balance does not match its ledger; --fix also corrects the balance.
+Progress is checkpointed per batch in reconciliation_checkpoints: an interrupted run continues
+where it stopped, --restart starts a new pass. --account checks only the given accounts.
+
+Usage:
+    alembic upgrade head
+    python "Testing code/run_reconciliation.py" --wallet owner --wallet vendor --batch-size 500 [--fix]
+"""
+import argparse
+import time
+
+from app.database.session import SessionLocal
+from app.crud.reconciliation import RECONCILE_BATCH_SIZE, WALLETS, reconcile_wallet
+from app.models.reconciliation import ReconciliationCheckpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wallet", action="append", choices=list(WALLETS), help="default: all wallets")
+    parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None, help="stop after this many batches (resume later)")
+    parser.add_argument("--fix", action="store_true", help="correct the mismatched balances")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first account")
+    parser.add_argument("--account", action="append", help="only these account ids (no checkpoint)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        for wallet in args.wallet or list(WALLETS):
+            started = time.perf_counter()
+            found = reconcile_wallet(db, wallet, fix=args.fix, batch_size=args.batch_size,
+                                     max_batches=args.max_batches, restart=args.restart, principal_ids=args.account)
+            if args.account:
+                print(f"{wallet:7} {len(found):>6} mismatched ({time.perf_counter() - started:.1f}s)")
+                continue
+            checkpoint = db.get(ReconciliationCheckpoint, wallet)
+            state = "done" if checkpoint.finished_at else f"stopped after {checkpoint.last_principal_id}"
+            print(f"{wallet:7} {checkpoint.checked:>8} checked {checkpoint.mismatched:>6} mismatched "
+                  f"{checkpoint.fixed:>6} fixed  {state} ({time.perf_counter() - started:.1f}s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
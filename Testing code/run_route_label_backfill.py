@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Backfill origin_label / destination_label / stop_count for rows created before
+migration 0004 (new rows are labelled by the models on insert).
+
+Works in primary key order, one short transaction per batch, so it can run against
+a live database and be stopped and restarted at any point.
+
+Usage:
+    alembic upgrade head
+    python "Testing code/run_route_label_backfill.py" --batch-size 1000
+"""
+import argparse
+import time
+
+from sqlalchemy import select, update
+
+from app.database.session import SessionLocal
+from app.database.migrations import load_models
+from app.utils.route_labels import route_labels
+
+load_models()
+
+from app.models.orders import Order
+from app.models.new_orders import NewOrder
+from app.models.hourly_rental import HourlyRental
+
+MODELS = [
+    (Order, Order.id),
+    (NewOrder, NewOrder.order_id),
+    (HourlyRental, HourlyRental.id),
+]
+
+
+def backfill(model, pk, batch_size: int) -> int:
+    """Label every unlabelled row of `model`, returns the number of rows updated"""
+    total = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(pk, model.pickup_drop_location)
+                .where(model.stop_count.is_(None), pk > last_id)
+                .order_by(pk)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return total
+
+            params = []
+            for row_id, location in rows:
+                origin, destination, stop_count = route_labels(location)
+                params.append({
+                    pk.key: row_id,
+                    "origin_label": origin,
+                    "destination_label": destination,
+                    "stop_count": stop_count,
+                })
+            # executemany UPDATE ... WHERE <pk> = ?
+            db.execute(update(model), params)
+            db.commit()
+        finally:
+            db.close()
+
+        total += len(rows)
+        last_id = rows[-1][0]
+        print(f"  {model.__tablename__}: {total} rows labelled (last id {last_id})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    for model, pk in MODELS:
+        started = time.perf_counter()
+        count = backfill(model, pk, args.batch_size)
+        print(f"✅ {model.__tablename__}: {count} rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 # api/routes/admin.py
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Response
 from sqlalchemy.orm import Session
 from app.schemas.admin import AdminSignup,UserInfoResponse, SearchUserRequest,AdminSignin, AdminTokenResponse, AdminOut, AdminUpdate, AdminLedger, UserPasswordUpdate, UserPasswordUpdateResponse
 from app.schemas.admin_add_money import VehicleOwnerInfoResponse, SearchVehicleOwnerRequest, AdminAddMoneyRequest, AdminAddMoneyResponse
@@ -10,7 +10,7 @@ from app.crud.admin_management import (
     get_all_vehicle_owners, get_vehicle_owner_full_details, update_vehicle_owner_account_status,
     update_vehicle_owner_document_status, get_vehicle_owner_cars, get_vehicle_owner_drivers,
     update_car_account_status, update_car_document_status, update_driver_account_status, update_driver_document_status,
-    get_all_accounts_unified, get_account_details_by_id,
+    get_all_accounts_unified, encode_account_cursor, get_account_details_by_id,
     get_all_account_documents, update_document_status_by_id, update_unified_account_status,
     get_all_cars_unified
 )
@@ -24,16 +24,32 @@ from app.schemas.admin_management import (
 )
 from app.schemas.order_details import AdminOrdersListResponse
 from app.crud.order_details import get_all_admin_orders
-from app.crud.admin_wallet import get_admin_account_ledger_data
+from app.crud.admin_wallet import get_admin_account_ledger_data, get_admin_balances
+from app.crud.wallet import encode_ledger_cursor
 from app.core.security import create_access_token, get_current_admin
 from app.database.session import get_db
-from app.utils.gcs import upload_image_to_gcs, generate_signed_url_from_gcs
+from app.database.replica import get_read_db, ReplicaFallbackRoute
+from app.utils.gcs import upload_image_to_gcs_async, generate_signed_url_from_gcs, generate_signed_urls_from_gcs
+from app.utils.images import InvalidImageError
 from app.models.common_enums import DocumentStatusEnum
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
 import os
 
-router = APIRouter()
+router = APIRouter(route_class=ReplicaFallbackRoute)
+
+
+def _admins_out(db: Session, admins) -> List[AdminOut]:
+    """AdminOut for each admin, balance including what is still in the wallet shards (one query)"""
+    balances = get_admin_balances(db, [admin.id for admin in admins])
+    out = []
+    for admin in admins:
+        admin_out = AdminOut.model_validate(admin)
+        admin_out.balance = balances.get(str(admin.id), admin.balance)
+        out.append(admin_out)
+    return out
+
 
 @router.post("/admin/signup", response_model=AdminTokenResponse, status_code=status.HTTP_201_CREATED)
 async def admin_signup(
@@ -95,15 +111,7 @@ async def admin_signup(
         access_token = create_access_token({"sub": str(admin.id)})
         
         # Prepare response
-        admin_response = AdminOut(
-            id=admin.id,
-            username=admin.username,
-            email=admin.email,
-            phone=admin.phone,
-            role=admin.role,
-            organization_id=admin.organization_id,
-            created_at=admin.created_at
-        )
+        admin_response = _admins_out(db, [admin])[0]
         
         return AdminTokenResponse(
             access_token=access_token,
@@ -148,15 +156,7 @@ async def admin_signin(
         access_token = create_access_token({"sub": str(admin.id)})
         
         # Prepare response
-        admin_response = AdminOut(
-            id=admin.id,
-            username=admin.username,
-            email=admin.email,
-            phone=admin.phone,
-            role=admin.role,
-            organization_id=admin.organization_id,
-            created_at=admin.created_at
-        )
+        admin_response = _admins_out(db, [admin])[0]
         
         return AdminTokenResponse(
             access_token=access_token,
@@ -186,7 +186,7 @@ async def get_admin_profile(
         - Admin profile details
     """
     try:
-        return current_admin
+        return _admins_out(db, [current_admin])[0]
         
     except HTTPException:
         raise
@@ -198,19 +198,28 @@ async def get_admin_profile(
 
 @router.get("/admin/acccount-ledger", response_model=List[AdminLedger])
 async def get_admin_account_ledger(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Number of entries to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    from_date: Optional[datetime] = Query(None, description="Only entries created at or after this time"),
+    to_date: Optional[datetime] = Query(None, description="Only entries created before this time"),
     current_admin = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get current admin profile
+    Get current admin wallet ledger
     
-    Returns the profile of the currently authenticated admin.
+    Returns the ledger entries of the currently authenticated admin, newest first.
+    When the page is full, the X-Next-Cursor response header holds the cursor for the next page.
     
     Returns:
-        - Admin profile details
+        - Admin ledger entries
     """
     try:
-        return get_admin_account_ledger_data(db, current_admin.id)
+        entries = get_admin_account_ledger_data(db, current_admin.id, limit, cursor, from_date, to_date)
+        if len(entries) == limit:
+            response.headers["X-Next-Cursor"] = encode_ledger_cursor(entries[-1].created_at, entries[-1].id)
+        return entries
 
     except HTTPException:
         raise
@@ -238,7 +247,7 @@ async def update_admin_profile(
         # Update admin profile
         updated_admin = update_admin(db, str(current_admin.id), **admin_update.dict(exclude_unset=True))
         
-        return updated_admin
+        return _admins_out(db, [updated_admin])[0]
         
     except HTTPException:
         raise
@@ -274,7 +283,7 @@ async def list_admins(
         
         admins, total_count = get_all_admins(db, skip, limit)
         
-        return admins
+        return _admins_out(db, admins)
         
     except HTTPException:
         raise
@@ -291,8 +300,10 @@ async def list_admins(
 async def list_all_orders(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    origin: Optional[str] = Query(None, min_length=1, description="Only orders whose pickup city starts with this text (case-insensitive)"),
+    full_images: bool = Query(False, description="Signed URLs of the full images instead of thumbnails"),
     current_admin = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get All Orders (Admin Only)
@@ -301,7 +312,7 @@ async def list_all_orders(
     - Order information (id, source, trip type, car type, customer details, pricing, etc.)
     - Vendor information (full vendor details)
     - Assignment history (all assignments for the order)
-    - End records (trip completion records)
+    - End records (trip completion records; image URLs are thumbnails unless full_images=true)
     - Driver information (if assigned)
     - Car information (if assigned)
     - Vehicle owner information (if assigned)
@@ -314,7 +325,7 @@ async def list_all_orders(
         - Pagination info (skip, limit)
     """
     try:
-        orders, total_count = get_all_admin_orders(db, skip=skip, limit=limit)
+        orders, total_count = get_all_admin_orders(db, skip=skip, limit=limit, origin=origin, thumbnails=not full_images)
         
         return AdminOrdersListResponse(
             orders=orders,
@@ -339,7 +350,7 @@ async def list_all_cars(
     status_filter: Optional[str] = Query(None, description="Filter by car status: ONLINE, DRIVING, BLOCKED, PROCESSING"),
     car_type_filter: Optional[str] = Query(None, description="Filter by car type"),
     current_admin = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get All Cars (Admin Only)
@@ -412,8 +423,10 @@ async def list_all_accounts(
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     account_type: Optional[str] = Query(None, description="Filter by account type: vendor, vehicle_owner, driver, quickdriver"),
     status_filter: Optional[str] = Query(None, description="Filter by status: active, inactive, pending, ONLINE, OFFLINE, etc."),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page; use instead of skip for deep pages"),
+    response: Response = None,
     current_admin = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get All Accounts (Admin Only)
@@ -427,6 +440,9 @@ async def list_all_accounts(
     Supports filtering by:
     - account_type: Filter by specific account type
     - status_filter: Filter by status (active, inactive, pending, or specific statuses)
+
+    Accounts are ordered vendors, vehicle owners, drivers, each by id. When the page is
+    full, the X-Next-Cursor response header holds the cursor for the next page.
     
     Requires admin authentication.
     
@@ -442,8 +458,11 @@ async def list_all_accounts(
             skip=skip,
             limit=limit,
             account_type=account_type,
-            status_filter=status_filter
+            status_filter=status_filter,
+            cursor=cursor
         )
+        if len(accounts) == limit:
+            response.headers["X-Next-Cursor"] = encode_account_cursor(accounts[-1])
         
         account_items = [
             AccountListItem(
@@ -595,7 +614,7 @@ async def get_admin_by_id_route(
                 detail="Admin not found"
             )
         
-        return admin
+        return _admins_out(db, [admin])[0]
         
     except HTTPException:
         raise
@@ -703,7 +722,7 @@ async def add_money_to_vehicle_owner(
         # Upload transaction image to GCS if provided
         if transaction_img:
             # Validate file type
-            allowed_extensions = {'.jpg', '.jpeg', '.png', '.pdf'}
+            allowed_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.heic', '.pdf'}
             file_ext = os.path.splitext(transaction_img.filename)[-1].lower()
             if file_ext not in allowed_extensions:
                 raise HTTPException(
@@ -711,11 +730,11 @@ async def add_money_to_vehicle_owner(
                     detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
                 )
             
-            # Upload to GCS
-            transaction_img_url = upload_image_to_gcs(
-                transaction_img,
-                folder="admin_transactions"
-            )
+            # Upload to GCS (photos through the image pipeline, PDF receipts as uploaded)
+            try:
+                transaction_img_url = await upload_image_to_gcs_async(transaction_img, "admin_transactions")
+            except InvalidImageError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         
         # Create transaction
         result = create_admin_add_money_transaction(
@@ -989,6 +1008,15 @@ async def get_vehicle_owner_details(
             )
         
         vehicle_owner_credentials, vehicle_owner_details = result
+        cars = get_vehicle_owner_cars(db, str(vehicle_owner_id))
+        drivers = get_vehicle_owner_drivers(db, str(vehicle_owner_id))
+
+        # Sign every image of the response in one batch
+        signed_urls = generate_signed_urls_from_gcs(
+            [vehicle_owner_details.aadhar_front_img]
+            + [url for car in cars for url in (car.rc_front_img_url, car.rc_back_img_url, car.insurance_img_url, car.fc_img_url, car.car_img_url)]
+            + [driver.licence_front_img for driver in drivers]
+        )
         
         # Prepare documents
         documents = {}
@@ -996,7 +1024,7 @@ async def get_vehicle_owner_details(
             documents["aadhar"] = {
                 "document_type": "aadhar",
                 "status": vehicle_owner_details.aadhar_status.value if vehicle_owner_details.aadhar_status else None,
-                "image_url": generate_signed_url_from_gcs(vehicle_owner_details.aadhar_front_img) if vehicle_owner_details.aadhar_front_img else None
+                "image_url": signed_urls.get(vehicle_owner_details.aadhar_front_img)
             }
         
         # Get vehicle owner details
@@ -1008,7 +1036,7 @@ async def get_vehicle_owner_details(
             secondary_number=vehicle_owner_details.secondary_number,
             wallet_balance=vehicle_owner_details.wallet_balance,
             aadhar_number=vehicle_owner_details.aadhar_number,
-            aadhar_front_img=generate_signed_url_from_gcs(vehicle_owner_details.aadhar_front_img) if vehicle_owner_details.aadhar_front_img else None,
+            aadhar_front_img=signed_urls.get(vehicle_owner_details.aadhar_front_img),
             aadhar_status=vehicle_owner_details.aadhar_status.value if vehicle_owner_details.aadhar_status else None,
             address=vehicle_owner_details.address,
             city=vehicle_owner_details.city,
@@ -1019,7 +1047,6 @@ async def get_vehicle_owner_details(
         )
         
         # Get cars
-        cars = get_vehicle_owner_cars(db, str(vehicle_owner_id))
         cars_list = []
         for car in cars:
             cars_list.append({
@@ -1029,22 +1056,21 @@ async def get_vehicle_owner_details(
                 "car_type": car.car_type.value,
                 "car_number": car.car_number,
                 "year_of_the_car": car.year_of_the_car,
-                "rc_front_img_url": generate_signed_url_from_gcs(car.rc_front_img_url) if car.rc_front_img_url else None,
+                "rc_front_img_url": signed_urls.get(car.rc_front_img_url),
                 "rc_front_status": car.rc_front_status.value if car.rc_front_status else None,
-                "rc_back_img_url": generate_signed_url_from_gcs(car.rc_back_img_url) if car.rc_back_img_url else None,
+                "rc_back_img_url": signed_urls.get(car.rc_back_img_url),
                 "rc_back_status": car.rc_back_status.value if car.rc_back_status else None,
-                "insurance_img_url": generate_signed_url_from_gcs(car.insurance_img_url) if car.insurance_img_url else None,
+                "insurance_img_url": signed_urls.get(car.insurance_img_url),
                 "insurance_status": car.insurance_status.value if car.insurance_status else None,
-                "fc_img_url": generate_signed_url_from_gcs(car.fc_img_url) if car.fc_img_url else None,
+                "fc_img_url": signed_urls.get(car.fc_img_url),
                 "fc_status": car.fc_status.value if car.fc_status else None,
-                "car_img_url": generate_signed_url_from_gcs(car.car_img_url) if car.car_img_url else None,
+                "car_img_url": signed_urls.get(car.car_img_url),
                 "car_img_status": car.car_img_status.value if car.car_img_status else None,
                 "car_status": car.car_status.value,
                 "created_at": car.created_at
             })
         
         # Get drivers
-        drivers = get_vehicle_owner_drivers(db, str(vehicle_owner_id))
         drivers_list = []
         for driver in drivers:
             drivers_list.append({
@@ -1054,7 +1080,7 @@ async def get_vehicle_owner_details(
                 "primary_number": driver.primary_number,
                 "secondary_number": driver.secondary_number,
                 "licence_number": driver.licence_number,
-                "licence_front_img": generate_signed_url_from_gcs(driver.licence_front_img) if driver.licence_front_img else None,
+                "licence_front_img": signed_urls.get(driver.licence_front_img),
                 "licence_front_status": driver.licence_front_status.value if driver.licence_front_status else None,
                 "address": driver.address,
                 "city": driver.city,
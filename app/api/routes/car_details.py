@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from app.schemas.car_details import CarDetailsForm, CarDetailsOut, CarDetailsSignupResponse
 from app.crud.car_details import create_car_details, update_car_images
 from app.database.session import get_db
-from app.utils.gcs import upload_image_to_gcs, delete_gcs_file_by_url
+from app.utils.gcs import upload_images_to_gcs, delete_gcs_files_by_url
+from app.crud.direct_uploads import DOCUMENT_COLUMNS, replace_document_image
 from app.core.security import get_current_user
 from app.models.vehicle_owner import VehicleOwnerCredentials
 from typing import List
@@ -74,26 +75,14 @@ async def signup_car_details(
         )
     
     # Step 3: Only after successful DB commit, upload images to GCS
-    uploaded_urls = {}
-    uploaded_files = []  # Track successfully uploaded files for cleanup if needed
-    
     try:
-        # Upload each image to GCS with car-specific folder structure
-        for field_name, image_file in image_files.items():
-            # Create folder structure: car_details/{car_id}/{image_type}
-            folder_path = f"car_details/{db_car.id}/{field_name}"
-            image_url = upload_image_to_gcs(image_file, folder_path)
-            uploaded_urls[f"{field_name}_url"] = image_url
-            uploaded_files.append(image_url)
-            
+        # Upload all images concurrently with car-specific folder structure: car_details/{car_id}/{image_type}
+        # If one upload fails, the ones already uploaded are deleted
+        uploaded_urls = await upload_images_to_gcs({
+            f"{field_name}_url": (image_file, f"car_details/{db_car.id}/{field_name}")
+            for field_name, image_file in image_files.items()
+        })
     except Exception as e:
-        # If GCS upload fails, clean up any uploaded files and raise error
-        for uploaded_url in uploaded_files:
-            try:
-                delete_gcs_file_by_url(uploaded_url)
-            except:
-                pass  # Ignore cleanup errors
-        
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to upload images to cloud storage: {str(e)}. Car details created but image upload failed."
@@ -104,11 +93,7 @@ async def signup_car_details(
         update_car_images(db, db_car.id, uploaded_urls)
     except Exception as e:
         # If update fails, clean up uploaded images and raise error
-        for uploaded_url in uploaded_files:
-            try:
-                delete_gcs_file_by_url(uploaded_url)
-            except:
-                pass  # Ignore cleanup errors
+        await delete_gcs_files_by_url(uploaded_urls.values())
         
         raise HTTPException(
             status_code=500, 
@@ -331,20 +316,9 @@ async def update_car_document(
         )
     
     try:
-        # Delete old image if exists
-        old_image_url = getattr(car, f"{document_type}_img_url")
-        if old_image_url:
-            delete_gcs_file_by_url(old_image_url)
-        
-        # Upload new image
+        # New image first: the old one is deleted only once the row points at the new one
         folder_path = f"car_details/{car.id}/{document_type}"
-        new_image_url = upload_image_to_gcs(image, folder_path)
-        
-        # Update database
-        setattr(car, f"{document_type}_img_url", new_image_url)
-        setattr(car, f"{document_type}_status", DocumentStatusEnum.PENDING) if document_type != "car" else setattr(car, f"{document_type}_img_status", DocumentStatusEnum.PENDING)
-        db.commit()
-        db.refresh(car)
+        new_image_url = await replace_document_image(db, car, *DOCUMENT_COLUMNS["car"][document_type], image, folder_path)
         
         return DocumentUpdateResponse(
             message="Document updated successfully",
@@ -353,6 +327,8 @@ async def update_car_document(
             new_status="Pending"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from app.schemas.car_driver import CarDriverForm, CarDriverOut, CarDriverSignupResponse, CarDriverSigninResponse, CarDriverSigninRequest, DriverStatusUpdateResponse
 from app.crud.car_driver import create_car_driver, update_driver_license_image
 from app.database.session import get_db
-from app.utils.gcs import upload_image_to_gcs, delete_gcs_file_by_url
+from app.utils.gcs import upload_image_to_gcs_async, delete_gcs_files_by_url
+from app.crud.direct_uploads import DOCUMENT_COLUMNS, replace_document_image
 from app.core.security import get_current_user
 from app.models.vehicle_owner import VehicleOwnerCredentials
 from typing import List
@@ -60,7 +61,7 @@ async def signup_car_driver(
     try:
         # Create folder structure: car_driver/{driver_id}/license
         folder_path = f"car_driver/{db_driver.id}/license"
-        license_img_url = upload_image_to_gcs(licence_front_img, folder_path)
+        license_img_url = await upload_image_to_gcs_async(licence_front_img, folder_path)
     except Exception as e:
         # If GCS upload fails, we still have the driver in DB but without image
         raise HTTPException(
@@ -73,7 +74,7 @@ async def signup_car_driver(
         update_driver_license_image(db, db_driver.id, license_img_url)
     except Exception as e:
         # If update fails, clean up the uploaded image and raise error
-        delete_gcs_file_by_url(license_img_url)
+        await delete_gcs_files_by_url([license_img_url])
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to update driver record with image URL: {str(e)}. Image uploaded but not linked to driver."
@@ -362,19 +363,9 @@ async def update_driver_document(
         )
     
     try:
-        # Delete old image if exists
-        if driver.licence_front_img:
-            delete_gcs_file_by_url(driver.licence_front_img)
-        
-        # Upload new image
+        # New image first: the old one is deleted only once the row points at the new one
         folder_path = f"car_driver/{driver.id}/license"
-        new_image_url = upload_image_to_gcs(licence_image, folder_path)
-        
-        # Update database
-        driver.licence_front_img = new_image_url
-        driver.licence_front_status = DocumentStatusEnum.PENDING
-        db.commit()
-        db.refresh(driver)
+        new_image_url = await replace_document_image(db, driver, *DOCUMENT_COLUMNS["driver"]["licence"], licence_image, folder_path)
         
         return DocumentUpdateResponse(
             message="Document updated successfully",
@@ -383,6 +374,8 @@ async def update_driver_document(
             new_status="Pending"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
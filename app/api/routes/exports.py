@@ -0,0 +1,84 @@
+# api/routes/exports.py
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.security import get_current_admin
+from app.crud.exports import (
+    EXPORT_FORMATS, stream_export, orders_export_select, owner_ledger_export_select,
+    vendor_ledger_export_select, admin_ledger_export_select, transfers_export_select,
+)
+from app.database.replica import read_session_factory
+
+router = APIRouter()
+
+
+class ExportDataset(str, Enum):
+    orders = "orders"
+    owner_ledger = "owner-ledger"
+    vendor_ledger = "vendor-ledger"
+    admin_ledger = "admin-ledger"
+    transfers = "transfers"
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+def get_export_session_factory(request: Request) -> Callable:
+    # The export is streamed after the endpoint returns, so the session is opened by the
+    # response generator itself rather than by a get_read_db dependency
+    return read_session_factory(request)
+
+
+def _export_select(dataset: ExportDataset, from_date, to_date, status_value, account_id, archived):
+    if dataset == ExportDataset.orders:
+        return orders_export_select(from_date, to_date, status_value, vendor_id=account_id, archived=archived)
+    if dataset == ExportDataset.owner_ledger:
+        return owner_ledger_export_select(from_date, to_date, status_value, vehicle_owner_id=account_id)
+    if dataset == ExportDataset.vendor_ledger:
+        return vendor_ledger_export_select(from_date, to_date, status_value, vendor_id=account_id)
+    if dataset == ExportDataset.admin_ledger:
+        return admin_ledger_export_select(from_date, to_date, status_value, admin_id=account_id)
+    return transfers_export_select(from_date, to_date, status_value, vendor_id=account_id)
+
+
+@router.get("/admin/exports/{dataset}")
+def export_dataset(
+    dataset: ExportDataset,
+    format: ExportFormat = Query(ExportFormat.csv, description="csv or ndjson (one JSON object per line)"),
+    from_date: Optional[datetime] = Query(None, description="Only rows created at or after this time"),
+    to_date: Optional[datetime] = Query(None, description="Only rows created before this time"),
+    status: Optional[str] = Query(None, description="Trip status for orders, transfer status for transfers, entry type (CREDIT / DEBIT) for ledgers"),
+    account_id: Optional[UUID] = Query(None, description="Only rows of this vendor / vehicle owner / admin"),
+    archived: bool = Query(False, description="Orders only: export the closed orders moved to the archive"),
+    current_admin = Depends(get_current_admin),
+    session_factory: Callable = Depends(get_export_session_factory),
+):
+    """
+    Export a whole table as CSV or NDJSON (Admin Only)
+
+    The response is streamed from a server-side cursor, so it starts immediately and the server's
+    memory does not grow with the number of rows. Columns are the table's columns as stored.
+    """
+    # Built before streaming starts so an invalid status is still a 400
+    stmt = _export_select(dataset, from_date, to_date, status, account_id, archived)
+
+    def body():
+        db = session_factory()
+        try:
+            yield from stream_export(db, stmt, format.value)
+        finally:
+            db.close()
+
+    filename = f"{dataset.value}-{datetime.utcnow():%Y%m%d%H%M%S}.{format.value}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[format.value],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
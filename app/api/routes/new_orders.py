@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict
 import os
 from app.database.session import get_db
+from app.database.replica import get_read_db, ReplicaFallbackRoute
 from app.core.security import get_current_vendor
 from app.schemas.new_orders import (
     OnewayQuoteRequest,
@@ -23,7 +24,7 @@ from app.schemas.baseorder import BaseOrderSchema
 from app.crud.orders import get_vendor_orders, recreate_order
 
 
-router = APIRouter()
+router = APIRouter(route_class=ReplicaFallbackRoute)
 admin_commession_env = os.getenv("ADMIN_COMMESSION_ENV")
 
 @router.post("/oneway/quote", response_model=OnewayQuoteResponse)
@@ -376,16 +377,17 @@ def get_pending_all_orders(db: Session = Depends(get_db)):
 
 @router.get("/vendor", response_model=List[BaseOrderSchema])
 def get_vendor_orderss(
-    db: Session = Depends(get_db),
+    include_archived: bool = Query(False, description="Also return closed orders moved to the archive"),
+    db: Session = Depends(get_read_db),
     current_vendor=Depends(get_current_vendor)
 ):
     print("checks 2")
-    return get_vendor_orders(db, current_vendor.id)
+    return get_vendor_orders(db, current_vendor.id, include_archived=include_archived)
 
 
 @router.get("/vendor/with-assignments", response_model=List[OrderAssignmentWithOrderDetails])
 def get_vendor_orders_with_assignmentss(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_vendor=Depends(get_current_vendor)
 ):
     """Get all orders for the authenticated vendor with their latest assignment details"""
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
 from sqlalchemy.orm import Session
-from typing import List,Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 from app.crud.notification import send_push_notification_to_vendor, send_push_notification_to_vendor_driver
-from app.database.session import get_db
+from app.database.session import get_db, get_async_db
 from app.core.security import get_current_user, get_current_vehicleOwner_id, get_current_driver, get_current_vendor
 from app.schemas.order_assignments import (
     OrderAssignmentCreate,
@@ -30,7 +31,7 @@ from app.crud.order_assignments import (
     complete_assignment,
     get_vendor_orders_with_assignments,
     update_assignment_car_driver,
-    get_driver_assigned_orders,
+    get_driver_assigned_orders_async,
     check_vehicle_owner_balance,
     get_driver_assigned_orders_report,
     cancel_order_by_vendor,
@@ -71,7 +72,8 @@ async def get_available_cars(
 
 @router.get("/vehicle_owner/pending", response_model=List[Union[vehicle_owner_pending_new_orders,vehicle_owner_pending_horuly_rental]])
 async def get_pending_orders_for_vehicle_owner(
-    db: Session = Depends(get_db),
+    origin: Optional[str] = Query(None, min_length=1, description="Only orders whose pickup city starts with this text (case-insensitive)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
     """Get pending orders for the authenticated vehicle owner based on business rules"""
@@ -79,8 +81,8 @@ async def get_pending_orders_for_vehicle_owner(
         # Get vehicle_owner_id from the authenticated user
         vehicle_owner_id = str(current_user.vehicle_owner_id)
         
-        from app.crud.order_assignments import get_pending_orders_for_vehicle_owner
-        pending_orders = get_pending_orders_for_vehicle_owner(db, vehicle_owner_id)
+        from app.crud.order_assignments import get_pending_orders_for_vehicle_owner_async
+        pending_orders = await get_pending_orders_for_vehicle_owner_async(db, vehicle_owner_id, origin=origin)
         
         # Log the number of orders found for debugging
         print(f"Found {len(pending_orders)} pending orders for vehicle owner {vehicle_owner_id}")
@@ -375,12 +377,12 @@ async def get_driver_assigned_orders_report_endpoint(
 
 @router.get("/driver/assigned-orders", response_model=List[DriverOrderListResponse])
 async def get_driver_assigned_orders_endpoint(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_driver=Depends(get_current_driver)
 ):
     """Get all ASSIGNED orders for the authenticated driver"""
     driver_id = str(current_driver.id)
-    assigned_orders = get_driver_assigned_orders(db, driver_id)
+    assigned_orders = await get_driver_assigned_orders_async(db, driver_id)
     print("Testing Car")
     return assigned_orders
 
@@ -396,37 +398,55 @@ async def get_driver_assigned_orders_endpoint(
     return assigned_orders
 
 
+async def _drop_unreferenced_upload(db: Session, column, url: str) -> None:
+    """Delete a trip image uploaded for a failed call, unless the call committed a record pointing at it before failing."""
+    from app.utils.gcs import delete_gcs_files_by_url
+    db.rollback()
+    if db.query(column).filter(column == url).first() is None:
+        await delete_gcs_files_by_url([url])
+
+
 @router.post("/driver/start-trip/{order_id}", response_model=StartTripResponse)
 async def start_trip(
     order_id: int,
     start_km: int = Form(...),
-    speedometer_img: UploadFile = File(...),
+    speedometer_img: UploadFile | None = File(None),
+    speedometer_img_url: str | None = Form(None),
     db: Session = Depends(get_db),
     current_driver=Depends(get_current_driver)
 ):
-    """Start trip by uploading start KM and speedometer image"""
+    """Start trip by uploading start KM and speedometer image (or the object_url of a direct upload, see /uploads/trips)"""
     try:
-        # Validate image file
-        if not speedometer_img.content_type or not speedometer_img.content_type.startswith('image/'):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file type. Please upload an image file."
-            )
-        
-        # Upload image to GCS
-        from app.utils.gcs import upload_image_to_gcs
         folder_path = f"trip_records/{order_id}/start"
-        speedometer_img_url = upload_image_to_gcs(speedometer_img, folder_path)
+        if speedometer_img_url:
+            from app.crud.direct_uploads import verify_direct_upload
+            verify_direct_upload(speedometer_img_url, folder_path)
+        else:
+            # Validate image file
+            if not speedometer_img or not speedometer_img.content_type or not speedometer_img.content_type.startswith('image/'):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid file type. Please upload an image file."
+                )
+            
+            # Upload image to GCS (off the event loop)
+            from app.utils.gcs import upload_image_to_gcs_async
+            speedometer_img_url = await upload_image_to_gcs_async(speedometer_img, folder_path)
         
-        # Create start trip record
+        # Create start trip record; drop the uploaded image if that fails
         from app.crud.end_records import create_start_trip_record
-        trip_record = await create_start_trip_record(
-            db=db,
-            order_id=order_id,
-            driver_id=str(current_driver.id),
-            start_km=start_km,
-            speedometer_img_url=speedometer_img_url
-        )
+        try:
+            trip_record = await create_start_trip_record(
+                db=db,
+                order_id=order_id,
+                driver_id=str(current_driver.id),
+                start_km=start_km,
+                speedometer_img_url=speedometer_img_url
+            )
+        except Exception:
+            from app.models.end_records import EndRecord
+            await _drop_unreferenced_upload(db, EndRecord.img_url, speedometer_img_url)
+            raise
         
         return {
             "message": "Trip started successfully",
@@ -435,6 +455,8 @@ async def start_trip(
             "speedometer_img_url": speedometer_img_url
         }
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -448,36 +470,46 @@ async def end_trip(
     toll_charge_update: bool = Form(False),
     updated_toll_charges: int | None = Form(None),
     waiting_time: int | None = Form(None),
-    close_speedometer_img: UploadFile = File(...),
+    close_speedometer_img: UploadFile | None = File(None),
+    close_speedometer_img_url: str | None = Form(None),
     db: Session = Depends(get_db),
     current_driver=Depends(get_current_driver)
 ):
-    """End trip by uploading end KM, optional toll updates, and close speedometer image"""
+    """End trip by uploading end KM, optional toll updates, and close speedometer image (or the object_url of a direct upload)"""
     try:
-        # Validate close speedometer image file
-        if not close_speedometer_img.content_type or not close_speedometer_img.content_type.startswith('image/'):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid close speedometer file type. Please upload an image file."
-            )
-        
-        # Upload close speedometer image to GCS
-        from app.utils.gcs import upload_image_to_gcs
         folder_path = f"trip_records/{order_id}/end"
-        close_speedometer_img_url = upload_image_to_gcs(close_speedometer_img, folder_path)
+        if close_speedometer_img_url:
+            from app.crud.direct_uploads import verify_direct_upload
+            verify_direct_upload(close_speedometer_img_url, folder_path)
+        else:
+            # Validate close speedometer image file
+            if not close_speedometer_img or not close_speedometer_img.content_type or not close_speedometer_img.content_type.startswith('image/'):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid close speedometer file type. Please upload an image file."
+                )
+            
+            # Upload close speedometer image to GCS (off the event loop)
+            from app.utils.gcs import upload_image_to_gcs_async
+            close_speedometer_img_url = await upload_image_to_gcs_async(close_speedometer_img, folder_path)
         
-        # Update end trip record
+        # Update end trip record; drop the uploaded image if that fails
         from app.crud.end_records import update_end_trip_record
-        result = await update_end_trip_record(
-            db=db,
-            order_id=order_id,
-            driver_id=str(current_driver.id),
-            end_km=end_km,
-            # toll_charge_update=toll_charge_update,
-            updated_toll_charges=updated_toll_charges,
-            close_speedometer_image_url=close_speedometer_img_url,
-            waiting_time=waiting_time
-        )
+        try:
+            result = await update_end_trip_record(
+                db=db,
+                order_id=order_id,
+                driver_id=str(current_driver.id),
+                end_km=end_km,
+                # toll_charge_update=toll_charge_update,
+                updated_toll_charges=updated_toll_charges,
+                close_speedometer_image_url=close_speedometer_img_url,
+                waiting_time=waiting_time
+            )
+        except Exception:
+            from app.models.end_records import EndRecord
+            await _drop_unreferenced_upload(db, EndRecord.close_speedometer_image, close_speedometer_img_url)
+            raise
         
         return {
             "message": "Trip ended successfully",
@@ -490,6 +522,8 @@ async def end_trip(
             # "vehicle_owner_amount": result["vehicle_owner_amount"]
         }
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Form, Body
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Form, Body, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from pydantic import BaseModel
 
-from app.database.session import get_db
+from app.database.session import get_db, get_async_db
 from app.core.security import get_current_vendor, get_current_driver, get_current_admin, get_current_vehicleOwner_id
 from app.schemas.new_orders import UnifiedOrder, CloseOrderResponse, Vendor_Pending_Order_Responce
 from app.schemas.order_details import AdminOrderDetailResponse, VendorOrderDetailResponse, VehicleOwnerOrderDetailResponse
-from app.crud.orders import get_all_orders, get_vendor_orders, close_order, get_vendor_pending_orders, set_vehicle_owner_visibility, get_max_time_to_assign_by_trip_type
+from app.crud.orders import get_all_orders, get_vendor_orders_async, close_order, get_vendor_pending_orders_async, set_vehicle_owner_visibility, get_max_time_to_assign_by_trip_type
 from app.crud.order_details import get_admin_order_details, get_vendor_order_details, get_vehicle_owner_pending_orders, get_vehicle_owner_non_pending_orders
 
 
@@ -20,21 +21,22 @@ def list_all_orders(db: Session = Depends(get_db)):
 
 
 @router.get("/vendor", response_model=List[UnifiedOrder])
-def list_vendor_orders(
-    db: Session = Depends(get_db),
+async def list_vendor_orders(
+    include_archived: bool = Query(False, description="Also return closed orders moved to the archive"),
+    db: AsyncSession = Depends(get_async_db),
     current_vendor=Depends(get_current_vendor),
 ):
     # print(current_vendor.id)
     print("Function executing")
-    return get_vendor_orders(db, current_vendor.id)
+    return await get_vendor_orders_async(db, current_vendor.id, include_archived=include_archived)
 
 @router.get("/pending/vendor", response_model=List[Vendor_Pending_Order_Responce])
-def list_vendor_orders(
-    db: Session = Depends(get_db),
+async def list_vendor_orders(
+    db: AsyncSession = Depends(get_async_db),
     current_vendor=Depends(get_current_vendor),
 ):
     print("function check")
-    return get_vendor_pending_orders(db, current_vendor.id)
+    return await get_vendor_pending_orders_async(db, current_vendor.id)
 
 
 @router.get("/admin/{order_id}", response_model=AdminOrderDetailResponse)
@@ -88,8 +90,9 @@ async def get_vendor_order_details_endpoint(
     return order_details
 
 
+# Plain def (threadpool): close_order runs the image pipeline and the sync session
 @router.post("/{order_id}/close", response_model=CloseOrderResponse)
-async def close_order_endpoint(
+def close_order_endpoint(
     order_id: int,
     closed_vendor_price: int = Form(...),
     closed_driver_price: int = Form(...),
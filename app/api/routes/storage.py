@@ -0,0 +1,48 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import FileResponse
+from tempfile import SpooledTemporaryFile
+from app.utils.storage import LocalStorageBackend, get_storage
+from app.utils.gcs import DIRECT_UPLOAD_MAX_BYTES
+
+router = APIRouter()
+
+
+def _local_storage(method: str, name: str, expires: int, signature: str, content_type: str = None) -> LocalStorageBackend:
+    storage = get_storage()
+    if not isinstance(storage, LocalStorageBackend):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    try:
+        valid = storage.verify(method, name, expires, signature, content_type)
+    except ValueError:
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired signature")
+    return storage
+
+
+@router.get("/storage/{name:path}")
+def download_local_object(name: str, expires: int, signature: str):
+    """Signed GET URL of the local storage backend (STORAGE_BACKEND=local)"""
+    storage = _local_storage("GET", name, expires, signature)
+    stored = storage.stat(name)
+    if stored is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return FileResponse(storage.path(name), media_type=stored.content_type)
+
+
+@router.put("/storage/{name:path}")
+async def upload_local_object(name: str, expires: int, signature: str, request: Request):
+    """Signed PUT URL of the local storage backend, the stand-in for direct uploads to the bucket"""
+    content_type = request.headers.get("content-type")
+    storage = _local_storage("PUT", name, expires, signature, content_type)
+
+    size = 0
+    with SpooledTemporaryFile(max_size=1024 * 1024) as body:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > DIRECT_UPLOAD_MAX_BYTES:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Object is larger than the upload limit")
+            body.write(chunk)
+        body.seek(0)
+        storage.upload(body, name, content_type, size)
+    return {"name": name, "size": size}
@@ -6,7 +6,9 @@ from app.schemas.transfer_transactions import (
     AdminTransferAction, 
     TransferTransactionOut, 
     VendorBalanceOut, 
-    TransferHistoryOut
+    TransferHistoryOut,
+    BulkTransferAction,
+    BulkTransferResultOut
 )
 from app.crud.transfer_transactions import (
     create_transfer_request,
@@ -14,17 +16,19 @@ from app.crud.transfer_transactions import (
     get_vendor_transfer_history,
     get_all_pending_transfers,
     process_transfer_request,
+    process_transfer_requests,
     get_vendor_balance,
     get_transfer_statistics,
     get_vendor_transfer_history_pending
 )
 from app.crud.vendor import get_vendor_by_id
 from app.database.session import get_db
+from app.database.replica import get_read_db, ReplicaFallbackRoute
 from app.core.security import get_current_vendor, get_current_admin
 from typing import Optional
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=ReplicaFallbackRoute)
 
 @router.post("/transfer/request", response_model=TransferTransactionOut, status_code=status.HTTP_201_CREATED)
 async def request_transfer(
@@ -103,7 +107,7 @@ async def get_transfer_history(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     current_vendor = Depends(get_current_vendor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get transfer history for the authenticated vendor
@@ -143,6 +147,7 @@ async def get_transfer_statistics_route(
         - Total rejected transfers
         - Total pending transfers
         - Total amount transferred
+        - Current wallet, bank and total balance
     """
     try:
         vendor_id = str(current_vendor.id)
@@ -230,6 +235,42 @@ async def process_transfer(
             detail=f"Internal server error: {str(e)}"
         )
 
+# Plain def (threadpool): process_transfer_requests runs on the sync session
+@router.post("/admin/transfers/bulk-process", response_model=BulkTransferResultOut)
+def process_transfers_bulk(
+    bulk_action: BulkTransferAction,
+    current_admin = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Approve or reject many transfer requests at once (Admin only)
+    
+    All approvals and rejections are applied in one transaction. Items that cannot be
+    processed (not found, already processed, insufficient balance) are reported as failed
+    and do not stop the others.
+    
+    Returns:
+        - Number of processed and failed items
+        - One result per item, in request order
+    """
+    try:
+        results = process_transfer_requests(db, bulk_action.items)
+        processed = sum(1 for result in results if result["success"])
+        
+        return BulkTransferResultOut(
+            processed=processed,
+            failed=len(results) - processed,
+            results=results
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
+
 @router.get("/admin/transfers/{transaction_id}", response_model=TransferTransactionOut)
 async def get_transfer_details(
     transaction_id: UUID,
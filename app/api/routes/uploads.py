@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.database.session import get_db
+from app.core.security import get_current_user, get_current_driver
+from app.models.vehicle_owner import VehicleOwnerCredentials
+from app.schemas.uploads import DocumentUploadUrlRequest, DocumentUploadCompleteRequest, TripUploadUrlRequest, UploadUrlResponse
+from app.schemas.document_status import DocumentUpdateResponse
+from app.crud.direct_uploads import (
+    check_document_type,
+    check_content_type,
+    get_document_entity,
+    document_folder,
+    trip_folder,
+    record_document_upload,
+)
+from app.utils import gcs
+
+router = APIRouter()
+
+
+def _upload_url_response(folder: str, content_type: str) -> UploadUrlResponse:
+    upload_url, object_url, headers = gcs.generate_upload_url(folder, content_type)
+    return UploadUrlResponse(
+        upload_url=upload_url,
+        headers=headers,
+        object_url=object_url,
+        expires_in_seconds=gcs.DIRECT_UPLOAD_EXPIRY_MINUTES * 60
+    )
+
+
+@router.post("/uploads/documents/upload-url", response_model=UploadUrlResponse)
+def create_document_upload_url(
+    request: DocumentUploadUrlRequest,
+    current_user: VehicleOwnerCredentials = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Pre-signed PUT URL for a vehicle owner, car or driver document (direct upload, instead of update-document)"""
+    check_document_type(request.entity_type, request.document_type)
+    check_content_type(request.content_type)
+    entity = get_document_entity(db, request.entity_type, request.entity_id, current_user.id)
+    return _upload_url_response(document_folder(request.entity_type, entity, request.document_type), request.content_type)
+
+
+@router.post("/uploads/documents/complete", response_model=DocumentUpdateResponse)
+def complete_document_upload(
+    request: DocumentUploadCompleteRequest,
+    current_user: VehicleOwnerCredentials = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Record a document uploaded through a pre-signed URL once the object is in the bucket"""
+    check_document_type(request.entity_type, request.document_type)
+    entity = get_document_entity(db, request.entity_type, request.entity_id, current_user.id)
+    record_document_upload(db, request.entity_type, entity, request.document_type, request.object_url)
+    return DocumentUpdateResponse(
+        message="Document updated successfully",
+        document_type=request.document_type,
+        new_image_url=request.object_url,
+        new_status="Pending"
+    )
+
+
+@router.post("/uploads/trips/{order_id}/upload-url", response_model=UploadUrlResponse)
+def create_trip_upload_url(
+    order_id: int,
+    request: TripUploadUrlRequest,
+    current_driver=Depends(get_current_driver),
+    db: Session = Depends(get_db)
+):
+    """Pre-signed PUT URL for a start / end speedometer image; pass object_url as speedometer_img_url to start-trip / end-trip"""
+    check_content_type(request.content_type)
+    folder = trip_folder(db, order_id, current_driver.id, request.stage)
+    return _upload_url_response(folder, request.content_type)
@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from app.schemas.vehicle_owner import VehicleOwnerBase, VehicleOwnerForm, UserLogin, VehicleOwnerDetailsResponse
 from app.crud.vehicle_owner import create_user, update_aadhar_image, authenticate_user, get_vehicle_owner_counts, get_vehicle_owner_by_id
 from app.database.session import get_db
-from app.utils.gcs import upload_image_to_gcs, delete_gcs_file_by_url  # Utility functions
+from app.utils.gcs import upload_image_to_gcs_async, delete_gcs_files_by_url  # Utility functions
+from app.crud.direct_uploads import DOCUMENT_COLUMNS, replace_document_image
 from app.core.security import create_access_token, get_current_vehicleOwner_id,get_current_user
 from app.schemas.document_status import DocumentStatusListResponse, UpdateDocumentStatusRequest, UpdateDocumentRequest, DocumentUpdateResponse
 from app.models.common_enums import DocumentStatusEnum
@@ -48,7 +49,7 @@ async def signup(
     
     # Step 3: Only after successful DB commit, upload image to GCS
     try:
-        aadhar_img_url = upload_image_to_gcs(aadhar_front_img)
+        aadhar_img_url = await upload_image_to_gcs_async(aadhar_front_img)
     except Exception as e:
         # If GCS upload fails, we still have the user in DB but without image
         # You might want to delete the user or leave it as is depending on your requirements
@@ -63,7 +64,7 @@ async def signup(
     except Exception as e:
         # If update fails, we have the image in GCS but not linked in DB
         # Clean up the uploaded image and raise error
-        delete_gcs_file_by_url(aadhar_img_url)
+        await delete_gcs_files_by_url([aadhar_img_url])
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to update user record with image URL: {str(e)}. Image uploaded but not linked to user."
@@ -231,18 +232,10 @@ async def update_vehicle_owner_document(
         )
     
     try:
-        # Delete old image if exists
-        if owner_details.aadhar_front_img:
-            delete_gcs_file_by_url(owner_details.aadhar_front_img)
-        
-        # Upload new image
-        new_image_url = upload_image_to_gcs(aadhar_image, "vehicle_owner_details/aadhar")
-        
-        # Update database
-        owner_details.aadhar_front_img = new_image_url
-        owner_details.aadhar_status = DocumentStatusEnum.PENDING
-        db.commit()
-        db.refresh(owner_details)
+        # New image first: the old one is deleted only once the row points at the new one
+        new_image_url = await replace_document_image(
+            db, owner_details, *DOCUMENT_COLUMNS["vehicle_owner"]["aadhar"], aadhar_image, "vehicle_owner_details/aadhar"
+        )
         
         return DocumentUpdateResponse(
             message="Document updated successfully",
@@ -251,6 +244,8 @@ async def update_vehicle_owner_document(
             new_status="Pending"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -13,8 +13,9 @@ from app.utils.gcs import generate_signed_url_from_gcs
 
 router = APIRouter()
 
+# Plain def (threadpool): create_vendor runs the image pipeline and the sync session
 @router.post("/vendor/signup", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-async def vendor_signup(
+def vendor_signup(
     full_name: str = Form(..., description="Full name (3-100 characters)"),
     primary_number: str = Form(..., description="Primary mobile number"),
     secondary_number: Optional[str] = Form(None, description="Secondary mobile number (optional)"),
@@ -300,21 +301,13 @@ async def update_vendor_document(
         )
     
     # Upload new image to GCS
-    from app.utils.gcs import upload_image_to_gcs, delete_gcs_file_by_url
+    from app.crud.direct_uploads import replace_document_image
     
     try:
-        # Delete old image if exists
-        if vendor_details.aadhar_front_img:
-            delete_gcs_file_by_url(vendor_details.aadhar_front_img)
-        
-        # Upload new image
-        new_image_url = upload_image_to_gcs(aadhar_image, "vendor_details/aadhar")
-        
-        # Update database
-        vendor_details.aadhar_front_img = new_image_url
-        vendor_details.aadhar_status = DocumentStatusEnum.PENDING
-        db.commit()
-        db.refresh(vendor_details)
+        # New image first: the old one is deleted only once the row points at the new one
+        new_image_url = await replace_document_image(
+            db, vendor_details, "aadhar_front_img", "aadhar_status", aadhar_image, "vendor_details/aadhar"
+        )
         
         return DocumentUpdateResponse(
             message="Document updated successfully",
@@ -323,6 +316,8 @@ async def update_vendor_document(
             new_status="Pending"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from functools import partial
+import json
 
-from app.database.session import get_db
+from anyio import from_thread
+
+from app.database.session import get_db, get_async_db
+from app.database.replica import get_read_db, ReplicaFallbackRoute
 from app.core.security import get_current_vehicleOwner_id, get_current_vendor
 from app.schemas.wallet import (
     CreateRazorpayOrderRequest,
@@ -15,19 +22,22 @@ from app.schemas.wallet import (
 )
 from app.utils.razorpay_client import RazorpayClient
 from app.crud.wallet import (
-    get_owner_balance,
-    credit_wallet,
+    get_owner_balance_async,
     create_rp_transaction,
-    mark_rp_payment_captured,
-    check_rp_payment_already_processed,
+    capture_rp_payment,
+    get_owner_ledger_page,
+    encode_ledger_cursor,
 )
-from app.models.wallet_ledger import WalletLedger
-from app.models.transfer_transactions import TransferTransactions, TransferStatusEnum
-from app.models.vendor_wallet_ledger import VendorWalletLedger
-from app.models.razorpay_transactions import RazorpayTransaction, RazorpayPaymentStatusEnum
+from app.crud.vendor_wallet import get_vendor_wallet_history_page
+from app.crud.razorpay_webhooks import enqueue_webhook_event, webhook_event_id
+
 
+router = APIRouter(route_class=ReplicaFallbackRoute)
 
-router = APIRouter()
+
+async def raw_body(request: Request) -> bytes:
+    """The request body as received (webhook signatures are over the exact bytes), read on the event loop"""
+    return await request.body()
 
 
 @router.post("/wallet/razorpay/order", response_model=CreateRazorpayOrderResponse)
@@ -36,10 +46,13 @@ def create_rp_order(
     db: Session = Depends(get_db),
     vehicle_owner_id: str = Depends(get_current_vehicleOwner_id),
 ):
-    print("check")
+    # Runs in the threadpool (blocking DB session); the Razorpay call goes back to the event loop,
+    # where the pooled httpx.AsyncClient lives
     client = RazorpayClient()
     try:
-        order = client.create_order(amount_paise=payload.amount, currency=payload.currency, notes=payload.notes)
+        order = from_thread.run(
+            partial(client.create_order, amount_paise=payload.amount, currency=payload.currency, notes=payload.notes)
+        )
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Razorpay error: {str(e)}")
 
@@ -59,32 +72,11 @@ def verify_rp_payment(
     if not RazorpayClient.verify_signature(payload.rp_order_id, payload.rp_payment_id, payload.rp_signature):
         raise HTTPException(status_code=400, detail="Invalid Razorpay signature")
 
-    # Check if payment already processed (idempotency)
-    if check_rp_payment_already_processed(db, payload.rp_payment_id):
-        # Return existing transaction without processing again
-        txn = db.query(RazorpayTransaction).filter(
-            RazorpayTransaction.rp_payment_id == payload.rp_payment_id
-        ).first()
-        if txn:
-            return txn
-        else:
-            raise HTTPException(status_code=400, detail="Payment already processed but transaction not found")
-
-    # Mark captured and credit wallet atomically
+    # Mark captured and credit wallet, once, even if the webhook processes the same payment (idempotent)
     try:
-        txn = mark_rp_payment_captured(db, payload.rp_order_id, payload.rp_payment_id, payload.rp_signature)
-        
-        # Only credit wallet if not already processed
-        if txn.status == RazorpayPaymentStatusEnum.CAPTURED and not check_rp_payment_already_processed(db, payload.rp_payment_id):
-            new_balance, _ = credit_wallet(
-                db,
-                vehicle_owner_id=vehicle_owner_id,
-                amount=txn.amount/100,
-                reference_id=txn.rp_payment_id,
-                reference_type="RAZORPAY_PAYMENT",
-                notes="Wallet top-up via Razorpay",
-            )
-        
+        txn = capture_rp_payment(db, payload.rp_order_id, payload.rp_payment_id, payload.rp_signature)
+        if txn is None:
+            raise ValueError("Transaction not found")
         db.commit()
     except Exception as e:
         db.rollback()
@@ -93,56 +85,73 @@ def verify_rp_payment(
     return txn
 
 
+@router.post("/wallet/razorpay/webhook")
+def razorpay_webhook(
+    request: Request,
+    body: bytes = Depends(raw_body),
+    db: Session = Depends(get_db),
+):
+    """
+    Razorpay webhook (payment.captured, order.paid)
+
+    Verifies X-Razorpay-Signature against RAZORPAY_WEBHOOK_SECRET and queues the event; wallets are
+    credited by the webhook processor (app/crud/razorpay_webhooks.py). Replayed deliveries are acknowledged
+    without being queued again.
+    """
+    if not RazorpayClient.verify_webhook_signature(body, request.headers.get("X-Razorpay-Signature", "")):
+        raise HTTPException(status_code=400, detail="Invalid Razorpay webhook signature")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+
+    event_id = webhook_event_id(request.headers.get("X-Razorpay-Event-Id"), body)
+    queued = enqueue_webhook_event(db, event_id, payload)
+    db.commit()
+    return {"status": "queued" if queued else "duplicate", "event_id": event_id}
+
+
 @router.get("/wallet/ledger", response_model=List[WalletLedgerOut])
 def get_ledger(
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Number of entries to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    from_date: Optional[datetime] = Query(None, description="Only entries created at or after this time"),
+    to_date: Optional[datetime] = Query(None, description="Only entries created before this time"),
+    db: Session = Depends(get_read_db),
     vehicle_owner_id: str = Depends(get_current_vehicleOwner_id),
 ):
-    entries = db.query(WalletLedger).filter(WalletLedger.vehicle_owner_id == vehicle_owner_id).order_by(WalletLedger.created_at.desc()).all()
+    """Wallet ledger, newest first. When the page is full, X-Next-Cursor holds the cursor for the next page."""
+    entries = get_owner_ledger_page(db, vehicle_owner_id, limit, cursor, from_date, to_date)
+    if len(entries) == limit:
+        response.headers["X-Next-Cursor"] = encode_ledger_cursor(entries[-1].created_at, entries[-1].id)
     return entries
 
 
 @router.get("/wallet/balance", response_model=WalletBalanceOut)
-def get_balance_endpoint(
-    db: Session = Depends(get_db),
+async def get_balance_endpoint(
+    db: AsyncSession = Depends(get_async_db),
     vehicle_owner_id: str = Depends(get_current_vehicleOwner_id),
 ):
-    balance = get_owner_balance(db, vehicle_owner_id)
+    balance = await get_owner_balance_async(db, vehicle_owner_id)
     return {"vehicle_owner_id": vehicle_owner_id, "current_balance": balance}
 
 
 @router.get("/vendor/wallet/history", response_model=List[WalletHistory])
 def get_ledger(
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Number of entries to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    from_date: Optional[datetime] = Query(None, description="Only entries created (transfers: approved) at or after this time"),
+    to_date: Optional[datetime] = Query(None, description="Only entries created (transfers: approved) before this time"),
+    db: Session = Depends(get_read_db),
     vendor_id: str = Depends(get_current_vendor),
 ):
-    # print(vendor_id.id)
-    credit = db.query(VendorWalletLedger).filter(VendorWalletLedger.vendor_id == vendor_id.id).order_by(VendorWalletLedger.created_at.desc()).all()
-    debit = db.query(TransferTransactions).filter(TransferTransactions.vendor_id == vendor_id.id,
-                                                  TransferTransactions.status == TransferStatusEnum.APPROVED).order_by(TransferTransactions.updated_at.desc()).all()
-    result = []
-    
-    for entry in debit:
-        result.append(WalletHistory(id=entry.id,
-                                    vendor_id=entry.vendor_id,
-                                    order_id=None,
-                                    # entry_type="DEBIT" if entry.status == "Approved" else "None",
-                                    entry_type="DEBIT",
-                                    amount=entry.requested_amount,
-                                    balance_before=entry.wallet_balance_before,
-                                    balance_after=entry.wallet_balance_after,
-                                    notes=entry.admin_notes,
-                                    created_at=entry.updated_at))
-    
-    for entry in credit:
-        result.append(WalletHistory(id=entry.id,
-                                    vendor_id=entry.vendor_id,
-                                    order_id=entry.order_id,
-                                    entry_type=entry.entry_type,
-                                    amount=entry.amount,
-                                    balance_before=entry.balance_before,
-                                    balance_after=entry.balance_after,
-                                    notes=entry.notes,
-                                    created_at=entry.created_at))
-    result.sort(key=lambda x: x.created_at, reverse=True)
-    return result
\ No newline at end of file
+    """
+    Vendor wallet ledger merged with approved transfers (as debits), newest first.
+    When the page is full, X-Next-Cursor holds the cursor for the next page.
+    """
+    entries = get_vendor_wallet_history_page(db, vendor_id.id, limit, cursor, from_date, to_date)
+    if len(entries) == limit:
+        response.headers["X-Next-Cursor"] = encode_ledger_cursor(entries[-1].created_at, entries[-1].id)
+    return [WalletHistory.model_validate(entry, from_attributes=True) for entry in entries]
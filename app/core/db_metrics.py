@@ -0,0 +1,104 @@
+"""
+Per-request SQL statement counter and N+1 detector.
+
+Every engine (sync, async, replica) reports through SQLAlchemy Engine events into the
+QueryStats of the current request, held in a context variable. db_metrics_middleware
+(registered in app/main.py) opens a QueryStats per request, adds X-DB-Queries /
+X-DB-Time headers outside production, and logs requests where one statement shape
+repeats N_PLUS_ONE_THRESHOLD times or more (the usual "query inside a loop" pattern).
+
+Tests can use track_queries() directly (see app/tests/conftest.py `query_budget`).
+"""
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+APP_ENV = os.getenv("APP_ENV", "development")
+DB_METRICS_HEADERS = os.getenv("DB_METRICS_HEADERS", "false" if APP_ENV == "production" else "true").lower() == "true"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "50"))
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("db_query_stats", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+# psycopg2 (%(name)s), asyncpg ($1) and qmark placeholders
+_PLACEHOLDER = re.compile(r"%\([^)]*\)s|\$\d+")
+# "IN (?, ?, ...)" differs in length per call; collapse to a single placeholder
+_PLACEHOLDER_LIST = re.compile(r"\?(\s*,\s*\?)+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise a SQL statement so that executions differing only in parameters compare equal."""
+    shape = _PLACEHOLDER.sub("?", _WHITESPACE.sub(" ", statement).strip())
+    return _PLACEHOLDER_LIST.sub("?", shape)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        """Statement shapes executed at least `threshold` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start_time")
+    elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+    stats.record(statement, elapsed)
+
+
+@contextmanager
+def track_queries():
+    """Collect statements executed in this context (including threadpool work started from it)."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def report(method: str, path: str, stats: QueryStats) -> None:
+    """Log requests with repeated statement shapes or an unusually high statement count."""
+    repeated = stats.repeated()
+    if not repeated and stats.count < SLOW_REQUEST_QUERIES:
+        return
+    print(f"[db] {method} {path}: {stats.count} queries in {stats.total_time * 1000:.1f} ms")
+    for shape, n in repeated[:5]:
+        print(f"[db]   N+1 suspect x{n}: {shape[:200]}")
+
+
+async def db_metrics_middleware(request, call_next):
+    """HTTP middleware: count SQL statements per request and flag repeated statement shapes."""
+    with track_queries() as stats:
+        response = await call_next(request)
+    if DB_METRICS_HEADERS:
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["X-DB-Time"] = f"{stats.total_time * 1000:.1f}ms"
+    report(request.method, request.url.path, stats)
+    return response
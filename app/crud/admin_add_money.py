@@ -1,10 +1,11 @@
 # crud/admin_add_money.py
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import NoResultFound
 from fastapi import HTTPException, status
 from app.models.admin_add_money_to_vehicle_owner import AdminAddMoneyToVehicleOwner
 from app.models.vehicle_owner_details import VehicleOwnerDetails
 from app.models.vehicle_owner import VehicleOwnerCredentials
-from app.models.wallet_ledger import WalletLedger, WalletEntryTypeEnum
+from app.crud.wallet import credit_wallet
 from typing import Optional
 from uuid import UUID
 import uuid
@@ -69,37 +70,23 @@ def create_admin_add_money_transaction(
             detail="Invalid vehicle_owner_id format"
         )
     
-    # Get vehicle owner details
-    vehicle_owner = db.query(VehicleOwnerDetails).filter(
-        VehicleOwnerDetails.vehicle_owner_id == vehicle_owner_id_uuid
-    ).first()
-    
-    if not vehicle_owner:
+    # Credit the wallet and write its ledger entry in one statement (see _apply_wallet_change in app/crud/wallet.py),
+    # so a concurrent credit or debit of the same owner is not overwritten
+    try:
+        new_balance, ledger_entry = credit_wallet(
+            db,
+            str(vehicle_owner_id_uuid),
+            transaction_value,
+            reference_id=str(uuid.uuid4()),  # Reference to the admin transaction
+            reference_type="ADMIN_ADD_MONEY",
+            notes=notes or f"Admin added money: {transaction_value}",
+        )
+    except NoResultFound:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Vehicle owner not found"
         )
-    
-    # Update wallet balance
-    balance_before = vehicle_owner.wallet_balance
-    new_balance = balance_before + transaction_value
-    
-    vehicle_owner.wallet_balance = new_balance
-    db.add(vehicle_owner)
-    
-    # Create wallet ledger entry
-    ledger_entry = WalletLedger(
-        vehicle_owner_id=vehicle_owner_id_uuid,
-        reference_id=str(uuid.uuid4()),  # Reference to the admin transaction
-        reference_type="ADMIN_ADD_MONEY",
-        entry_type=WalletEntryTypeEnum.CREDIT,
-        amount=transaction_value,
-        balance_before=balance_before,
-        balance_after=new_balance,
-        notes=notes or f"Admin added money: {transaction_value}"
-    )
-    db.add(ledger_entry)
-    db.flush()  # Get the ID without committing
     wallet_ledger_entry_id = ledger_entry.id
     
     # Create admin add money transaction record
@@ -1,6 +1,6 @@
 # crud/admin_management.py
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, true, select, func, literal, cast, String, union_all, Select, ColumnElement
 from fastapi import HTTPException, status
 from app.models.vendor import VendorCredentials, AccountStatusEnum as VendorAccountStatusEnum
 from app.models.vendor_details import VendorDetails
@@ -206,6 +206,9 @@ def get_all_cars_unified(
 ) -> Tuple[List[dict], int, int, int, int, int]:
     """
     Get all cars with filtering and pagination.
+
+    Two queries whatever the page size: one COUNT(*) FILTER aggregate for the total and
+    status counts, one page query joined to the owner details for the owner name.
     
     Args:
         db: Database session
@@ -218,42 +221,46 @@ def get_all_cars_unified(
     Returns:
         Tuple of (cars list, total_count, online_count, blocked_count, processing_count, driving_count)
     """
-    from app.utils.gcs import generate_signed_url_from_gcs
-    
-    # Build query
-    query = db.query(CarDetails)
-    
-    # Apply filters
+    # Owner filter applies to the page and the status counters, the other filters only to the page
+    owner_filter = []
     if vehicle_owner_id:
-        query = query.filter(CarDetails.vehicle_owner_id == str(vehicle_owner_id))
-    
+        owner_filter.append(CarDetails.vehicle_owner_id == str(vehicle_owner_id))
+
+    page_filter = []
     if status_filter:
         status_filter_upper = status_filter.upper()
         if status_filter_upper in ["ONLINE", "DRIVING", "BLOCKED", "PROCESSING"]:
-            query = query.filter(CarDetails.car_status == CarStatusEnum[status_filter_upper])
+            page_filter.append(CarDetails.car_status == CarStatusEnum[status_filter_upper])
     
     if car_type_filter:
         from app.models.car_details import CarTypeEnum
         try:
-            query = query.filter(CarDetails.car_type == CarTypeEnum[car_type_filter.upper()])
+            page_filter.append(CarDetails.car_type == CarTypeEnum[car_type_filter.upper()])
         except KeyError:
             pass  # Invalid car type, ignore filter
-    
-    # Get total count before pagination
-    total_count = query.count()
-    
-    # Apply pagination
-    cars = query.offset(skip).limit(limit).all()
-    
-    # Get vehicle owner names
+
+    # Total and status counts in one pass
+    total_count, online_count, blocked_count, processing_count, driving_count = db.execute(
+        select(
+            func.count().filter(and_(true(), *page_filter)),
+            func.count().filter(CarDetails.car_status == CarStatusEnum.ONLINE),
+            func.count().filter(CarDetails.car_status == CarStatusEnum.BLOCKED),
+            func.count().filter(CarDetails.car_status == CarStatusEnum.PROCESSING),
+            func.count().filter(CarDetails.car_status == CarStatusEnum.DRIVING),
+        ).where(*owner_filter)
+    ).one()
+
+    # Page with the owner name joined in
+    rows = db.execute(
+        select(CarDetails, VehicleOwnerDetails.full_name)
+        .outerjoin(VehicleOwnerDetails, VehicleOwnerDetails.vehicle_owner_id == CarDetails.vehicle_owner_id)
+        .where(*owner_filter, *page_filter)
+        .offset(skip)
+        .limit(limit)
+    ).all()
+
     car_list = []
-    for car in cars:
-        # Get vehicle owner name
-        owner_details = db.query(VehicleOwnerDetails).filter(
-            VehicleOwnerDetails.vehicle_owner_id == car.vehicle_owner_id
-        ).first()
-        owner_name = owner_details.full_name if owner_details else None
-        
+    for car, owner_name in rows:
         car_list.append({
             "id": car.id,
             "vehicle_owner_id": car.vehicle_owner_id,
@@ -266,16 +273,6 @@ def get_all_cars_unified(
             "created_at": car.created_at
         })
     
-    # Calculate status counts
-    all_cars_query = db.query(CarDetails)
-    if vehicle_owner_id:
-        all_cars_query = all_cars_query.filter(CarDetails.vehicle_owner_id == str(vehicle_owner_id))
-    
-    online_count = all_cars_query.filter(CarDetails.car_status == CarStatusEnum.ONLINE).count()
-    blocked_count = all_cars_query.filter(CarDetails.car_status == CarStatusEnum.BLOCKED).count()
-    processing_count = all_cars_query.filter(CarDetails.car_status == CarStatusEnum.PROCESSING).count()
-    driving_count = all_cars_query.filter(CarDetails.car_status == CarStatusEnum.DRIVING).count()
-    
     return car_list, total_count, online_count, blocked_count, processing_count, driving_count
 
 # ============ CAR MANAGEMENT ============
@@ -410,15 +407,85 @@ def update_driver_document_status(db: Session, driver_id: str, document_status:
 
 # ============ UNIFIED ACCOUNT MANAGEMENT ============
 
+ACCOUNT_TYPE_ORDER = ["vendor", "vehicle_owner", "driver"]
+ACTIVE_ACCOUNT_STATUSES = ["ACTIVE", "ONLINE", "DRIVING"]
+
+
+def encode_account_cursor(account: dict) -> str:
+    """Keyset cursor for the unified account listing: "<account_type>:<id>" of the last row of a page."""
+    return f"{account['account_type']}:{account['id']}"
+
+
+def _parse_account_cursor(cursor: str) -> Tuple[int, UUID]:
+    try:
+        account_type, account_id = cursor.split(":", 1)
+        return ACCOUNT_TYPE_ORDER.index(account_type), UUID(account_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _account_selects(account_type: Optional[str], status_filter: Optional[str]) -> List[Tuple[int, Select, ColumnElement]]:
+    """One SELECT per account type matching `account_type`, with `status_filter` applied: (type rank, select, id column)."""
+    selects = []
+    status_filter_upper = status_filter.upper() if status_filter else None
+
+    if not account_type or account_type.lower() in ["vendor", "vendors"]:
+        stmt = select(
+            literal(0).label("type_rank"),
+            VendorCredentials.id.label("id"),
+            VendorDetails.full_name.label("name"),
+            cast(VendorCredentials.account_status, String).label("account_status"),
+        ).join(VendorDetails, VendorDetails.vendor_id == VendorCredentials.id)
+        if status_filter_upper in ["ACTIVE", "INACTIVE", "PENDING"]:
+            stmt = stmt.where(VendorCredentials.account_status == VendorAccountStatusEnum[status_filter_upper])
+        selects.append((0, stmt, VendorCredentials.id))
+
+    if not account_type or account_type.lower() in ["vehicle_owner", "vehicle_owners", "vehicleowner"]:
+        stmt = select(
+            literal(1).label("type_rank"),
+            VehicleOwnerCredentials.id.label("id"),
+            VehicleOwnerDetails.full_name.label("name"),
+            cast(VehicleOwnerCredentials.account_status, String).label("account_status"),
+        ).join(VehicleOwnerDetails, VehicleOwnerDetails.vehicle_owner_id == VehicleOwnerCredentials.id)
+        if status_filter_upper in ["ACTIVE", "INACTIVE", "PENDING"]:
+            stmt = stmt.where(VehicleOwnerCredentials.account_status == VehicleOwnerAccountStatusEnum[status_filter_upper])
+        selects.append((1, stmt, VehicleOwnerCredentials.id))
+
+    # Drivers (including quickdriver as same type)
+    if not account_type or account_type.lower() in ["driver", "drivers", "quickdriver", "quickdrivers"]:
+        stmt = select(
+            literal(2).label("type_rank"),
+            CarDriver.id.label("id"),
+            CarDriver.full_name.label("name"),
+            cast(CarDriver.driver_status, String).label("account_status"),
+        )
+        if status_filter_upper in ["ONLINE", "OFFLINE", "DRIVING", "BLOCKED", "PROCESSING"]:
+            stmt = stmt.where(CarDriver.driver_status == DriverStatusEnum[status_filter_upper])
+        elif status_filter_upper == "ACTIVE":
+            stmt = stmt.where(CarDriver.driver_status.in_([DriverStatusEnum.ONLINE, DriverStatusEnum.DRIVING]))
+        elif status_filter_upper == "INACTIVE":
+            stmt = stmt.where(CarDriver.driver_status.in_([DriverStatusEnum.OFFLINE, DriverStatusEnum.BLOCKED, DriverStatusEnum.PROCESSING]))
+        selects.append((2, stmt, CarDriver.id))
+
+    return selects
+
+
 def get_all_accounts_unified(
     db: Session, 
     skip: int = 0, 
     limit: int = 100,
     account_type: Optional[str] = None,
-    status_filter: Optional[str] = None
+    status_filter: Optional[str] = None,
+    cursor: Optional[str] = None
 ) -> Tuple[List[dict], int, int, int]:
     """
     Get all accounts (vendors, vehicle owners, drivers) in a unified format.
+
+    Accounts are listed vendors first, then vehicle owners, then drivers, each by id.
+    The page comes from one UNION ALL query and the counts from one FILTER aggregate.
     
     Args:
         db: Database session
@@ -426,107 +493,57 @@ def get_all_accounts_unified(
         limit: Maximum number of records to return
         account_type: Filter by account type ("vendor", "vehicle_owner", "driver", "quickdriver")
         status_filter: Filter by status ("active", "inactive", "pending", etc.)
+        cursor: Keyset cursor (see encode_account_cursor); the page starts after that account
     
     Returns:
         Tuple of (accounts list, total_count, active_count, inactive_count)
     """
+    selects = _account_selects(account_type, status_filter)
+    if not selects:
+        return [], 0, 0, 0
+
+    counts = union_all(*[stmt for _, stmt, _ in selects]).subquery("accounts")
+    total_count, active_count = db.execute(
+        select(
+            func.count(),
+            func.count().filter(counts.c.account_status.in_(ACTIVE_ACCOUNT_STATUSES)),
+        ).select_from(counts)
+    ).one()
+
+    # Keyset and the per-type LIMIT are applied inside each branch so every branch is an
+    # index walk over at most skip + limit rows instead of a sort of every account
+    after_rank, after_id = _parse_account_cursor(cursor) if cursor else (-1, None)
+    page_selects = []
+    for rank, stmt, id_column in selects:
+        if rank < after_rank:
+            continue
+        if rank == after_rank:
+            stmt = stmt.where(id_column > after_id)
+        page_selects.append(stmt.order_by(id_column).limit(skip + limit))
+
+    rows = []
+    if page_selects:
+        page = union_all(*page_selects).subquery("page")
+        rows = db.execute(
+            select(page).order_by(page.c.type_rank, page.c.id).offset(skip).limit(limit)
+        ).all()
+
     accounts = []
-    
-    # Get vendors
-    if not account_type or account_type.lower() in ["vendor", "vendors"]:
-        vendors_query = db.query(VendorDetails).join(VendorCredentials, VendorDetails.vendor_id == VendorCredentials.id)
-        
-        if status_filter:
-            status_filter_upper = status_filter.upper()
-            if status_filter_upper in ["ACTIVE", "INACTIVE", "PENDING"]:
-                vendors_query = vendors_query.filter(VendorCredentials.account_status == VendorAccountStatusEnum[status_filter_upper])
-            elif status_filter.lower() in ["active", "inactive"]:
-                # Handle active/inactive filter
-                if status_filter.lower() == "active":
-                    vendors_query = vendors_query.filter(VendorCredentials.account_status == VendorAccountStatusEnum.ACTIVE)
-                else:
-                    vendors_query = vendors_query.filter(VendorCredentials.account_status == VendorAccountStatusEnum.INACTIVE)
-        
-        # Get all vendors first (we'll paginate later after combining all account types)
-        vendors = vendors_query.all()
-        
-        for vendor in vendors:
-            vendor_cred = db.query(VendorCredentials).filter(VendorCredentials.id == vendor.vendor_id).first()
-            accounts.append({
-                "id": vendor.vendor_id,
-                "name": vendor.full_name,
-                "account_type": "vendor",
-                "account_status": vendor_cred.account_status.value if vendor_cred else "Pending"
-            })
-    
-    # Get vehicle owners
-    if not account_type or account_type.lower() in ["vehicle_owner", "vehicle_owners", "vehicleowner"]:
-        owners_query = db.query(VehicleOwnerDetails).join(VehicleOwnerCredentials, VehicleOwnerDetails.vehicle_owner_id == VehicleOwnerCredentials.id)
-        
-        if status_filter:
-            status_filter_upper = status_filter.upper()
-            if status_filter_upper in ["ACTIVE", "INACTIVE", "PENDING"]:
-                owners_query = owners_query.filter(VehicleOwnerCredentials.account_status == VehicleOwnerAccountStatusEnum[status_filter_upper])
-            elif status_filter.lower() in ["active", "inactive"]:
-                # Handle active/inactive filter
-                if status_filter.lower() == "active":
-                    owners_query = owners_query.filter(VehicleOwnerCredentials.account_status == VehicleOwnerAccountStatusEnum.ACTIVE)
-                else:
-                    owners_query = owners_query.filter(VehicleOwnerCredentials.account_status == VehicleOwnerAccountStatusEnum.INACTIVE)
-        
-        # Get all owners first
-        owners = owners_query.all()
-        
-        for owner in owners:
-            owner_cred = db.query(VehicleOwnerCredentials).filter(VehicleOwnerCredentials.id == owner.vehicle_owner_id).first()
-            accounts.append({
-                "id": owner.vehicle_owner_id,
-                "name": owner.full_name,
-                "account_type": "vehicle_owner",
-                "account_status": owner_cred.account_status.value if owner_cred else "Inactive"
-            })
-    
-    # Get drivers (including quickdriver as same type)
-    if not account_type or account_type.lower() in ["driver", "drivers", "quickdriver", "quickdrivers"]:
-        drivers_query = db.query(CarDriver)
-        
-        if status_filter:
-            status_filter_upper = status_filter.upper()
-            if status_filter_upper in ["ONLINE", "OFFLINE", "DRIVING", "BLOCKED", "PROCESSING"]:
-                try:
-                    drivers_query = drivers_query.filter(CarDriver.driver_status == DriverStatusEnum[status_filter_upper])
-                except KeyError:
-                    pass
-            elif status_filter.lower() in ["active", "inactive"]:
-                # Handle active/inactive filter for drivers
-                if status_filter.lower() == "active":
-                    drivers_query = drivers_query.filter(CarDriver.driver_status.in_([DriverStatusEnum.ONLINE, DriverStatusEnum.DRIVING]))
-                else:
-                    drivers_query = drivers_query.filter(CarDriver.driver_status.in_([DriverStatusEnum.OFFLINE, DriverStatusEnum.BLOCKED, DriverStatusEnum.PROCESSING]))
-        
-        # Get all drivers first
-        drivers = drivers_query.all()
-        
-        for driver in drivers:
-            accounts.append({
-                "id": driver.id,
-                "name": driver.full_name,
-                "account_type": "driver",  # Treat quickdriver same as driver
-                "account_status": driver.driver_status.value
-            })
-    
-    # Calculate counts before pagination
-    total_count = len(accounts)
-    active_count = sum(1 for acc in accounts if (
-        (acc["account_type"] in ["vendor", "vehicle_owner"] and acc["account_status"].lower() == "active") or
-        (acc["account_type"] == "driver" and acc["account_status"].upper() in ["ONLINE", "DRIVING"])
-    ))
-    inactive_count = total_count - active_count
-    
-    # Apply pagination after combining all accounts
-    paginated_accounts = accounts[skip:skip + limit] if skip > 0 or limit < total_count else accounts
-    
-    return paginated_accounts, total_count, active_count, inactive_count
+    for row in rows:
+        if row.type_rank == 2:
+            account_status = row.account_status
+        elif row.type_rank == 0:
+            account_status = VendorAccountStatusEnum[row.account_status].value
+        else:
+            account_status = VehicleOwnerAccountStatusEnum[row.account_status].value
+        accounts.append({
+            "id": row.id,
+            "name": row.name,
+            "account_type": ACCOUNT_TYPE_ORDER[row.type_rank],
+            "account_status": account_status
+        })
+
+    return accounts, total_count, active_count, total_count - active_count
 
 def get_account_details_by_id(db: Session, account_id: str, account_type: str) -> Optional[dict]:
     """
@@ -636,7 +653,7 @@ def get_all_account_documents(db: Session, account_id: str, account_type: str) -
     Returns:
         Dictionary with all documents organized by type
     """
-    from app.utils.gcs import generate_signed_url_from_gcs
+    from app.utils.gcs import generate_signed_urls_from_gcs
     
     # Ensure account_id is a string
     account_id = str(account_id)
@@ -651,7 +668,7 @@ def get_all_account_documents(db: Session, account_id: str, account_type: str) -
                 "document_id": "account_aadhar",
                 "document_type": "aadhar",
                 "document_name": "Aadhar Card",
-                "image_url": generate_signed_url_from_gcs(vendor_details.aadhar_front_img) if vendor_details.aadhar_front_img else None,
+                "image_url": vendor_details.aadhar_front_img,
                 "status": vendor_details.aadhar_status.value if vendor_details.aadhar_status else "PENDING",
                 "uploaded_at": vendor_details.created_at,
                 "car_id": None,
@@ -668,7 +685,7 @@ def get_all_account_documents(db: Session, account_id: str, account_type: str) -
                     "document_id": "account_aadhar",
                     "document_type": "aadhar",
                     "document_name": "Aadhar Card",
-                    "image_url": generate_signed_url_from_gcs(owner_details.aadhar_front_img) if owner_details.aadhar_front_img else None,
+                    "image_url": owner_details.aadhar_front_img,
                     "status": owner_details.aadhar_status.value if owner_details.aadhar_status else "PENDING",
                     "uploaded_at": owner_details.created_at,
                     "car_id": None,
@@ -694,7 +711,7 @@ def get_all_account_documents(db: Session, account_id: str, account_type: str) -
                             "document_id": f"car_{car.id}_{doc_type}",
                             "document_type": doc_type,
                             "document_name": f"{doc_name} - {car.car_name}",
-                            "image_url": generate_signed_url_from_gcs(img_url) if img_url else None,
+                            "image_url": img_url,
                             "status": doc_status.value if doc_status else "PENDING",
                             "uploaded_at": car.created_at,
                             "car_id": car.id,
@@ -709,7 +726,7 @@ def get_all_account_documents(db: Session, account_id: str, account_type: str) -
                 "document_id": "account_licence",
                 "document_type": "licence",
                 "document_name": "Driving License",
-                "image_url": generate_signed_url_from_gcs(driver.licence_front_img) if driver.licence_front_img else None,
+                "image_url": driver.licence_front_img,
                 "status": driver.licence_front_status.value if driver.licence_front_status else "PENDING",
                 "uploaded_at": driver.created_at,
                 "car_id": None,
@@ -719,6 +736,11 @@ def get_all_account_documents(db: Session, account_id: str, account_type: str) -
     
     # Calculate counts
     all_docs = account_documents + car_documents
+
+    # Sign all document images in one batch
+    signed_urls = generate_signed_urls_from_gcs(doc["image_url"] for doc in all_docs)
+    for doc in all_docs:
+        doc["image_url"] = signed_urls.get(doc["image_url"])
     pending_count = sum(1 for doc in all_docs if doc["status"] == "PENDING")
     verified_count = sum(1 for doc in all_docs if doc["status"] == "VERIFIED")
     invalid_count = sum(1 for doc in all_docs if doc["status"] == "INVALID")
@@ -1,27 +1,130 @@
-from typing import Optional, Tuple
+import os
+import random
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update, insert, literal, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from cachetools import TTLCache
+from threading import Lock
+import uuid
 
 from app.models.admin import Admin
-from app.models.admin_wallet_ledger import AdminWalletLedger, AdminLedgerEntryType
+from app.models.admin_wallet_ledger import AdminWalletLedger, AdminLedgerEntryType, AdminWalletShard
+from app.crud.wallet import ledger_page_conditions
+
+# Admin credits (platform profit on every settlement) go to one of this many accumulator rows
+# instead of the admin row; 0 credits admin.balance directly
+ADMIN_WALLET_SHARDS = int(os.getenv("ADMIN_WALLET_SHARDS", "16"))
+# How often the background job folds the shards into admin.balance
+ADMIN_WALLET_FOLD_SECONDS = int(os.getenv("ADMIN_WALLET_FOLD_SECONDS", "300"))
+ADMIN_ID_CACHE_SECONDS = int(os.getenv("ADMIN_ID_CACHE_SECONDS", "300"))
+
+_admin_id_cache = TTLCache(maxsize=1, ttl=ADMIN_ID_CACHE_SECONDS)
+_admin_id_lock = Lock()
+
+
+def get_platform_admin_id(db: Session) -> Optional[str]:
+    """Id of the admin that receives platform profit (the first admin), cached for ADMIN_ID_CACHE_SECONDS"""
+    with _admin_id_lock:
+        admin_id = _admin_id_cache.get("admin_id")
+    if admin_id is None:
+        admin = db.query(Admin).first()
+        if not admin:
+            return None
+        admin_id = str(admin.id)
+        with _admin_id_lock:
+            _admin_id_cache["admin_id"] = admin_id
+    return admin_id
+
+
+def _admin_balance_expression(admin_id: str):
+    """admin.balance plus what is still in the admin's shards"""
+    in_shards = (
+        select(func.coalesce(func.sum(AdminWalletShard.balance), 0))
+        .where(AdminWalletShard.admin_id == admin_id)
+        .scalar_subquery()
+    )
+    return Admin.balance + in_shards
 
 
 def get_admin_balance(db: Session, admin_id: str) -> int:
     """Get admin's current balance"""
-    admin = db.execute(
-        select(Admin).where(Admin.id == admin_id)
+    return db.execute(
+        select(_admin_balance_expression(admin_id)).where(Admin.id == admin_id)
     ).scalar_one()
-    return admin.balance
 
-def get_admin_account_ledger_data(db: Session, admin_id: str):
-    """Get admin's current balance"""
+
+def get_admin_balances(db: Session, admin_ids: Iterable[str]) -> Dict[str, int]:
+    """Current balance of several admins in one query: {str(admin_id): balance}"""
+    admin_ids = [str(admin_id) for admin_id in admin_ids]
+    if not admin_ids:
+        return {}
+    in_shards = (
+        select(AdminWalletShard.admin_id, func.sum(AdminWalletShard.balance).label("balance"))
+        .where(AdminWalletShard.admin_id.in_(admin_ids))
+        .group_by(AdminWalletShard.admin_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(Admin.id, Admin.balance + func.coalesce(in_shards.c.balance, 0))
+        .outerjoin(in_shards, in_shards.c.admin_id == Admin.id)
+        .where(Admin.id.in_(admin_ids))
+    ).all()
+    return {str(admin_id): balance for admin_id, balance in rows}
+
+
+def fold_admin_wallet_shards(db: Session, admin_id: Optional[str] = None) -> int:
+    """
+    Move the shard balances into admin.balance (one admin, or all), in one statement: lock the non-zero
+    shards, UPDATE them to 0 RETURNING what they held, then UPDATE admin with their sums. Returns the amount moved.
+    Readers see either the shards or the folded balance, never both or neither. The shard rows stay, so
+    the next credit is a plain UPDATE instead of re-creating them.
+    """
+    locked = select(AdminWalletShard.admin_id, AdminWalletShard.shard, AdminWalletShard.balance).where(AdminWalletShard.balance != 0)
+    if admin_id is not None:
+        locked = locked.where(AdminWalletShard.admin_id == admin_id)
+    # FOR UPDATE: the balance returned is the one being zeroed, even if a credit committed meanwhile
+    locked = locked.with_for_update().cte("locked")
+    drained = (
+        update(AdminWalletShard)
+        .where(AdminWalletShard.admin_id == locked.c.admin_id, AdminWalletShard.shard == locked.c.shard)
+        .values(balance=0)
+        .returning(locked.c.admin_id, locked.c.balance)
+        .cte("drained")
+    )
+    totals = (
+        select(drained.c.admin_id, func.sum(drained.c.balance).label("total"))
+        .group_by(drained.c.admin_id)
+        .cte("totals")
+    )
+    folded = (
+        update(Admin)
+        .where(Admin.id == totals.c.admin_id)
+        .values(balance=Admin.balance + totals.c.total)
+        .returning(totals.c.total)
+    )
+    return sum(db.execute(folded, execution_options={"synchronize_session": False}).scalars())
+
+def get_admin_account_ledger_data(db: Session, admin_id: str, limit: int = 100, cursor: Optional[str] = None,
+                                  from_date: Optional[datetime] = None, to_date: Optional[datetime] = None):
+    """One page of the admin's ledger, newest first (keyset on created_at, id; see encode_ledger_cursor)"""
     print("checking admin id in crud:", admin_id)
-    wallet_data = db.query(AdminWalletLedger).filter(AdminWalletLedger.admin_id == admin_id).all()
+    wallet_data = db.execute(
+        select(AdminWalletLedger)
+        .where(
+            AdminWalletLedger.admin_id == admin_id,
+            *ledger_page_conditions(AdminWalletLedger.created_at, AdminWalletLedger.id, cursor, from_date, to_date),
+        )
+        .order_by(AdminWalletLedger.created_at.desc(), AdminWalletLedger.id.desc())
+        .limit(limit)
+    ).scalars().all()
     return wallet_data
 
 
 def set_admin_balance(db: Session, admin_id: str, new_balance: int) -> None:
     """Set admin's balance"""
+    fold_admin_wallet_shards(db, admin_id)
     admin = db.execute(
         select(Admin).where(Admin.id == admin_id)
     ).scalar_one()
@@ -54,6 +157,91 @@ def append_admin_ledger_entry(
     return entry
 
 
+def _apply_admin_wallet_change(
+    db: Session,
+    *,
+    admin_id: str,
+    order_id: Optional[int],
+    entry_type: AdminLedgerEntryType,
+    amount: int,
+    notes: Optional[str],
+) -> Optional[AdminWalletLedger]:
+    """
+    UPDATE admin ... RETURNING balance and INSERT the ledger entry from it in one statement,
+    see _apply_wallet_change in app/crud/wallet.py. Returns None when no row was updated.
+    """
+    delta = amount if entry_type == AdminLedgerEntryType.CREDIT else -amount
+    changed = update(Admin).where(Admin.id == admin_id).values(balance=Admin.balance + delta)
+    if entry_type == AdminLedgerEntryType.DEBIT:
+        changed = changed.where(Admin.balance >= amount)
+    changed = changed.returning(Admin.id, Admin.balance).cte("changed")
+
+    rows = select(
+        literal(uuid.uuid4(), AdminWalletLedger.id.type),
+        changed.c.id,
+        literal(order_id, AdminWalletLedger.order_id.type),
+        literal(entry_type, AdminWalletLedger.entry_type.type),
+        literal(amount, AdminWalletLedger.amount.type),
+        changed.c.balance - delta,
+        changed.c.balance,
+        literal(notes, AdminWalletLedger.notes.type),
+    )
+    columns = ["id", "admin_id", "order_id", "entry_type", "amount", "balance_before", "balance_after", "notes"]
+    return db.execute(insert(AdminWalletLedger).from_select(columns, rows).returning(AdminWalletLedger)).scalar_one_or_none()
+
+
+def _create_admin_wallet_shards(db: Session, admin_id: str) -> None:
+    """The admin's ADMIN_WALLET_SHARDS accumulator rows (first credit, or after ADMIN_WALLET_SHARDS was raised)"""
+    db.execute(
+        pg_insert(AdminWalletShard)
+        .values([{"admin_id": admin_id, "shard": shard, "balance": 0} for shard in range(ADMIN_WALLET_SHARDS)])
+        .on_conflict_do_nothing()
+    )
+
+
+def _add_to_admin_wallet_shard(
+    db: Session,
+    *,
+    admin_id: str,
+    order_id: Optional[int],
+    amount: int,
+    notes: Optional[str],
+) -> AdminWalletLedger:
+    """
+    Credit one random shard and write the ledger entry in one statement (UPDATE ... RETURNING into the
+    ledger INSERT, like _apply_admin_wallet_change). Concurrent credits only meet when they pick the same
+    shard. The entry's balance_before is the balance as of the statement's snapshot (admin row plus shards),
+    so entries written at the same time can show the same balance_before; get_admin_balance is always exact.
+    """
+    changed = (
+        update(AdminWalletShard)
+        .where(AdminWalletShard.admin_id == admin_id, AdminWalletShard.shard == random.randrange(ADMIN_WALLET_SHARDS))
+        .values(balance=AdminWalletShard.balance + amount)
+        .returning(AdminWalletShard.admin_id)
+        .cte("changed")
+    )
+    before = select(_admin_balance_expression(admin_id)).where(Admin.id == admin_id).scalar_subquery()
+
+    rows = select(
+        literal(uuid.uuid4(), AdminWalletLedger.id.type),
+        changed.c.admin_id,
+        literal(order_id, AdminWalletLedger.order_id.type),
+        literal(AdminLedgerEntryType.CREDIT, AdminWalletLedger.entry_type.type),
+        literal(amount, AdminWalletLedger.amount.type),
+        before,
+        before + amount,
+        literal(notes, AdminWalletLedger.notes.type),
+    )
+    columns = ["id", "admin_id", "order_id", "entry_type", "amount", "balance_before", "balance_after", "notes"]
+    credit = insert(AdminWalletLedger).from_select(columns, rows).returning(AdminWalletLedger)
+    entry = db.execute(credit).scalar_one_or_none()
+    if entry is None:
+        # No shard rows yet (or not this one, after ADMIN_WALLET_SHARDS was raised)
+        _create_admin_wallet_shards(db, admin_id)
+        entry = db.execute(credit).scalar_one()
+    return entry
+
+
 def credit_admin_wallet(
     db: Session,
     *,
@@ -66,21 +254,21 @@ def credit_admin_wallet(
     if amount <= 0:
         raise ValueError("Amount must be positive")
     
-    before = get_admin_balance(db, admin_id)
-    after = before + amount
-    set_admin_balance(db, admin_id, after)
-    
-    entry = append_admin_ledger_entry(
+    if ADMIN_WALLET_SHARDS > 0:
+        entry = _add_to_admin_wallet_shard(db, admin_id=admin_id, order_id=order_id, amount=amount, notes=notes)
+        return entry.balance_after, entry
+
+    entry = _apply_admin_wallet_change(
         db,
         admin_id=admin_id,
         order_id=order_id,
         entry_type=AdminLedgerEntryType.CREDIT,
         amount=amount,
-        balance_before=before,
-        balance_after=after,
         notes=notes,
     )
-    return after, entry
+    if entry is None:
+        get_admin_balance(db, admin_id)  # raises NoResultFound for an unknown admin, as before
+    return entry.balance_after, entry
 
 
 def debit_admin_wallet(
@@ -95,23 +283,17 @@ def debit_admin_wallet(
     if amount <= 0:
         raise ValueError("Amount must be positive")
     
-    before = get_admin_balance(db, admin_id)
-    after = before - amount
-    
-    if after < 0:
-        raise ValueError("Insufficient admin balance")
-    
-    set_admin_balance(db, admin_id, after)
-    
-    entry = append_admin_ledger_entry(
+    # Debits are checked against admin.balance, so bring the shards in first
+    fold_admin_wallet_shards(db, admin_id)
+    entry = _apply_admin_wallet_change(
         db,
         admin_id=admin_id,
         order_id=order_id,
         entry_type=AdminLedgerEntryType.DEBIT,
         amount=amount,
-        balance_before=before,
-        balance_after=after,
         notes=notes,
     )
-    return after, entry
-
+    if entry is None:
+        get_admin_balance(db, admin_id)
+        raise ValueError("Insufficient admin balance")
+    return entry.balance_after, entry
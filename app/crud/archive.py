@@ -0,0 +1,105 @@
+"""
+Cold archive for closed orders.
+
+COMPLETED / CANCELLED orders older than ARCHIVE_AFTER_DAYS are moved, together with
+their new_orders / hourly_rental source row, assignments and end records, into the
+*_archive tables (app/models/archive.py). Each batch is one transaction: the order rows
+are claimed with FOR UPDATE SKIP LOCKED, so rows being changed by a request (or by a
+second job instance) are left for the next run, and every row is either still hot or
+already archived, never both.
+
+Runs hourly from app/main.py when ARCHIVE_ENABLED=true, or by hand with
+`python "Testing code/run_order_archive.py"`.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import delete, insert, select, exists
+from sqlalchemy.orm import Session
+
+from app.models.orders import Order, OrderSourceEnum
+from app.models.new_orders import NewOrder
+from app.models.hourly_rental import HourlyRental
+from app.models.order_assignments import OrderAssignment
+from app.models.end_records import EndRecord
+from app.models.archive import (
+    ArchivedOrder,
+    ArchivedNewOrder,
+    ArchivedHourlyRental,
+    ArchivedOrderAssignment,
+    ArchivedEndRecord,
+)
+
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "false").lower() == "true"
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+CLOSED_STATUSES = ("COMPLETED", "CANCELLED")
+
+
+def _move(db: Session, model, archive_model, condition) -> int:
+    """DELETE ... RETURNING into INSERT INTO <archive> in a single statement."""
+    table = model.__table__
+    names = [c.name for c in table.columns]
+    moved = delete(table).where(condition).returning(*table.columns).cte("moved")
+    result = db.execute(
+        insert(archive_model.__table__).from_select(names, select(*[moved.c[name] for name in names]))
+    )
+    return result.rowcount
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> Dict[str, int]:
+    """Archive up to `batch_size` closed orders created before `cutoff`. Returns moved rows per table."""
+    claimed = db.execute(
+        select(Order.id, Order.source, Order.source_order_id)
+        .where(Order.trip_status.in_(CLOSED_STATUSES), Order.created_at < cutoff)
+        .order_by(Order.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not claimed:
+        db.rollback()
+        return {}
+
+    order_ids = [row.id for row in claimed]
+    new_order_ids = [row.source_order_id for row in claimed if row.source == OrderSourceEnum.NEW_ORDERS]
+    hourly_ids = [row.source_order_id for row in claimed if row.source == OrderSourceEnum.HOURLY_RENTAL]
+
+    try:
+        counts = {
+            "end_records": _move(db, EndRecord, ArchivedEndRecord, EndRecord.order_id.in_(order_ids)),
+            "order_assignments": _move(db, OrderAssignment, ArchivedOrderAssignment, OrderAssignment.order_id.in_(order_ids)),
+            "orders": _move(db, Order, ArchivedOrder, Order.id.in_(order_ids)),
+        }
+        # Source rows go too, unless a remaining (e.g. recreated) order still points at them
+        counts["new_orders"] = _move(db, NewOrder, ArchivedNewOrder, NewOrder.order_id.in_(new_order_ids) & ~exists().where(
+            Order.source == OrderSourceEnum.NEW_ORDERS, Order.source_order_id == NewOrder.order_id
+        )) if new_order_ids else 0
+        counts["hourly_rental"] = _move(db, HourlyRental, ArchivedHourlyRental, HourlyRental.id.in_(hourly_ids) & ~exists().where(
+            Order.source == OrderSourceEnum.HOURLY_RENTAL, Order.source_order_id == HourlyRental.id
+        )) if hourly_ids else 0
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return counts
+
+
+def archive_closed_orders(
+    db: Session,
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> Dict[str, int]:
+    """Archive closed orders in batches until none are left (or `max_batches` ran). Returns totals per table."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    totals: Dict[str, int] = {}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        counts = archive_batch(db, cutoff, batch_size)
+        if not counts:
+            break
+        batches += 1
+        for table, count in counts.items():
+            totals[table] = totals.get(table, 0) + count
+    return totals
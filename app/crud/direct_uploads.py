@@ -0,0 +1,141 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import Optional
+from uuid import UUID
+from app.models.vehicle_owner_details import VehicleOwnerDetails
+from app.models.car_details import CarDetails
+from app.models.car_driver import CarDriver
+from app.models.order_assignments import OrderAssignment, AssignmentStatusEnum
+from app.models.common_enums import DocumentStatusEnum
+from app.utils import gcs
+from app.utils.images import InvalidImageError
+
+# entity type -> document type -> (image column, status column)
+DOCUMENT_COLUMNS = {
+    "vehicle_owner": {"aadhar": ("aadhar_front_img", "aadhar_status")},
+    "car": {
+        "rc_front": ("rc_front_img_url", "rc_front_status"),
+        "rc_back": ("rc_back_img_url", "rc_back_status"),
+        "insurance": ("insurance_img_url", "insurance_status"),
+        "fc": ("fc_img_url", "fc_status"),
+        "car": ("car_img_url", "car_img_status"),
+        "permit": ("permit_img_url", "permit_status"),
+    },
+    "driver": {"licence": ("licence_front_img", "licence_front_status")},
+}
+
+TRIP_STAGES = ("start", "end")
+
+
+def check_document_type(entity_type: str, document_type: str) -> None:
+    if entity_type not in DOCUMENT_COLUMNS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid entity type. Must be one of: {', '.join(DOCUMENT_COLUMNS)}"
+        )
+    if document_type not in DOCUMENT_COLUMNS[entity_type]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid document type. Must be one of: {', '.join(DOCUMENT_COLUMNS[entity_type])}"
+        )
+
+
+def check_content_type(content_type: str) -> None:
+    if content_type not in gcs.DIRECT_UPLOAD_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid content type. Must be one of: {', '.join(gcs.DIRECT_UPLOAD_CONTENT_TYPES)}"
+        )
+
+
+def get_document_entity(db: Session, entity_type: str, entity_id: Optional[UUID], vehicle_owner_id: UUID):
+    """The vehicle owner's own details, car or driver a document belongs to (404 / 403 otherwise)."""
+    if entity_type == "vehicle_owner":
+        entity = db.query(VehicleOwnerDetails).filter(VehicleOwnerDetails.vehicle_owner_id == vehicle_owner_id).first()
+    elif entity_type == "car":
+        entity = db.query(CarDetails).filter(CarDetails.id == entity_id).first() if entity_id else None
+    else:
+        entity = db.query(CarDriver).filter(CarDriver.id == entity_id).first() if entity_id else None
+
+    if not entity:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{entity_type.replace('_', ' ').capitalize()} not found")
+    if entity.vehicle_owner_id != vehicle_owner_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied. You can only upload your own documents.")
+    return entity
+
+
+def document_folder(entity_type: str, entity, document_type: str) -> str:
+    """Object prefix a document upload must land under (same layout as the multipart routes, scoped to the entity)."""
+    if entity_type == "vehicle_owner":
+        return f"vehicle_owner_details/{entity.vehicle_owner_id}/aadhar"
+    if entity_type == "car":
+        return f"car_details/{entity.id}/{document_type}"
+    return f"car_driver/{entity.id}/license"
+
+
+def trip_folder(db: Session, order_id: int, driver_id: UUID, stage: str) -> str:
+    """Object prefix for a trip speedometer image; only the driver assigned to the order may upload there."""
+    if stage not in TRIP_STAGES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid stage. Must be one of: start, end")
+    assignment = db.query(OrderAssignment.id).filter(
+        OrderAssignment.order_id == order_id,
+        OrderAssignment.driver_id == driver_id,
+        OrderAssignment.assignment_status.in_([AssignmentStatusEnum.ASSIGNED, AssignmentStatusEnum.DRIVING])
+    ).first()
+    if not assignment:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Driver is not assigned to this order")
+    return f"trip_records/{order_id}/{stage}"
+
+
+def verify_direct_upload(object_url: str, folder: str) -> None:
+    """Check that a client-reported upload is under `folder`, exists, and is an image within the size limit."""
+    if not object_url.startswith(gcs.public_url_for(folder + "/")):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded object is not in the expected location")
+    blob = gcs.get_uploaded_object(object_url)
+    if blob is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded object not found. Upload the file before completing.")
+    if blob.content_type not in gcs.DIRECT_UPLOAD_CONTENT_TYPES or (blob.size or 0) > gcs.DIRECT_UPLOAD_MAX_BYTES:
+        gcs.delete_gcs_file_by_url(object_url)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded object is not an image within the size limit")
+
+
+def record_document_upload(db: Session, entity_type: str, entity, document_type: str, object_url: str) -> None:
+    """Point the document at a verified direct upload and send it back for review; the replaced image is deleted."""
+    verify_direct_upload(object_url, document_folder(entity_type, entity, document_type))
+    image_column, status_column = DOCUMENT_COLUMNS[entity_type][document_type]
+    old_image_url = getattr(entity, image_column)
+    if old_image_url == object_url:
+        return
+
+    setattr(entity, image_column, object_url)
+    setattr(entity, status_column, DocumentStatusEnum.PENDING)
+    db.commit()
+    db.refresh(entity)
+    if old_image_url:
+        gcs.delete_gcs_file_by_url(old_image_url)
+
+
+async def replace_document_image(db: Session, entity, image_column: str, status_column: str, file, folder: str) -> str:
+    """
+    Multipart counterpart of record_document_upload: store the new image first, point the document at it and
+    send it back for review, and only then delete the replaced image. A rejected file (400) or a failed commit
+    leaves the document on its old image.
+    """
+    try:
+        new_image_url = await gcs.upload_image_to_gcs_async(file, folder)
+    except InvalidImageError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    old_image_url = getattr(entity, image_column)
+    try:
+        setattr(entity, image_column, new_image_url)
+        setattr(entity, status_column, DocumentStatusEnum.PENDING)
+        db.commit()
+        db.refresh(entity)
+    except Exception:
+        db.rollback()
+        await gcs.delete_gcs_files_by_url([new_image_url])
+        raise
+    if old_image_url:
+        await gcs.delete_gcs_files_by_url([old_image_url])
+    return new_image_url
@@ -284,9 +284,8 @@ async def update_end_trip_record(
             raise ValueError(f"Wallet debit failed: {str(e)}")
         
         # Get admin_id (use first admin)
-        from app.models.admin import Admin
-        admin = db.query(Admin).first()
-        admin_id = str(admin.id) if admin else None
+        from app.crud.admin_wallet import get_platform_admin_id
+        admin_id = get_platform_admin_id(db)
         
         # Credit vendor wallet with vendor_profit and deduct admin_profit
         try:
@@ -0,0 +1,133 @@
+# crud/exports.py
+"""
+Streaming exports (CSV / NDJSON) of orders, wallet ledgers and transfer transactions for finance.
+
+Rows are read as plain columns through a server-side cursor (`yield_per`, EXPORT_BATCH_SIZE rows per
+fetch) and formatted one batch at a time, so memory does not grow with the number of rows exported.
+The routes are in app/api/routes/exports.py.
+"""
+import csv
+import enum
+import io
+import json
+import os
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.models.admin_wallet_ledger import AdminWalletLedger, AdminLedgerEntryType
+from app.models.archive import orders_archive
+from app.models.orders import Order, Trip_status
+from app.models.transfer_transactions import TransferTransactions, TransferStatusEnum
+from app.models.vendor_wallet_ledger import VendorWalletLedger, VendorLedgerEntryType
+from app.models.wallet_ledger import WalletLedger, WalletEntryTypeEnum
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _parse_status(enum_class, value: Optional[str]):
+    """Enum member for a status filter given by name or value (case-insensitive)."""
+    if value is None:
+        return None
+    for member in enum_class:
+        if value.upper() in (member.name, str(member.value).upper()):
+            return member
+    allowed = ", ".join(member.name for member in enum_class)
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid status {value!r}, expected one of {allowed}")
+
+
+def _filtered(table, date_column, status_column, status_enum, from_date, to_date, status_value, **equals) -> Select:
+    stmt = select(*table.columns)
+    if from_date is not None:
+        stmt = stmt.where(date_column >= from_date)
+    if to_date is not None:
+        stmt = stmt.where(date_column < to_date)
+    member = _parse_status(status_enum, status_value)
+    if member is not None:
+        stmt = stmt.where(status_column == member)
+    for name, value in equals.items():
+        if value is not None:
+            stmt = stmt.where(table.c[name] == value)
+    return stmt
+
+
+def orders_export_select(from_date=None, to_date=None, status_value=None, vendor_id=None, archived: bool = False) -> Select:
+    """Orders (or the archived ones) created in [from_date, to_date), optionally by trip status."""
+    table = orders_archive if archived else Order.__table__
+    return _filtered(table, table.c.created_at, table.c.trip_status, Trip_status, from_date, to_date, status_value, vendor_id=vendor_id)
+
+
+def owner_ledger_export_select(from_date=None, to_date=None, status_value=None, vehicle_owner_id=None) -> Select:
+    table = WalletLedger.__table__
+    return _filtered(table, table.c.created_at, table.c.entry_type, WalletEntryTypeEnum, from_date, to_date, status_value, vehicle_owner_id=vehicle_owner_id)
+
+
+def vendor_ledger_export_select(from_date=None, to_date=None, status_value=None, vendor_id=None) -> Select:
+    table = VendorWalletLedger.__table__
+    return _filtered(table, table.c.created_at, table.c.entry_type, VendorLedgerEntryType, from_date, to_date, status_value, vendor_id=vendor_id)
+
+
+def admin_ledger_export_select(from_date=None, to_date=None, status_value=None, admin_id=None) -> Select:
+    table = AdminWalletLedger.__table__
+    return _filtered(table, table.c.created_at, table.c.entry_type, AdminLedgerEntryType, from_date, to_date, status_value, admin_id=admin_id)
+
+
+def transfers_export_select(from_date=None, to_date=None, status_value=None, vendor_id=None) -> Select:
+    table = TransferTransactions.__table__
+    return _filtered(table, table.c.created_at, table.c.status, TransferStatusEnum, from_date, to_date, status_value, vendor_id=vendor_id)
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, timedelta)):
+        return str(value)
+    return value
+
+
+def _csv_cell(value):
+    value = _plain(value)
+    # JSONB / ARRAY columns (pickup_drop_location, pick_near_city) as JSON text
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+def _csv_batches(columns: List[str], batches) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_cell(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+
+
+def _ndjson_batches(columns: List[str], batches) -> Iterator[str]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, (_plain(value) for value in row))), default=str) + "\n" for row in rows
+        )
+
+
+FORMATTERS: Dict[str, Callable] = {"csv": _csv_batches, "ndjson": _ndjson_batches}
+
+
+def stream_export(db: Session, stmt: Select, export_format: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """
+    Text chunks of the export, one per batch of rows.
+
+    yield_per makes the driver use a server-side cursor: only batch_size rows are held at a time.
+    The caller owns the session and must keep it open until the generator is exhausted.
+    """
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    columns = list(result.keys())
+    yield from FORMATTERS[export_format](columns, result.partitions())
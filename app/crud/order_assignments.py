@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, text, select
 from typing import Optional, List
 from datetime import datetime, timedelta
 from app.models.order_assignments import OrderAssignment, AssignmentStatusEnum
@@ -12,6 +13,7 @@ from fastapi import HTTPException
 from app.crud.vendor_wallet import credit_vendor_wallet
 from app.crud.notification import notify_vendor_auto_cancelled_order
 from app.models.vendor_details import VendorDetails
+from app.utils.route_labels import origin_label_filter
 import math
 
 
@@ -65,9 +67,8 @@ async def cancel_timed_out_pending_assignments(db: Session) -> int:
     """
     from app.models.orders import CancelledByEnum
     from app.crud.wallet import debit_wallet, get_owner_balance
-    from app.models.admin import Admin
-    admin = db.query(Admin).first()
-    admin_id = str(admin.id) if admin else None
+    from app.crud.admin_wallet import get_platform_admin_id
+    admin_id = get_platform_admin_id(db)
     
     now = datetime.utcnow()
     # Find pending assignments whose order's max_time_to_assign_order has passed
@@ -363,6 +364,65 @@ def get_vendor_orders_with_assignments(db: Session, vendor_id: str) -> List[dict
     return result
 
 
+def _pending_order_row(order: Order, new_order: Optional[NewOrder] = None, hourly_order: Optional[HourlyRental] = None) -> Optional[dict]:
+    """Build the vehicle-owner pending order payload for an order and its source row."""
+    if order.source == OrderSourceEnum.NEW_ORDERS:
+        if not new_order:
+            return None  # Skip if new_order not found
+
+        return {
+            "order_id": order.id,
+            "trip_status": order.trip_status,
+            # Order details
+
+            "trip_type": order.trip_type if order.trip_type else "Unknown",
+            "car_type": order.car_type if order.car_type else "Unknown",
+            "pickup_drop_location": order.pickup_drop_location or {},
+            "origin_label": order.origin_label,
+            "destination_label": order.destination_label,
+            "stop_count": order.stop_count,
+            "start_date_time": order.start_date_time,
+            "pick_near_city": (",".join(order.pick_near_city) if isinstance(order.pick_near_city, list) else order.pick_near_city) or "Unknown",
+            "trip_distance": order.trip_distance,
+            "trip_time": order.trip_time or "Unknown",
+            "estimated_price": order.estimated_price,
+            "toll_charge_update":order.toll_charge_update,
+            "max_time_to_assign_order": order.max_time_to_assign_order,
+            "pickup_notes": new_order.pickup_notes if new_order else None,
+            "created_at": order.created_at,
+            "charges_to_deduct" : round((order.vendor_price-order.estimated_price)+((new_order.cost_per_km*new_order.trip_distance)*10/100)) if new_order else 0
+        }
+    elif order.source == OrderSourceEnum.HOURLY_RENTAL:
+        if not hourly_order:
+            return None  # Skip if hourly_order not found
+
+        return {
+            "order_id": order.id,
+            "trip_status": order.trip_status,
+            # Order details
+
+            "trip_type": order.trip_type if order.trip_type else "Unknown",
+            "car_type": order.car_type if order.car_type else "Unknown",
+            "pickup_drop_location": order.pickup_drop_location or {},
+            "origin_label": order.origin_label,
+            "destination_label": order.destination_label,
+            "stop_count": order.stop_count,
+            "start_date_time": order.start_date_time,
+            "pick_near_city": (",".join(order.pick_near_city) if isinstance(order.pick_near_city, list) else order.pick_near_city) or "Unknown",
+            "trip_distance": hourly_order.package_hours["km_range"],
+            "trip_time": str(hourly_order.package_hours["hours"])+" hours" or "Unknown",
+            "estimated_price": order.estimated_price,
+            "toll_charge_update":order.toll_charge_update,
+            "max_time_to_assign_order": order.max_time_to_assign_order,
+            "pickup_notes": hourly_order.pickup_notes,
+            "created_at": order.created_at,
+            "charges_to_deduct" : int(order.vendor_price - order.estimated_price),
+            "package" : hourly_order.package_hours,
+            "cost_for_addon_km":hourly_order.cost_for_addon_km
+        }
+    return None
+
+
 def get_pending_orders_for_vehicle_owner(db: Session, vehicle_owner_id: str) -> List[dict]:
     """
     Get pending orders for a vehicle owner based on business rules:
@@ -391,58 +451,50 @@ def get_pending_orders_for_vehicle_owner(db: Session, vehicle_owner_id: str) ->
         ).order_by(desc(OrderAssignment.created_at)).first()
         
         if not latest_assignment:
+            new_order = None
+            hourly_order = None
             if order.source == OrderSourceEnum.NEW_ORDERS:
                 new_order = db.query(NewOrder).filter(NewOrder.order_id == order.source_order_id).first()
-                
-                if not new_order:
-                    continue  # Skip if new_order not found
-
-                pending_orders.append({
-                    "order_id": order.id,
-                    "trip_status": order.trip_status,
-                    # Order details
-
-                    "trip_type": order.trip_type if order.trip_type else "Unknown",
-                    "car_type": order.car_type if order.car_type else "Unknown",
-                    "pickup_drop_location": order.pickup_drop_location or {},
-                    "start_date_time": order.start_date_time,
-                    "pick_near_city": (",".join(order.pick_near_city) if isinstance(order.pick_near_city, list) else order.pick_near_city) or "Unknown",
-                    "trip_distance": order.trip_distance,
-                    "trip_time": order.trip_time or "Unknown",
-                    "estimated_price": order.estimated_price,
-                    "toll_charge_update":order.toll_charge_update,
-                    "max_time_to_assign_order": order.max_time_to_assign_order,
-                    "pickup_notes": new_order.pickup_notes if new_order else None,
-                    "created_at": order.created_at,
-                    "charges_to_deduct" : round((order.vendor_price-order.estimated_price)+((new_order.cost_per_km*new_order.trip_distance)*10/100)) if new_order else 0
-                })
             elif order.source == OrderSourceEnum.HOURLY_RENTAL:
                 hourly_order = db.query(HourlyRental).filter(HourlyRental.id == order.source_order_id).first()
-                
-                if not hourly_order:
-                    continue  # Skip if hourly_order not found
-                
-                pending_orders.append({
-                    "order_id": order.id,
-                    "trip_status": order.trip_status,
-                    # Order details
 
-                    "trip_type": order.trip_type if order.trip_type else "Unknown",
-                    "car_type": order.car_type if order.car_type else "Unknown",
-                    "pickup_drop_location": order.pickup_drop_location or {},
-                    "start_date_time": order.start_date_time,
-                    "pick_near_city": (",".join(order.pick_near_city) if isinstance(order.pick_near_city, list) else order.pick_near_city) or "Unknown",
-                    "trip_distance": hourly_order.package_hours["km_range"],
-                    "trip_time": str(hourly_order.package_hours["hours"])+" hours" or "Unknown",
-                    "estimated_price": order.estimated_price,
-                    "toll_charge_update":order.toll_charge_update,
-                    "max_time_to_assign_order": order.max_time_to_assign_order,
-                    "pickup_notes": hourly_order.pickup_notes,
-                    "created_at": order.created_at,
-                    "charges_to_deduct" : int(order.vendor_price - order.estimated_price),
-                    "package" : hourly_order.package_hours,
-                    "cost_for_addon_km":hourly_order.cost_for_addon_km
-                })     
+            row = _pending_order_row(order, new_order, hourly_order)
+            if row:
+                pending_orders.append(row)
+    return pending_orders
+
+
+async def get_pending_orders_for_vehicle_owner_async(db: AsyncSession, vehicle_owner_id: str, origin: Optional[str] = None) -> List[dict]:
+    """
+    Async variant of get_pending_orders_for_vehicle_owner.
+    Resolves the same rows with a single query (orders never assigned, joined to their source order).
+    `origin` keeps only orders whose pickup city starts with the given text.
+    """
+    has_assignment = select(OrderAssignment.id).where(OrderAssignment.order_id == Order.id).exists()
+    stmt = (
+        select(Order, NewOrder, HourlyRental)
+        .outerjoin(
+            NewOrder,
+            (Order.source == OrderSourceEnum.NEW_ORDERS) &
+            (Order.source_order_id == NewOrder.order_id)
+        )
+        .outerjoin(
+            HourlyRental,
+            (Order.source == OrderSourceEnum.HOURLY_RENTAL) &
+            (Order.source_order_id == HourlyRental.id)
+        )
+        .where(Order.trip_status == "PENDING", ~has_assignment)
+        .order_by(Order.id)
+    )
+    if origin:
+        stmt = stmt.where(origin_label_filter(Order, origin))
+    results = (await db.execute(stmt)).all()
+
+    pending_orders = []
+    for order, new_order, hourly_order in results:
+        row = _pending_order_row(order, new_order, hourly_order)
+        if row:
+            pending_orders.append(row)
     return pending_orders
 
 def update_assignment_car_driver(
@@ -466,6 +518,34 @@ def update_assignment_car_driver(
     db.refresh(assignment)
     return assignment
 
+def _driver_order_row(assignment: OrderAssignment, order: Order, vendor_detail_show: VendorDetails) -> dict:
+    """Build the driver order list payload for an assignment."""
+    return {
+        "id": assignment.id,
+        "order_id": assignment.order_id,
+        "assignment_status": assignment.assignment_status,
+        "customer_name": order.customer_name if order.data_visibility_vehicle_owner else "Hidden",
+        "customer_number": order.customer_number if order.data_visibility_vehicle_owner else "Hidden",
+        "vendor_name" : vendor_detail_show.full_name,
+        "vendor_primary_number" : vendor_detail_show.primary_number,
+        "vendor_secondary_number" : vendor_detail_show.secondary_number,
+        "pickup_drop_location": order.pickup_drop_location,
+        "start_date_time": order.start_date_time,
+        "trip_type": order.trip_type.value if order.trip_type else "Unknown",
+        "car_type": order.car_type.value if order.car_type else "Unknown",
+        "trip_time": order.trip_time,
+        "trip_distance": order.trip_distance,
+        "estimated_price": order.estimated_price,
+        "toll_charge_update": order.toll_charge_update,
+        "data_visibility_vehicle_owner": order.data_visibility_vehicle_owner,
+        "closed_vendor_price": order.closed_vendor_price,
+        "night_charges": order.night_charges,
+        "waiting_time": order.waiting_time,
+        "assigned_at": assignment.assigned_at,
+        "created_at": assignment.created_at
+    }
+
+
 def get_driver_assigned_orders(db: Session, driver_id: str) -> List[dict]:
     """Get all ASSIGNED orders for a specific driver"""
     assignments = db.query(OrderAssignment).filter(
@@ -481,33 +561,29 @@ def get_driver_assigned_orders(db: Session, driver_id: str) -> List[dict]:
         vendor_detail_show = db.query(VendorDetails).filter(VendorDetails.vendor_id == order.vendor_id).first()
         
         if order:
-            result.append({
-                "id": assignment.id,
-                "order_id": assignment.order_id,
-                "assignment_status": assignment.assignment_status,
-                "customer_name": order.customer_name if order.data_visibility_vehicle_owner else "Hidden",
-                "customer_number": order.customer_number if order.data_visibility_vehicle_owner else "Hidden",
-                "vendor_name" : vendor_detail_show.full_name,
-                "vendor_primary_number" : vendor_detail_show.primary_number,
-                "vendor_secondary_number" : vendor_detail_show.secondary_number,
-                "pickup_drop_location": order.pickup_drop_location,
-                "start_date_time": order.start_date_time,
-                "trip_type": order.trip_type.value if order.trip_type else "Unknown",
-                "car_type": order.car_type.value if order.car_type else "Unknown",
-                "trip_time": order.trip_time,
-                "trip_distance": order.trip_distance,
-                "estimated_price": order.estimated_price,
-                "toll_charge_update": order.toll_charge_update,
-                "data_visibility_vehicle_owner": order.data_visibility_vehicle_owner,
-                "closed_vendor_price": order.closed_vendor_price,
-                "night_charges": order.night_charges,
-                "waiting_time": order.waiting_time,
-                "assigned_at": assignment.assigned_at,
-                "created_at": assignment.created_at
-            })
+            result.append(_driver_order_row(assignment, order, vendor_detail_show))
     
     return result
 
+
+async def get_driver_assigned_orders_async(db: AsyncSession, driver_id: str) -> List[dict]:
+    """Async variant of get_driver_assigned_orders; joins order and vendor details in one query."""
+    stmt = (
+        select(OrderAssignment, Order, VendorDetails)
+        .join(Order, Order.id == OrderAssignment.order_id)
+        .join(VendorDetails, VendorDetails.vendor_id == Order.vendor_id)
+        .where(
+            OrderAssignment.driver_id == driver_id,
+            OrderAssignment.assignment_status.in_([AssignmentStatusEnum.ASSIGNED, AssignmentStatusEnum.DRIVING])
+        )
+        .order_by(desc(OrderAssignment.assigned_at))
+    )
+    results = (await db.execute(stmt)).all()
+    return [
+        _driver_order_row(assignment, order, vendor_detail_show)
+        for assignment, order, vendor_detail_show in results
+    ]
+
 def get_driver_assigned_orders_completed_trip(db: Session, driver_id: str) -> List[dict]:
     """Get all ASSIGNED orders for a specific driver"""
     assignments = db.query(OrderAssignment).filter(
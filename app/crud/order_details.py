@@ -22,8 +22,9 @@ from app.schemas.order_details import (
     OrderAssignmentDetail,
     EndRecordDetail
 )
+from app.utils.route_labels import origin_label_filter
 import math
-from app.utils.gcs import generate_signed_url_from_gcs
+from app.utils.gcs import generate_signed_urls_from_gcs
 
 
 def get_order_by_id(db: Session, order_id: int) -> Optional[Order]:
@@ -31,16 +32,7 @@ def get_order_by_id(db: Session, order_id: int) -> Optional[Order]:
     return db.query(Order).filter(Order.id == order_id).first()
 
 
-def get_vendor_basic_info(db: Session, vendor_id: str) -> Optional[VendorBasicInfo]:
-    """Get basic vendor information"""
-    vendor_creds = db.query(VendorCredentials).filter(VendorCredentials.id == vendor_id).first()
-    if not vendor_creds:
-        return None
-    
-    vendor_details = db.query(VendorDetails).filter(VendorDetails.vendor_id == vendor_id).first()
-    if not vendor_details:
-        return None
-    
+def _vendor_basic_info(vendor_creds: VendorCredentials, vendor_details: VendorDetails) -> VendorBasicInfo:
     return VendorBasicInfo(
         id=vendor_creds.id,
         full_name=vendor_details.full_name,
@@ -55,12 +47,20 @@ def get_vendor_basic_info(db: Session, vendor_id: str) -> Optional[VendorBasicIn
     )
 
 
-def get_driver_basic_info(db: Session, driver_id: str) -> Optional[DriverBasicInfo]:
-    """Get basic driver information"""
-    driver = db.query(CarDriver).filter(CarDriver.id == driver_id).first()
-    if not driver:
+def get_vendor_basic_info(db: Session, vendor_id: str) -> Optional[VendorBasicInfo]:
+    """Get basic vendor information"""
+    vendor_creds = db.query(VendorCredentials).filter(VendorCredentials.id == vendor_id).first()
+    if not vendor_creds:
+        return None
+    
+    vendor_details = db.query(VendorDetails).filter(VendorDetails.vendor_id == vendor_id).first()
+    if not vendor_details:
         return None
     
+    return _vendor_basic_info(vendor_creds, vendor_details)
+
+
+def _driver_basic_info(driver: CarDriver) -> DriverBasicInfo:
     return DriverBasicInfo(
         id=driver.id,
         full_name=driver.full_name,
@@ -73,12 +73,16 @@ def get_driver_basic_info(db: Session, driver_id: str) -> Optional[DriverBasicIn
     )
 
 
-def get_car_basic_info(db: Session, car_id: str) -> Optional[CarBasicInfo]:
-    """Get basic car information"""
-    car = db.query(CarDetails).filter(CarDetails.id == car_id).first()
-    if not car:
+def get_driver_basic_info(db: Session, driver_id: str) -> Optional[DriverBasicInfo]:
+    """Get basic driver information"""
+    driver = db.query(CarDriver).filter(CarDriver.id == driver_id).first()
+    if not driver:
         return None
     
+    return _driver_basic_info(driver)
+
+
+def _car_basic_info(car: CarDetails) -> CarBasicInfo:
     return CarBasicInfo(
         id=car.id,
         car_name=car.car_name,
@@ -94,16 +98,16 @@ def get_car_basic_info(db: Session, car_id: str) -> Optional[CarBasicInfo]:
     )
 
 
-def get_vehicle_owner_basic_info(db: Session, vehicle_owner_id: str) -> Optional[VehicleOwnerBasicInfo]:
-    """Get basic vehicle owner information"""
-    owner_creds = db.query(VehicleOwnerCredentials).filter(VehicleOwnerCredentials.id == vehicle_owner_id).first()
-    if not owner_creds:
-        return None
-    
-    owner_details = db.query(VehicleOwnerDetails).filter(VehicleOwnerDetails.vehicle_owner_id == vehicle_owner_id).first()
-    if not owner_details:
+def get_car_basic_info(db: Session, car_id: str) -> Optional[CarBasicInfo]:
+    """Get basic car information"""
+    car = db.query(CarDetails).filter(CarDetails.id == car_id).first()
+    if not car:
         return None
     
+    return _car_basic_info(car)
+
+
+def _vehicle_owner_basic_info(owner_creds: VehicleOwnerCredentials, owner_details: VehicleOwnerDetails) -> VehicleOwnerBasicInfo:
     return VehicleOwnerBasicInfo(
         id=owner_creds.id,
         full_name=owner_details.full_name,
@@ -115,47 +119,153 @@ def get_vehicle_owner_basic_info(db: Session, vehicle_owner_id: str) -> Optional
     )
 
 
+def get_vehicle_owner_basic_info(db: Session, vehicle_owner_id: str) -> Optional[VehicleOwnerBasicInfo]:
+    """Get basic vehicle owner information"""
+    owner_creds = db.query(VehicleOwnerCredentials).filter(VehicleOwnerCredentials.id == vehicle_owner_id).first()
+    if not owner_creds:
+        return None
+    
+    owner_details = db.query(VehicleOwnerDetails).filter(VehicleOwnerDetails.vehicle_owner_id == vehicle_owner_id).first()
+    if not owner_details:
+        return None
+    
+    return _vehicle_owner_basic_info(owner_creds, owner_details)
+
+
+def _assignment_detail(assignment: OrderAssignment) -> OrderAssignmentDetail:
+    return OrderAssignmentDetail(
+        id=assignment.id,
+        order_id=assignment.order_id,
+        vehicle_owner_id=assignment.vehicle_owner_id,
+        driver_id=assignment.driver_id,
+        car_id=assignment.car_id,
+        assignment_status=assignment.assignment_status,
+        assigned_at=assignment.assigned_at,
+        expires_at=assignment.expires_at,
+        cancelled_at=assignment.cancelled_at,
+        completed_at=assignment.completed_at,
+        created_at=assignment.created_at
+    )
+
+
 def get_order_assignments(db: Session, order_id: int) -> list[OrderAssignmentDetail]:
     """Get all order assignments for an order"""
-    assignments = db.query(OrderAssignment).filter(OrderAssignment.order_id == order_id).all()
+    assignments = db.query(OrderAssignment).filter(OrderAssignment.order_id == order_id).order_by(OrderAssignment.id).all()
     
-    return [
-        OrderAssignmentDetail(
-            id=assignment.id,
-            order_id=assignment.order_id,
-            vehicle_owner_id=assignment.vehicle_owner_id,
-            driver_id=assignment.driver_id,
-            car_id=assignment.car_id,
-            assignment_status=assignment.assignment_status,
-            assigned_at=assignment.assigned_at,
-            expires_at=assignment.expires_at,
-            cancelled_at=assignment.cancelled_at,
-            completed_at=assignment.completed_at,
-            created_at=assignment.created_at
-        )
-        for assignment in assignments
-    ]
+    return [_assignment_detail(assignment) for assignment in assignments]
+
+
+def _sign_end_record_images(end_records: List[EndRecord], thumbnails: bool = False) -> Dict[str, str]:
+    return generate_signed_urls_from_gcs(
+        (url for record in end_records for url in (record.img_url, record.close_speedometer_image)),
+        thumbnails=thumbnails
+    )
+
+
+def _end_record_detail(record: EndRecord, signed_urls: Dict[str, str]) -> EndRecordDetail:
+    return EndRecordDetail(
+        id=record.id,
+        order_id=record.order_id,
+        driver_id=record.driver_id,
+        start_km=record.start_km,
+        end_km=record.end_km,
+        contact_number=record.contact_number,
+        img_url=signed_urls.get(record.img_url),
+        close_speedometer_image=signed_urls.get(record.close_speedometer_image),
+        created_at=record.created_at,
+        updated_at=record.updated_at
+    )
 
 
 def get_order_end_records(db: Session, order_id: int) -> list[EndRecordDetail]:
     """Get all end records for an order"""
-    end_records = db.query(EndRecord).filter(EndRecord.order_id == order_id).all()
-    
-    return [
-        EndRecordDetail(
-            id=record.id,
-            order_id=record.order_id,
-            driver_id=record.driver_id,
-            start_km=record.start_km,
-            end_km=record.end_km,
-            contact_number=record.contact_number,
-            img_url= generate_signed_url_from_gcs(record.img_url) if record.img_url else None,
-            close_speedometer_image=generate_signed_url_from_gcs(record.close_speedometer_image) if record.close_speedometer_image else None,
-            created_at=record.created_at,
-            updated_at=record.updated_at
+    end_records = db.query(EndRecord).filter(EndRecord.order_id == order_id).order_by(EndRecord.id).all()
+    
+    signed_urls = _sign_end_record_images(end_records)
+    return [_end_record_detail(record, signed_urls) for record in end_records]
+
+
+class OrderRelations:
+    """
+    Batch loader for the rows hanging off a page of orders.
+
+    Collects the ids of the page and resolves each entity type with one IN (...) query:
+    vendors, assignments, end records, then driver / car / vehicle owner of the latest
+    assignment. At most 6 queries however many orders are passed in, and the end record
+    images are signed in one batch.
+    """
+
+    def __init__(self, db: Session, orders: List[Order], thumbnails: bool = False):
+        order_ids = [order.id for order in orders]
+        vendor_ids = {order.vendor_id for order in orders}
+
+        self.vendors: Dict[Any, tuple] = {}
+        if vendor_ids:
+            for creds, details in db.query(VendorCredentials, VendorDetails).join(
+                VendorDetails, VendorDetails.vendor_id == VendorCredentials.id
+            ).filter(VendorCredentials.id.in_(vendor_ids)):
+                self.vendors.setdefault(creds.id, (creds, details))
+
+        self.assignments: Dict[int, List[OrderAssignment]] = {}
+        self.end_records: Dict[int, List[EndRecord]] = {}
+        if order_ids:
+            for assignment in db.query(OrderAssignment).filter(
+                OrderAssignment.order_id.in_(order_ids)
+            ).order_by(OrderAssignment.id):
+                self.assignments.setdefault(assignment.order_id, []).append(assignment)
+            for record in db.query(EndRecord).filter(EndRecord.order_id.in_(order_ids)).order_by(EndRecord.id):
+                self.end_records.setdefault(record.order_id, []).append(record)
+        # All images of the page signed in one batch (thumbnails for listings)
+        self.signed_urls = _sign_end_record_images([r for records in self.end_records.values() for r in records], thumbnails)
+
+        # Only the latest (most recent) assignment of each order is expanded
+        latest = [assignments[-1] for assignments in self.assignments.values()]
+        driver_ids = {a.driver_id for a in latest if a.driver_id}
+        car_ids = {a.car_id for a in latest if a.car_id}
+        owner_ids = {a.vehicle_owner_id for a in latest if a.vehicle_owner_id}
+
+        self.drivers: Dict[Any, CarDriver] = {}
+        if driver_ids:
+            self.drivers = {driver.id: driver for driver in db.query(CarDriver).filter(CarDriver.id.in_(driver_ids))}
+        self.cars: Dict[Any, CarDetails] = {}
+        if car_ids:
+            self.cars = {car.id: car for car in db.query(CarDetails).filter(CarDetails.id.in_(car_ids))}
+        self.owners: Dict[Any, tuple] = {}
+        if owner_ids:
+            for creds, details in db.query(VehicleOwnerCredentials, VehicleOwnerDetails).join(
+                VehicleOwnerDetails, VehicleOwnerDetails.vehicle_owner_id == VehicleOwnerCredentials.id
+            ).filter(VehicleOwnerCredentials.id.in_(owner_ids)):
+                self.owners.setdefault(creds.id, (creds, details))
+
+    def vendor(self, order: Order) -> Optional[VendorBasicInfo]:
+        found = self.vendors.get(order.vendor_id)
+        return _vendor_basic_info(*found) if found else None
+
+    def assignment_details(self, order: Order) -> List[OrderAssignmentDetail]:
+        return [_assignment_detail(assignment) for assignment in self.assignments.get(order.id, [])]
+
+    def end_record_details(self, order: Order) -> List[EndRecordDetail]:
+        return [_end_record_detail(record, self.signed_urls) for record in self.end_records.get(order.id, [])]
+
+    def latest_assignment(self, order: Order) -> Optional[OrderAssignment]:
+        assignments = self.assignments.get(order.id)
+        return assignments[-1] if assignments else None
+
+    def assigned(self, order: Order) -> tuple:
+        """(driver, car, (owner credentials, owner details)) of the latest assignment, each None if missing."""
+        latest = self.latest_assignment(order)
+        if not latest:
+            return None, None, None
+        return self.drivers.get(latest.driver_id), self.cars.get(latest.car_id), self.owners.get(latest.vehicle_owner_id)
+
+    def admin_assigned(self, order: Order) -> tuple:
+        """(DriverBasicInfo, CarBasicInfo, VehicleOwnerBasicInfo) of the latest assignment."""
+        driver, car, owner = self.assigned(order)
+        return (
+            _driver_basic_info(driver) if driver else None,
+            _car_basic_info(car) if car else None,
+            _vehicle_owner_basic_info(*owner) if owner else None,
         )
-        for record in end_records
-    ]
 
 
 def get_admin_order_details(db: Session, order_id: int) -> Optional[AdminOrderDetailResponse]:
@@ -164,34 +274,18 @@ def get_admin_order_details(db: Session, order_id: int) -> Optional[AdminOrderDe
     if not order:
         return None
     
+    relations = OrderRelations(db, [order])
+
     # Get vendor information
-    vendor = get_vendor_basic_info(db, str(order.vendor_id))
+    vendor = relations.vendor(order)
     if not vendor:
         return None
     
-    # Get assignments
-    assignments = get_order_assignments(db, order_id)
-    
-    # Get end records
-    end_records = get_order_end_records(db, order_id)
+    assignments = relations.assignment_details(order)
+    end_records = relations.end_record_details(order)
     
-    # Get latest assignment details
-    latest_assignment = None
-    assigned_driver = None
-    assigned_car = None
-    vehicle_owner = None
-    
-    if assignments:
-        latest_assignment = assignments[-1]  # Most recent assignment
-        
-        if latest_assignment.driver_id:
-            assigned_driver = get_driver_basic_info(db, str(latest_assignment.driver_id))
-        
-        if latest_assignment.car_id:
-            assigned_car = get_car_basic_info(db, str(latest_assignment.car_id))
-        
-        if latest_assignment.vehicle_owner_id:
-            vehicle_owner = get_vehicle_owner_basic_info(db, str(latest_assignment.vehicle_owner_id))
+    # Latest assignment details
+    assigned_driver, assigned_car, vehicle_owner = relations.admin_assigned(order)
     
     return AdminOrderDetailResponse(
         id=order.id,
@@ -201,6 +295,9 @@ def get_admin_order_details(db: Session, order_id: int) -> Optional[AdminOrderDe
         trip_type=order.trip_type,
         car_type=order.car_type,
         pickup_drop_location=order.pickup_drop_location,
+        origin_label=order.origin_label,
+        destination_label=order.destination_label,
+        stop_count=order.stop_count,
         start_date_time=order.start_date_time,
         customer_name=order.customer_name,
         customer_number=order.customer_number,
@@ -224,46 +321,40 @@ def get_admin_order_details(db: Session, order_id: int) -> Optional[AdminOrderDe
     )
 
 
-def get_all_admin_orders(db: Session, skip: int = 0, limit: int = 100) -> tuple[List[AdminOrderDetailResponse], int]:
-    """Get all orders with full details for admin with pagination"""
+def get_all_admin_orders(db: Session, skip: int = 0, limit: int = 100, origin: Optional[str] = None,
+                         thumbnails: bool = True) -> tuple[List[AdminOrderDetailResponse], int]:
+    """
+    Get all orders with full details for admin with pagination, optionally only orders starting from `origin` (prefix, case-insensitive).
+    End record images are signed thumbnails unless thumbnails=False.
+    """
     from app.models.orders import Order
     
+    query = db.query(Order)
+    if origin:
+        query = query.filter(origin_label_filter(Order, origin))
+
     # Get total count
-    total_count = db.query(Order).count()
+    total_count = query.count()
     
     # Get paginated orders
-    orders = db.query(Order).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+    orders = query.order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
     
+    # Related rows for the whole page in a fixed number of queries
+    relations = OrderRelations(db, orders, thumbnails)
+
     # Build response list
     order_responses = []
     for order in orders:
         # Get vendor information
-        vendor = get_vendor_basic_info(db, str(order.vendor_id))
+        vendor = relations.vendor(order)
         if not vendor:
             continue  # Skip orders without vendor info
         
-        # Get assignments
-        assignments = get_order_assignments(db, order.id)
+        assignments = relations.assignment_details(order)
+        end_records = relations.end_record_details(order)
         
-        # Get end records
-        end_records = get_order_end_records(db, order.id)
-        
-        # Get latest assignment details
-        assigned_driver = None
-        assigned_car = None
-        vehicle_owner = None
-        
-        if assignments:
-            latest_assignment = assignments[-1]  # Most recent assignment
-            
-            if latest_assignment.driver_id:
-                assigned_driver = get_driver_basic_info(db, str(latest_assignment.driver_id))
-            
-            if latest_assignment.car_id:
-                assigned_car = get_car_basic_info(db, str(latest_assignment.car_id))
-            
-            if latest_assignment.vehicle_owner_id:
-                vehicle_owner = get_vehicle_owner_basic_info(db, str(latest_assignment.vehicle_owner_id))
+        # Latest assignment details
+        assigned_driver, assigned_car, vehicle_owner = relations.admin_assigned(order)
         
         order_response = AdminOrderDetailResponse(
             id=order.id,
@@ -273,6 +364,9 @@ def get_all_admin_orders(db: Session, skip: int = 0, limit: int = 100) -> tuple[
             trip_type=order.trip_type,
             car_type=order.car_type,
             pickup_drop_location=order.pickup_drop_location,
+            origin_label=order.origin_label,
+            destination_label=order.destination_label,
+            stop_count=order.stop_count,
             start_date_time=order.start_date_time,
             customer_name=order.customer_name,
             customer_number=order.customer_number,
@@ -317,11 +411,9 @@ def get_vendor_order_details(db: Session, order_id: int, vendor_id: str) -> Opti
         time_diff = (order.max_time_to_assign_order - order.created_at).total_seconds() / 60
         max_time = int(time_diff)
     
-    # Get assignments
-    assignments = get_order_assignments(db, order_id)
-    
-    # Get end records
-    end_records = get_order_end_records(db, order_id)
+    relations = OrderRelations(db, [order])
+    assignments = relations.assignment_details(order)
+    end_records = relations.end_record_details(order)
     
     # Get limited info from latest assignment
     assigned_driver_name = None
@@ -330,27 +422,15 @@ def get_vendor_order_details(db: Session, order_id: int, vendor_id: str) -> Opti
     assigned_car_number = None
     vehicle_owner_name = None
     
-    if assignments:
-        latest_assignment = assignments[-1]  # Most recent assignment
-        
-        if latest_assignment.driver_id:
-            driver = db.query(CarDriver).filter(CarDriver.id == latest_assignment.driver_id).first()
-            if driver:
-                assigned_driver_name = driver.full_name
-                assigned_driver_phone = driver.primary_number
-        
-        if latest_assignment.car_id:
-            car = db.query(CarDetails).filter(CarDetails.id == latest_assignment.car_id).first()
-            if car:
-                assigned_car_name = car.car_name
-                assigned_car_number = car.car_number
-        
-        if latest_assignment.vehicle_owner_id:
-            owner_details = db.query(VehicleOwnerDetails).filter(
-                VehicleOwnerDetails.vehicle_owner_id == latest_assignment.vehicle_owner_id
-            ).first()
-            if owner_details:
-                vehicle_owner_name = owner_details.full_name
+    driver, car, owner = relations.assigned(order)
+    if driver:
+        assigned_driver_name = driver.full_name
+        assigned_driver_phone = driver.primary_number
+    if car:
+        assigned_car_name = car.car_name
+        assigned_car_number = car.car_number
+    if owner:
+        vehicle_owner_name = owner[1].full_name
     
     # Get source-specific details
     cost_per_km = None
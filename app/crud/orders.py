@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Optional
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import func, extract
+from sqlalchemy import func, extract, select
 import os
 from app.models.orders import Order, OrderSourceEnum
 from app.models.end_records import EndRecord
@@ -9,14 +10,28 @@ from app.utils.gcs import upload_image_to_gcs
 from app.models.new_orders import NewOrder, OrderTypeEnum
 from app.models.hourly_rental import HourlyRental
 from app.models.order_assignments import OrderAssignment,AssignmentStatusEnum
+from app.models.archive import ArchivedOrder, ArchivedNewOrder, ArchivedHourlyRental
 from sqlalchemy.sql import or_, and_
 from app.crud.notification import send_push_notifications_vehicle_owner, send_custom_sound_notification_vehicle_owner
 import asyncio
+import heapq
 import math
+from cachetools import TTLCache
+from threading import Lock
 
 vendor_commession_env = os.getenv("VENDOR_COMMESSION_ENV")
 admin_commession_env = int(os.getenv("ADMIN_COMMESSION_ENV"))
 
+# Longest assignment window (max_time_to_assign_order - created_at) per trip type, for /max-assignment-times.
+# The aggregate is cached and raised in place as this process creates orders (note_order_assign_time);
+# orders created by other processes show within the TTL
+MAX_ASSIGN_TIME_CACHE_SECONDS = int(os.getenv("MAX_ASSIGN_TIME_CACHE_SECONDS", "300"))
+DEFAULT_MAX_ASSIGN_MINUTES = 15
+
+_max_assign_time_cache = TTLCache(maxsize=1, ttl=MAX_ASSIGN_TIME_CACHE_SECONDS)
+# Held while the cached dict is read or raised; raising it in place (not storing a new one) keeps the TTL running
+_max_assign_time_lock = Lock()
+
 
 def create_master_from_new_order(db: Session, new_order: NewOrder, max_time_to_assign_order: int = 15, toll_charge_update: bool = False, *, night_charges: int | None = None) -> Order:
     master = Order(
@@ -42,21 +57,12 @@ def create_master_from_new_order(db: Session, new_order: NewOrder, max_time_to_a
         night_charges=night_charges,
         vendor_fees_percent = vendor_commession_env
     )
-    print(new_order.pickup_drop_location)
     db.add(master)
     db.commit()
     db.refresh(master)
-    locations = new_order.pickup_drop_location
-
-    values = list(locations.values())
-
-    first_location = values[0]
-    last_location = values[-1]
-
-    print(first_location)
-    print(last_location)
+    note_order_assign_time(master)
     asyncio.ensure_future(
-        send_custom_sound_notification_vehicle_owner(db, f"New Booking - {new_order.trip_type.value} (ID: {master.id})", f"{new_order.pickup_drop_location['0']} -> {new_order.pickup_drop_location[str(len(new_order.pickup_drop_location)-1)]}",ordered_city = new_order.pick_near_city)
+        send_custom_sound_notification_vehicle_owner(db, f"New Booking - {new_order.trip_type.value} (ID: {master.id})", f"{master.origin_label} -> {master.destination_label}",ordered_city = new_order.pick_near_city)
     )
     return master
 
@@ -86,8 +92,9 @@ def create_master_from_hourly(db: Session, hourly: HourlyRental, *, pick_near_ci
     db.add(master)
     db.commit()
     db.refresh(master)
+    note_order_assign_time(master)
     asyncio.ensure_future(
-        send_custom_sound_notification_vehicle_owner(db, f"New Booking - Hourly Rental (ID: {master.id})", f"{hourly.pickup_drop_location['0']}",ordered_city = pick_near_city)
+        send_custom_sound_notification_vehicle_owner(db, f"New Booking - Hourly Rental (ID: {master.id})", f"{master.origin_label}",ordered_city = pick_near_city)
     )
     return master
 
@@ -203,9 +210,10 @@ def map_to_combined_schema(order, new_order=None, hourly_rental=None):
     return {**base_data, "source_data": source_data}
 
 
-def map_to_combined_schema_pending_orders(order, new_order=None, hourly_rental=None, db : Session = None):
+def map_to_combined_schema_pending_orders(order, new_order=None, hourly_rental=None, db : Session = None, order_assignment=None):
     # BaseOrderSchema fields
-    order_assignment = db.query(OrderAssignment).filter(OrderAssignment.order_id == order.id).first()
+    if db is not None:
+        order_assignment = db.query(OrderAssignment).filter(OrderAssignment.order_id == order.id).first()
     order_accept_status= (
             order_assignment is not None and 
             order_assignment.assignment_status in (AssignmentStatusEnum.PENDING, AssignmentStatusEnum.ASSIGNED)
@@ -275,25 +283,39 @@ def map_to_combined_schema_pending_orders(order, new_order=None, hourly_rental=N
 
     return {**base_data, "source_data": source_data}
 
-def get_vendor_orders(db: Session, vendor_id: str):
-    query = (
-        db.query(Order, NewOrder, HourlyRental)
+def _vendor_orders_select(vendor_id: str, pending_only: bool = False, archived: bool = False):
+    if archived:
+        order_model, new_order_model, hourly_model = ArchivedOrder, ArchivedNewOrder, ArchivedHourlyRental
+    else:
+        order_model, new_order_model, hourly_model = Order, NewOrder, HourlyRental
+    stmt = (
+        select(order_model, new_order_model, hourly_model)
         .outerjoin(
-            NewOrder,
-            (Order.source == OrderSourceEnum.NEW_ORDERS) &
-            (Order.source_order_id == NewOrder.order_id)
+            new_order_model,
+            (order_model.source == OrderSourceEnum.NEW_ORDERS) &
+            (order_model.source_order_id == new_order_model.order_id)
         )
         .outerjoin(
-            HourlyRental,
-            (Order.source == OrderSourceEnum.HOURLY_RENTAL) &
-            (Order.source_order_id == HourlyRental.id)
+            hourly_model,
+            (order_model.source == OrderSourceEnum.HOURLY_RENTAL) &
+            (order_model.source_order_id == hourly_model.id)
         )
-        .filter(Order.vendor_id == vendor_id)
-        .order_by(Order.created_at.desc())
+        .where(order_model.vendor_id == vendor_id)
     )
-    # print("Constructed Query:")
+    if pending_only:
+        stmt = stmt.where(order_model.trip_status == 'PENDING')
+    return stmt.order_by(order_model.created_at.desc())
 
-    results = query.all()
+
+def _newest_first(*row_lists):
+    # Hot and archived rows are each sorted by created_at desc; merge them into one listing
+    return list(heapq.merge(*row_lists, key=lambda row: row[0].created_at, reverse=True))
+
+
+def get_vendor_orders(db: Session, vendor_id: str, include_archived: bool = False):
+    results = db.execute(_vendor_orders_select(vendor_id)).all()
+    if include_archived:
+        results = _newest_first(results, db.execute(_vendor_orders_select(vendor_id, archived=True)).all())
 
     # map each row to CombinedOrderSchema dict
     combined_orders = [
@@ -303,25 +325,22 @@ def get_vendor_orders(db: Session, vendor_id: str):
 
     return combined_orders
 
-def get_vendor_pending_orders(db: Session, vendor_id: str):
-    query = (
-        db.query(Order, NewOrder, HourlyRental)
-        .outerjoin(
-            NewOrder,
-            (Order.source == OrderSourceEnum.NEW_ORDERS) &
-            (Order.source_order_id == NewOrder.order_id)
-        )
-        .outerjoin(
-            HourlyRental,
-            (Order.source == OrderSourceEnum.HOURLY_RENTAL) &
-            (Order.source_order_id == HourlyRental.id)
-        )
-        .filter(Order.vendor_id == vendor_id)
-        .filter(Order.trip_status == 'PENDING')
-        .order_by(Order.created_at.desc())
-    )
 
-    results = query.all()
+async def get_vendor_orders_async(db: AsyncSession, vendor_id: str, include_archived: bool = False):
+    """Async variant of get_vendor_orders for handlers running on the event loop."""
+    results = (await db.execute(_vendor_orders_select(vendor_id))).all()
+    if include_archived:
+        archived = (await db.execute(_vendor_orders_select(vendor_id, archived=True))).all()
+        results = _newest_first(results, archived)
+
+    return [
+        map_to_combined_schema(order, new_order, hourly_rental)
+        for order, new_order, hourly_rental in results
+    ]
+
+
+def get_vendor_pending_orders(db: Session, vendor_id: str):
+    results = db.execute(_vendor_orders_select(vendor_id, pending_only=True)).all()
 
     # map each row to CombinedOrderSchema dict
     combined_orders = [
@@ -332,63 +351,76 @@ def get_vendor_pending_orders(db: Session, vendor_id: str):
     return combined_orders
 
 
+async def get_vendor_pending_orders_async(db: AsyncSession, vendor_id: str):
+    """Async variant of get_vendor_pending_orders; loads assignments for the page in one query."""
+    results = (await db.execute(_vendor_orders_select(vendor_id, pending_only=True))).all()
+
+    order_ids = [order.id for order, _, _ in results]
+    assignments = {}
+    if order_ids:
+        rows = await db.execute(
+            select(OrderAssignment)
+            .where(OrderAssignment.order_id.in_(order_ids))
+            .order_by(OrderAssignment.id)
+        )
+        for assignment in rows.scalars():
+            assignments.setdefault(assignment.order_id, assignment)
+
+    return [
+        map_to_combined_schema_pending_orders(order, new_order, hourly_rental, order_assignment=assignments.get(order.id))
+        for order, new_order, hourly_rental in results
+    ]
+
+
+def _assign_minutes(window: timedelta) -> int:
+    return int(window.total_seconds() / 60) if window is not None else 0
+
+
+def _max_assign_minutes(db: Session) -> Dict[str, int]:
+    """Longest assignment window in whole minutes per trip type (0 when there are no orders), one GROUP BY"""
+    with _max_assign_time_lock:
+        minutes = _max_assign_time_cache.get("minutes")
+        if minutes is not None:
+            return dict(minutes)
+    rows = db.execute(
+        select(Order.trip_type, func.max(Order.max_time_to_assign_order - Order.created_at))
+        .group_by(Order.trip_type)
+    ).all()
+    minutes = {trip_type.value: _assign_minutes(window) for trip_type, window in rows}
+    with _max_assign_time_lock:
+        _max_assign_time_cache["minutes"] = minutes
+        return dict(minutes)
+
+
+def note_order_assign_time(order: Order) -> None:
+    """Raise the cached maximum for a newly created order instead of dropping the cache"""
+    if not (order.max_time_to_assign_order and order.created_at):
+        return
+    window = _assign_minutes(order.max_time_to_assign_order - order.created_at)
+    with _max_assign_time_lock:
+        minutes = _max_assign_time_cache.get("minutes")
+        if minutes is not None:
+            minutes[order.trip_type.value] = max(minutes.get(order.trip_type.value, 0), window)
+
+
 def get_max_time_to_assign_by_trip_type(db: Session) -> Dict[str, int]:
     """
     Get the maximum time to assign orders from existing orders for each trip type.
-    Returns the maximum time in minutes for oneway, roundtrip, multicity, and hourly rental.
+    Returns the maximum time in minutes for oneway, roundtrip, multicity, and hourly rental
+    (DEFAULT_MAX_ASSIGN_MINUTES for trip types without orders).
     """
     trip_types = [OrderTypeEnum.ONEWAY, OrderTypeEnum.ROUND_TRIP, OrderTypeEnum.MULTY_CITY, OrderTypeEnum.HOURLY_RENTAL]
-    max_times = {}
-    
-    for trip_type in trip_types:
-        # Get orders for this trip type
-        orders = db.query(Order).filter(Order.trip_type == trip_type).all()
-        
-        if not orders:
-            # If no orders exist for this trip type, use default 15 minutes
-            max_times[trip_type.value] = 15
-            continue
-            
-        # Calculate the time difference between created_at and max_time_to_assign_order
-        max_time_minutes = 0
-        for order in orders:
-            if order.max_time_to_assign_order and order.created_at:
-                time_diff = (order.max_time_to_assign_order - order.created_at).total_seconds() / 60
-                max_time_minutes = max(max_time_minutes, int(time_diff))
-        
-        # If no valid time differences found, use default 15 minutes
-        if max_time_minutes == 0:
-            max_time_minutes = 15
-            
-        max_times[trip_type.value] = max_time_minutes
-    
-    return max_times
+    minutes = _max_assign_minutes(db)
+    return {trip_type.value: get_max_time_for_trip_type(db, trip_type, minutes) for trip_type in trip_types}
 
 
-def get_max_time_for_trip_type(db: Session, trip_type: OrderTypeEnum) -> int:
+def get_max_time_for_trip_type(db: Session, trip_type: OrderTypeEnum, minutes: Optional[Dict[str, int]] = None) -> int:
     """
     Get the maximum time to assign orders for a specific trip type.
     Returns the maximum time in minutes.
     """
-    # Get orders for this trip type
-    orders = db.query(Order).filter(Order.trip_type == trip_type).all()
-    
-    if not orders:
-        # If no orders exist for this trip type, use default 15 minutes
-        return 15
-        
-    # Calculate the time difference between created_at and max_time_to_assign_order
-    max_time_minutes = 0
-    for order in orders:
-        if order.max_time_to_assign_order and order.created_at:
-            time_diff = (order.max_time_to_assign_order - order.created_at).total_seconds() / 60
-            max_time_minutes = max(max_time_minutes, int(time_diff))
-    
-    # If no valid time differences found, use default 15 minutes
-    if max_time_minutes == 0:
-        max_time_minutes = 15
-        
-    return max_time_minutes
+    max_time_minutes = (minutes if minutes is not None else _max_assign_minutes(db)).get(trip_type.value, 0)
+    return max_time_minutes if max_time_minutes > 0 else DEFAULT_MAX_ASSIGN_MINUTES
 
 
 def close_order(
@@ -0,0 +1,95 @@
+# crud/razorpay_webhooks.py
+"""
+Razorpay webhook queue.
+
+The webhook endpoint (POST /api/wallet/razorpay/webhook) only verifies the signature and stores the
+delivery (enqueue_webhook_event); Razorpay retries until it gets a 2xx, so the endpoint stays fast and a
+replayed delivery is a no-op (unique event_id). process_webhook_events applies the pending events:
+payment.captured / order.paid credit the owner's wallet through capture_rp_payment, the same idempotent
+path as /wallet/razorpay/verify, so a payment seen by both is credited once.
+
+Events are claimed with FOR UPDATE SKIP LOCKED, so several workers (app instances) can drain the queue
+side by side. Each event is applied in a savepoint: a failing event is retried on a later run and marked
+FAILED after RAZORPAY_WEBHOOK_MAX_ATTEMPTS, without undoing the rest of the batch.
+Runs every RAZORPAY_WEBHOOK_POLL_SECONDS from app/main.py.
+"""
+import hashlib
+import os
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.crud.wallet import capture_rp_payment
+from app.models.razorpay_transactions import RazorpayWebhookEvent, RazorpayWebhookStatusEnum
+
+RAZORPAY_WEBHOOK_POLL_SECONDS = float(os.getenv("RAZORPAY_WEBHOOK_POLL_SECONDS", "5"))
+RAZORPAY_WEBHOOK_BATCH_SIZE = int(os.getenv("RAZORPAY_WEBHOOK_BATCH_SIZE", "100"))
+RAZORPAY_WEBHOOK_MAX_ATTEMPTS = int(os.getenv("RAZORPAY_WEBHOOK_MAX_ATTEMPTS", "5"))
+
+PAYMENT_EVENTS = ("payment.captured", "order.paid")
+
+
+def webhook_event_id(event_id_header: Optional[str], body: bytes) -> str:
+    """X-Razorpay-Event-Id, or a digest of the body for deliveries without it"""
+    return event_id_header or f"sha256:{hashlib.sha256(body).hexdigest()}"
+
+
+def enqueue_webhook_event(db: Session, event_id: str, payload: Dict[str, Any]) -> bool:
+    """Store a verified delivery. Returns False when the event was already received."""
+    inserted = db.execute(
+        pg_insert(RazorpayWebhookEvent)
+        .values(event_id=event_id, event=payload.get("event") or "", payload=payload,
+                status=RazorpayWebhookStatusEnum.PENDING, attempts=0)
+        .on_conflict_do_nothing(index_elements=[RazorpayWebhookEvent.event_id])
+        .returning(RazorpayWebhookEvent.id)
+    ).first()
+    return inserted is not None
+
+
+def _apply_event(db: Session, event: RazorpayWebhookEvent) -> RazorpayWebhookStatusEnum:
+    if event.event not in PAYMENT_EVENTS:
+        return RazorpayWebhookStatusEnum.IGNORED
+    payment = ((event.payload.get("payload") or {}).get("payment") or {}).get("entity") or {}
+    if not payment.get("id") or not payment.get("order_id"):
+        raise ValueError("payment entity without id / order_id")
+    txn = capture_rp_payment(db, payment["order_id"], payment["id"])
+    # Orders created elsewhere (another app on the same Razorpay account) are not ours to credit
+    return RazorpayWebhookStatusEnum.PROCESSED if txn is not None else RazorpayWebhookStatusEnum.IGNORED
+
+
+def process_webhook_events(db: Session, batch_size: int = RAZORPAY_WEBHOOK_BATCH_SIZE) -> int:
+    """Apply one batch of pending events and commit. Returns how many events were claimed."""
+    events = db.execute(
+        select(RazorpayWebhookEvent)
+        .where(RazorpayWebhookEvent.status == RazorpayWebhookStatusEnum.PENDING)
+        .order_by(RazorpayWebhookEvent.received_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+    for event in events:
+        event.attempts += 1
+        try:
+            with db.begin_nested():
+                event.status = _apply_event(db, event)
+            event.processed_at = func.now()
+            event.last_error = None
+        except Exception as e:
+            print(f"Failed to apply Razorpay webhook event {event.event_id}: {e}")
+            event.last_error = str(e)
+            if event.attempts >= RAZORPAY_WEBHOOK_MAX_ATTEMPTS:
+                event.status = RazorpayWebhookStatusEnum.FAILED
+    db.commit()
+    return len(events)
+
+
+def drain_webhook_events(db: Session, batch_size: int = RAZORPAY_WEBHOOK_BATCH_SIZE) -> int:
+    """process_webhook_events until no full batch is left. Returns the number of events claimed."""
+    total = 0
+    while True:
+        claimed = process_webhook_events(db, batch_size)
+        total += claimed
+        if claimed < batch_size:
+            return total
@@ -0,0 +1,222 @@
+"""
+Balance reconciliation: compare the stored wallet balances with their ledgers.
+
+For every account of a wallet (vehicle owner, vendor, admin) the expected balance is recomputed in SQL
+from the ledger: the first entry's balance_before (the balance when the ledger started) plus the running
+sum of the signed amounts in created_at order. Vendor wallets also include approved transfer
+transactions as debits; the admin balance includes its shards (app/crud/admin_wallet.py).
+An account is reported when
+- the stored balance differs from the expected one, or
+- the ledger itself drifted: an entry's balance_after is not the running balance at that entry
+  (first_drift_at; not checked for the admin, whose sharded credits record snapshot balances), or
+- it holds a balance but has no ledger history (expected is None): there is nothing to recompute
+  the balance from, so these are only reported, never fixed
+
+Accounts are processed in batches of RECONCILE_BATCH_SIZE in primary key order, one short transaction
+per batch. Reads take no row locks; with fix=True the balance is moved by the difference
+(balance = balance + expected - stored), so changes committed since the batch was read are kept.
+After each batch the position is saved in reconciliation_checkpoints, and an interrupted run
+continues from there. A pass limited to some accounts (principal_ids) leaves the checkpoint alone.
+
+Runs daily from app/main.py (report only) when RECONCILE_ENABLED=true, or by hand with
+`python "Testing code/run_reconciliation.py" [--fix]`.
+"""
+import os
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.models.reconciliation import ReconciliationCheckpoint
+
+RECONCILE_ENABLED = os.getenv("RECONCILE_ENABLED", "false").lower() == "true"
+RECONCILE_BATCH_SIZE = int(os.getenv("RECONCILE_BATCH_SIZE", "500"))
+RECONCILE_LOCK_TIMEOUT_MS = int(os.getenv("RECONCILE_LOCK_TIMEOUT_MS", "2000"))
+
+
+class WalletSpec(NamedTuple):
+    table: str            # table holding the stored balance, aliased b
+    key: str              # account id column of that table
+    balance_column: str
+    stored: str           # stored balance expression
+    entries: str          # (principal_id, created_at, id, signed, balance_before, balance_after) of the batch's accounts
+    chained: bool         # whether balance_after of consecutive entries must follow the running sum
+
+
+WALLETS: Dict[str, WalletSpec] = {
+    "owner": WalletSpec(
+        "vehicle_owner_details", "vehicle_owner_id", "wallet_balance", "b.wallet_balance",
+        """
+        SELECT vehicle_owner_id, created_at, id, CASE WHEN entry_type = 'CREDIT' THEN amount ELSE -amount END,
+               balance_before, balance_after
+        FROM wallet_ledger WHERE vehicle_owner_id IN (SELECT principal_id FROM batch)
+        """,
+        True,
+    ),
+    "vendor": WalletSpec(
+        "vendor_details", "vendor_id", "wallet_balance", "b.wallet_balance",
+        """
+        SELECT vendor_id, created_at, id, CASE WHEN entry_type = 'CREDIT' THEN amount ELSE -amount END,
+               balance_before, balance_after
+        FROM vendor_wallet_ledger WHERE vendor_id IN (SELECT principal_id FROM batch)
+        UNION ALL
+        SELECT vendor_id, updated_at, id, -requested_amount, wallet_balance_before, wallet_balance_after
+        FROM transfer_transactions WHERE status = 'APPROVED' AND vendor_id IN (SELECT principal_id FROM batch)
+        """,
+        True,
+    ),
+    "admin": WalletSpec(
+        "admin", "id", "balance",
+        "b.balance + COALESCE((SELECT sum(s.balance) FROM admin_wallet_shards s WHERE s.admin_id = b.id), 0)",
+        """
+        SELECT admin_id, created_at, id, CASE WHEN entry_type = 'CREDIT' THEN amount ELSE -amount END,
+               balance_before, balance_after
+        FROM admin_wallet_ledger WHERE admin_id IN (SELECT principal_id FROM batch)
+        """,
+        False,
+    ),
+}
+
+
+class Mismatch(NamedTuple):
+    wallet: str
+    principal_id: str
+    stored: int
+    expected: Optional[int]  # None: no ledger history
+    entries: int
+    first_drift_at: Optional[datetime]
+
+
+def _batch_sql(spec: WalletSpec, resume: bool, scoped: bool = False) -> str:
+    # Entries with the same created_at were written by one transaction (now() is the transaction start):
+    # they are one step of the running sum (window peers), and one of them must end on the running balance
+    drift = "min(created_at) FILTER (WHERE NOT on_balance)" if spec.chained else "NULL::timestamptz"
+    return f"""
+        WITH batch AS (
+            SELECT b.{spec.key} AS principal_id, {spec.stored} AS stored
+            FROM {spec.table} b
+            WHERE {f"b.{spec.key} > :after" if resume else "true"}
+            {f"AND b.{spec.key} = ANY(CAST(:principal_ids AS uuid[]))" if scoped else ""}
+            ORDER BY b.{spec.key}
+            LIMIT :batch_size
+        ),
+        entries(principal_id, created_at, id, signed, balance_before, balance_after) AS ({spec.entries}),
+        running AS (
+            SELECT principal_id, created_at, balance_after,
+                   first_value(balance_before) OVER (PARTITION BY principal_id ORDER BY created_at, id)
+                   + sum(signed) OVER (PARTITION BY principal_id ORDER BY created_at) AS running
+            FROM entries
+        ),
+        steps AS (
+            SELECT principal_id, created_at, count(*) AS entries, min(running) AS running,
+                   bool_or(balance_after = running) AS on_balance
+            FROM running
+            GROUP BY principal_id, created_at
+        ),
+        expected AS (
+            SELECT principal_id, sum(entries) AS entries,
+                   (array_agg(running ORDER BY created_at DESC))[1] AS expected,
+                   {drift} AS first_drift_at
+            FROM steps
+            GROUP BY principal_id
+        )
+        SELECT batch.principal_id, batch.stored, expected.expected,
+               COALESCE(expected.entries, 0) AS entries, expected.first_drift_at
+        FROM batch LEFT JOIN expected USING (principal_id)
+        ORDER BY batch.principal_id
+    """
+
+
+def _checkpoint(db: Session, wallet: str, restart: bool) -> ReconciliationCheckpoint:
+    checkpoint = db.get(ReconciliationCheckpoint, wallet)
+    if checkpoint is None:
+        checkpoint = ReconciliationCheckpoint(wallet=wallet)
+        db.add(checkpoint)
+    elif restart or checkpoint.finished_at is not None or checkpoint.last_principal_id is None:
+        checkpoint.started_at = func.now()
+    else:
+        print(f"Resuming {wallet} reconciliation after {checkpoint.last_principal_id}")
+        return checkpoint
+    checkpoint.last_principal_id = None
+    checkpoint.checked = checkpoint.mismatched = checkpoint.fixed = 0
+    checkpoint.finished_at = None
+    db.commit()
+    return checkpoint
+
+
+def reconcile_wallet(
+    db: Session,
+    wallet: str,
+    fix: bool = False,
+    batch_size: int = RECONCILE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    restart: bool = False,
+    principal_ids: Optional[List[str]] = None,
+) -> List[Mismatch]:
+    """
+    Check (and with fix=True correct) the accounts of one wallet, continuing from its checkpoint.
+    Returns the mismatches found by this call; the totals of the pass are on the checkpoint row.
+    With principal_ids only those accounts are checked, in one pass that does not use the checkpoint.
+    """
+    if wallet not in WALLETS:
+        raise ValueError(f"{wallet} is not one of {list(WALLETS)}")
+    spec = WALLETS[wallet]
+    if principal_ids is None:
+        checkpoint = _checkpoint(db, wallet, restart)
+    else:
+        checkpoint = ReconciliationCheckpoint(wallet=wallet, checked=0, mismatched=0, fixed=0)  # never added
+        principal_ids = [str(principal_id) for principal_id in principal_ids]
+    found: List[Mismatch] = []
+
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        after = checkpoint.last_principal_id
+        rows = db.execute(
+            text(_batch_sql(spec, resume=after is not None, scoped=principal_ids is not None)),
+            {"after": after, "batch_size": batch_size, "principal_ids": principal_ids},
+        ).all()
+        mismatches = [
+            Mismatch(wallet, str(row.principal_id), row.stored, row.expected, row.entries, row.first_drift_at)
+            for row in rows
+            # No ledger and no balance is an account that was never used
+            if row.stored != (row.expected or 0) or row.first_drift_at is not None
+        ]
+        for mismatch in mismatches:
+            if mismatch.expected is None:
+                print(f"Balance without ledger history {mismatch}")
+            else:
+                print(f"Balance mismatch {mismatch}")
+
+        corrections = [
+            {"principal_id": m.principal_id, "delta": m.expected - m.stored}
+            for m in mismatches
+            if m.expected is not None and m.stored != m.expected
+        ]
+        if fix and corrections:
+            # Wait briefly for an account that is being changed; the batch is retried on the next run otherwise
+            db.execute(text(f"SET LOCAL lock_timeout = {RECONCILE_LOCK_TIMEOUT_MS}"))
+            db.execute(
+                text(f"UPDATE {spec.table} SET {spec.balance_column} = {spec.balance_column} + :delta WHERE {spec.key} = :principal_id"),
+                corrections,
+            )
+            checkpoint.fixed += len(corrections)
+
+        checkpoint.checked += len(rows)
+        checkpoint.mismatched += len(mismatches)
+        if rows:
+            checkpoint.last_principal_id = rows[-1].principal_id
+        if len(rows) < batch_size:
+            checkpoint.last_principal_id = None
+            checkpoint.finished_at = func.now()
+        db.commit()
+
+        found += mismatches
+        batches += 1
+        if checkpoint.finished_at is not None:
+            break
+    return found
+
+
+def reconcile_all(db: Session, fix: bool = False, batch_size: int = RECONCILE_BATCH_SIZE) -> Dict[str, List[Mismatch]]:
+    return {wallet: reconcile_wallet(db, wallet, fix=fix, batch_size=batch_size) for wallet in WALLETS}
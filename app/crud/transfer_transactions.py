@@ -1,13 +1,34 @@
 # crud/transfer_transactions.py
+import os
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, update, bindparam
 from fastapi import HTTPException, status
+from cachetools import TTLCache
+from threading import Lock
 from app.models.transfer_transactions import TransferTransactions, TransferStatusEnum
 from app.models.vendor_details import VendorDetails
-from app.schemas.transfer_transactions import TransferRequest, AdminTransferAction
+from app.schemas.transfer_transactions import TransferRequest, AdminTransferAction, BulkTransferItem
 from typing import List, Optional
 import uuid
 
+# The vendor dashboard loads the transfer statistics on every open; the transfer counts and total are cached
+# per vendor for this long (balances are always read fresh). The cache is per worker process: a transfer drops
+# the entry only in the worker that handled it, so the other workers can show the old counts for up to the TTL
+TRANSFER_STATS_CACHE_SECONDS = int(os.getenv("TRANSFER_STATS_CACHE_SECONDS", "30"))
+TRANSFER_STATS_CACHE_SIZE = int(os.getenv("TRANSFER_STATS_CACHE_SIZE", "10000"))
+
+# Most transfer requests one bulk call may process (month-end payout runs)
+TRANSFER_BULK_MAX_ITEMS = int(os.getenv("TRANSFER_BULK_MAX_ITEMS", "1000"))
+
+_transfer_stats_cache = TTLCache(maxsize=TRANSFER_STATS_CACHE_SIZE, ttl=TRANSFER_STATS_CACHE_SECONDS)
+_transfer_stats_lock = Lock()
+
+
+def invalidate_transfer_statistics(vendor_id) -> None:
+    with _transfer_stats_lock:
+        _transfer_stats_cache.pop(str(vendor_id), None)
+
+
 def create_transfer_request(db: Session, vendor_id: str, transfer_data: TransferRequest):
     """
     Create a new transfer request from wallet to bank
@@ -42,6 +63,7 @@ def create_transfer_request(db: Session, vendor_id: str, transfer_data: Transfer
     try:
         db.add(transfer_transaction)
         db.commit()
+        invalidate_transfer_statistics(vendor_id)
         db.refresh(transfer_transaction)
         return transfer_transaction
     except Exception as e:
@@ -104,6 +126,19 @@ def get_all_pending_transfers(db: Session, skip: int = 0, limit: int = 100):
     
     return transactions, total_count
 
+def _move_vendor_wallet_to_bank(db: Session, vendor_id, amount: int):
+    """
+    UPDATE vendor_details SET wallet_balance = wallet_balance - :amount, bank_balance = bank_balance + :amount
+    WHERE vendor_id = :id AND wallet_balance >= :amount RETURNING the new balances (None when not covered).
+    """
+    return db.execute(
+        update(VendorDetails)
+        .where(VendorDetails.vendor_id == vendor_id, VendorDetails.wallet_balance >= amount)
+        .values(wallet_balance=VendorDetails.wallet_balance - amount, bank_balance=VendorDetails.bank_balance + amount)
+        .returning(VendorDetails.wallet_balance, VendorDetails.bank_balance)
+    ).first()
+
+
 def process_transfer_request(db: Session, transaction_id: str, admin_action: AdminTransferAction):
     """
     Process transfer request (approve or reject) by admin
@@ -136,29 +171,42 @@ def process_transfer_request(db: Session, transaction_id: str, admin_action: Adm
     
     try:
         if admin_action.action == "approve":
-            # Check if vendor still has sufficient balance
-            if vendor_details.wallet_balance < transfer_transaction.requested_amount:
+            # Move the amount from wallet to bank in one statement: the UPDATE's row lock serialises it with
+            # concurrent credits (app/crud/vendor_wallet.py), and it only applies while the wallet covers it
+            balances = _move_vendor_wallet_to_bank(db, transfer_transaction.vendor_id, transfer_transaction.requested_amount)
+            if balances is None:
+                db.rollback()
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Insufficient wallet balance for transfer"
                 )
-            
-            # Update vendor balances
-            vendor_details.wallet_balance -= transfer_transaction.requested_amount
-            vendor_details.bank_balance += transfer_transaction.requested_amount
-            
-            # Update transaction
-            transfer_transaction.status = TransferStatusEnum.APPROVED
-            transfer_transaction.wallet_balance_after = vendor_details.wallet_balance
-            transfer_transaction.bank_balance_after = vendor_details.bank_balance
-            transfer_transaction.admin_notes = admin_action.notes
-            
-        elif admin_action.action == "reject":
+            values = {
+                "status": TransferStatusEnum.APPROVED,
+                "wallet_balance_after": balances.wallet_balance,
+                "bank_balance_after": balances.bank_balance,
+            }
+        else:
             # Update transaction status only
-            transfer_transaction.status = TransferStatusEnum.REJECTED
-            transfer_transaction.admin_notes = admin_action.notes
+            values = {"status": TransferStatusEnum.REJECTED}
+
+        # The approved transfer is the ledger entry of the wallet debit (vendor history, reconciliation).
+        # Only a still pending request is updated, so a concurrent approval cannot move the money twice
+        processed = db.execute(
+            update(TransferTransactions)
+            .where(TransferTransactions.id == transfer_transaction.id, TransferTransactions.status == TransferStatusEnum.PENDING)
+            .values(admin_notes=admin_action.notes, **values)
+            .returning(TransferTransactions.id)
+        ).first()
+        if processed is None:
+            db.rollback()
+            db.refresh(transfer_transaction)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Transfer request is already {transfer_transaction.status.value}"
+            )
         
         db.commit()
+        invalidate_transfer_statistics(transfer_transaction.vendor_id)
         db.refresh(transfer_transaction)
         db.refresh(vendor_details)
         
@@ -173,6 +221,127 @@ def process_transfer_request(db: Session, transaction_id: str, admin_action: Adm
             detail=f"Failed to process transfer request: {str(e)}"
         )
 
+def _bulk_item_result(item: BulkTransferItem, detail: Optional[str] = None, **values) -> dict:
+    result = {"transaction_id": item.transaction_id, "action": item.action, "success": detail is None, "detail": detail,
+              "status": None, "vendor_id": None, "wallet_balance_after": None, "bank_balance_after": None}
+    result.update(values)
+    return result
+
+
+def process_transfer_requests(db: Session, items: List[BulkTransferItem]) -> List[dict]:
+    """
+    Approve or reject many transfer requests in one transaction.
+
+    The vendor_details rows of all affected vendors are locked first, ordered by vendor_id (two overlapping
+    batches wait for each other instead of deadlocking), then the transfers. Items are applied in request
+    order against the locked balances; an item that cannot be applied (unknown, already processed,
+    insufficient balance, repeated in the request) is reported and skipped without failing the others.
+    All transfer and balance updates are written with one executemany each and committed once.
+
+    Returns one result per item, in request order.
+    """
+    if len(items) > TRANSFER_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {TRANSFER_BULK_MAX_ITEMS} transfer requests can be processed at once"
+        )
+
+    transaction_ids = list({item.transaction_id for item in items})
+    vendors = db.execute(
+        select(VendorDetails.id, VendorDetails.vendor_id, VendorDetails.wallet_balance, VendorDetails.bank_balance)
+        .where(VendorDetails.vendor_id.in_(
+            select(TransferTransactions.vendor_id).where(TransferTransactions.id.in_(transaction_ids))
+        ))
+        .order_by(VendorDetails.vendor_id)
+        .with_for_update(of=VendorDetails)
+    ).all()
+    balances = {row.vendor_id: {"id": row.id, "wallet_balance": row.wallet_balance, "bank_balance": row.bank_balance} for row in vendors}
+    transfers = {
+        row.id: row for row in db.execute(
+            select(TransferTransactions.id, TransferTransactions.vendor_id, TransferTransactions.requested_amount, TransferTransactions.status)
+            .where(TransferTransactions.id.in_(transaction_ids))
+            .order_by(TransferTransactions.id)
+            .with_for_update()
+        )
+    }
+
+    results, transfer_updates, seen = [], [], set()
+    for item in items:
+        transfer = transfers.get(item.transaction_id)
+        if item.transaction_id in seen:
+            results.append(_bulk_item_result(item, "Transfer request appears more than once in this batch"))
+            continue
+        seen.add(item.transaction_id)
+        if transfer is None:
+            results.append(_bulk_item_result(item, "Transfer transaction not found"))
+            continue
+        if transfer.status != TransferStatusEnum.PENDING:
+            results.append(_bulk_item_result(item, f"Transfer request is already {transfer.status.value}", vendor_id=transfer.vendor_id))
+            continue
+        balance = balances.get(transfer.vendor_id)
+        if balance is None:
+            results.append(_bulk_item_result(item, "Vendor not found", vendor_id=transfer.vendor_id))
+            continue
+
+        if item.action == "approve":
+            if balance["wallet_balance"] < transfer.requested_amount:
+                results.append(_bulk_item_result(item, "Insufficient wallet balance for transfer", vendor_id=transfer.vendor_id))
+                continue
+            balance["wallet_balance"] -= transfer.requested_amount
+            balance["bank_balance"] += transfer.requested_amount
+            balance["changed"] = True
+            new_status, wallet_after, bank_after = TransferStatusEnum.APPROVED, balance["wallet_balance"], balance["bank_balance"]
+        else:
+            new_status, wallet_after, bank_after = TransferStatusEnum.REJECTED, None, None
+
+        transfer_updates.append({
+            "b_id": transfer.id, "b_status": new_status, "b_notes": item.notes,
+            "b_wallet_after": wallet_after, "b_bank_after": bank_after,
+        })
+        results.append(_bulk_item_result(
+            item, status=new_status.value, vendor_id=transfer.vendor_id,
+            wallet_balance_after=wallet_after, bank_balance_after=bank_after,
+        ))
+
+    vendor_updates = [
+        {"b_id": balance["id"], "b_wallet": balance["wallet_balance"], "b_bank": balance["bank_balance"]}
+        for balance in balances.values() if balance.get("changed")
+    ]
+    try:
+        if transfer_updates:
+            table = TransferTransactions.__table__
+            db.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(
+                    status=bindparam("b_status", type_=table.c.status.type),
+                    admin_notes=bindparam("b_notes"),
+                    wallet_balance_after=bindparam("b_wallet_after"),
+                    bank_balance_after=bindparam("b_bank_after"),
+                    updated_at=func.now(),
+                ),
+                transfer_updates,
+            )
+        if vendor_updates:
+            table = VendorDetails.__table__
+            db.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(wallet_balance=bindparam("b_wallet"), bank_balance=bindparam("b_bank")),
+                vendor_updates,
+            )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process transfer requests: {str(e)}"
+        )
+
+    for vendor_id in balances:
+        invalidate_transfer_statistics(vendor_id)
+    return results
+
 def get_vendor_balance(db: Session, vendor_id: str):
     """
     Get current wallet and bank balance for a vendor
@@ -191,40 +360,63 @@ def get_vendor_balance(db: Session, vendor_id: str):
 
 def get_transfer_statistics(db: Session, vendor_id: str):
     """
-    Get transfer statistics for a vendor
+    Get transfer statistics and current balances for a vendor, in one query:
+    the vendor's transfers are aggregated with FILTER clauses next to its vendor_details row.
+    The transfer figures are cached for TRANSFER_STATS_CACHE_SECONDS (see invalidate_transfer_statistics);
+    on a cache hit only the balances are read.
     """
-    # Convert vendor_id to string if it's a UUID
     vendor_id_str = str(vendor_id)
-    
-    # Get total approved transfers
-    total_approved = db.query(TransferTransactions).filter(
-        TransferTransactions.vendor_id == vendor_id_str,
-        TransferTransactions.status == TransferStatusEnum.APPROVED
-    ).count()
-    
-    # Get total rejected transfers
-    total_rejected = db.query(TransferTransactions).filter(
-        TransferTransactions.vendor_id == vendor_id_str,
-        TransferTransactions.status == TransferStatusEnum.REJECTED
-    ).count()
-    
-    # Get total pending transfers
-    total_pending = db.query(TransferTransactions).filter(
-        TransferTransactions.vendor_id == vendor_id_str,
-        TransferTransactions.status == TransferStatusEnum.PENDING
-    ).count()
-    
-    # Get total amount transferred
-    total_transferred = db.query(TransferTransactions).filter(
-        TransferTransactions.vendor_id == vendor_id_str,
-        TransferTransactions.status == TransferStatusEnum.APPROVED
-    ).with_entities(
-        func.sum(TransferTransactions.requested_amount)
-    ).scalar() or 0
-    
+    with _transfer_stats_lock:
+        cached = _transfer_stats_cache.get(vendor_id_str)
+    if cached is not None:
+        balances = db.execute(
+            select(VendorDetails.wallet_balance, VendorDetails.bank_balance).where(VendorDetails.vendor_id == vendor_id_str)
+        ).first()
+        if balances is None:
+            invalidate_transfer_statistics(vendor_id_str)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vendor not found"
+            )
+        return _with_balances(cached, balances.wallet_balance, balances.bank_balance)
+
+    approved = TransferTransactions.status == TransferStatusEnum.APPROVED
+    row = db.execute(
+        select(
+            VendorDetails.wallet_balance,
+            VendorDetails.bank_balance,
+            func.count().filter(approved).label("total_approved"),
+            func.count().filter(TransferTransactions.status == TransferStatusEnum.REJECTED).label("total_rejected"),
+            func.count().filter(TransferTransactions.status == TransferStatusEnum.PENDING).label("total_pending"),
+            func.coalesce(func.sum(TransferTransactions.requested_amount).filter(approved), 0).label("total_transferred"),
+        )
+        .select_from(VendorDetails)
+        .outerjoin(TransferTransactions, TransferTransactions.vendor_id == VendorDetails.vendor_id)
+        .where(VendorDetails.vendor_id == vendor_id_str)
+        .group_by(VendorDetails.id)
+    ).first()
+
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Vendor not found"
+        )
+
+    statistics = {
+        "total_approved": row.total_approved,
+        "total_rejected": row.total_rejected,
+        "total_pending": row.total_pending,
+        "total_transferred": row.total_transferred,
+    }
+    with _transfer_stats_lock:
+        _transfer_stats_cache[vendor_id_str] = statistics
+    return _with_balances(statistics, row.wallet_balance, row.bank_balance)
+
+
+def _with_balances(statistics: dict, wallet_balance: int, bank_balance: int) -> dict:
     return {
-        "total_approved": total_approved,
-        "total_rejected": total_rejected,
-        "total_pending": total_pending,
-        "total_transferred": total_transferred
+        **statistics,
+        "wallet_balance": wallet_balance,
+        "bank_balance": bank_balance,
+        "total_balance": wallet_balance + bank_balance,
     }
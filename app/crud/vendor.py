@@ -5,6 +5,7 @@ from app.models.vendor_details import VendorDetails
 from app.schemas.vendor import VendorSignupForm
 from app.core.security import get_password_hash, verify_password
 from app.utils.gcs import upload_image_to_gcs, delete_gcs_file_by_url
+from app.utils.images import InvalidImageError
 from fastapi import UploadFile
 import uuid
 
@@ -83,6 +84,9 @@ def create_vendor(db: Session, vendor_data: VendorSignupForm, aadhar_image: Uplo
         
         return vendor_credentials, vendor_details
         
+    except InvalidImageError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         # Rollback database changes
         db.rollback()
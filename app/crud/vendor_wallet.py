@@ -1,9 +1,13 @@
-from typing import Optional, Tuple
+from datetime import datetime
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update, insert, literal, null, cast, String, union_all
+import uuid
 
 from app.models.vendor_details import VendorDetails
 from app.models.vendor_wallet_ledger import VendorWalletLedger, VendorLedgerEntryType
+from app.models.transfer_transactions import TransferTransactions, TransferStatusEnum
+from app.crud.wallet import ledger_page_conditions
 
 
 def get_vendor_wallet_balance(db: Session, vendor_id: str) -> int:
@@ -45,6 +49,43 @@ def append_vendor_ledger_entry(
     return entry
 
 
+def _apply_vendor_wallet_change(
+    db: Session,
+    *,
+    vendor_id: str,
+    order_id: Optional[int],
+    entry_type: VendorLedgerEntryType,
+    amount: int,
+    notes: Optional[str],
+) -> Optional[VendorWalletLedger]:
+    """
+    UPDATE vendor_details ... RETURNING wallet_balance and INSERT the ledger entry from it in one statement,
+    see _apply_wallet_change in app/crud/wallet.py. Returns None when no row was updated.
+    """
+    delta = amount if entry_type == VendorLedgerEntryType.CREDIT else -amount
+    changed = (
+        update(VendorDetails)
+        .where(VendorDetails.vendor_id == vendor_id)
+        .values(wallet_balance=VendorDetails.wallet_balance + delta)
+    )
+    if entry_type == VendorLedgerEntryType.DEBIT:
+        changed = changed.where(VendorDetails.wallet_balance >= amount)
+    changed = changed.returning(VendorDetails.vendor_id, VendorDetails.wallet_balance).cte("changed")
+
+    rows = select(
+        literal(uuid.uuid4(), VendorWalletLedger.id.type),
+        changed.c.vendor_id,
+        literal(order_id, VendorWalletLedger.order_id.type),
+        literal(entry_type, VendorWalletLedger.entry_type.type),
+        literal(amount, VendorWalletLedger.amount.type),
+        changed.c.wallet_balance - delta,
+        changed.c.wallet_balance,
+        literal(notes, VendorWalletLedger.notes.type),
+    )
+    columns = ["id", "vendor_id", "order_id", "entry_type", "amount", "balance_before", "balance_after", "notes"]
+    return db.execute(insert(VendorWalletLedger).from_select(columns, rows).returning(VendorWalletLedger)).scalar_one_or_none()
+
+
 def credit_vendor_wallet(
     db: Session,
     *,
@@ -59,42 +100,31 @@ def credit_vendor_wallet(
     if amount <= 0:
         raise ValueError("Amount must be positive")
     
-    before = get_vendor_wallet_balance(db, vendor_id)
-    
+    deduct_admin_profit = bool(deduct_admin_profit and admin_profit and admin_profit > 0)
+    if deduct_admin_profit:
+        notes = notes or f"Trip {order_id} vendor profit"
+
+    entry = _apply_vendor_wallet_change(
+        db,
+        vendor_id=vendor_id,
+        order_id=order_id,
+        entry_type=VendorLedgerEntryType.CREDIT,
+        amount=amount,
+        notes=notes,
+    )
+    if entry is None:
+        get_vendor_wallet_balance(db, vendor_id)  # raises NoResultFound for an unknown vendor, as before
+    after = entry.balance_after
+
+    from app.crud.transfer_transactions import invalidate_transfer_statistics
+    invalidate_transfer_statistics(vendor_id)
+
     # If admin profit needs to be deducted
-    if deduct_admin_profit and admin_profit and admin_profit > 0:
-        # First credit the full amount to vendor
-        after = before + amount
-        set_vendor_wallet_balance(db, vendor_id, after)
-        
-        # Then debit admin_profit from vendor
+    if deduct_admin_profit:
+        # The full amount stays credited to the vendor; admin_profit is credited to the admin
+        # and left out of the returned balance (no vendor debit entry is written for it)
         final_after = after - admin_profit
-        # set_vendor_wallet_balance(db, vendor_id, final_after)
-        
-        # Create ledger entry for credit of full amount
-        credit_entry = append_vendor_ledger_entry(
-            db,
-            vendor_id=vendor_id,
-            order_id=order_id,
-            entry_type=VendorLedgerEntryType.CREDIT,
-            amount=amount,
-            balance_before=before,
-            balance_after=after,
-            notes=notes or f"Trip {order_id} vendor profit",
-        )
-        
-        # Create ledger entry for admin profit debit
-        # debit_entry = append_vendor_ledger_entry(
-        #     db,
-        #     vendor_id=vendor_id,
-        #     order_id=order_id,
-        #     entry_type=VendorLedgerEntryType.DEBIT,
-        #     amount=admin_profit,
-        #     balance_before=after,
-        #     balance_after=final_after,
-        #     notes=f"Admin profit deduction for order {order_id}",
-        # )
-        
+
         # Credit admin wallet with admin profit
         if admin_id:
             from app.crud.admin_wallet import credit_admin_wallet
@@ -105,23 +135,10 @@ def credit_vendor_wallet(
                 order_id=order_id,
                 notes=f"Admin profit from order {order_id}"
             )
-        
-        return final_after, credit_entry
-    else:
-        # Normal credit without admin profit deduction
-        after = before + amount
-        set_vendor_wallet_balance(db, vendor_id, after)
-        entry = append_vendor_ledger_entry(
-            db,
-            vendor_id=vendor_id,
-            order_id=order_id,
-            entry_type=VendorLedgerEntryType.CREDIT,
-            amount=amount,
-            balance_before=before,
-            balance_after=after,
-            notes=notes,
-        )
-        return after, entry
+
+        return final_after, entry
+
+    return after, entry
 
 
 def debit_vendor_wallet(
@@ -136,24 +153,67 @@ def debit_vendor_wallet(
     if amount <= 0:
         raise ValueError("Amount must be positive")
     
-    before = get_vendor_wallet_balance(db, vendor_id)
-    after = before - amount
-    
-    if after < 0:
-        raise ValueError("Insufficient vendor balance")
-    
-    set_vendor_wallet_balance(db, vendor_id, after)
-    
-    entry = append_vendor_ledger_entry(
+    entry = _apply_vendor_wallet_change(
         db,
         vendor_id=vendor_id,
         order_id=order_id,
         entry_type=VendorLedgerEntryType.DEBIT,
         amount=amount,
-        balance_before=before,
-        balance_after=after,
         notes=notes,
     )
-    return after, entry
+    if entry is None:
+        get_vendor_wallet_balance(db, vendor_id)
+        raise ValueError("Insufficient vendor balance")
+    return entry.balance_after, entry
 
 
+def get_vendor_wallet_history_page(db: Session, vendor_id: str, limit: int, cursor: Optional[str] = None,
+                                   from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> list:
+    """
+    One page of the vendor wallet history, newest first: ledger entries merged with approved
+    transfers (debits, dated by their approval) in one UNION ALL query. Each branch is limited
+    to `limit` rows on its own index before the merge.
+    """
+    credits = (
+        select(
+            VendorWalletLedger.id,
+            VendorWalletLedger.vendor_id,
+            VendorWalletLedger.order_id,
+            cast(VendorWalletLedger.entry_type, String).label("entry_type"),
+            VendorWalletLedger.amount,
+            VendorWalletLedger.balance_before,
+            VendorWalletLedger.balance_after,
+            VendorWalletLedger.notes,
+            VendorWalletLedger.created_at,
+        )
+        .where(
+            VendorWalletLedger.vendor_id == vendor_id,
+            *ledger_page_conditions(VendorWalletLedger.created_at, VendorWalletLedger.id, cursor, from_date, to_date),
+        )
+        .order_by(VendorWalletLedger.created_at.desc(), VendorWalletLedger.id.desc())
+        .limit(limit)
+    )
+    transfers = (
+        select(
+            TransferTransactions.id,
+            TransferTransactions.vendor_id,
+            null().label("order_id"),
+            literal("DEBIT").label("entry_type"),
+            TransferTransactions.requested_amount.label("amount"),
+            TransferTransactions.wallet_balance_before.label("balance_before"),
+            TransferTransactions.wallet_balance_after.label("balance_after"),
+            TransferTransactions.admin_notes.label("notes"),
+            TransferTransactions.updated_at.label("created_at"),
+        )
+        .where(
+            TransferTransactions.vendor_id == vendor_id,
+            TransferTransactions.status == TransferStatusEnum.APPROVED,
+            *ledger_page_conditions(TransferTransactions.updated_at, TransferTransactions.id, cursor, from_date, to_date),
+        )
+        .order_by(TransferTransactions.updated_at.desc(), TransferTransactions.id.desc())
+        .limit(limit)
+    )
+    history = union_all(credits, transfers).subquery("history")
+    return db.execute(
+        select(history).order_by(history.c.created_at.desc(), history.c.id.desc()).limit(limit)
+    ).all()
@@ -1,6 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update
-from typing import Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, insert, literal, tuple_
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException, status
+from typing import List, Optional, Tuple
+from datetime import datetime
+import base64
+import uuid
 
 from app.models.vehicle_owner_details import VehicleOwnerDetails
 from app.models.wallet_ledger import WalletLedger, WalletEntryTypeEnum
@@ -14,6 +20,13 @@ def get_owner_balance(db: Session, vehicle_owner_id: str) -> int:
     return owner.wallet_balance
 
 
+async def get_owner_balance_async(db: AsyncSession, vehicle_owner_id: str) -> int:
+    result = await db.execute(
+        select(VehicleOwnerDetails.wallet_balance).where(VehicleOwnerDetails.vehicle_owner_id == vehicle_owner_id)
+    )
+    return result.scalar_one()
+
+
 def upsert_owner_balance(db: Session, vehicle_owner_id: str, new_balance: int) -> None:
     owner = db.execute(
         select(VehicleOwnerDetails).where(VehicleOwnerDetails.vehicle_owner_id == vehicle_owner_id)
@@ -40,30 +53,105 @@ def append_ledger_entry(db: Session, vehicle_owner_id: str, entry_type: WalletEn
     return entry
 
 
+def _apply_wallet_change(db: Session, vehicle_owner_id: str, entry_type: WalletEntryTypeEnum, amount: int,
+                         reference_id: Optional[str], reference_type: Optional[str], notes: Optional[str]) -> Optional[WalletLedger]:
+    """
+    Change the balance and write its ledger entry in one statement:
+
+        WITH upd AS (UPDATE vehicle_owner_details SET wallet_balance = wallet_balance - :amount
+                     WHERE vehicle_owner_id = :id AND wallet_balance >= :amount RETURNING wallet_balance)
+        INSERT INTO wallet_ledger (...) SELECT ..., upd.wallet_balance + :amount, upd.wallet_balance FROM upd RETURNING ...
+
+    The row lock taken by the UPDATE serialises concurrent changes, so none is lost.
+    Returns None when no row was updated (unknown owner, or not enough balance for a debit).
+    """
+    delta = amount if entry_type == WalletEntryTypeEnum.CREDIT else -amount
+    changed = (
+        update(VehicleOwnerDetails)
+        .where(VehicleOwnerDetails.vehicle_owner_id == vehicle_owner_id)
+        .values(wallet_balance=VehicleOwnerDetails.wallet_balance + delta)
+    )
+    if entry_type == WalletEntryTypeEnum.DEBIT:
+        changed = changed.where(VehicleOwnerDetails.wallet_balance >= amount)
+    changed = changed.returning(VehicleOwnerDetails.vehicle_owner_id, VehicleOwnerDetails.wallet_balance).cte("changed")
+
+    rows = select(
+        literal(uuid.uuid4(), WalletLedger.id.type),
+        changed.c.vehicle_owner_id,
+        literal(entry_type, WalletLedger.entry_type.type),
+        literal(amount, WalletLedger.amount.type),
+        changed.c.wallet_balance - delta,
+        changed.c.wallet_balance,
+        literal(reference_id, WalletLedger.reference_id.type),
+        literal(reference_type, WalletLedger.reference_type.type),
+        literal(notes, WalletLedger.notes.type),
+    )
+    columns = ["id", "vehicle_owner_id", "entry_type", "amount", "balance_before", "balance_after", "reference_id", "reference_type", "notes"]
+    return db.execute(insert(WalletLedger).from_select(columns, rows).returning(WalletLedger)).scalar_one_or_none()
+
+
 def credit_wallet(db: Session, vehicle_owner_id: str, amount: int, reference_id: Optional[str], reference_type: str, notes: Optional[str] = None) -> Tuple[int, WalletLedger]:
     if amount <= 0:
         raise ValueError("Amount must be positive")
-    current = get_owner_balance(db, vehicle_owner_id)
-    new_balance = current + amount
-    upsert_owner_balance(db, vehicle_owner_id, new_balance)
-    entry = append_ledger_entry(
-        db, vehicle_owner_id, WalletEntryTypeEnum.CREDIT, amount, current, new_balance, reference_id, reference_type, notes
-    )
-    return new_balance, entry
+    entry = _apply_wallet_change(db, vehicle_owner_id, WalletEntryTypeEnum.CREDIT, amount, reference_id, reference_type, notes)
+    if entry is None:
+        get_owner_balance(db, vehicle_owner_id)  # raises NoResultFound for an unknown owner, as before
+    return entry.balance_after, entry
 
 
 def debit_wallet(db: Session, vehicle_owner_id: str, amount: int, reference_id: Optional[str], reference_type: str, notes: Optional[str] = None) -> Tuple[int, WalletLedger]:
     if amount <= 0:
         raise ValueError("Amount must be positive")
-    current = get_owner_balance(db, vehicle_owner_id)
-    if current < amount:
+    entry = _apply_wallet_change(db, vehicle_owner_id, WalletEntryTypeEnum.DEBIT, amount, reference_id, reference_type, notes)
+    if entry is None:
+        get_owner_balance(db, vehicle_owner_id)
         raise ValueError("Insufficient balance")
-    new_balance = current - amount
-    upsert_owner_balance(db, vehicle_owner_id, new_balance)
-    entry = append_ledger_entry(
-        db, vehicle_owner_id, WalletEntryTypeEnum.DEBIT, amount, current, new_balance, reference_id, reference_type, notes
-    )
-    return new_balance, entry
+    return entry.balance_after, entry
+
+
+def encode_ledger_cursor(created_at: datetime, entry_id) -> str:
+    """Opaque keyset cursor for the ledger listings: (created_at, id) of the last entry of a page."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{entry_id}".encode()).decode()
+
+
+def _parse_ledger_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        created_at, entry_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(entry_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def ledger_page_conditions(created_at_column, id_column, cursor: Optional[str] = None,
+                           from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> list:
+    """
+    WHERE conditions for a page of a ledger listed newest first (ORDER BY created_at DESC, id DESC):
+    entries after `cursor` and in [from_date, to_date).
+    """
+    conditions = []
+    if cursor:
+        conditions.append(tuple_(created_at_column, id_column) < tuple_(*_parse_ledger_cursor(cursor)))
+    if from_date:
+        conditions.append(created_at_column >= from_date)
+    if to_date:
+        conditions.append(created_at_column < to_date)
+    return conditions
+
+
+def get_owner_ledger_page(db: Session, vehicle_owner_id: str, limit: int, cursor: Optional[str] = None,
+                          from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> List[WalletLedger]:
+    return db.execute(
+        select(WalletLedger)
+        .where(
+            WalletLedger.vehicle_owner_id == vehicle_owner_id,
+            *ledger_page_conditions(WalletLedger.created_at, WalletLedger.id, cursor, from_date, to_date),
+        )
+        .order_by(WalletLedger.created_at.desc(), WalletLedger.id.desc())
+        .limit(limit)
+    ).scalars().all()
 
 
 def create_rp_transaction(db: Session, vehicle_owner_id: str, rp_order_id: str, amount: int, notes: Optional[str] = None) -> RazorpayTransaction:
@@ -95,6 +183,47 @@ def mark_rp_payment_captured(db: Session, rp_order_id: str, rp_payment_id: str,
     return txn
 
 
+RAZORPAY_PAYMENT = "RAZORPAY_PAYMENT"
+
+
+def capture_rp_payment(db: Session, rp_order_id: str, rp_payment_id: str, rp_signature: Optional[str] = None) -> Optional[RazorpayTransaction]:
+    """
+    Mark the order's payment captured and credit the owner's wallet, at most once per order and payment.
+    Shared by the verify endpoint and the webhook processor, which can see the same payment concurrently:
+    - the UPDATE only matches a transaction that is not captured yet; a concurrent caller waits for the
+      row lock and then matches nothing
+    - the credit runs in a savepoint; if the payment is already in the ledger
+      (ux_wallet_ledger_razorpay_payment) only the savepoint is rolled back
+    Returns the transaction, or None for an unknown order.
+    """
+    values = {"rp_payment_id": rp_payment_id, "status": RazorpayPaymentStatusEnum.CAPTURED, "captured": True}
+    if rp_signature is not None:
+        values["rp_signature"] = rp_signature
+    txn = db.execute(
+        update(RazorpayTransaction)
+        .where(RazorpayTransaction.rp_order_id == rp_order_id, RazorpayTransaction.captured.is_(False))
+        .values(**values)
+        .returning(RazorpayTransaction),
+        execution_options={"synchronize_session": False},
+    ).scalar_one_or_none()
+    if txn is None:
+        return db.execute(select(RazorpayTransaction).where(RazorpayTransaction.rp_order_id == rp_order_id)).scalars().first()
+
+    try:
+        with db.begin_nested():
+            credit_wallet(
+                db,
+                vehicle_owner_id=txn.vehicle_owner_id,
+                amount=txn.amount // 100,
+                reference_id=rp_payment_id,
+                reference_type=RAZORPAY_PAYMENT,
+                notes="Wallet top-up via Razorpay",
+            )
+    except IntegrityError:
+        print(f"Razorpay payment {rp_payment_id} is already credited")
+    return txn
+
+
 def check_rp_payment_already_processed(db: Session, rp_payment_id: str) -> bool:
     """Check if a Razorpay payment has already been processed (for idempotency)"""
     existing_ledger = db.query(WalletLedger).filter(
@@ -0,0 +1,73 @@
+"""
+Schema revision helpers.
+
+Schema changes are applied by Alembic as a separate one-shot step
+(`alembic upgrade head`, see Documentation/MIGRATION_README.md). The application
+only compares the database revision with the migration head at startup.
+"""
+import importlib
+import os
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+MODEL_MODULES = [
+    "app.models.admin",
+    "app.models.car_driver",
+    "app.models.vehicle_owner",
+    "app.models.vehicle_owner_details",
+    "app.models.car_details",
+    "app.models.vendor",
+    "app.models.new_orders",
+    "app.models.vendor_details",
+    "app.models.hourly_rental",
+    "app.models.orders",
+    "app.models.order_assignments",
+    "app.models.transfer_transactions",
+    "app.models.wallet_ledger",
+    "app.models.razorpay_transactions",
+    "app.models.vendor_wallet_ledger",
+    "app.models.admin_wallet_ledger",
+    "app.models.admin_add_money_to_vehicle_owner",
+    "app.models.end_records",
+    "app.models.notification",
+    "app.models.archive",
+    "app.models.reconciliation",
+]
+
+
+def load_models() -> None:
+    """Import every model module so all tables are registered on Base.metadata."""
+    for module in MODEL_MODULES:
+        importlib.import_module(module)
+
+
+def get_head_revision() -> str:
+    script = ScriptDirectory.from_config(Config(ALEMBIC_INI))
+    return script.get_current_head()
+
+
+def get_current_revision(engine) -> str:
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def check_schema_revision(engine) -> bool:
+    """
+    Compare the database revision with the migration head.
+    Returns True when the schema is up to date. Set REQUIRE_SCHEMA_HEAD=true to fail startup otherwise.
+    """
+    head = get_head_revision()
+    current = get_current_revision(engine)
+    if current == head:
+        print(f"Database schema at revision {current}")
+        return True
+
+    message = f"Database schema revision {current} does not match migration head {head}; run `alembic upgrade head`"
+    if os.getenv("REQUIRE_SCHEMA_HEAD", "false").lower() == "true":
+        raise RuntimeError(message)
+    print(f"WARNING: {message}")
+    return False
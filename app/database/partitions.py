@@ -0,0 +1,319 @@
+"""
+Monthly range partitioning on created_at for the append-mostly tables.
+
+Tables are converted once with `Testing code/run_partition_migration.py` (online:
+batched copy into a partitioned shadow table kept in sync by a trigger, then a short
+rename swap). Once a table is partitioned, `ensure_partitions` creates the monthly
+partitions PARTITION_MONTHS_AHEAD months in advance; app/main.py runs it daily.
+Rows outside every monthly range land in the `<table>_default` partition.
+
+Partitions are named `<table>_yYYYYmMM`.
+"""
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+PARTITIONED_TABLES = [
+    "orders",
+    "order_assignments",
+    "wallet_ledger",
+    "vendor_wallet_ledger",
+    "admin_wallet_ledger",
+]
+PARTITION_KEY = "created_at"
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+
+PARTITION_NAME = re.compile(r"^(?P<table>.+)_(y\d{4}m\d{2}|default)$")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month = value.month - 1 + months
+    return date(value.year + month // 12, month % 12 + 1, 1)
+
+
+def months_between(first: date, last: date) -> Iterable[date]:
+    """Month starts from the month of `first` up to and including the month of `last`."""
+    current = month_start(first)
+    while current <= last:
+        yield current
+        current = add_months(current, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partition_table(name: str) -> bool:
+    """True for partition children and leftovers of the conversion (used to hide them from Alembic)."""
+    match = PARTITION_NAME.match(name)
+    if match and match.group("table") in PARTITIONED_TABLES:
+        return True
+    return name in {f"{t}_unpartitioned" for t in PARTITIONED_TABLES} | {f"{t}_p" for t in PARTITIONED_TABLES}
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return bool(conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:t))"),
+        {"t": table},
+    ).scalar())
+
+
+def partition_ddl(parent: str, month: date, name_table: Optional[str] = None) -> str:
+    """CREATE TABLE statement for the partition of `parent` holding `month`."""
+    name = partition_name(name_table or parent, month)
+    upper = add_months(month, 1)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{parent}" '
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+    )
+
+
+def existing_partitions(conn, table: str) -> List[str]:
+    return list(conn.execute(
+        text("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+             "WHERE i.inhparent = to_regclass(:t) ORDER BY c.relname"),
+        {"t": table},
+    ).scalars())
+
+
+def ensure_partitions(conn, table: str, months_ahead: int = PARTITION_MONTHS_AHEAD, today: Optional[date] = None) -> List[str]:
+    """Create the partitions for the current month and `months_ahead` following months. Returns the created names."""
+    today = today or datetime.now(timezone.utc).date()
+    existing = set(existing_partitions(conn, table))
+    created = []
+    for month in months_between(today, add_months(month_start(today), months_ahead)):
+        name = partition_name(table, month)
+        if name in existing:
+            continue
+        conn.execute(text(partition_ddl(table, month)))
+        created.append(name)
+    return created
+
+
+def ensure_all_partitions(engine, months_ahead: int = PARTITION_MONTHS_AHEAD) -> List[str]:
+    """ensure_partitions for every table in PARTITIONED_TABLES that has been converted."""
+    created = []
+    for table in PARTITIONED_TABLES:
+        # One transaction per table so a failure (e.g. rows already in the default partition) does not block the others
+        try:
+            with engine.begin() as conn:
+                if is_partitioned(conn, table):
+                    created += ensure_partitions(conn, table, months_ahead)
+        except Exception as e:
+            print(f"Failed to create partitions for {table}: {e}")
+    return created
+
+
+def incoming_foreign_keys(conn, table: str) -> List[Tuple[str, str, str]]:
+    """(referencing table, constraint name, definition) of foreign keys pointing at `table`."""
+    return [tuple(row) for row in conn.execute(
+        text("SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint "
+             "WHERE contype = 'f' AND confrelid = to_regclass(:t) AND conparentid = 0 ORDER BY 1, 2"),
+        {"t": table},
+    )]
+
+
+# ---- one-off conversion of an existing table (see Testing code/run_partition_migration.py) ----
+
+def _columns(conn, table: str) -> List[str]:
+    return list(conn.execute(
+        text("SELECT attname FROM pg_attribute WHERE attrelid = to_regclass(:t) AND attnum > 0 AND NOT attisdropped ORDER BY attnum"),
+        {"t": table},
+    ).scalars())
+
+
+def _copy_exprs(columns: List[str], prefix: str = "") -> str:
+    # Partition key columns must be NOT NULL; old rows without a created_at get the conversion time
+    return ", ".join(
+        f'COALESCE({prefix}"{c}", now())' if c == PARTITION_KEY else f'{prefix}"{c}"' for c in columns
+    )
+
+
+_INDEX_COLUMNS = re.compile(r"^(?P<head>.* USING \w+ )\((?P<columns>.*?)\)(?P<where> WHERE .*)?$")
+
+
+def _unique_index_with_partition_key(definition: str, temp: str, shadow: str) -> str:
+    """The unique index re-created on the shadow table with the partition key added (when it is not a key column already)."""
+    ddl = re.sub(r"^CREATE UNIQUE INDEX \S+ ON (ONLY )?\S+", f'CREATE UNIQUE INDEX "{temp}" ON "{shadow}"', definition)
+    match = _INDEX_COLUMNS.match(ddl)
+    columns = match.group("columns")
+    if PARTITION_KEY not in [column.strip().strip('"') for column in columns.split(",")]:
+        columns = f"{columns}, {PARTITION_KEY}"
+    return f"{match.group('head')}({columns}){match.group('where') or ''}"
+
+
+def prepare_conversion(conn, table: str, months_ahead: int = PARTITION_MONTHS_AHEAD, drop_incoming_fks: bool = False,
+                       weaken_unique_indexes: bool = False) -> List[Tuple[str, str]]:
+    """
+    Create the partitioned shadow table `<table>_p` with partitions, indexes, foreign keys
+    and a trigger that mirrors writes on `<table>` into it.
+    A unique index on a partitioned table must contain the partition key, so unique indexes can only be
+    re-created with created_at added, which only rejects duplicates with the same created_at: the
+    conversion is refused unless weaken_unique_indexes is set.
+    Returns (index name on the old table, temporary index name on the shadow table) pairs for the swap.
+    """
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"{table} is not one of {PARTITIONED_TABLES}")
+    if is_partitioned(conn, table):
+        raise ValueError(f"{table} is already partitioned")
+
+    incoming = incoming_foreign_keys(conn, table)
+    if incoming and not drop_incoming_fks:
+        listed = "\n".join(f"  {src}.{name}: {definition}" for src, name, definition in incoming)
+        raise ValueError(
+            f"{table} is referenced by foreign keys that cannot point at a partitioned table "
+            f"(its primary key becomes (id, {PARTITION_KEY})):\n{listed}\n"
+            "Pass --drop-incoming-fks to drop them during the swap."
+        )
+
+    indexes = conn.execute(
+        text("SELECT i.relname, pg_get_indexdef(x.indexrelid), x.indisunique, x.indisprimary FROM pg_index x "
+             "JOIN pg_class i ON i.oid = x.indexrelid WHERE x.indrelid = to_regclass(:t) ORDER BY 1"),
+        {"t": table},
+    ).all()
+    unique = [(name, definition) for name, definition, is_unique, primary in indexes if is_unique and not primary]
+    if unique and not weaken_unique_indexes:
+        listed = "\n".join(f"  {name}: {definition}" for name, definition in unique)
+        raise ValueError(
+            f"{table} has unique indexes that a partitioned table can only enforce together with {PARTITION_KEY}:\n"
+            f"{listed}\nPass --weaken-unique-indexes to re-create them with {PARTITION_KEY} added."
+        )
+
+    shadow = f"{table}_p"
+    columns = _columns(conn, table)
+    conn.execute(text(
+        f'CREATE TABLE "{shadow}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED) '
+        f"PARTITION BY RANGE ({PARTITION_KEY})"
+    ))
+    conn.execute(text(f'ALTER TABLE "{shadow}" ALTER COLUMN {PARTITION_KEY} SET NOT NULL'))
+    conn.execute(text(f'ALTER TABLE "{shadow}" ADD CONSTRAINT "{shadow}_pkey" PRIMARY KEY (id, {PARTITION_KEY})'))
+
+    first = conn.execute(text(f'SELECT min({PARTITION_KEY}) FROM "{table}"')).scalar()
+    today = datetime.now(timezone.utc).date()
+    first_month = month_start(first.date()) if first else month_start(today)
+    for month in months_between(first_month, add_months(month_start(today), months_ahead)):
+        conn.execute(text(partition_ddl(shadow, month, name_table=table)))
+    conn.execute(text(f'CREATE TABLE IF NOT EXISTS "{table}_default" PARTITION OF "{shadow}" DEFAULT'))
+
+    renames = [(f"{table}_pkey", f"{shadow}_pkey")]
+    for name, definition, is_unique, primary in indexes:
+        if primary:
+            continue
+        temp = f"{name[:61]}_p"
+        if is_unique:
+            ddl = _unique_index_with_partition_key(definition, temp, shadow)
+            print(f"  unique index {name} re-created with {PARTITION_KEY}: {ddl}")
+        else:
+            ddl = re.sub(r"^CREATE INDEX \S+ ON (ONLY )?\S+", f'CREATE INDEX "{temp}" ON "{shadow}"', definition)
+        conn.execute(text(ddl))
+        renames.append((name, temp))
+
+    for name, definition in conn.execute(
+        text("SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE contype = 'f' AND conrelid = to_regclass(:t)"),
+        {"t": table},
+    ).all():
+        conn.execute(text(f'ALTER TABLE "{shadow}" ADD CONSTRAINT "{name}" {definition}'))
+
+    # Keep the shadow table in sync with writes that happen while the copy runs. An UPDATE overwrites
+    # whatever copy of the row the shadow table holds, even one its DELETE could not see yet
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    updates = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in columns if c not in ("id", PARTITION_KEY))
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION "{table}_partition_sync"() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM "{shadow}" WHERE id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO "{shadow}" ({column_list}) VALUES ({_copy_exprs(columns, "NEW.")})
+                ON CONFLICT (id, {PARTITION_KEY}) DO UPDATE SET {updates};
+            END IF;
+            RETURN NULL;
+        END $$
+    """))
+    conn.execute(text(
+        f'CREATE TRIGGER "{table}_partition_sync" AFTER INSERT OR UPDATE OR DELETE ON "{table}" '
+        f'FOR EACH ROW EXECUTE FUNCTION "{table}_partition_sync"()'
+    ))
+    return renames
+
+
+def copy_batch(conn, table: str, after_id, batch_size: int):
+    """
+    Copy the next `batch_size` rows (by id) into the shadow table. Returns (last id, rows copied).
+    The batch is read FOR SHARE: an UPDATE / DELETE of one of its rows waits for the copy to commit, so
+    the sync trigger always sees (and replaces or removes) the copied row, and the copy takes the latest
+    version of a row that was being changed when it started.
+    """
+    columns = _columns(conn, table)
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    where = "WHERE id > :after_id" if after_id is not None else ""
+    row = conn.execute(text(f"""
+        WITH batch AS (
+            SELECT * FROM "{table}" {where} ORDER BY id LIMIT :batch_size FOR SHARE
+        ), copied AS (
+            INSERT INTO "{table}_p" ({column_list}) SELECT {_copy_exprs(columns)} FROM batch ON CONFLICT DO NOTHING
+        )
+        SELECT (SELECT id FROM batch ORDER BY id DESC LIMIT 1), (SELECT count(*) FROM batch)
+    """), {"after_id": after_id, "batch_size": batch_size}).one()
+    return row[0], row[1]
+
+
+def swap_tables(conn, table: str, renames: List[Tuple[str, str]], drop_incoming_fks: bool = False) -> None:
+    """Replace `table` by its partitioned shadow. The old table is kept as `<table>_unpartitioned`."""
+    shadow = f"{table}_p"
+    conn.execute(text(f'LOCK TABLE "{table}" IN ACCESS EXCLUSIVE MODE'))
+    conn.execute(text(f'DROP TRIGGER "{table}_partition_sync" ON "{table}"'))
+    conn.execute(text(f'DROP FUNCTION "{table}_partition_sync"()'))
+
+    for source, name, _ in incoming_foreign_keys(conn, table):
+        if not drop_incoming_fks:
+            raise ValueError(f"{source}.{name} references {table}")
+        print(f"  dropping foreign key {source}.{name}")
+        conn.execute(text(f'ALTER TABLE {source} DROP CONSTRAINT "{name}"'))
+
+    sequences = conn.execute(
+        text("SELECT attname, pg_get_serial_sequence(:t, attname) FROM pg_attribute "
+             "WHERE attrelid = to_regclass(:t) AND attnum > 0 AND NOT attisdropped"),
+        {"t": table},
+    ).all()
+
+    for old_name, _ in renames:
+        conn.execute(text(f'ALTER INDEX "{old_name}" RENAME TO "{old_name[:50]}_unpartitioned"'))
+    conn.execute(text(f'ALTER TABLE "{table}" RENAME TO "{table}_unpartitioned"'))
+    conn.execute(text(f'ALTER TABLE "{shadow}" RENAME TO "{table}"'))
+    for old_name, temp in renames:
+        conn.execute(text(f'ALTER INDEX "{temp}" RENAME TO "{old_name}"'))
+    # The id sequence would otherwise be dropped together with the old table
+    for column, sequence in sequences:
+        if sequence:
+            conn.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY "{table}"."{column}"'))
+
+
+def create_index_concurrently(conn, table: str, name: str, columns: str, where: Optional[str] = None) -> None:
+    """
+    CREATE INDEX without blocking writes, on a plain or a partitioned table. `conn` must be in autocommit.
+    A partitioned table cannot be indexed CONCURRENTLY: the index is created ON ONLY the parent, then
+    built CONCURRENTLY on each partition and attached; partitions created later get it automatically.
+    """
+    predicate = f" WHERE {where}" if where else ""
+    if not is_partitioned(conn, table):
+        conn.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" ({columns}){predicate}'))
+        return
+    conn.execute(text(f'CREATE INDEX IF NOT EXISTS "{name}" ON ONLY "{table}" ({columns}){predicate}'))
+    for partition in existing_partitions(conn, table):
+        partition_index = f"{partition[:40]}_{name[-22:]}"
+        conn.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{partition_index}" ON "{partition}" ({columns}){predicate}'))
+        attached = conn.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:i) AND inhparent = to_regclass(:p))"),
+            {"i": partition_index, "p": name},
+        ).scalar()
+        if not attached:
+            conn.execute(text(f'ALTER INDEX "{name}" ATTACH PARTITION "{partition_index}"'))
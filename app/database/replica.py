@@ -0,0 +1,237 @@
+"""
+Read replica routing for read-only endpoints.
+
+Set REPLICA_DATABASE_URL to enable; without it every read goes to the primary.
+A request is served from the primary instead of the replica when:
+- the replica is unreachable (it is then skipped for REPLICA_ERROR_COOLDOWN_SECONDS)
+- replication lag is above REPLICA_MAX_LAG_SECONDS (checked at most every REPLICA_LAG_CHECK_SECONDS)
+- the caller wrote something within the last READ_YOUR_WRITES_SECONDS (see record_write)
+
+The read-your-writes window is kept in two places: in memory per process (by JWT subject), and in the
+`read_your_writes_until` cookie / `X-Read-Your-Writes-Until` header set on every successful write, so a
+client whose next request lands on another worker or instance still reads from the primary.
+A read that fails because the replica went away is retried once on the primary (ReplicaFallbackRoute).
+"""
+import os
+import threading
+import time
+from typing import Callable, Optional, Union
+
+from fastapi import HTTPException, Request
+from fastapi.routing import APIRoute
+from jose import JWTError, jwt
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database.session import SessionLocal
+
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "2"))
+REPLICA_ERROR_COOLDOWN_SECONDS = float(os.getenv("REPLICA_ERROR_COOLDOWN_SECONDS", "30"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+READ_YOUR_WRITES_COOKIE = "read_your_writes_until"
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes-Until"
+
+REPLICA_CAUGHT_UP_BYTES = int(os.getenv("REPLICA_CAUGHT_UP_BYTES", "1048576"))
+
+# Zero when this is not a standby or it has (nearly) replayed everything it received.
+# An idle standby has an old last replay timestamp, so the timestamp alone would
+# report a large lag as soon as a small WAL record arrives.
+REPLICA_LAG_SQL = text(f"""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_wal_lsn_diff(pg_last_wal_receive_lsn(), pg_last_wal_replay_lsn()) <= {REPLICA_CAUGHT_UP_BYTES} THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReadRouter:
+    """Chooses the primary or replica session factory for a read-only request."""
+
+    def __init__(
+        self,
+        primary_factory: Callable,
+        replica_factory: Optional[Callable] = None,
+        max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS,
+        lag_check_seconds: float = REPLICA_LAG_CHECK_SECONDS,
+        error_cooldown_seconds: float = REPLICA_ERROR_COOLDOWN_SECONDS,
+        read_your_writes_seconds: float = READ_YOUR_WRITES_SECONDS,
+    ):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self.error_cooldown_seconds = error_cooldown_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+
+        self._lock = threading.Lock()
+        self._lag: Optional[float] = None
+        self._lag_checked_at = 0.0
+        self._unavailable_until = 0.0
+        self._recent_writes = {}
+
+    # ---- read-your-writes ----
+    def record_write(self, subject: Optional[str]) -> Optional[float]:
+        """
+        Remember a write by `subject` in this process. Returns the wall-clock time until which the caller
+        should read from the primary, for the cookie / header (None without a replica).
+        """
+        if self.replica_factory is None:
+            return None
+        if subject:
+            now = time.monotonic()
+            with self._lock:
+                self._recent_writes[subject] = now + self.read_your_writes_seconds
+                # Drop expired entries so the map stays bounded by the active writers
+                if len(self._recent_writes) > 10000:
+                    self._recent_writes = {k: v for k, v in self._recent_writes.items() if v > now}
+        return time.time() + self.read_your_writes_seconds
+
+    def wrote_recently(self, subject: Optional[str], written_until: Union[str, float, None] = None) -> bool:
+        if written_until is not None:
+            try:
+                until = float(written_until)
+            except (TypeError, ValueError):
+                until = 0.0
+            now = time.time()
+            # A marker further ahead than one window was not set by us; ignore it
+            if now < until <= now + self.read_your_writes_seconds + 1:
+                return True
+        if not subject:
+            return False
+        expires_at = self._recent_writes.get(subject)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    # ---- replica health ----
+    def mark_replica_failed(self) -> None:
+        with self._lock:
+            self._unavailable_until = time.monotonic() + self.error_cooldown_seconds
+            self._lag = None
+
+    def replica_reachable(self) -> bool:
+        """Probe the replica now (after a failed read); marks it failed when it cannot be reached."""
+        db = self.replica_factory()
+        try:
+            db.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            print(f"Read replica unavailable, using primary: {e}")
+            self.mark_replica_failed()
+            return False
+        finally:
+            db.close()
+
+    def replica_lag(self) -> Optional[float]:
+        """Cached replication lag in seconds, or None when the replica cannot be reached."""
+        now = time.monotonic()
+        if now < self._unavailable_until:
+            return None
+        if self._lag is not None and now - self._lag_checked_at < self.lag_check_seconds:
+            return self._lag
+
+        db = self.replica_factory()
+        try:
+            lag = float(db.execute(REPLICA_LAG_SQL).scalar() or 0)
+        except Exception as e:
+            print(f"Read replica unavailable, using primary: {e}")
+            self.mark_replica_failed()
+            return None
+        finally:
+            db.close()
+
+        with self._lock:
+            self._lag = lag
+            self._lag_checked_at = now
+        if lag > self.max_lag_seconds:
+            print(f"Read replica lag {lag:.1f}s above {self.max_lag_seconds}s, using primary")
+        return lag
+
+    def use_replica(self, subject: Optional[str] = None, written_until: Union[str, float, None] = None) -> bool:
+        if self.replica_factory is None or self.wrote_recently(subject, written_until):
+            return False
+        lag = self.replica_lag()
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def session_factory(self, subject: Optional[str] = None, written_until: Union[str, float, None] = None) -> Callable:
+        return self.replica_factory if self.use_replica(subject, written_until) else self.primary_factory
+
+
+replica_engine = (
+    create_engine(
+        REPLICA_DATABASE_URL,
+        pool_pre_ping=True,
+        connect_args={"options": "-c search_path=drop-cars", "connect_timeout": 3},
+    )
+    if REPLICA_DATABASE_URL
+    else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine is not None else None
+)
+
+read_router = ReadRouter(SessionLocal, ReplicaSessionLocal)
+
+
+def subject_from_request(request: Request) -> Optional[str]:
+    """JWT `sub` of the caller, without verifying the account against the database."""
+    from app.core.security import SECRET_KEY, ALGORITHM
+
+    authorization = request.headers.get("Authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    sub = payload.get("sub")
+    return str(sub) if sub is not None else None
+
+
+def read_session_factory(request: Request) -> Callable:
+    """Session factory for a read-only request: primary on a retry or within the caller's read-your-writes window"""
+    if getattr(request.state, "read_from_primary", False):
+        return read_router.primary_factory
+    written_until = request.headers.get(READ_YOUR_WRITES_HEADER) or request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    return read_router.session_factory(subject_from_request(request), written_until)
+
+
+class ReplicaUnavailable(Exception):
+    """A read failed because the replica went away; ReplicaFallbackRoute retries the request on the primary"""
+
+
+class ReplicaFallbackRoute(APIRoute):
+    """Route class for routers with get_read_db endpoints: a request whose replica read failed runs again on the primary"""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request):
+            try:
+                return await handler(request)
+            except ReplicaUnavailable as e:
+                print(f"Read replica failed during {request.method} {request.url.path}, retrying on primary: {e.__cause__}")
+                request.state.read_from_primary = True
+                return await handler(request)
+
+        return route_handler
+
+
+# Dependency for read-only endpoints (replica when healthy, primary otherwise)
+def get_read_db(request: Request):
+    factory = read_session_factory(request)
+    db = factory()
+    try:
+        yield db
+    except Exception as e:
+        # Most routes turn errors into HTTPException(500), so anything but a client error may be the replica
+        if factory is read_router.replica_factory and not (isinstance(e, HTTPException) and e.status_code < 500):
+            if isinstance(e, OperationalError) or not read_router.replica_reachable():
+                read_router.mark_replica_failed()
+                raise ReplicaUnavailable(str(e)) from e
+        raise
+    finally:
+        db.close()
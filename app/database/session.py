@@ -1,5 +1,6 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
@@ -8,11 +9,21 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 
 DATABASE_URL = f"postgresql+psycopg2://drop-cars:{DB_PASSWORD}@{DB_HOST}:5432/drop-cars"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://drop-cars:{DB_PASSWORD}@{DB_HOST}:5432/drop-cars"
 
 engine = create_engine(DATABASE_URL, connect_args={"options": "-c search_path=drop-cars"})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for handlers that must not block the event loop (asyncpg driver)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=int(os.getenv("ASYNC_DB_POOL_SIZE", "10")),
+    max_overflow=int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "10")),
+    connect_args={"server_settings": {"search_path": "drop-cars"}},
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Dependency for DB
 def get_db():
     db = SessionLocal()
@@ -20,3 +31,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency for async DB
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
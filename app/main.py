@@ -1,8 +1,11 @@
-from fastapi import FastAPI
+import math
+from fastapi import FastAPI, Request
 from fastapi_utils.tasks import repeat_every
 from app.database.session import SessionLocal
-from app.api.routes import vendor, vehicle_owner, car_details, car_driver, new_orders, order_assignments, transfer_transactions, admin, hourly_rental, orders, wallet, notification
+from app.api.routes import vendor, vehicle_owner, car_details, car_driver, new_orders, order_assignments, transfer_transactions, admin, hourly_rental, orders, wallet, notification, uploads, exports
 from app.api.routes import cities as cities_router
+from app.api.routes import storage as storage_router
+from app.utils.storage import STORAGE_BACKEND
 from app.utils.cities import load_cities_once
 import app.models.admin
 import app.models.car_driver
@@ -23,9 +26,17 @@ import app.models.admin_wallet_ledger
 import app.models.admin_add_money_to_vehicle_owner
 from app.database.session import Base, engine
 import app.models.end_records
+import app.models.archive
+import app.models.reconciliation
+from app.database.migrations import check_schema_revision
+from app.database.partitions import ensure_all_partitions
+from app.database.replica import read_router, subject_from_request, READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER
+from app.core.db_metrics import db_metrics_middleware
+from app.crud.admin_wallet import ADMIN_WALLET_FOLD_SECONDS, fold_admin_wallet_shards
+from app.crud.razorpay_webhooks import RAZORPAY_WEBHOOK_POLL_SECONDS, drain_webhook_events
+from app.utils.razorpay_client import close_http_client
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
+# Tables are created/migrated by `alembic upgrade head` as a separate deploy step
 
 app = FastAPI(title="Auth API")
 
@@ -42,9 +53,41 @@ app.include_router(transfer_transactions.router, prefix="/api", tags=["TransferT
 app.include_router(admin.router, prefix="/api", tags=["Admin"])
 app.include_router(wallet.router, prefix="/api", tags=["Wallet"]) 
 app.include_router(notification.router, prefix="/api", tags=["notifications"]) 
-app.include_router(cities_router.router, prefix="/api", tags=["Cities"]) 
+app.include_router(cities_router.router, prefix="/api", tags=["Cities"])
+app.include_router(uploads.router, prefix="/api", tags=["Uploads"])
+app.include_router(exports.router, prefix="/api", tags=["Exports"])
+if STORAGE_BACKEND == "local":
+    app.include_router(storage_router.router, prefix="/api", tags=["Storage"])
 
 
+app.middleware("http")(db_metrics_middleware)
+
+
+@app.middleware("http")
+async def read_your_writes_middleware(request: Request, call_next):
+    # After a successful write, serve that user's reads from the primary for a short window.
+    # The cookie / header carry the window to whichever worker or instance serves the next request
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        written_until = read_router.record_write(subject_from_request(request))
+        if written_until is not None:
+            response.headers[READ_YOUR_WRITES_HEADER] = f"{written_until:.3f}"
+            response.set_cookie(READ_YOUR_WRITES_COOKIE, f"{written_until:.3f}",
+                                max_age=math.ceil(read_router.read_your_writes_seconds), httponly=True, samesite="lax")
+    return response
+
+
+
+@app.on_event("startup")
+def check_schema_startup() -> None:
+    # Only compare the database revision with the migration head; no schema reflection on cold start
+    try:
+        check_schema_revision(engine)
+    except RuntimeError:
+        raise
+    except Exception as e:
+        print(f"Failed to check schema revision: {e}")
+
 
 @app.on_event("startup")
 async def load_cities_startup() -> None:
@@ -68,3 +111,85 @@ async def cancel_expired_assignments_task() -> None:
     finally:
         db.close()
 
+
+@app.on_event("startup")
+@repeat_every(seconds=60 * 60 * 24)  # daily, and once at startup
+def ensure_partitions_task() -> None:
+    """Background job: create next months' created_at partitions for the partitioned tables."""
+    created = ensure_all_partitions(engine)
+    if created:
+        print(f"Created partitions: {', '.join(created)}")
+
+
+@app.on_event("startup")
+@repeat_every(seconds=60 * 60, wait_first=True)  # hourly
+def archive_closed_orders_task() -> None:
+    """Background job: move closed orders older than ARCHIVE_AFTER_DAYS to the archive tables."""
+    from app.crud.archive import ARCHIVE_ENABLED, archive_closed_orders
+    if not ARCHIVE_ENABLED:
+        return
+    db = SessionLocal()
+    try:
+        moved = archive_closed_orders(db)
+        if moved:
+            print(f"Archived closed orders: {moved}")
+    except Exception as e:
+        print(f"Failed to archive closed orders: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+@repeat_every(seconds=ADMIN_WALLET_FOLD_SECONDS, wait_first=True)
+def fold_admin_wallet_shards_task() -> None:
+    """Background job: move the admin wallet shard balances into admin.balance."""
+    db = SessionLocal()
+    try:
+        folded = fold_admin_wallet_shards(db)
+        db.commit()
+        if folded:
+            print(f"Folded {folded} into the admin wallet")
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to fold admin wallet shards: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+@repeat_every(seconds=RAZORPAY_WEBHOOK_POLL_SECONDS, wait_first=True)
+def process_razorpay_webhooks_task() -> None:
+    """Background job: credit wallets for the queued Razorpay webhook events."""
+    db = SessionLocal()
+    try:
+        processed = drain_webhook_events(db)
+        if processed:
+            print(f"Processed {processed} Razorpay webhook event(s)")
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to process Razorpay webhook events: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+async def close_razorpay_client() -> None:
+    await close_http_client()
+
+
+@app.on_event("startup")
+@repeat_every(seconds=60 * 60 * 24, wait_first=True)  # daily
+def reconcile_balances_task() -> None:
+    """Background job: report wallet balances that do not match their ledgers (fixing is done by hand)."""
+    from app.crud.reconciliation import RECONCILE_ENABLED, reconcile_all
+    if not RECONCILE_ENABLED:
+        return
+    db = SessionLocal()
+    try:
+        found = reconcile_all(db)
+        print(f"Balance reconciliation: {', '.join(f'{w} {len(m)} mismatched' for w, m in found.items())}")
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to reconcile balances: {e}")
+    finally:
+        db.close()
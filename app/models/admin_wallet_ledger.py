@@ -1,5 +1,5 @@
 # models/admin_wallet_ledger.py
-from sqlalchemy import Column, String, TIMESTAMP, Integer, func, Enum as SqlEnum, ForeignKey
+from sqlalchemy import Column, String, TIMESTAMP, Integer, func, Enum as SqlEnum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
@@ -14,7 +14,8 @@ class AdminWalletLedger(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, index=True)
     admin_id = Column(UUID(as_uuid=True), ForeignKey("admin.id"), nullable=False, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True, index=True)
+    # orders.id or orders_archive.id (closed orders are moved to the archive, see app/crud/archive.py)
+    order_id = Column(Integer, nullable=True, index=True)
     entry_type = Column(SqlEnum(AdminLedgerEntryType, name="admin_wallet_entry_type_enum"), nullable=False)
     amount = Column(Integer, nullable=False)
     balance_before = Column(Integer, nullable=False)
@@ -22,3 +23,20 @@ class AdminWalletLedger(Base):
     notes = Column(String, nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index("ix_admin_wallet_ledger_admin_id_created_at", "admin_id", created_at.desc()),
+    )
+
+
+
+class AdminWalletShard(Base):
+    """
+    Striped accumulator for admin credits (see app/crud/admin_wallet.py): settlements add to one of
+    ADMIN_WALLET_SHARDS rows instead of all locking the admin row. The admin's balance is
+    admin.balance plus the sum of its shards; fold_admin_wallet_shards moves the shards into admin.balance.
+    """
+    __tablename__ = "admin_wallet_shards"
+
+    admin_id = Column(UUID(as_uuid=True), ForeignKey("admin.id"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    balance = Column(Integer, nullable=False, default=0)
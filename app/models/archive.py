@@ -0,0 +1,59 @@
+# models/archive.py
+"""
+Cold archive tables for closed orders (see app/crud/archive.py).
+
+Each archive table has the columns of its hot table plus archived_at, without the
+foreign keys, so the ORM classes below can be used wherever the hot model is read
+(same attribute names).
+"""
+from sqlalchemy import Column, Table, TIMESTAMP, Index, func
+from app.database.session import Base
+from app.models.orders import Order
+from app.models.new_orders import NewOrder
+from app.models.hourly_rental import HourlyRental
+from app.models.order_assignments import OrderAssignment
+from app.models.end_records import EndRecord
+
+
+def _archive_table(source: Table, *indexes) -> Table:
+    columns = [
+        Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable, autoincrement=False)
+        for c in source.columns
+    ]
+    return Table(
+        f"{source.name}_archive",
+        Base.metadata,
+        *columns,
+        Column("archived_at", TIMESTAMP(timezone=True), server_default=func.now(), nullable=False),
+        *indexes,
+    )
+
+
+orders_archive = _archive_table(Order.__table__)
+Index("ix_orders_archive_vendor_id_created_at", orders_archive.c.vendor_id, orders_archive.c.created_at.desc())
+
+order_assignments_archive = _archive_table(OrderAssignment.__table__)
+Index("ix_order_assignments_archive_order_id", order_assignments_archive.c.order_id)
+
+end_records_archive = _archive_table(EndRecord.__table__)
+Index("ix_end_records_archive_order_id", end_records_archive.c.order_id)
+
+
+class ArchivedOrder(Base):
+    __table__ = orders_archive
+
+
+class ArchivedNewOrder(Base):
+    __table__ = _archive_table(NewOrder.__table__)
+
+
+class ArchivedHourlyRental(Base):
+    __table__ = _archive_table(HourlyRental.__table__)
+
+
+class ArchivedOrderAssignment(Base):
+    __table__ = order_assignments_archive
+
+
+class ArchivedEndRecord(Base):
+    __table__ = end_records_archive
@@ -1,7 +1,8 @@
 from sqlalchemy import Column, String, TIMESTAMP, Integer, func, JSON, Enum as SqlEnum, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 import enum
 from app.database.session import Base
+from app.utils.route_labels import track_route_labels
 from app.models.new_orders import OrderTypeEnum, CarTypeEnum
 
 
@@ -19,7 +20,10 @@ class HourlyRental(Base):
         SqlEnum(CarTypeEnum, name="CAR_TYPE_ENUM"),
         nullable=False,
     )
-    pickup_drop_location = Column(JSON, nullable=False)
+    pickup_drop_location = Column(JSONB, nullable=False)
+    origin_label = Column(String, nullable=True)
+    destination_label = Column(String, nullable=True)
+    stop_count = Column(Integer, nullable=True)
     start_date_time = Column(TIMESTAMP(timezone=True), nullable=False)
     customer_name = Column(String, nullable=False)
     customer_number = Column(String, nullable=False)
@@ -36,3 +40,4 @@ class HourlyRental(Base):
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
 
+track_route_labels(HourlyRental)
@@ -1,9 +1,10 @@
 # models/new_orders.py
 from sqlalchemy import Column, String, TIMESTAMP, Integer, func, JSON, Enum as SqlEnum, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 import uuid
 import enum
 from app.database.session import Base
+from app.utils.route_labels import track_route_labels
 
 class OrderTypeEnum(enum.Enum):
     ONEWAY = "Oneway"
@@ -31,7 +32,7 @@ class NewOrder(Base):
     __tablename__ = "new_orders"
 
     order_id  = Column(Integer, primary_key=True, autoincrement=True)
-    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendor.id"), nullable=False)
+    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendor.id"), nullable=False, index=True)
     trip_type = Column(
         SqlEnum(OrderTypeEnum, name="ORDER_TYPE_ENUM"),
         nullable=False
@@ -40,7 +41,10 @@ class NewOrder(Base):
         SqlEnum(CarTypeEnum, name="CAR_TYPE_ENUM"),
         nullable=False
     )
-    pickup_drop_location = Column(JSON, nullable=False)
+    pickup_drop_location = Column(JSONB, nullable=False)
+    origin_label = Column(String, nullable=True)
+    destination_label = Column(String, nullable=True)
+    stop_count = Column(Integer, nullable=True)
     start_date_time = Column(TIMESTAMP(timezone=True), nullable=False)
     customer_name = Column(String, nullable=False)
     customer_number = Column(String, nullable=False)
@@ -61,5 +65,6 @@ class NewOrder(Base):
     estimated_price = Column(Integer, nullable=True)
     vendor_price  = Column(Integer, nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
-    
-    
+
+
+track_route_labels(NewOrder)
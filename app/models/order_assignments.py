@@ -1,5 +1,5 @@
 # models/new_orders.py
-from sqlalchemy import Column, String, TIMESTAMP, Integer, func, JSON, Enum as SqlEnum, ForeignKey
+from sqlalchemy import Column, String, TIMESTAMP, Integer, func, JSON, Enum as SqlEnum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
@@ -30,10 +30,16 @@ class OrderAssignment(Base):
     expires_at = Column(TIMESTAMP)
     cancelled_at = Column(TIMESTAMP)
     completed_at = Column(TIMESTAMP)
-    created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    created_at = Column(TIMESTAMP, default=datetime.utcnow, nullable=False)
 
     # Optional: define relationships if needed
     # order = relationship("NewOrder")
     # driver = relationship("CarDriver")
     # car = relationship("CarDetail")
-    # owner = relationship("VehicleOwner")
\ No newline at end of file
+    # owner = relationship("VehicleOwner")
+
+    __table_args__ = (
+        # Latest assignment per order (pending order checks, vendor order status)
+        Index("ix_order_assignments_order_id_created_at", "order_id", created_at.desc()),
+        Index("ix_order_assignments_driver_id", "driver_id"),
+    )
\ No newline at end of file
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, TIMESTAMP, Integer, func, JSON, Enum as SqlEnum, ForeignKey, Boolean, Interval
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, TIMESTAMP, Integer, func, JSON, Enum as SqlEnum, ForeignKey, Boolean, Interval, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 import enum
 from app.database.session import Base
 from app.models.new_orders import OrderTypeEnum, CarTypeEnum
+from app.utils.route_labels import track_route_labels
 
 class Trip_status(str,enum.Enum): 
     PENDING = "PENDING"
@@ -28,13 +29,17 @@ class Order(Base):
     vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendor.id"), nullable=False)
     trip_type = Column(SqlEnum(OrderTypeEnum, name="ORDER_TYPE_ENUM"), nullable=False)
     car_type = Column(SqlEnum(CarTypeEnum, name="CAR_TYPE_ENUM"), nullable=False)
-    pickup_drop_location = Column(JSON, nullable=False)
+    pickup_drop_location = Column(JSONB, nullable=False)
+    # Denormalised from pickup_drop_location (see app/utils/route_labels.py)
+    origin_label = Column(String, nullable=True)
+    destination_label = Column(String, nullable=True)
+    stop_count = Column(Integer, nullable=True)
     start_date_time = Column(TIMESTAMP(timezone=True), nullable=False)
     customer_name = Column(String, nullable=False)
     customer_number = Column(String, nullable=False)
 
     # Optional shared financials/summaries
-    trip_status = Column(SqlEnum(Trip_status,name="Trip_status"),nullable=False)
+    trip_status = Column(SqlEnum(Trip_status,name="Trip_status"),nullable=False, index=True)
     pick_near_city = Column(ARRAY(String), nullable=True)
     trip_distance = Column(Integer, nullable=True)
     trip_time = Column(String, nullable=True)
@@ -73,4 +78,20 @@ class Order(Base):
 
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Vendor order history, newest first
+        Index("ix_orders_vendor_id_created_at", "vendor_id", created_at.desc()),
+        # Pending order board for vehicle owners
+        Index("ix_orders_pending_created_at", created_at.desc(), postgresql_where=(trip_status == "PENDING")),
+        # "Orders from city X" prefix search (lower(origin_label) LIKE 'x%')
+        Index(
+            "ix_orders_origin_label_lower",
+            func.lower(origin_label).label("origin_label_lower"),
+            postgresql_ops={"origin_label_lower": "text_pattern_ops"},
+        ),
+    )
+
+
+track_route_labels(Order)
+
 
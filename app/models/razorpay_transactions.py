@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, TIMESTAMP, Integer, func, Enum as SqlEnum, ForeignKey, Text, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, TIMESTAMP, Integer, func, Enum as SqlEnum, ForeignKey, Text, Boolean, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 import enum
 from app.database.session import Base
@@ -35,3 +35,31 @@ class RazorpayTransaction(Base):
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
+class RazorpayWebhookStatusEnum(str, enum.Enum):
+    PENDING = "PENDING"
+    PROCESSED = "PROCESSED"
+    IGNORED = "IGNORED"  # event type we do not handle, or an order that is not ours
+    FAILED = "FAILED"    # gave up after RAZORPAY_WEBHOOK_MAX_ATTEMPTS
+
+
+class RazorpayWebhookEvent(Base):
+    """
+    Webhook deliveries, stored as received and applied by process_webhook_events
+    (app/crud/razorpay_webhooks.py). Razorpay retries deliveries; event_id keeps one row per event.
+    """
+    __tablename__ = "razorpay_webhook_events"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    event_id = Column(String, nullable=False, unique=True)  # X-Razorpay-Event-Id
+    event = Column(String, nullable=False)  # e.g. payment.captured
+    payload = Column(JSONB, nullable=False)
+    status = Column(SqlEnum(RazorpayWebhookStatusEnum, name="razorpay_webhook_status_enum"), nullable=False, default=RazorpayWebhookStatusEnum.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    received_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    processed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The processor's queue scan
+        Index("ix_razorpay_webhook_events_pending", "received_at", postgresql_where=text("status = 'PENDING'")),
+    )
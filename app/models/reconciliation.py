@@ -0,0 +1,21 @@
+# models/reconciliation.py
+from sqlalchemy import Column, String, TIMESTAMP, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.database.session import Base
+
+
+class ReconciliationCheckpoint(Base):
+    """
+    Progress of the balance reconciliation job (app/crud/reconciliation.py), one row per wallet.
+    last_principal_id is the last account of the last committed batch; NULL once a pass is complete.
+    """
+    __tablename__ = "reconciliation_checkpoints"
+
+    wallet = Column(String, primary_key=True)  # owner / vendor / admin
+    last_principal_id = Column(UUID(as_uuid=True), nullable=True)
+    checked = Column(Integer, nullable=False, default=0)
+    mismatched = Column(Integer, nullable=False, default=0)
+    fixed = Column(Integer, nullable=False, default=0)
+    started_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
@@ -1,5 +1,5 @@
 # models/transfer_transactions.py
-from sqlalchemy import Column, String, TIMESTAMP, Integer, func, Boolean, Enum as SqlEnum, ForeignKey, Text
+from sqlalchemy import Column, String, TIMESTAMP, Integer, func, Boolean, Enum as SqlEnum, ForeignKey, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
@@ -14,7 +14,7 @@ class TransferTransactions(Base):
     __tablename__ = "transfer_transactions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, index=True)
-    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendor.id"), nullable=False)
+    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendor.id"), nullable=False, index=True)
     requested_amount = Column(Integer, nullable=False)
     wallet_balance_before = Column(Integer, nullable=False)
     bank_balance_before = Column(Integer, nullable=False)
@@ -23,8 +23,15 @@ class TransferTransactions(Base):
     status = Column(
         SqlEnum(TransferStatusEnum, name="transfer_status_enum"),
         default=TransferStatusEnum.PENDING,
-        nullable=False
+        nullable=False,
+        index=True
     )
     admin_notes = Column(Text, nullable=True)  # Admin can add notes when approving/rejecting
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Approved transfers are the debits of the vendor wallet history (app/crud/vendor_wallet.py)
+        Index("ix_transfer_transactions_approved_vendor_id_updated_at", "vendor_id", updated_at.desc(),
+              postgresql_where=text("status = 'APPROVED'")),
+    )
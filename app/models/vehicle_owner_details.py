@@ -10,7 +10,7 @@ class VehicleOwnerDetails(Base):
     __tablename__ = "vehicle_owner_details"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, index=True)
-    vehicle_owner_id = Column(UUID(as_uuid=True), ForeignKey("vehicle_owner.id"), nullable=False)
+    vehicle_owner_id = Column(UUID(as_uuid=True), ForeignKey("vehicle_owner.id"), nullable=False, index=True)
     full_name = Column(String, nullable=False)
     primary_number = Column(String, unique=True, nullable=False)
     secondary_number = Column(String, unique=True, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, TIMESTAMP, Integer, func, ForeignKey, Enum as SqlEnum
+from sqlalchemy import Column, String, TIMESTAMP, Integer, func, ForeignKey, Enum as SqlEnum, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
@@ -14,8 +14,9 @@ class VendorWalletLedger(Base):
     __tablename__ = "vendor_wallet_ledger"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, index=True)
-    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendor.id"), nullable=False, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True, index=True)
+    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendor.id"), nullable=False)
+    # orders.id or orders_archive.id (closed orders are moved to the archive, see app/crud/archive.py)
+    order_id = Column(Integer, nullable=True, index=True)
     entry_type = Column(SqlEnum(VendorLedgerEntryType, name="vendor_wallet_entry_type_enum"), nullable=False)
     amount = Column(Integer, nullable=False)
     balance_before = Column(Integer, nullable=False)
@@ -23,4 +24,6 @@ class VendorWalletLedger(Base):
     notes = Column(String, nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
-
+    __table_args__ = (
+        Index("ix_vendor_wallet_ledger_vendor_id_created_at", "vendor_id", created_at.desc()),
+    )
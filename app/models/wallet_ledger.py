@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, TIMESTAMP, Integer, func, Enum as SqlEnum, ForeignKey, Text
+from sqlalchemy import Column, String, TIMESTAMP, Integer, func, Enum as SqlEnum, ForeignKey, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
@@ -24,4 +24,11 @@ class WalletLedger(Base):
     notes = Column(Text, nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index("ix_wallet_ledger_vehicle_owner_id_created_at", "vehicle_owner_id", created_at.desc()),
+        # A Razorpay payment is credited at most once (app/crud/wallet.py capture_rp_payment)
+        Index("ux_wallet_ledger_razorpay_payment", "reference_type", "reference_id", unique=True,
+              postgresql_where=text("reference_type = 'RAZORPAY_PAYMENT'")),
+    )
+
 
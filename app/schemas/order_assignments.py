@@ -82,6 +82,9 @@ class BaseResponce_pending_orders(BaseModel):
     trip_type: str
     car_type: str
     pickup_drop_location: dict
+    origin_label: Optional[str] = None
+    destination_label: Optional[str] = None
+    stop_count: Optional[int] = None
     start_date_time: datetime
     pick_near_city:str
     trip_distance: int
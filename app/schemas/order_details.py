@@ -114,6 +114,9 @@ class AdminOrderDetailResponse(BaseModel):
     trip_type: str
     car_type: str
     pickup_drop_location: Dict[str, Any]
+    origin_label: Optional[str] = None
+    destination_label: Optional[str] = None
+    stop_count: Optional[int] = None
     start_date_time: datetime
     customer_name: str
     customer_number: str
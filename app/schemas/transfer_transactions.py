@@ -1,6 +1,6 @@
 # schemas/transfer_transactions.py
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from enum import Enum
@@ -31,6 +31,28 @@ class AdminTransferAction(BaseModel):
             raise ValueError('Action must be either "approve" or "reject"')
         return v.lower()
 
+# --- Bulk Admin Action Schemas ---
+class BulkTransferItem(AdminTransferAction):
+    transaction_id: UUID
+
+class BulkTransferAction(BaseModel):
+    items: List[BulkTransferItem] = Field(..., min_length=1, description="Transfer requests to approve or reject")
+
+class BulkTransferItemResult(BaseModel):
+    transaction_id: UUID
+    action: str
+    success: bool
+    status: Optional[TransferStatusEnum] = None
+    vendor_id: Optional[UUID] = None
+    wallet_balance_after: Optional[int] = None
+    bank_balance_after: Optional[int] = None
+    detail: Optional[str] = None
+
+class BulkTransferResultOut(BaseModel):
+    processed: int
+    failed: int
+    results: List[BulkTransferItemResult]
+
 # --- Transfer Transaction Response Schema ---
 class TransferTransactionOut(BaseModel):
     id: UUID
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Optional, Dict
+from uuid import UUID
+
+
+class DocumentUploadUrlRequest(BaseModel):
+    """Request model for a pre-signed document upload URL"""
+    entity_type: str  # "vehicle_owner", "car", "driver"
+    entity_id: Optional[UUID] = None  # car / driver id; not needed for the vehicle owner's own documents
+    document_type: str  # e.g. "aadhar", "licence", "rc_front"
+    content_type: str  # e.g. "image/jpeg"
+
+
+class DocumentUploadCompleteRequest(BaseModel):
+    """Request model for recording a document uploaded through a pre-signed URL"""
+    entity_type: str
+    entity_id: Optional[UUID] = None
+    document_type: str
+    object_url: str  # object_url from the upload URL response
+
+
+class TripUploadUrlRequest(BaseModel):
+    """Request model for a pre-signed speedometer image upload URL"""
+    stage: str  # "start" or "end"
+    content_type: str
+
+
+class UploadUrlResponse(BaseModel):
+    """PUT the file to upload_url with exactly these headers, then hand object_url to the completion call"""
+    upload_url: str
+    method: str = "PUT"
+    headers: Dict[str, str]
+    object_url: str
+    expires_in_seconds: int
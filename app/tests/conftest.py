@@ -0,0 +1,88 @@
+"""
+Shared fixtures for database backed tests.
+
+Tests that need PostgreSQL use the `pg_engine` fixture. It is skipped unless
+TEST_DATABASE_URL is set, e.g.
+
+    TEST_DATABASE_URL=postgresql+psycopg2://drop-cars:pw@localhost:5432/drop-cars python -m pytest app/tests
+
+Each test session creates its own throwaway schema, creates all tables in it and drops it afterwards.
+
+`query_budget` asserts how many SQL statements an endpoint (TestClient call) or crud call may run.
+"""
+
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+from app.core import db_metrics
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+
+    from app.database.migrations import load_models
+    from app.database.session import Base
+    load_models()
+
+    schema = f"test_{uuid.uuid4().hex[:10]}"
+    admin_engine = create_engine(TEST_DATABASE_URL)
+    with admin_engine.begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+
+    engine = create_engine(TEST_DATABASE_URL, connect_args={"options": f"-c search_path={schema}"})
+    try:
+        Base.metadata.create_all(bind=engine)
+        yield engine
+    finally:
+        engine.dispose()
+        with admin_engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin_engine.dispose()
+
+
+@pytest.fixture
+def query_budget(monkeypatch):
+    """
+    Assert a SQL statement budget for the calls made inside the block:
+
+        with query_budget(max_queries=3, max_repeats=1):
+            client.get("/api/admin/orders")
+
+    Covers requests served through db_metrics_middleware as well as direct crud calls.
+    `max_repeats` caps how often a single statement shape may run (N+1 guard).
+    """
+    captured = []
+    report = db_metrics.report
+
+    def capture(method, path, stats):
+        captured.append(stats)
+        report(method, path, stats)
+
+    monkeypatch.setattr(db_metrics, "report", capture)
+
+    @contextmanager
+    def budget(max_queries, max_repeats=None):
+        captured.clear()
+        with db_metrics.track_queries() as direct:
+            yield captured
+        captured.append(direct)
+
+        total = sum(stats.count for stats in captured)
+        assert total <= max_queries, f"{total} queries, budget {max_queries}"
+        if max_repeats is not None:
+            for stats in captured:
+                for shape, n in stats.shapes.most_common(1):
+                    assert n <= max_repeats, f"statement repeated {n} times (max {max_repeats}): {shape[:200]}"
+
+    return budget
@@ -0,0 +1,113 @@
+"""
+Tests for the unified admin accounts listing (get_all_accounts_unified). Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'acct-v' || g, 'x', (ARRAY['ACTIVE', 'INACTIVE', 'PENDING'])[1 + g % 3]::account_status_enum, 0
+FROM generate_series(1, 7) g;
+
+INSERT INTO vendor_details(id, vendor_id, full_name, primary_number, wallet_balance, bank_balance, gpay_number, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), v.id, 'Vendor ' || v.primary_number, v.primary_number, 0, 0, v.primary_number, v.primary_number, 'Street', 'Chennai', '600001'
+FROM vendor v WHERE v.primary_number LIKE 'acct-v%';
+
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'acct-o' || g, 'x', (ARRAY['ACTIVE', 'INACTIVE', 'PENDING'])[1 + g % 3]::account_status_enum, 0
+FROM generate_series(1, 5) g;
+
+INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), o.id, 'Owner ' || o.primary_number, o.primary_number, 0, o.primary_number, 'Street', 'Chennai', '600001'
+FROM vehicle_owner o WHERE o.primary_number LIKE 'acct-o%';
+
+INSERT INTO car_driver(id, vehicle_owner_id, full_name, primary_number, hashed_password, licence_number, address, city, pincode, driver_status, token_version)
+SELECT gen_random_uuid(), (SELECT id FROM vehicle_owner WHERE primary_number = 'acct-o1'), 'Driver ' || g, 'acct-d' || g, 'x', 'acct-d' || g,
+       'Street', 'Chennai', '600001', (ARRAY['ONLINE', 'OFFLINE', 'DRIVING', 'BLOCKED', 'PROCESSING'])[1 + g % 5]::driver_status_enum, 0
+FROM generate_series(1, 6) g
+"""
+
+EXPECTED_SQL = """
+SELECT * FROM (
+    SELECT 0 AS rank, v.id, d.full_name AS name, 'vendor' AS account_type, v.account_status::text AS status
+    FROM vendor v JOIN vendor_details d ON d.vendor_id = v.id
+    UNION ALL
+    SELECT 1, o.id, d.full_name, 'vehicle_owner', o.account_status::text
+    FROM vehicle_owner o JOIN vehicle_owner_details d ON d.vehicle_owner_id = o.id
+    UNION ALL
+    SELECT 2, c.id, c.full_name, 'driver', c.driver_status::text FROM car_driver c
+) a ORDER BY rank, id
+"""
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    with pg_engine.begin() as conn:
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement))
+    return sessionmaker(bind=pg_engine)
+
+
+@pytest.fixture(scope="module")
+def expected(pg_engine, Session):
+    with pg_engine.connect() as conn:
+        return conn.execute(text(EXPECTED_SQL)).all()
+
+
+def test_counts_and_first_page(Session, expected, query_budget):
+    from app.crud.admin_management import get_all_accounts_unified
+
+    db = Session()
+    try:
+        with query_budget(max_queries=2):
+            accounts, total, active, inactive = get_all_accounts_unified(db, skip=0, limit=5)
+    finally:
+        db.close()
+
+    assert total == len(expected)
+    assert active == sum(1 for row in expected if row.status in ("ACTIVE", "ONLINE", "DRIVING"))
+    assert inactive == total - active
+    assert [a["id"] for a in accounts] == [row.id for row in expected[:5]]
+    # Vendor / owner statuses keep their display values
+    assert {a["account_status"] for a in accounts if a["account_type"] == "vendor"} <= {"Active", "Inactive", "Pending"}
+
+
+def test_cursor_walks_every_account_once(Session, expected):
+    from app.crud.admin_management import get_all_accounts_unified, encode_account_cursor
+
+    db = Session()
+    try:
+        seen, cursor = [], None
+        while True:
+            page, *_ = get_all_accounts_unified(db, limit=4, cursor=cursor)
+            seen.extend(page)
+            if len(page) < 4:
+                break
+            cursor = encode_account_cursor(page[-1])
+        by_offset, *_ = get_all_accounts_unified(db, skip=4, limit=4)
+    finally:
+        db.close()
+
+    assert [(a["account_type"], a["id"]) for a in seen] == [(row.account_type, row.id) for row in expected]
+    assert by_offset == seen[4:8]
+
+
+def test_filters(Session, expected):
+    from app.crud.admin_management import get_all_accounts_unified
+
+    db = Session()
+    try:
+        drivers, total, active, _ = get_all_accounts_unified(db, account_type="quickdriver", status_filter="active")
+        pending, *_ = get_all_accounts_unified(db, status_filter="pending")
+        nothing, total_unknown, *_ = get_all_accounts_unified(db, account_type="admin")
+    finally:
+        db.close()
+
+    assert total == active == sum(1 for row in expected if row.status in ("ONLINE", "DRIVING"))
+    assert all(a["account_type"] == "driver" for a in drivers)
+    # A vendor/owner status does not filter drivers (unchanged behaviour)
+    assert sum(1 for a in pending if a["account_type"] == "driver") == sum(1 for row in expected if row.rank == 2)
+    assert {a["account_status"] for a in pending if a["account_type"] != "driver"} == {"Pending"}
+    assert nothing == [] and total_unknown == 0
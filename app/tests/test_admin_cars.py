@@ -0,0 +1,66 @@
+"""
+Tests for the admin car listing (get_all_cars_unified). Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+OWNER_ID = uuid.uuid4()
+
+SEED_SQL = """
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:owner_id, 'cars-owner', 'x', 'ACTIVE', 0);
+
+INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode)
+VALUES (gen_random_uuid(), :owner_id, 'Cars Owner', 'cars-owner', 0, 'cars-owner', 'Street', 'Chennai', '600001');
+
+-- 20 cars: statuses cycle ONLINE, DRIVING, BLOCKED, PROCESSING; odd cars are SUVs
+INSERT INTO car_details(id, vehicle_owner_id, car_name, car_type, car_number, car_status)
+SELECT gen_random_uuid(), :owner_id, 'Car ' || g, (ARRAY['HATCHBACK', 'SUV'])[1 + g % 2]::car_type_enum, 'cars-' || g,
+       (ARRAY['ONLINE', 'DRIVING', 'BLOCKED', 'PROCESSING'])[1 + g % 4]::car_status_enum
+FROM generate_series(0, 19) g
+"""
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    with pg_engine.begin() as conn:
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement), {"owner_id": OWNER_ID})
+    return sessionmaker(bind=pg_engine)
+
+
+@pytest.mark.parametrize("limit", [1, 20])
+def test_two_queries_whatever_the_page_size(Session, query_budget, limit):
+    from app.crud.admin_management import get_all_cars_unified
+
+    db = Session()
+    try:
+        with query_budget(max_queries=2):
+            cars, total, online, blocked, processing, driving = get_all_cars_unified(db, limit=limit, vehicle_owner_id=OWNER_ID)
+    finally:
+        db.close()
+
+    assert len(cars) == limit
+    assert (total, online, blocked, processing, driving) == (20, 5, 5, 5, 5)
+    assert {car["vehicle_owner_name"] for car in cars} == {"Cars Owner"}
+
+
+def test_filters_apply_to_total_but_not_status_counts(Session):
+    from app.crud.admin_management import get_all_cars_unified
+
+    db = Session()
+    try:
+        cars, total, online, blocked, processing, driving = get_all_cars_unified(
+            db, vehicle_owner_id=OWNER_ID, status_filter="online", car_type_filter="hatchback"
+        )
+    finally:
+        db.close()
+
+    # ONLINE cars are g = 0, 4, 8, ...: all even, so all HATCHBACK
+    assert total == len(cars) == 5
+    assert {(car["car_status"], car["car_type"]) for car in cars} == {("ONLINE", "HATCHBACK")}
+    assert (online, blocked, processing, driving) == (5, 5, 5, 5)
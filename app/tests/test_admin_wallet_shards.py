@@ -0,0 +1,167 @@
+"""
+Tests for the striped admin wallet (AdminWalletShard, credit / fold / debit in app/crud/admin_wallet.py).
+Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from cachetools import TTLCache
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import admin_wallet
+
+ADMIN_ID = uuid.uuid4()
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    with pg_engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO admin(id, username, email, phone, role, organization_id, balance) "
+                 "VALUES (:id, 'shard-admin', 'shard-admin@example.com', '9999999999', 'Owner', gen_random_uuid(), 100)"),
+            {"id": ADMIN_ID},
+        )
+    yield sessionmaker(bind=pg_engine)
+    # The schema is shared by the whole session (test_partitions.py counts admin_wallet_ledger rows)
+    with pg_engine.begin() as conn:
+        for table, column in (("admin_wallet_ledger", "admin_id"), ("admin_wallet_shards", "admin_id"), ("admin", "id")):
+            conn.execute(text(f"DELETE FROM {table} WHERE {column} = :id"), {"id": ADMIN_ID})
+
+
+def admin_row_and_shards(Session):
+    with Session() as db:
+        row = db.execute(text("SELECT balance FROM admin WHERE id = :id"), {"id": ADMIN_ID}).scalar_one()
+        shards = db.execute(text("SELECT shard, balance FROM admin_wallet_shards WHERE admin_id = :id"), {"id": ADMIN_ID}).all()
+    return row, dict(shards)
+
+
+def credit(Session, amount, order_id):
+    with Session() as db:
+        admin_wallet.credit_admin_wallet(db, admin_id=str(ADMIN_ID), amount=amount, order_id=order_id)
+        db.commit()
+
+
+def test_credits_go_to_shards_and_fold_into_the_admin_row(Session):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: credit(Session, 7, i), range(200)))
+
+    row, shards = admin_row_and_shards(Session)
+    assert row == 100  # the admin row itself was never locked
+    assert len(shards) == admin_wallet.ADMIN_WALLET_SHARDS and sum(shards.values()) == 1400
+    with Session() as db:
+        assert admin_wallet.get_admin_balance(db, str(ADMIN_ID)) == 1500
+
+        assert admin_wallet.fold_admin_wallet_shards(db, str(ADMIN_ID)) == 1400
+        db.commit()
+        assert admin_wallet.get_admin_balance(db, str(ADMIN_ID)) == 1500
+    assert admin_row_and_shards(Session) == (1500, dict.fromkeys(shards, 0))
+
+
+def test_debit_sees_credits_still_in_shards(Session):
+    before = admin_row_and_shards(Session)[0]
+    credit(Session, 50, 1)
+
+    with Session() as db:
+        balance, entry = admin_wallet.debit_admin_wallet(db, admin_id=str(ADMIN_ID), amount=before + 50, order_id=1)
+        assert balance == 0 and entry.balance_before == before + 50
+        db.commit()
+    row, shards = admin_row_and_shards(Session)
+    assert row == 0 and set(shards.values()) == {0}
+
+
+def test_credit_ledger_entry_is_written_with_the_shard(Session, query_budget):
+    with Session() as db:
+        # The last fold left the shard rows at 0: the credit is one UPDATE, nothing is re-created
+        with query_budget(max_queries=1):
+            admin_wallet.credit_admin_wallet(db, admin_id=str(ADMIN_ID), amount=1, order_id=4)
+        assert sum(admin_row_and_shards(Session)[1].values()) == 0  # not committed yet
+        db.commit()
+        assert sum(admin_row_and_shards(Session)[1].values()) == 1
+
+        start = admin_wallet.get_admin_balance(db, str(ADMIN_ID))
+        with query_budget(max_queries=1):
+            balance, entry = admin_wallet.credit_admin_wallet(db, admin_id=str(ADMIN_ID), amount=9, order_id=5, notes="profit")
+        assert (entry.balance_before, entry.balance_after, balance) == (start, start + 9, start + 9)
+        assert entry.order_id == 5 and entry.notes == "profit"
+        db.rollback()
+
+
+def test_folds_during_credits_lose_nothing(Session):
+    with Session() as db:
+        start = admin_wallet.get_admin_balance(db, str(ADMIN_ID))
+
+    def fold(_):
+        with Session() as db:
+            admin_wallet.fold_admin_wallet_shards(db, str(ADMIN_ID))
+            db.commit()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        credits = [pool.submit(credit, Session, 3, i) for i in range(200)]
+        list(pool.map(fold, range(20)))
+        for future in credits:
+            future.result()
+
+    with Session() as db:
+        assert admin_wallet.get_admin_balance(db, str(ADMIN_ID)) == start + 600
+
+
+def test_unsharded_credit_updates_the_admin_row(Session, monkeypatch):
+    monkeypatch.setattr(admin_wallet, "ADMIN_WALLET_SHARDS", 0)
+    row, shards = admin_row_and_shards(Session)
+    credit(Session, 4, 2)
+    assert admin_row_and_shards(Session) == (row + 4, shards)
+
+
+def test_platform_admin_id_is_cached(Session, query_budget, monkeypatch):
+    monkeypatch.setattr(admin_wallet, "_admin_id_cache", TTLCache(maxsize=1, ttl=60))
+    with Session() as db:
+        admin_id = admin_wallet.get_platform_admin_id(db)
+        with query_budget(max_queries=0):
+            assert admin_wallet.get_platform_admin_id(db) == admin_id
+    assert admin_id is not None
+
+
+
+def test_admin_endpoints_report_the_balance_in_shards(Session, query_budget, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api.routes import admin
+    from app.core.security import get_current_admin
+    from app.database.session import get_db
+    from app.models.admin import Admin
+
+    credit(Session, 25, 3)
+    row, shards = admin_row_and_shards(Session)
+    balance = row + sum(shards.values())
+    assert shards and balance != row
+    with Session() as db:
+        with query_budget(max_queries=1):
+            assert admin_wallet.get_admin_balances(db, [ADMIN_ID, uuid.uuid4()]) == {str(ADMIN_ID): balance}
+        current_admin = db.get(Admin, ADMIN_ID)
+        db.expunge(current_admin)
+
+    def get_session():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/api")
+    app.dependency_overrides[get_db] = get_session
+    app.dependency_overrides[get_current_admin] = lambda: current_admin
+    client = TestClient(app)
+
+    response = client.get("/api/admin/profile")
+    assert response.status_code == 200, response.text
+    assert response.json()["balance"] == balance
+    response = client.get(f"/api/admin/{ADMIN_ID}")
+    assert response.status_code == 200, response.text
+    assert response.json()["balance"] == balance
+    # Admins seeded by other modules have no email (not a valid AdminOut), list this one only
+    monkeypatch.setattr(admin, "get_all_admins", lambda db, skip, limit: ([db.get(Admin, ADMIN_ID)], 1))
+    assert [out["balance"] for out in client.get("/api/admin/list").json()] == [balance]
@@ -0,0 +1,113 @@
+"""
+Tests for the closed order archive (app/crud/archive.py). Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+VENDOR_ID = uuid.uuid4()
+OWNER_ID = uuid.uuid4()
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:vendor_id, 'archive-vendor', 'x', 'ACTIVE', 0);
+
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:owner_id, 'archive-owner', 'x', 'ACTIVE', 0);
+
+INSERT INTO new_orders(vendor_id, trip_type, car_type, pickup_drop_location, start_date_time, customer_name,
+                       customer_number, cost_per_km, extra_cost_per_km, driver_allowance, extra_driver_allowance,
+                       permit_charges, extra_permit_charges, hill_charges, toll_charges, trip_status,
+                       pick_near_city, trip_distance, trip_time, platform_fees_percent, created_at)
+SELECT :vendor_id, 'ONEWAY', 'SEDAN_4_PLUS_1', '{"0": "Chennai", "1": "Madurai"}', now(), 'Customer', '9999999999',
+       12, 2, 300, 50, 0, 0, 0, 0, 'PENDING', ARRAY['Chennai'], 450, '8 hours', 10, now() - (g * interval '30 days')
+FROM generate_series(1, 12) g;
+
+-- Orders 1-12 months old; every 4th one is still PENDING and must stay
+INSERT INTO orders(source, source_order_id, vendor_id, trip_type, car_type, pickup_drop_location, start_date_time,
+                   customer_name, customer_number, trip_status, trip_distance, vendor_fees_percent, platform_fees_percent, created_at)
+SELECT 'NEW_ORDERS', n.order_id, n.vendor_id, 'ONEWAY', 'SEDAN_4_PLUS_1', n.pickup_drop_location, now(),
+       'Customer', '9999999999',
+       CASE WHEN row_number() OVER (ORDER BY n.order_id) % 4 = 0 THEN 'PENDING' ELSE 'COMPLETED' END::"Trip_status",
+       450, 10, 10, n.created_at
+FROM new_orders n WHERE n.vendor_id = :vendor_id;
+
+INSERT INTO order_assignments(order_id, vehicle_owner_id, assignment_status, created_at)
+SELECT o.id, :owner_id, 'COMPLETED', o.created_at FROM orders o WHERE o.vendor_id = :vendor_id;
+"""
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    with pg_engine.begin() as conn:
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement), {"vendor_id": VENDOR_ID, "owner_id": OWNER_ID})
+    return sessionmaker(bind=pg_engine)
+
+
+def counts(conn, table):
+    hot = conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+    archived = conn.execute(text(f"SELECT count(*) FROM {table}_archive")).scalar()
+    return hot, archived
+
+
+def test_locked_orders_are_skipped(pg_engine, Session):
+    from app.crud.archive import archive_batch
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=100)
+    with pg_engine.connect() as locker:
+        locked_id = locker.execute(text(
+            "SELECT id FROM orders WHERE vendor_id = :v AND trip_status = 'COMPLETED' ORDER BY id LIMIT 1 FOR UPDATE"
+        ), {"v": VENDOR_ID}).scalar()
+
+        db = Session()
+        try:
+            moved = archive_batch(db, cutoff, batch_size=2)
+        finally:
+            db.close()
+        locker.rollback()
+
+    assert moved["orders"] == 2
+    with pg_engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM orders WHERE id = :id"), {"id": locked_id}).scalar() == 1
+
+
+def test_archive_moves_only_old_closed_orders(pg_engine, Session):
+    from app.crud.archive import archive_closed_orders
+
+    db = Session()
+    try:
+        archive_closed_orders(db, older_than_days=100, batch_size=2)
+    finally:
+        db.close()
+
+    with pg_engine.connect() as conn:
+        left = conn.execute(text(
+            "SELECT trip_status, created_at < now() - interval '100 days' FROM orders WHERE vendor_id = :v"
+        ), {"v": VENDOR_ID}).all()
+        # Months 1-3 plus the old PENDING orders (months 4, 8, 12) stay hot
+        assert len(left) == 6
+        assert all(status == "PENDING" or not old for status, old in left)
+        assert counts(conn, "orders")[1] == 6
+        assert counts(conn, "order_assignments")[1] == 6
+        assert counts(conn, "new_orders")[1] == 6
+
+
+def test_vendor_orders_include_archived(Session):
+    from app.crud.orders import get_vendor_orders
+
+    db = Session()
+    try:
+        hot = get_vendor_orders(db, VENDOR_ID)
+        everything = get_vendor_orders(db, VENDOR_ID, include_archived=True)
+    finally:
+        db.close()
+
+    assert len(hot) == 6
+    assert len(everything) == 12
+    created = [order["created_at"] for order in everything]
+    assert created == sorted(created, reverse=True)
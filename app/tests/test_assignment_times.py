@@ -0,0 +1,98 @@
+"""
+Tests for the longest assignment window per trip type (/max-assignment-times,
+get_max_time_to_assign_by_trip_type in app/crud/orders.py). Requires TEST_DATABASE_URL (see conftest.py).
+
+Runs inside one outer transaction that is rolled back: the windows of the orders other modules created
+are zeroed so the aggregate only sees this module's orders.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from cachetools import TTLCache
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+VENDOR_ID = uuid.uuid4()
+
+SEED_SQL = """
+UPDATE orders SET max_time_to_assign_order = created_at;
+
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:vendor_id, 'assign-vendor', 'x', 'ACTIVE', 0);
+
+INSERT INTO orders(source, source_order_id, vendor_id, trip_type, car_type, pickup_drop_location, start_date_time,
+                   customer_name, customer_number, trip_status, created_at, max_time_to_assign_order)
+SELECT 'NEW_ORDERS', g, :vendor_id, t.trip_type::"ORDER_TYPE_ENUM", 'SEDAN_4_PLUS_1', '{"0": "Chennai", "1": "Madurai"}', now(),
+       'Customer', '9999999999', 'PENDING', now() - g * interval '1 hour',
+       now() - g * interval '1 hour' + t.minutes * interval '1 minute' + interval '59 seconds'
+FROM (VALUES ('ONEWAY', 20), ('ONEWAY', 45), ('ROUND_TRIP', 90), ('ROUND_TRIP', 30), ('HOURLY_RENTAL', -5)) AS t(trip_type, minutes),
+     generate_series(1, 3) g
+"""
+
+
+@pytest.fixture
+def db(pg_engine, monkeypatch):
+    from app.crud import orders
+    monkeypatch.setattr(orders, "_max_assign_time_cache", TTLCache(maxsize=1, ttl=60))
+
+    with pg_engine.connect() as conn:
+        transaction = conn.begin()
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement), {"vendor_id": VENDOR_ID})
+        session = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+
+
+def test_one_aggregate_then_cached(db, query_budget):
+    from app.crud.orders import get_max_time_to_assign_by_trip_type, get_max_time_for_trip_type
+    from app.models.new_orders import OrderTypeEnum
+
+    expected = {"Oneway": 45, "Round Trip": 90, "Multy City": 15, "Hourly Rental": 15}
+    db.execute(text("SELECT 1"))  # opens the session's savepoint outside the budget
+    with query_budget(max_queries=1):
+        assert get_max_time_to_assign_by_trip_type(db) == expected
+    with query_budget(max_queries=0):
+        assert get_max_time_to_assign_by_trip_type(db) == expected
+        assert get_max_time_for_trip_type(db, OrderTypeEnum.ROUND_TRIP) == 90
+
+
+def test_new_orders_raise_the_cached_maximum(db, query_budget):
+    from app.crud.orders import get_max_time_to_assign_by_trip_type, note_order_assign_time
+    from app.models.new_orders import OrderTypeEnum
+    from app.models.orders import Order
+
+    get_max_time_to_assign_by_trip_type(db)
+    created_at = datetime.now(timezone.utc)
+    for trip_type, minutes in ((OrderTypeEnum.ONEWAY, 30), (OrderTypeEnum.ONEWAY, 120), (OrderTypeEnum.MULTY_CITY, 10)):
+        note_order_assign_time(Order(trip_type=trip_type, created_at=created_at,
+                                     max_time_to_assign_order=created_at + timedelta(minutes=minutes)))
+
+    with query_budget(max_queries=0):
+        max_times = get_max_time_to_assign_by_trip_type(db)
+    assert max_times == {"Oneway": 120, "Round Trip": 90, "Multy City": 10, "Hourly Rental": 15}
+
+
+def test_concurrent_notes_keep_the_largest_window(db):
+    from concurrent.futures import ThreadPoolExecutor
+    from app.crud.orders import get_max_time_to_assign_by_trip_type, get_max_time_for_trip_type, note_order_assign_time
+    from app.models.new_orders import OrderTypeEnum
+    from app.models.orders import Order
+
+    get_max_time_to_assign_by_trip_type(db)
+    created_at = datetime.now(timezone.utc)
+
+    def note(minutes):
+        note_order_assign_time(Order(trip_type=OrderTypeEnum.MULTY_CITY, created_at=created_at,
+                                     max_time_to_assign_order=created_at + timedelta(minutes=minutes)))
+        return get_max_time_for_trip_type(db, OrderTypeEnum.MULTY_CITY)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        seen = list(pool.map(note, range(1, 801)))
+    assert all(minutes >= 1 for minutes in seen)
+    assert get_max_time_for_trip_type(db, OrderTypeEnum.MULTY_CITY) == 800
@@ -0,0 +1,85 @@
+"""
+Tests for the per-request SQL statement counter (app/core/db_metrics.py).
+Uses an in-memory SQLite engine, no PostgreSQL needed.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core import db_metrics
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (id, name) VALUES (1, 'a'), (2, 'b'), (3, 'c')"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine):
+    app = FastAPI()
+    app.middleware("http")(db_metrics.db_metrics_middleware)
+
+    @app.get("/items/batched")
+    def batched():
+        with engine.connect() as conn:
+            return [row.name for row in conn.execute(text("SELECT name FROM items WHERE id IN (1, 2, 3)"))]
+
+    @app.get("/items/looped")
+    def looped():
+        with engine.connect() as conn:
+            return [
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": item_id}).scalar_one()
+                for item_id in (1, 2, 3)
+            ]
+
+    return TestClient(app)
+
+
+def test_statement_shape_ignores_parameters():
+    one = db_metrics.statement_shape("SELECT *\n  FROM orders WHERE id IN (%(id_1_1)s)")
+    many = db_metrics.statement_shape("SELECT * FROM orders WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)")
+    assert one == many == "SELECT * FROM orders WHERE id IN (?)"
+
+
+def test_track_queries_counts_and_detects_repeats(engine):
+    with db_metrics.track_queries() as stats:
+        with engine.connect() as conn:
+            for item_id in (1, 2, 3):
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": item_id})
+    assert stats.count == 3
+    assert stats.total_time > 0
+    assert stats.repeated(threshold=3) == [("SELECT name FROM items WHERE id = ?", 3)]
+
+
+def test_queries_outside_tracking_are_ignored(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    with db_metrics.track_queries() as stats:
+        pass
+    assert stats.count == 0
+
+
+def test_middleware_adds_headers(client):
+    response = client.get("/items/looped")
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "3"
+    assert response.headers["X-DB-Time"].endswith("ms")
+
+
+def test_query_budget_passes_for_batched_endpoint(client, query_budget):
+    with query_budget(max_queries=1, max_repeats=1):
+        client.get("/items/batched")
+
+
+def test_query_budget_flags_n_plus_one(client, query_budget):
+    with pytest.raises(AssertionError, match="repeated 3 times"):
+        with query_budget(max_queries=10, max_repeats=1):
+            client.get("/items/looped")
@@ -0,0 +1,277 @@
+"""
+Tests for direct uploads through pre-signed URLs (app/api/routes/uploads.py, app/crud/direct_uploads.py).
+Each test runs against the GCS backend talking to a local emulator stand-in (XML PUT + JSON get/delete,
+as fake-gcs-server) and against the local filesystem backend (app/api/routes/storage.py).
+Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import unquote, urlparse
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import storage
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.utils import gcs, storage as storage_module
+
+VENDOR_ID = uuid.uuid4()
+OWNER_ID = uuid.uuid4()
+OTHER_OWNER_ID = uuid.uuid4()
+CAR_ID = uuid.uuid4()
+DRIVER_ID = uuid.uuid4()
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:vendor_id, 'uploads-vendor', 'x', 'ACTIVE', 0);
+
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:owner_id, 'uploads-owner', 'x', 'ACTIVE', 0), (:other_owner_id, 'uploads-other', 'x', 'ACTIVE', 0);
+
+INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode)
+VALUES (gen_random_uuid(), :owner_id, 'Uploads Owner', 'uploads-owner', 0, 'uploads-owner', 'Street', 'Chennai', '600001');
+
+INSERT INTO car_details(id, vehicle_owner_id, car_name, car_type, car_number, car_status)
+VALUES (:car_id, :owner_id, 'Car', 'SUV', 'uploads-car', 'ONLINE');
+
+INSERT INTO car_driver(id, vehicle_owner_id, full_name, primary_number, hashed_password, licence_number, address, city, pincode, driver_status, token_version)
+VALUES (:driver_id, :owner_id, 'Driver', 'uploads-driver', 'x', 'uploads-driver', 'Street', 'Chennai', '600001', 'ONLINE', 0);
+
+INSERT INTO orders(id, source, source_order_id, vendor_id, trip_type, car_type, pickup_drop_location, start_date_time,
+                   customer_name, customer_number, trip_status, trip_distance, vendor_fees_percent, platform_fees_percent)
+VALUES (987654, 'HOURLY_RENTAL', 1, :vendor_id, 'ONEWAY', 'SUV', '{"0": "Chennai", "1": "Madurai"}', now(),
+        'Customer', '9999999999', 'PENDING', 450, 10, 10);
+
+INSERT INTO order_assignments(order_id, vehicle_owner_id, driver_id, car_id, assignment_status, created_at)
+VALUES (987654, :owner_id, :driver_id, :car_id, 'ASSIGNED', now())
+"""
+
+
+class EmulatorHandler(BaseHTTPRequestHandler):
+    objects = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _object_name(self):
+        path = urlparse(self.path).path
+        json_prefix = f"/storage/v1/b/{gcs.GCS_BUCKET_NAME}/o/"
+        if path.startswith(json_prefix):
+            return unquote(path[len(json_prefix):])
+        return unquote(path[len(f"/{gcs.GCS_BUCKET_NAME}/"):])
+
+    def _reply(self, code, body=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_PUT(self):
+        data = self.rfile.read(int(self.headers["Content-Length"]))
+        self.objects[self._object_name()] = (data, self.headers["Content-Type"])
+        self._reply(200)
+
+    def do_GET(self):
+        name = self._object_name()
+        if name not in self.objects:
+            return self._reply(404, {"error": {"code": 404, "message": "Not found"}})
+        data, content_type = self.objects[name]
+        self._reply(200, {"bucket": gcs.GCS_BUCKET_NAME, "name": name, "size": str(len(data)), "contentType": content_type})
+
+    def do_DELETE(self):
+        self.objects.pop(self._object_name(), None)
+        self._reply(204)
+
+
+@pytest.fixture(params=["gcs-emulator", "local"])
+def backend(request, monkeypatch, tmp_path):
+    """The storage backend under test and a function doing the client side PUT of an upload URL."""
+    if request.param == "gcs-emulator":
+        EmulatorHandler.objects = {}
+        server = ThreadingHTTPServer(("127.0.0.1", 0), EmulatorHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host = f"http://127.0.0.1:{server.server_port}"
+        client = storage.Client(project="test", credentials=AnonymousCredentials(), client_options={"api_endpoint": host})
+        monkeypatch.setattr(storage_module, "STORAGE_EMULATOR_HOST", host)
+        monkeypatch.setattr(storage_module, "_backend", storage_module.GCSBackend(gcs.GCS_BUCKET_NAME, client=client))
+        request.addfinalizer(server.shutdown)
+        yield storage_module.get_storage(), lambda _client, url, **kwargs: httpx.put(url, **kwargs)
+    else:
+        monkeypatch.setattr(storage_module, "_backend", storage_module.LocalStorageBackend(
+            root=str(tmp_path), base_url="http://testserver/api/storage", signing_key="test"
+        ))
+        yield storage_module.get_storage(), lambda client, url, **kwargs: client.put(url, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    with pg_engine.begin() as conn:
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement), {
+                "vendor_id": VENDOR_ID, "owner_id": OWNER_ID, "other_owner_id": OTHER_OWNER_ID, "car_id": CAR_ID,
+                "driver_id": DRIVER_ID,
+            })
+    return sessionmaker(bind=pg_engine)
+
+
+@pytest.fixture
+def client(Session, backend):
+    from app.api.routes import uploads, storage as storage_routes
+    from app.core.security import get_current_user, get_current_driver
+    from app.database.session import get_db
+
+    def db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(uploads.router, prefix="/api")
+    app.include_router(storage_routes.router, prefix="/api")
+    app.dependency_overrides[get_db] = db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=app.state.owner_id)
+    app.dependency_overrides[get_current_driver] = lambda: SimpleNamespace(id=DRIVER_ID)
+    app.state.owner_id = OWNER_ID
+    test_client = TestClient(app)
+    _, put_url = backend
+    app.state.put = lambda upload, data=b"\xff\xd8 image", headers=None: put_url(
+        test_client, upload["upload_url"], content=data, headers=headers or upload["headers"]
+    )
+    return test_client, app.state
+
+
+def test_document_upload_is_recorded_after_completion(client, Session):
+    client, state = client
+    request = {"entity_type": "car", "entity_id": str(CAR_ID), "document_type": "rc_front", "content_type": "image/jpeg"}
+    upload = client.post("/api/uploads/documents/upload-url", json=request).json()
+
+    assert upload["object_url"].startswith(gcs.public_url_for(f"car_details/{CAR_ID}/rc_front/"))
+    assert upload["headers"]["Content-Type"] == "image/jpeg"
+
+    complete = {key: request[key] for key in ("entity_type", "entity_id", "document_type")}
+    complete["object_url"] = upload["object_url"]
+    # Not uploaded yet
+    assert client.post("/api/uploads/documents/complete", json=complete).status_code == 400
+
+    assert state.put(upload).status_code == 200
+    response = client.post("/api/uploads/documents/complete", json=complete)
+    assert response.status_code == 200
+    assert response.json()["new_status"] == "Pending"
+
+    db = Session()
+    try:
+        url, status = db.execute(text("SELECT rc_front_img_url, rc_front_status FROM car_details WHERE id = :id"), {"id": CAR_ID}).one()
+    finally:
+        db.close()
+    assert (url, status) == (upload["object_url"], "PENDING")
+
+
+def test_replaced_aadhar_image_is_deleted(client, Session, backend):
+    client, state = client
+    storage_backend, _ = backend
+    old_upload = storage_backend.sign("vehicle_owner_details/aadhar/old.jpg", 1, method="PUT", content_type="image/jpeg")
+    state.put({"upload_url": old_upload, "headers": {"Content-Type": "image/jpeg"}}, data=b"old")
+    with Session.begin() as db:
+        db.execute(text("UPDATE vehicle_owner_details SET aadhar_front_img = :url WHERE vehicle_owner_id = :id"),
+                   {"url": storage_backend.public_url("vehicle_owner_details/aadhar/old.jpg"), "id": OWNER_ID})
+
+    request = {"entity_type": "vehicle_owner", "document_type": "aadhar", "content_type": "image/png"}
+    upload = client.post("/api/uploads/documents/upload-url", json=request).json()
+    state.put(upload)
+
+    complete = {"entity_type": "vehicle_owner", "document_type": "aadhar", "object_url": upload["object_url"]}
+    assert client.post("/api/uploads/documents/complete", json=complete).status_code == 200
+    assert not storage_backend.exists("vehicle_owner_details/aadhar/old.jpg")
+    assert storage_backend.stat(storage_backend.blob_name(upload["object_url"])).content_type == "image/png"
+
+
+def test_completion_rejects_objects_outside_the_document_folder(client):
+    client, state = client
+    # Upload URL for the driver licence, completed as the car's RC
+    upload = client.post("/api/uploads/documents/upload-url", json={
+        "entity_type": "driver", "entity_id": str(DRIVER_ID), "document_type": "licence", "content_type": "image/jpeg"
+    }).json()
+    state.put(upload)
+    response = client.post("/api/uploads/documents/complete", json={
+        "entity_type": "car", "entity_id": str(CAR_ID), "document_type": "rc_back", "object_url": upload["object_url"]
+    })
+    assert response.status_code == 400
+
+
+def test_wrong_content_type_is_not_recorded(client, backend):
+    client, state = client
+    storage_backend, _ = backend
+    upload = client.post("/api/uploads/documents/upload-url", json={
+        "entity_type": "car", "entity_id": str(CAR_ID), "document_type": "fc", "content_type": "image/jpeg"
+    }).json()
+    # Refused by a signature check (local), or stored and deleted at completion (emulator, which does not check)
+    state.put(upload, data=b"%PDF", headers={"Content-Type": "application/pdf"})
+
+    response = client.post("/api/uploads/documents/complete", json={
+        "entity_type": "car", "entity_id": str(CAR_ID), "document_type": "fc", "object_url": upload["object_url"]
+    })
+    assert response.status_code == 400
+    assert not storage_backend.exists(storage_backend.blob_name(upload["object_url"]))
+
+
+def test_upload_url_checks_ownership_and_types(client):
+    client, state = client
+    request = {"entity_type": "car", "entity_id": str(CAR_ID), "document_type": "rc_front", "content_type": "image/jpeg"}
+    assert client.post("/api/uploads/documents/upload-url", json={**request, "content_type": "application/pdf"}).status_code == 400
+    assert client.post("/api/uploads/documents/upload-url", json={**request, "document_type": "aadhar"}).status_code == 400
+
+    state.owner_id = OTHER_OWNER_ID
+    assert client.post("/api/uploads/documents/upload-url", json=request).status_code == 403
+
+
+def test_trip_upload_url_only_for_the_assigned_driver(client):
+    client, state = client
+    upload = client.post("/api/uploads/trips/987654/upload-url", json={"stage": "start", "content_type": "image/jpeg"})
+    assert upload.status_code == 200
+    assert upload.json()["object_url"].startswith(gcs.public_url_for("trip_records/987654/start/"))
+
+    assert client.post("/api/uploads/trips/1/upload-url", json={"stage": "start", "content_type": "image/jpeg"}).status_code == 403
+    assert client.post("/api/uploads/trips/987654/upload-url", json={"stage": "middle", "content_type": "image/jpeg"}).status_code == 400
+
+    # start-trip takes the object_url once the file is in the bucket
+    from app.crud.direct_uploads import verify_direct_upload
+    state.put(upload.json())
+    verify_direct_upload(upload.json()["object_url"], "trip_records/987654/start")
+
+
+def test_local_signed_urls_expire_and_cover_the_object(tmp_path):
+    storage_backend = storage_module.LocalStorageBackend(root=str(tmp_path), base_url="http://testserver/api/storage", signing_key="test")
+    url = storage_backend.sign("a/b.jpg", expiry_minutes=1)
+    query = dict(part.split("=") for part in url.split("?")[1].split("&"))
+    expires, signature = int(query["expires"]), query["signature"]
+
+    assert storage_backend.verify("GET", "a/b.jpg", expires, signature)
+    assert not storage_backend.verify("GET", "a/c.jpg", expires, signature)
+    assert not storage_backend.verify("PUT", "a/b.jpg", expires, signature)
+    assert not storage_backend.verify("GET", "a/b.jpg", expires - 3600, storage_backend.signature("GET", "a/b.jpg", expires - 3600))
+    with pytest.raises(ValueError):
+        storage_backend.path("../outside.jpg")
+
+
+def test_backend_missing_a_method_fails_when_created():
+    class WithoutStat(storage_module.StorageBackend):
+        url_prefix = "http://testserver/"
+
+        def upload(self, fileobj, name, content_type, size=None): ...
+        def delete(self, name): ...
+        def sign(self, name, expiry_minutes, method="GET", content_type=None, headers=None): ...
+
+    with pytest.raises(TypeError, match="stat"):
+        WithoutStat()
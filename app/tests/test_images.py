@@ -0,0 +1,164 @@
+"""
+Tests for the image pipeline (app/utils/images.py), how uploads store and sign its output (app/utils/gcs.py)
+and how a multipart document update replaces the stored image (replace_document_image).
+Storage is the local filesystem backend in a temporary directory.
+"""
+
+import asyncio
+import io
+import os
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from app.crud.direct_uploads import replace_document_image
+from app.models.common_enums import DocumentStatusEnum
+from app.utils import gcs, images, storage
+
+
+def photo(size=(4000, 3000), fmt="JPEG", orientation=None):
+    image = Image.new("RGB", size, (40, 120, 200))
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"  # Make
+    exif[0x8825] = {2: (13.0, 4.0, 0.0)}  # GPSInfo, GPSLatitude
+    if orientation:
+        exif[0x0112] = orientation
+    out = io.BytesIO()
+    image.save(out, format=fmt, exif=exif, quality=95)
+    out.seek(0)
+    return out
+
+
+@pytest.fixture
+def local_storage(monkeypatch, tmp_path):
+    backend = storage.LocalStorageBackend(root=str(tmp_path), base_url="http://testserver/api/storage", signing_key="test")
+    monkeypatch.setattr(storage, "_backend", backend)
+    return backend
+
+
+def test_photo_is_downsized_stripped_and_thumbnailed():
+    processed = images.process_image(photo())
+
+    result = Image.open(io.BytesIO(processed.data))
+    assert result.format == images.IMAGE_FORMAT
+    assert max(result.size) == images.IMAGE_MAX_DIMENSION
+    assert not result.getexif()
+    assert "exif" not in result.info and "icc_profile" not in result.info
+    assert max(Image.open(io.BytesIO(processed.thumbnail)).size) == images.THUMBNAIL_DIMENSION
+
+
+def test_exif_orientation_is_applied_before_stripping():
+    # Orientation 6: stored landscape, displayed rotated 90 degrees (portrait)
+    processed = images.process_image(photo(size=(800, 600), orientation=6))
+    assert (processed.width, processed.height) == (600, 800)
+
+
+@pytest.mark.parametrize("data", [b"not an image", b"\xff\xd8\xff\xe0 truncated jpeg"])
+def test_non_images_are_rejected(data):
+    with pytest.raises(images.InvalidImageError):
+        images.process_image(io.BytesIO(data))
+
+
+def test_unsupported_formats_are_rejected():
+    gif = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(gif, format="GIF")
+    gif.seek(0)
+    with pytest.raises(images.InvalidImageError):
+        images.process_image(gif)
+
+
+def test_upload_stores_optimized_image_and_thumbnail(local_storage):
+    url = gcs.upload_image_to_gcs(UploadFile(photo(), filename="speedometer.jpg"), "trip_records/1/start")
+
+    name = local_storage.blob_name(url)
+    thumbnail = local_storage.blob_name(gcs.thumbnail_url(url))
+    assert name.startswith("trip_records/1/start/") and ".opt." in name
+    assert local_storage.stat(name).content_type == local_storage.stat(thumbnail).content_type == "image/webp"
+    assert local_storage.stat(thumbnail).size < local_storage.stat(name).size
+
+    gcs.delete_gcs_file_by_url(url)
+    assert not local_storage.exists(name) and not local_storage.exists(thumbnail)
+
+
+def test_listings_sign_thumbnails(local_storage, monkeypatch):
+    monkeypatch.setattr(gcs, "_sign_blob", lambda name, expiry: f"signed:{name}")
+    processed = local_storage.public_url("trip_records/1/start/a.opt.webp")
+    legacy = local_storage.public_url("trip_records/1/start/b.jpg")
+
+    signed = gcs.generate_signed_urls_from_gcs([processed, legacy, None], thumbnails=True)
+
+    assert signed == {processed: "signed:trip_records/1/start/a.thumb.webp", legacy: "signed:trip_records/1/start/b.jpg"}
+
+
+def upload(data, filename, content_type=None):
+    return UploadFile(io.BytesIO(data), filename=filename, headers=Headers({"content-type": content_type} if content_type else {}))
+
+
+@pytest.mark.parametrize("filename, content_type", [("receipt.pdf", "application/pdf"), ("photo.heic", "image/heic"), ("receipt.pdf", None)])
+def test_pdf_and_heic_are_stored_as_uploaded(local_storage, filename, content_type):
+    data = b"%PDF-1.4 receipt" if filename.endswith(".pdf") else b"\x00\x00\x00\x18ftypheic"
+    url = gcs.upload_image_to_gcs(upload(data, filename, content_type), "admin_transactions")
+
+    name = local_storage.blob_name(url)
+    assert name.endswith(os.path.splitext(filename)[1]) and ".opt." not in name
+    assert local_storage.stat(name).content_type == gcs.upload_content_type(upload(data, filename, content_type))
+
+
+@pytest.mark.parametrize("filename, content_type", [("anim.gif", "image/gif"), ("notes.txt", "text/plain"), ("fake.jpg", "image/jpeg")])
+def test_other_files_are_rejected(local_storage, filename, content_type):
+    with pytest.raises(images.InvalidImageError):
+        gcs.upload_image_to_gcs(upload(b"not a photo", filename, content_type), "admin_transactions")
+
+
+def test_multipart_and_direct_uploads_accept_the_same_photo_types():
+    photo_types = {content_type for content_type in gcs.UPLOAD_CONTENT_TYPES if content_type.startswith("image/")}
+    assert photo_types == set(gcs.DIRECT_UPLOAD_CONTENT_TYPES)
+
+
+class FakeSession:
+    def __init__(self, fail_commit=False):
+        self.fail_commit, self.committed, self.rolled_back = fail_commit, 0, 0
+
+    def commit(self):
+        if self.fail_commit:
+            raise RuntimeError("database unavailable")
+        self.committed += 1
+
+    def rollback(self):
+        self.rolled_back += 1
+
+    def refresh(self, entity):
+        pass
+
+
+@pytest.fixture
+def document(local_storage):
+    old_url = gcs.upload_image_to_gcs(UploadFile(photo(size=(800, 600)), filename="old.jpg"), "car_driver/1/license")
+    return SimpleNamespace(licence_front_img=old_url, licence_front_status=DocumentStatusEnum.VERIFIED)
+
+
+def test_replaced_document_image_is_deleted_after_the_commit(local_storage, document):
+    old_url, db = document.licence_front_img, FakeSession()
+    new_url = asyncio.run(replace_document_image(db, document, "licence_front_img", "licence_front_status",
+                                                 UploadFile(photo(size=(800, 600)), filename="new.jpg"), "car_driver/1/license"))
+
+    assert (document.licence_front_img, document.licence_front_status, db.committed) == (new_url, DocumentStatusEnum.PENDING, 1)
+    assert local_storage.exists(local_storage.blob_name(new_url)) and not local_storage.exists(local_storage.blob_name(old_url))
+
+
+@pytest.mark.parametrize("fail_commit", [False, True])
+def test_rejected_or_unsaved_document_image_keeps_the_old_one(local_storage, document, fail_commit):
+    old_url, db = document.licence_front_img, FakeSession(fail_commit)
+    file = UploadFile(photo(size=(800, 600)), filename="new.jpg") if fail_commit else upload(b"not a photo", "new.jpg", "image/jpeg")
+    with pytest.raises(RuntimeError if fail_commit else HTTPException) as error:
+        asyncio.run(replace_document_image(db, document, "licence_front_img", "licence_front_status", file, "car_driver/1/license"))
+
+    if not fail_commit:
+        assert error.value.status_code == 400
+    assert local_storage.exists(local_storage.blob_name(old_url))
+    # Nothing but the old image and its thumbnail is left in the folder
+    stored = [name for name in os.listdir(local_storage.path("car_driver/1/license")) if not name.endswith(".meta")]
+    assert len(stored) == 2
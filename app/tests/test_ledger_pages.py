@@ -0,0 +1,151 @@
+"""
+Tests for the keyset-paginated ledger listings (owner, vendor and admin). Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+VENDOR_ID = uuid.uuid4()
+OWNER_ID = uuid.uuid4()
+ADMIN_ID = uuid.uuid4()
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:vendor_id, 'pages-vendor', 'x', 'ACTIVE', 0);
+
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:owner_id, 'pages-owner', 'x', 'ACTIVE', 0);
+
+INSERT INTO admin(id, username, phone, organization_id, balance)
+VALUES (:admin_id, 'pages-admin', '9999999999', gen_random_uuid(), 0);
+
+-- Every third day has two entries with the same created_at (ties are broken by id)
+INSERT INTO vendor_wallet_ledger(id, vendor_id, order_id, entry_type, amount, balance_before, balance_after, created_at)
+SELECT gen_random_uuid(), :vendor_id, g, 'CREDIT', 10, 0, 10, :start + ((g - g % 3 / 2) || ' days')::interval
+FROM generate_series(1, 30) g;
+
+INSERT INTO transfer_transactions(id, vendor_id, requested_amount, wallet_balance_before, bank_balance_before,
+                                  wallet_balance_after, bank_balance_after, status, admin_notes, created_at, updated_at)
+SELECT gen_random_uuid(), :vendor_id, 5, 10, 0, 5, 5, CASE WHEN g <= 10 THEN 'APPROVED' ELSE 'PENDING' END::transfer_status_enum,
+       'transfer ' || g, :start, :start + (g * 3 || ' days')::interval - interval '1 hour'
+FROM generate_series(1, 15) g;
+
+INSERT INTO wallet_ledger(id, vehicle_owner_id, entry_type, amount, balance_before, balance_after, created_at)
+SELECT gen_random_uuid(), :owner_id, 'DEBIT', 1, 1, 0, :start + (g || ' days')::interval
+FROM generate_series(1, 25) g;
+
+INSERT INTO admin_wallet_ledger(id, admin_id, order_id, entry_type, amount, balance_before, balance_after, created_at)
+SELECT gen_random_uuid(), :admin_id, g, 'CREDIT', 3, 0, 3, :start + (g / 2 || ' days')::interval
+FROM generate_series(1, 12) g
+"""
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    params = {"vendor_id": VENDOR_ID, "owner_id": OWNER_ID, "admin_id": ADMIN_ID, "start": START}
+    with pg_engine.begin() as conn:
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement), params)
+    yield sessionmaker(bind=pg_engine)
+    # The schema is shared by the whole session (test_partitions.py counts admin_wallet_ledger rows)
+    with pg_engine.begin() as conn:
+        conn.execute(text("DELETE FROM admin_wallet_ledger WHERE admin_id = :admin_id"), params)
+
+
+@pytest.fixture
+def client(Session):
+    from app.api.routes import wallet
+    from app.core.security import get_current_vendor
+    from app.database.replica import get_read_db
+
+    def db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(wallet.router, prefix="/api")
+    app.dependency_overrides[get_read_db] = db
+    app.dependency_overrides[get_current_vendor] = lambda: SimpleNamespace(id=VENDOR_ID)
+    return TestClient(app)
+
+
+def expected_vendor_history(Session):
+    with Session() as db:
+        return [str(row.id) for row in db.execute(text("""
+            SELECT id, created_at FROM vendor_wallet_ledger WHERE vendor_id = :id
+            UNION ALL
+            SELECT id, updated_at FROM transfer_transactions WHERE vendor_id = :id AND status = 'APPROVED'
+            ORDER BY created_at DESC, id DESC
+        """), {"id": VENDOR_ID})]
+
+
+def test_vendor_history_pages_walk_ledger_and_approved_transfers(client, Session):
+    seen, cursor, pages = [], None, 0
+    while True:
+        response = client.get("/api/vendor/wallet/history", params={"limit": 7, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        seen += [entry["id"] for entry in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == expected_vendor_history(Session)
+    assert len(seen) == 40 and pages == 6
+    debits = [entry for entry in client.get("/api/vendor/wallet/history", params={"limit": 1000}).json() if entry["entry_type"] == "DEBIT"]
+    assert len(debits) == 10 and all(entry["order_id"] is None and entry["notes"].startswith("transfer") for entry in debits)
+
+
+def test_vendor_history_page_is_one_query(Session, query_budget):
+    from app.crud.vendor_wallet import get_vendor_wallet_history_page
+    from app.crud.wallet import encode_ledger_cursor
+
+    with Session() as db:
+        first = get_vendor_wallet_history_page(db, str(VENDOR_ID), 10)
+        with query_budget(max_queries=1):
+            second = get_vendor_wallet_history_page(db, str(VENDOR_ID), 10, encode_ledger_cursor(first[-1].created_at, first[-1].id))
+    assert [str(row.id) for row in first + second] == expected_vendor_history(Session)[:20]
+
+
+def test_date_range_filters(client, Session):
+    from app.crud.wallet import get_owner_ledger_page
+
+    with Session() as db:
+        entries = get_owner_ledger_page(db, str(OWNER_ID), 100, from_date=START + timedelta(days=5), to_date=START + timedelta(days=10))
+    assert [entry.created_at for entry in entries] == [START + timedelta(days=d) for d in range(9, 4, -1)]
+
+    response = client.get("/api/vendor/wallet/history", params={"from_date": (START + timedelta(days=28)).isoformat()})
+    assert all(entry["created_at"] >= "2026-01-29" for entry in response.json())
+    assert {entry["entry_type"] for entry in response.json()} == {"CREDIT", "DEBIT"}
+
+
+def test_admin_ledger_pages(Session):
+    from app.crud.admin_wallet import get_admin_account_ledger_data
+    from app.crud.wallet import encode_ledger_cursor
+
+    with Session() as db:
+        seen, cursor = [], None
+        while True:
+            page = get_admin_account_ledger_data(db, str(ADMIN_ID), limit=5, cursor=cursor)
+            seen += page
+            if len(page) < 5:
+                break
+            cursor = encode_ledger_cursor(page[-1].created_at, page[-1].id)
+
+    assert len({entry.id for entry in seen}) == 12
+    assert [(entry.created_at, entry.id) for entry in seen] == sorted(((entry.created_at, entry.id) for entry in seen), reverse=True)
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/api/vendor/wallet/history", params={"cursor": "not-a-cursor"}).status_code == 400
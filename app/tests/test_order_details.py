@@ -0,0 +1,109 @@
+"""
+Tests for the order details batch loader (OrderRelations in app/crud/order_details.py). Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+VENDOR_ID = uuid.uuid4()
+OWNER_ID = uuid.uuid4()
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:vendor_id, 'details-vendor', 'x', 'ACTIVE', 0);
+
+INSERT INTO vendor_details(id, vendor_id, full_name, primary_number, wallet_balance, bank_balance, gpay_number, aadhar_number, address, city, pincode)
+VALUES (gen_random_uuid(), :vendor_id, 'Details Vendor', 'details-vendor', 0, 0, 'details-vendor', 'details-vendor', 'Street', 'Chennai', '600001');
+
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:owner_id, 'details-owner', 'x', 'ACTIVE', 0);
+
+INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode)
+VALUES (gen_random_uuid(), :owner_id, 'Details Owner', 'details-owner', 0, 'details-owner', 'Street', 'Chennai', '600001');
+
+INSERT INTO car_driver(id, vehicle_owner_id, full_name, primary_number, hashed_password, licence_number, address, city, pincode, driver_status, token_version)
+SELECT gen_random_uuid(), :owner_id, 'Driver ' || g, 'details-d' || g, 'x', 'details-d' || g, 'Street', 'Chennai', '600001', 'ONLINE', 0
+FROM generate_series(1, 3) g;
+
+INSERT INTO car_details(id, vehicle_owner_id, car_name, car_type, car_number, car_status)
+SELECT gen_random_uuid(), :owner_id, 'Car ' || g, 'SUV', 'details-c' || g, 'ONLINE' FROM generate_series(1, 3) g;
+
+INSERT INTO orders(source, source_order_id, vendor_id, trip_type, car_type, pickup_drop_location, start_date_time,
+                   customer_name, customer_number, trip_status, trip_distance, vendor_fees_percent, platform_fees_percent, created_at)
+SELECT 'HOURLY_RENTAL', g, :vendor_id, 'ONEWAY', 'SUV', '{"0": "Chennai", "1": "Madurai"}', now(), 'Customer', '9999999999',
+       'COMPLETED', 450, 10, 10, now() + g * interval '1 second'
+FROM generate_series(1, 30) g;
+
+-- Two assignments per order, the second (latest) one with a driver and car
+INSERT INTO order_assignments(order_id, vehicle_owner_id, driver_id, car_id, assignment_status, created_at)
+SELECT o.id, :owner_id, NULL, NULL, 'CANCELLED', now() FROM orders o WHERE o.vendor_id = :vendor_id;
+
+INSERT INTO order_assignments(order_id, vehicle_owner_id, driver_id, car_id, assignment_status, created_at)
+SELECT o.id, :owner_id,
+       (SELECT id FROM car_driver WHERE primary_number = 'details-d' || (1 + o.id % 3)),
+       (SELECT id FROM car_details WHERE car_number = 'details-c' || (1 + o.id % 3)),
+       'COMPLETED', now()
+FROM orders o WHERE o.vendor_id = :vendor_id;
+
+INSERT INTO end_records(order_id, driver_id, start_km, end_km, contact_number, img_url)
+SELECT a.order_id, a.driver_id, 100, 550, '9999999999', 'https://storage.googleapis.com/bucket/start.jpg'
+FROM order_assignments a WHERE a.driver_id IS NOT NULL
+"""
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    with pg_engine.begin() as conn:
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement), {"vendor_id": VENDOR_ID, "owner_id": OWNER_ID})
+    return sessionmaker(bind=pg_engine)
+
+
+@pytest.fixture(autouse=True)
+def no_signing(monkeypatch):
+    from app.crud import order_details
+    monkeypatch.setattr(order_details, "generate_signed_urls_from_gcs", lambda urls, **kwargs: {url: url + "?signed" for url in urls if url})
+
+
+@pytest.mark.parametrize("limit", [5, 30])
+def test_admin_orders_page_runs_a_fixed_number_of_queries(Session, query_budget, limit):
+    from app.crud.order_details import get_all_admin_orders
+
+    db = Session()
+    try:
+        # count + page + vendors, assignments, end records, drivers, cars, owners
+        with query_budget(max_queries=8, max_repeats=1):
+            orders, _ = get_all_admin_orders(db, limit=limit)
+    finally:
+        db.close()
+
+    ours = [order for order in orders if order.vendor_id == VENDOR_ID]
+    assert len(ours) == limit
+    for order in ours:
+        assert len(order.assignments) == 2
+        latest = order.assignments[-1]
+        assert order.assigned_driver.id == latest.driver_id
+        assert order.assigned_car.id == latest.car_id
+        assert order.vehicle_owner.full_name == "Details Owner"
+        assert order.vendor.full_name == "Details Vendor"
+        assert order.end_records[0].img_url.endswith("?signed")
+
+
+def test_detail_endpoints_share_the_loader(Session):
+    from app.crud.order_details import get_admin_order_details, get_vendor_order_details
+
+    db = Session()
+    try:
+        order_id = db.execute(text("SELECT max(id) FROM orders WHERE vendor_id = :v"), {"v": VENDOR_ID}).scalar()
+        admin = get_admin_order_details(db, order_id)
+        vendor = get_vendor_order_details(db, order_id, str(VENDOR_ID))
+    finally:
+        db.close()
+
+    assert [a.id for a in admin.assignments] == [a.id for a in vendor.assignments]
+    assert vendor.assigned_driver_name == admin.assigned_driver.full_name
+    assert vendor.assigned_car_number == admin.assigned_car.car_number
+    assert vendor.vehicle_owner_name == admin.vehicle_owner.full_name
@@ -0,0 +1,154 @@
+"""
+Tests for monthly created_at partitioning (app/database/partitions.py).
+The conversion tests need TEST_DATABASE_URL (see conftest.py).
+"""
+
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import partitions
+
+
+def test_month_helpers():
+    assert partitions.add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert list(partitions.months_between(date(2026, 11, 20), date(2027, 1, 1))) == [
+        date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1)
+    ]
+    assert partitions.partition_name("wallet_ledger", date(2027, 1, 1)) == "wallet_ledger_y2027m01"
+
+
+def test_partition_tables_are_recognised():
+    assert partitions.is_partition_table("wallet_ledger_y2027m01")
+    assert partitions.is_partition_table("orders_default")
+    assert partitions.is_partition_table("orders_unpartitioned")
+    assert not partitions.is_partition_table("orders")
+    assert not partitions.is_partition_table("transfer_transactions_default")
+
+
+@pytest.fixture(scope="module")
+def ledger(pg_engine):
+    admin_id = uuid.uuid4()
+    with pg_engine.begin() as conn:
+        conn.execute(text("INSERT INTO admin(id, phone, organization_id, balance) VALUES (:id, '9999999999', :id, 0)"), {"id": admin_id})
+        conn.execute(text("""
+            INSERT INTO admin_wallet_ledger(id, admin_id, entry_type, amount, balance_before, balance_after, created_at)
+            SELECT gen_random_uuid(), :admin_id, 'CREDIT', 10, 0, 10, now() - (g || ' days')::interval
+            FROM generate_series(0, 419) g
+        """), {"admin_id": admin_id})
+    return admin_id
+
+
+def test_tables_with_incoming_foreign_keys_are_refused(pg_engine):
+    with pg_engine.begin() as conn:
+        with pytest.raises(ValueError, match="referenced by foreign keys"):
+            partitions.prepare_conversion(conn, "orders")
+
+
+def test_unique_indexes_are_refused_without_the_flag(pg_engine):
+    with pg_engine.begin() as conn:
+        with pytest.raises(ValueError, match="ix_admin_wallet_ledger_id"):
+            partitions.prepare_conversion(conn, "admin_wallet_ledger")
+
+
+def test_unique_index_gets_the_partition_key():
+    definition = ("CREATE UNIQUE INDEX ux_wallet_ledger_razorpay_payment ON public.wallet_ledger USING btree "
+                  "(reference_type, reference_id) WHERE ((reference_type)::text = 'RAZORPAY_PAYMENT'::text)")
+    assert partitions._unique_index_with_partition_key(definition, "ux_p", "wallet_ledger_p") == (
+        'CREATE UNIQUE INDEX "ux_p" ON "wallet_ledger_p" USING btree (reference_type, reference_id, created_at) '
+        "WHERE ((reference_type)::text = 'RAZORPAY_PAYMENT'::text)"
+    )
+    definition = "CREATE UNIQUE INDEX ix ON public.orders USING btree (lower(name), created_at)"
+    assert partitions._unique_index_with_partition_key(definition, "ix_p", "orders_p") == (
+        'CREATE UNIQUE INDEX "ix_p" ON "orders_p" USING btree (lower(name), created_at)'
+    )
+
+
+def test_convert_admin_wallet_ledger(pg_engine, ledger):
+    from app.models.admin_wallet_ledger import AdminWalletLedger
+
+    with pg_engine.begin() as conn:
+        renames = partitions.prepare_conversion(conn, "admin_wallet_ledger", weaken_unique_indexes=True)
+
+    # A write during the copy reaches the shadow table through the sync trigger
+    with pg_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO admin_wallet_ledger(id, admin_id, entry_type, amount, balance_before, balance_after) "
+            "VALUES (gen_random_uuid(), :admin_id, 'DEBIT', 5, 10, 5)"
+        ), {"admin_id": ledger})
+    # An update replaces a stale shadow copy of the row
+    with pg_engine.begin() as conn:
+        conn.execute(text("UPDATE admin_wallet_ledger_p SET notes = 'stale' WHERE amount = 5"))
+        conn.execute(text("UPDATE admin_wallet_ledger SET notes = 'updated' WHERE admin_id = :admin_id AND amount = 5"),
+                     {"admin_id": ledger})
+
+    last_id, batches = None, 0
+    while True:
+        with pg_engine.begin() as conn:
+            last_id, count = partitions.copy_batch(conn, "admin_wallet_ledger", last_id, 100)
+        if not count:
+            break
+        batches += 1
+    assert batches == 5
+
+    with pg_engine.begin() as conn:
+        partitions.swap_tables(conn, "admin_wallet_ledger", renames)
+
+    with pg_engine.connect() as conn:
+        assert partitions.is_partitioned(conn, "admin_wallet_ledger")
+        assert conn.execute(text("SELECT count(*) FROM admin_wallet_ledger")).scalar() == 421
+        assert conn.execute(text("SELECT count(*) FROM admin_wallet_ledger_default")).scalar() == 0
+        assert conn.execute(text("SELECT notes FROM admin_wallet_ledger WHERE amount = 5")).scalar() == "updated"
+        names = partitions.existing_partitions(conn, "admin_wallet_ledger")
+        indexes = set(conn.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'admin_wallet_ledger'"
+        )).scalars())
+    assert "admin_wallet_ledger_default" in names and len(names) >= 15
+    assert {"admin_wallet_ledger_pkey", "ix_admin_wallet_ledger_admin_id", "ix_admin_wallet_ledger_id"} <= indexes
+
+    # The ORM keeps working against the partitioned table
+    db = sessionmaker(bind=pg_engine)()
+    try:
+        db.add(AdminWalletLedger(admin_id=ledger, entry_type="CREDIT", amount=1, balance_before=5, balance_after=6))
+        db.commit()
+        assert db.query(AdminWalletLedger).filter(AdminWalletLedger.admin_id == ledger).count() == 422
+    finally:
+        db.close()
+
+
+def test_ensure_partitions_creates_future_months(pg_engine):
+    with pg_engine.begin() as conn:
+        created = partitions.ensure_partitions(conn, "admin_wallet_ledger", months_ahead=1, today=date(2031, 5, 2))
+        again = partitions.ensure_partitions(conn, "admin_wallet_ledger", months_ahead=1, today=date(2031, 5, 2))
+    assert created == ["admin_wallet_ledger_y2031m05", "admin_wallet_ledger_y2031m06"]
+    assert again == []
+
+
+def test_window_queries_are_pruned(pg_engine):
+    with pg_engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN (FORMAT JSON) SELECT count(*) FROM admin_wallet_ledger "
+            "WHERE created_at >= '2031-05-01 00:00:00+00' AND created_at < '2031-06-01 00:00:00+00'"
+        )).scalar_one()[0]["Plan"]
+    stack, relations = [plan], set()
+    while stack:
+        node = stack.pop()
+        relations.add(node.get("Relation Name"))
+        stack.extend(node.get("Plans", []))
+    assert relations - {None} == {"admin_wallet_ledger_y2031m05"}
+
+
+def test_index_is_built_per_partition_and_attached(pg_engine):
+    with pg_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        partitions.create_index_concurrently(conn, "admin_wallet_ledger", "ix_admin_wallet_ledger_order_id_created_at", "order_id, created_at DESC")
+        partitions.create_index_concurrently(conn, "admin_wallet_ledger", "ix_admin_wallet_ledger_order_id_created_at", "order_id, created_at DESC")
+        valid, attached = conn.execute(text(
+            "SELECT x.indisvalid, (SELECT count(*) FROM pg_inherits WHERE inhparent = x.indexrelid) FROM pg_index x "
+            "WHERE x.indexrelid = to_regclass('ix_admin_wallet_ledger_order_id_created_at')"
+        )).one()
+        partition_count = len(partitions.existing_partitions(conn, "admin_wallet_ledger"))
+    # The parent index becomes valid once every partition has its index attached
+    assert valid and attached == partition_count
@@ -0,0 +1,153 @@
+"""
+Query plan regression tests for the hot filters.
+
+Seeds a realistic amount of data, runs ANALYZE and asserts via EXPLAIN that the
+key queries are served by the secondary indexes declared on the models.
+Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import pytest
+from sqlalchemy import select, desc, text
+from sqlalchemy.dialects import postgresql
+
+VENDORS = 200
+ORDERS_PER_VENDOR = 100
+OWNERS = 200
+LEDGER_PER_OWNER = 100
+
+SEED_SQL = f"""
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'v' || g, 'x', 'ACTIVE', 0 FROM generate_series(1, {VENDORS}) g;
+
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+SELECT gen_random_uuid(), 'o' || g, 'x', 'ACTIVE', 0 FROM generate_series(1, {OWNERS}) g;
+
+INSERT INTO new_orders(vendor_id, trip_type, car_type, pickup_drop_location, start_date_time, customer_name,
+                       customer_number, cost_per_km, extra_cost_per_km, driver_allowance, extra_driver_allowance,
+                       permit_charges, extra_permit_charges, hill_charges, toll_charges, trip_status,
+                       pick_near_city, trip_distance, trip_time, platform_fees_percent)
+SELECT v.id, 'ONEWAY', 'SEDAN_4_PLUS_1', '{{"0": "Chennai", "1": "Madurai"}}', now(), 'Customer', '9999999999',
+       12, 2, 300, 50, 0, 0, 0, 0, 'PENDING', ARRAY['Chennai'], 450, '8 hours', 10
+FROM vendor v, generate_series(1, {ORDERS_PER_VENDOR});
+
+-- Most orders are closed, only a small slice is still pending
+INSERT INTO orders(source, source_order_id, vendor_id, trip_type, car_type, pickup_drop_location, origin_label,
+                   start_date_time, customer_name, customer_number, trip_status, created_at)
+SELECT 'NEW_ORDERS', n.order_id, n.vendor_id, 'ONEWAY', 'SEDAN_4_PLUS_1', n.pickup_drop_location,
+       CASE WHEN n.order_id % 100 = 0 THEN 'Coimbatore' ELSE n.pickup_drop_location ->> '0' END, now(),
+       'Customer', '9999999999',
+       CASE WHEN n.order_id % 50 = 0 THEN 'PENDING' ELSE 'COMPLETED' END::"Trip_status",
+       now() - (n.order_id || ' minutes')::interval
+FROM new_orders n;
+
+INSERT INTO order_assignments(order_id, vehicle_owner_id, assignment_status, created_at)
+SELECT o.id, (SELECT id FROM vehicle_owner LIMIT 1), 'COMPLETED', o.created_at FROM orders o;
+
+INSERT INTO wallet_ledger(id, vehicle_owner_id, entry_type, amount, balance_before, balance_after, created_at)
+SELECT gen_random_uuid(), vo.id, 'CREDIT', 100, 0, 100, now() - (g || ' minutes')::interval
+FROM vehicle_owner vo, generate_series(1, {LEDGER_PER_OWNER}) g;
+
+INSERT INTO vendor_wallet_ledger(id, vendor_id, entry_type, amount, balance_before, balance_after)
+SELECT gen_random_uuid(), v.id, 'CREDIT', 100, 0, 100
+FROM vendor v, generate_series(1, {LEDGER_PER_OWNER});
+
+INSERT INTO transfer_transactions(id, vendor_id, requested_amount, wallet_balance_before, bank_balance_before, status)
+SELECT gen_random_uuid(), v.id, 100, 100, 0,
+       CASE WHEN g = 1 THEN 'PENDING' ELSE 'APPROVED' END::transfer_status_enum
+FROM vendor v, generate_series(1, 50) g;
+"""
+
+
+@pytest.fixture(scope="module")
+def seeded(pg_engine):
+    with pg_engine.begin() as conn:
+        conn.execute(text(SEED_SQL))
+    with pg_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+        vendor_id = conn.execute(text("SELECT id FROM vendor LIMIT 1")).scalar_one()
+        owner_id = conn.execute(text("SELECT id FROM vehicle_owner LIMIT 1")).scalar_one()
+        order_id = conn.execute(text("SELECT id FROM orders ORDER BY id DESC LIMIT 1")).scalar_one()
+    return {"engine": pg_engine, "vendor_id": vendor_id, "owner_id": owner_id, "order_id": order_id}
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def explain(engine, stmt):
+    """Return (index names, sequentially scanned tables) for the plan of a SQLAlchemy statement"""
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql)).scalar_one()[0]["Plan"]
+    nodes = list(_plan_nodes(plan))
+    indexes = {n["Index Name"] for n in nodes if "Index Name" in n}
+    seq_scans = {n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"}
+    return indexes, seq_scans
+
+
+def assert_uses_index(engine, stmt, index_name, table):
+    indexes, seq_scans = explain(engine, stmt)
+    assert index_name in indexes, f"expected {index_name}, plan used {indexes} (seq scans: {seq_scans})"
+    assert table not in seq_scans, f"{table} is sequentially scanned"
+
+
+def test_vendor_orders_use_vendor_created_at_index(seeded):
+    from app.crud.orders import _vendor_orders_select
+    assert_uses_index(seeded["engine"], _vendor_orders_select(seeded["vendor_id"]), "ix_orders_vendor_id_created_at", "orders")
+
+
+def test_latest_assignment_uses_composite_index(seeded):
+    from app.models.order_assignments import OrderAssignment
+    stmt = (
+        select(OrderAssignment)
+        .where(OrderAssignment.order_id == seeded["order_id"])
+        .order_by(desc(OrderAssignment.created_at))
+        .limit(1)
+    )
+    assert_uses_index(seeded["engine"], stmt, "ix_order_assignments_order_id_created_at", "order_assignments")
+
+
+def test_pending_orders_use_partial_index(seeded):
+    from app.models.orders import Order
+    stmt = select(Order).where(Order.trip_status == "PENDING").order_by(Order.created_at.desc()).limit(50)
+    assert_uses_index(seeded["engine"], stmt, "ix_orders_pending_created_at", "orders")
+
+
+def test_wallet_history_uses_owner_index(seeded):
+    from app.models.wallet_ledger import WalletLedger
+    stmt = (
+        select(WalletLedger)
+        .where(WalletLedger.vehicle_owner_id == seeded["owner_id"])
+        .order_by(WalletLedger.created_at.desc())
+    )
+    assert_uses_index(seeded["engine"], stmt, "ix_wallet_ledger_vehicle_owner_id_created_at", "wallet_ledger")
+
+
+def test_vendor_wallet_history_uses_vendor_index(seeded):
+    from app.models.vendor_wallet_ledger import VendorWalletLedger
+    stmt = select(VendorWalletLedger).where(VendorWalletLedger.vendor_id == seeded["vendor_id"])
+    assert_uses_index(seeded["engine"], stmt, "ix_vendor_wallet_ledger_vendor_id_created_at", "vendor_wallet_ledger")
+
+
+def test_transfer_lookups_use_indexes(seeded):
+    from app.models.transfer_transactions import TransferTransactions, TransferStatusEnum
+    by_vendor = select(TransferTransactions).where(TransferTransactions.vendor_id == seeded["vendor_id"])
+    assert_uses_index(seeded["engine"], by_vendor, "ix_transfer_transactions_vendor_id", "transfer_transactions")
+
+    pending = select(TransferTransactions).where(TransferTransactions.status == TransferStatusEnum.PENDING)
+    assert_uses_index(seeded["engine"], pending, "ix_transfer_transactions_status", "transfer_transactions")
+
+
+def test_new_orders_by_vendor_use_index(seeded):
+    from app.models.new_orders import NewOrder
+    stmt = select(NewOrder).where(NewOrder.vendor_id == seeded["vendor_id"])
+    assert_uses_index(seeded["engine"], stmt, "ix_new_orders_vendor_id", "new_orders")
+
+
+def test_orders_from_city_use_origin_index(seeded):
+    from app.models.orders import Order
+    from app.utils.route_labels import origin_label_filter
+    stmt = select(Order).where(origin_label_filter(Order, "Coimba"))
+    assert_uses_index(seeded["engine"], stmt, "ix_orders_origin_label_lower", "orders")
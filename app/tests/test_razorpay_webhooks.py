@@ -0,0 +1,244 @@
+"""
+Tests for Razorpay top-ups: order creation against a local Razorpay stand-in, the webhook queue and its
+processor (app/crud/razorpay_webhooks.py) and the idempotent capture shared with /wallet/razorpay/verify.
+Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import razorpay_webhooks
+from app.crud.wallet import capture_rp_payment
+from app.utils import razorpay_client
+
+KEY_ID, KEY_SECRET, WEBHOOK_SECRET = "rzp_test_key", "key-secret", "webhook-secret"
+OWNERS = [uuid.uuid4() for _ in range(10)]
+
+
+def razorpay_stand_in():
+    """POST /v1/orders of the Razorpay API, enough for RazorpayClient.create_order"""
+    stand_in = FastAPI()
+    stand_in.state.orders = 0
+
+    @stand_in.post("/v1/orders")
+    async def create_order(request: Request):
+        expected = "Basic " + base64.b64encode(f"{KEY_ID}:{KEY_SECRET}".encode()).decode()
+        if request.headers.get("authorization") != expected:
+            raise HTTPException(status_code=401, detail="The api key provided is invalid")
+        body = await request.json()
+        stand_in.state.orders += 1
+        return {"id": f"order_{uuid.uuid4().hex[:14]}", "entity": "order", "amount": body["amount"],
+                "currency": body["currency"], "status": "created"}
+
+    return stand_in
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    with pg_engine.begin() as conn:
+        for owner_id in OWNERS:
+            conn.execute(text(
+                "INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version) "
+                "VALUES (:id, 'rzp-' || :id, 'x', 'ACTIVE', 0)"
+            ), {"id": owner_id})
+            conn.execute(text(
+                "INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode) "
+                "VALUES (gen_random_uuid(), :id, 'Owner', 'rzp-' || :id, 0, 'rzp-' || :id, 'Street', 'Chennai', '600001')"
+            ), {"id": owner_id})
+    return sessionmaker(bind=pg_engine)
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    monkeypatch.setenv("RAZORPAY_KEY_ID", KEY_ID)
+    monkeypatch.setenv("RAZORPAY_KEY_SECRET", KEY_SECRET)
+    monkeypatch.setenv("RAZORPAY_WEBHOOK_SECRET", WEBHOOK_SECRET)
+    app = razorpay_stand_in()
+    monkeypatch.setattr(razorpay_client, "RAZORPAY_BASE_URL", "http://razorpay.local/v1")
+    monkeypatch.setattr(razorpay_client, "_http_client", httpx.AsyncClient(transport=httpx.ASGITransport(app=app)))
+    return app
+
+
+@pytest.fixture
+def client(Session, stand_in):
+    from app.api.routes import wallet
+    from app.core.security import get_current_vehicleOwner_id
+    from app.database.session import get_db
+
+    def db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def owner(request: Request):
+        return request.headers["X-Owner"]
+
+    app = FastAPI()
+    app.include_router(wallet.router, prefix="/api")
+    app.dependency_overrides[get_db] = db
+    app.dependency_overrides[get_current_vehicleOwner_id] = owner
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def balance(Session, owner_id):
+    with Session() as db:
+        return db.execute(text("SELECT wallet_balance FROM vehicle_owner_details WHERE vehicle_owner_id = :id"), {"id": owner_id}).scalar_one()
+
+
+def razorpay_credits(Session, owner_id):
+    with Session() as db:
+        return db.execute(text(
+            "SELECT count(*) FROM wallet_ledger WHERE vehicle_owner_id = :id AND reference_type = 'RAZORPAY_PAYMENT'"
+        ), {"id": owner_id}).scalar_one()
+
+
+def create_order(client, owner_id, amount=5):
+    response = client.post("/api/wallet/razorpay/order", json={"amount": amount}, headers={"X-Owner": str(owner_id)})
+    assert response.status_code == 200, response.text
+    return response.json()["rp_order_id"]
+
+
+def delivery(event, event_id, order_id, payment_id, amount=500):
+    body = json.dumps({
+        "entity": "event", "event": event,
+        "payload": {"payment": {"entity": {"id": payment_id, "order_id": order_id, "amount": amount, "status": "captured"}}},
+    }).encode()
+    signature = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return body, {"X-Razorpay-Signature": signature, "X-Razorpay-Event-Id": event_id, "Content-Type": "application/json"}
+
+
+def drain(Session, workers=3):
+    """Several processors draining the queue side by side, like several app instances"""
+    def worker(_):
+        with Session() as db:
+            return razorpay_webhooks.drain_webhook_events(db, batch_size=4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(worker, range(workers)))
+
+
+def test_replayed_webhook_batches_credit_each_payment_once(client, Session, stand_in):
+    orders = {owner_id: create_order(client, owner_id) for owner_id in OWNERS}
+    assert stand_in.state.orders == len(OWNERS)
+
+    # Razorpay sends payment.captured and order.paid for one payment, and retries deliveries
+    deliveries = []
+    for owner_id, order_id in orders.items():
+        payment_id = f"pay_{uuid.uuid4().hex[:14]}"
+        deliveries.append(delivery("payment.captured", f"evt_{uuid.uuid4().hex}", order_id, payment_id))
+        deliveries.append(delivery("order.paid", f"evt_{uuid.uuid4().hex}", order_id, payment_id))
+    replayed = deliveries * 3
+    random.Random(7).shuffle(replayed)
+
+    statuses = [client.post("/api/wallet/razorpay/webhook", content=body, headers=headers).json()["status"] for body, headers in replayed]
+    assert statuses.count("queued") == len(deliveries) and statuses.count("duplicate") == 2 * len(deliveries)
+
+    assert drain(Session) == len(deliveries)
+    for owner_id in OWNERS:
+        assert (balance(Session, owner_id), razorpay_credits(Session, owner_id)) == (5, 1)
+    with Session() as db:
+        events = db.execute(text("SELECT status, count(*) FROM razorpay_webhook_events GROUP BY status")).all()
+    assert dict(events) == {"PROCESSED": len(deliveries)}
+
+    # The app's verify call arriving after the webhook does not credit again
+    owner_id, order_id = next(iter(orders.items()))
+    with Session() as db:
+        payment_id = db.execute(text("SELECT rp_payment_id FROM razorpay_transactions WHERE rp_order_id = :o"), {"o": order_id}).scalar_one()
+    signature = hmac.new(KEY_SECRET.encode(), f"{order_id}|{payment_id}".encode(), hashlib.sha256).hexdigest()
+    response = client.post("/api/wallet/razorpay/verify", headers={"X-Owner": str(owner_id)},
+                           json={"rp_order_id": order_id, "rp_payment_id": payment_id, "rp_signature": signature})
+    assert response.status_code == 200 and response.json()["captured"] is True
+    assert balance(Session, owner_id) == 5
+
+
+def test_webhook_signature_is_verified(client):
+    body, headers = delivery("payment.captured", "evt_forged", "order_x", "pay_x")
+    headers["X-Razorpay-Signature"] = "0" * 64
+    assert client.post("/api/wallet/razorpay/webhook", content=body, headers=headers).status_code == 400
+    del headers["X-Razorpay-Signature"]
+    assert client.post("/api/wallet/razorpay/webhook", content=body, headers=headers).status_code == 400
+
+
+def test_unknown_orders_and_events_are_ignored(client, Session):
+    for args in (("payment.captured", "evt_unknown_order", "order_not_ours", "pay_y"), ("refund.created", "evt_refund", "order_z", "pay_z")):
+        body, headers = delivery(*args)
+        assert client.post("/api/wallet/razorpay/webhook", content=body, headers=headers).json()["status"] == "queued"
+    drain(Session, workers=1)
+    with Session() as db:
+        statuses = db.execute(text(
+            "SELECT status FROM razorpay_webhook_events WHERE event_id IN ('evt_unknown_order', 'evt_refund')"
+        )).scalars().all()
+    assert statuses == ["IGNORED", "IGNORED"]
+
+
+def test_webhook_waiting_on_the_database_does_not_block_other_requests(client, Session):
+    body, headers = delivery("payment.captured", f"evt_{uuid.uuid4().hex}", "order_slow", "pay_slow")
+    with ThreadPoolExecutor(max_workers=2) as pool, Session() as holder:
+        try:
+            # The same event inserted, not committed: the webhook's INSERT waits for this transaction
+            razorpay_webhooks.enqueue_webhook_event(holder, headers["X-Razorpay-Event-Id"], json.loads(body))
+            webhook = pool.submit(client.post, "/api/wallet/razorpay/webhook", content=body, headers=headers)
+            threading.Event().wait(0.3)
+            assert not webhook.done()
+            # Served meanwhile, Razorpay call included: the waiting webhook holds a worker thread, not the event loop
+            assert pool.submit(create_order, client, OWNERS[3]).result(timeout=5)
+        finally:
+            holder.rollback()  # before the pool waits for the webhook
+    assert webhook.result().json()["status"] == "queued"
+
+
+def test_concurrent_captures_of_one_payment_credit_once(client, Session):
+    owner_id = OWNERS[1]
+    order_id = create_order(client, owner_id, amount=7)
+    before = balance(Session, owner_id)
+
+    first, second = Session(), Session()
+    try:
+        capture_rp_payment(first, order_id, "pay_race")
+        # The second capture waits for the first one's row lock, then finds the payment captured
+        result = {}
+        thread = threading.Thread(target=lambda: result.setdefault("txn", capture_rp_payment(second, order_id, "pay_race")))
+        thread.start()
+        thread.join(0.5)
+        assert thread.is_alive()
+        first.commit()
+        thread.join(10)
+        second.commit()
+        assert result["txn"].captured is True
+    finally:
+        first.close()
+        second.close()
+    assert balance(Session, owner_id) == before + 7
+
+
+def test_payment_already_in_the_ledger_is_not_credited_again(client, Session):
+    owner_id = OWNERS[2]
+    order_id = create_order(client, owner_id, amount=3)
+    with Session() as db:
+        # Credited by an earlier path while the transaction row was left uncaptured
+        db.execute(text(
+            "INSERT INTO wallet_ledger(id, vehicle_owner_id, reference_id, reference_type, entry_type, amount, balance_before, balance_after) "
+            "VALUES (gen_random_uuid(), :id, 'pay_legacy', 'RAZORPAY_PAYMENT', 'CREDIT', 0, 0, 0)"
+        ), {"id": owner_id})
+        db.commit()
+        before = balance(Session, owner_id)
+
+        txn = capture_rp_payment(db, order_id, "pay_legacy")
+        db.commit()
+        assert txn.captured is True
+    assert balance(Session, owner_id) == before
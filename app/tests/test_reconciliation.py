@@ -0,0 +1,136 @@
+"""
+Tests for the balance reconciliation job (app/crud/reconciliation.py). Requires TEST_DATABASE_URL (see conftest.py).
+
+Everything runs inside one outer transaction that is rolled back (the job's per-batch commits become
+savepoints): the schema is shared with the other modules and the job scans all of its accounts.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.reconciliation import reconcile_wallet
+from app.models.reconciliation import ReconciliationCheckpoint
+
+OWNERS = {name: uuid.uuid4() for name in ("ok", "same_tx", "balance", "chain", "no_ledger")}
+VENDORS = {name: uuid.uuid4() for name in ("ok", "transfer")}
+ADMINS = {name: uuid.uuid4() for name in ("ok", "balance")}
+T1, T2, T3 = (datetime(2026, 5, day, tzinfo=timezone.utc) for day in (1, 2, 3))
+
+SEED_SQL = """
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+SELECT id, 'rec-' || id, 'x', 'ACTIVE', 0 FROM unnest(CAST(:owners AS uuid[])) id;
+
+INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), o.id, 'Owner', 'rec-' || o.id, o.balance, 'rec-' || o.id, 'Street', 'Chennai', '600001'
+FROM unnest(CAST(:owners AS uuid[]), CAST(:owner_balances AS int[])) AS o(id, balance);
+
+INSERT INTO wallet_ledger(id, vehicle_owner_id, entry_type, amount, balance_before, balance_after, created_at)
+VALUES
+    (gen_random_uuid(), :owner_ok, 'CREDIT', 100, 0, 100, :t1),
+    (gen_random_uuid(), :owner_ok, 'DEBIT', 30, 100, 70, :t2),
+    (gen_random_uuid(), :owner_same_tx, 'CREDIT', 100, 50, 150, :t1),
+    (gen_random_uuid(), :owner_same_tx, 'DEBIT', 20, 150, 130, :t2),
+    (gen_random_uuid(), :owner_same_tx, 'DEBIT', 10, 130, 120, :t2),
+    (gen_random_uuid(), :owner_balance, 'CREDIT', 100, 0, 100, :t1),
+    (gen_random_uuid(), :owner_balance, 'DEBIT', 30, 100, 70, :t2),
+    (gen_random_uuid(), :owner_chain, 'CREDIT', 100, 0, 100, :t1),
+    (gen_random_uuid(), :owner_chain, 'DEBIT', 30, 90, 60, :t2),
+    (gen_random_uuid(), :owner_chain, 'CREDIT', 10, 60, 70, :t3);
+
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+SELECT id, 'rec-' || id, 'x', 'ACTIVE', 0 FROM unnest(CAST(:vendors AS uuid[])) id;
+
+INSERT INTO vendor_details(id, vendor_id, full_name, primary_number, wallet_balance, bank_balance, gpay_number, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), v.id, 'Vendor', 'rec-' || v.id, v.balance, 0, 'rec-' || v.id, 'rec-' || v.id, 'Street', 'Chennai', '600001'
+FROM unnest(CAST(:vendors AS uuid[]), CAST(:vendor_balances AS int[])) AS v(id, balance);
+
+INSERT INTO vendor_wallet_ledger(id, vendor_id, order_id, entry_type, amount, balance_before, balance_after, created_at)
+SELECT gen_random_uuid(), id, 1, 'CREDIT', 100, 0, 100, :t1 FROM unnest(CAST(:vendors AS uuid[])) id;
+
+INSERT INTO transfer_transactions(id, vendor_id, requested_amount, wallet_balance_before, bank_balance_before,
+                                  wallet_balance_after, bank_balance_after, status, created_at, updated_at)
+SELECT gen_random_uuid(), id, 40, 100, 0, 60, 40, 'APPROVED', :t1, :t2 FROM unnest(CAST(:vendors AS uuid[])) id;
+
+INSERT INTO admin(id, username, phone, organization_id, balance)
+SELECT a.id, 'rec-' || a.id, '9999999999', gen_random_uuid(), a.balance
+FROM unnest(CAST(:admins AS uuid[]), CAST(:admin_balances AS int[])) AS a(id, balance);
+
+INSERT INTO admin_wallet_shards(admin_id, shard, balance) VALUES (:admin_ok, 0, 5);
+
+INSERT INTO admin_wallet_ledger(id, admin_id, order_id, entry_type, amount, balance_before, balance_after, created_at)
+SELECT gen_random_uuid(), id, g, 'CREDIT', 5, 0, 5, :t1 FROM unnest(CAST(:admins AS uuid[])) id, generate_series(1, 3) g
+"""
+
+
+@pytest.fixture
+def db(pg_engine):
+    params = {
+        "owners": list(OWNERS.values()), "owner_balances": [70, 120, 50, 80, 25],
+        "vendors": list(VENDORS.values()), "vendor_balances": [60, 100],
+        "admins": list(ADMINS.values()), "admin_balances": [10, 0],
+        **{f"owner_{name}": value for name, value in OWNERS.items()},
+        "admin_ok": ADMINS["ok"], "t1": T1, "t2": T2, "t3": T3,
+    }
+    with pg_engine.connect() as conn:
+        transaction = conn.begin()
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement), params)
+        session = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+
+
+def ours(mismatches, ids):
+    by_id = {str(value): name for name, value in ids.items()}
+    return {by_id[m.principal_id]: (m.stored, m.expected, m.first_drift_at) for m in mismatches if m.principal_id in by_id}
+
+
+def test_reports_balance_and_ledger_mismatches(db):
+    assert ours(reconcile_wallet(db, "owner"), OWNERS) == {
+        "balance": (50, 70, None),
+        "chain": (80, 80, T2),  # the debit started from 90 instead of 100
+        "no_ledger": (25, None, None),  # nothing to recompute the balance from
+    }
+    assert ours(reconcile_wallet(db, "vendor"), VENDORS) == {"transfer": (100, 60, None)}
+    # admin: stored balance is admin.balance plus its shards
+    assert ours(reconcile_wallet(db, "admin"), ADMINS) == {"balance": (0, 15, None)}
+
+
+def test_fix_moves_balances_to_the_ledger(db):
+    db.execute(text("DELETE FROM reconciliation_checkpoints"))  # rolled back with the rest
+    # Only this module's accounts: the other modules' accounts in the shared schema are left alone
+    for wallet, ids in (("owner", OWNERS), ("vendor", VENDORS), ("admin", ADMINS)):
+        reconcile_wallet(db, wallet, fix=True, batch_size=2, principal_ids=list(ids.values()))
+    assert db.get(ReconciliationCheckpoint, "owner") is None  # a scoped pass has no checkpoint
+
+    assert ours(reconcile_wallet(db, "owner"), OWNERS) == {
+        "chain": (80, 80, T2),  # the ledger itself is not rewritten
+        "no_ledger": (25, None, None),  # reported, never zeroed
+    }
+    assert ours(reconcile_wallet(db, "vendor"), VENDORS) == {}
+    assert ours(reconcile_wallet(db, "admin"), ADMINS) == {}
+    balances = db.execute(
+        text("SELECT vehicle_owner_id, wallet_balance FROM vehicle_owner_details WHERE vehicle_owner_id IN (:balance, :no_ledger)"),
+        {"balance": OWNERS["balance"], "no_ledger": OWNERS["no_ledger"]},
+    )
+    assert dict(balances.all()) == {OWNERS["balance"]: 70, OWNERS["no_ledger"]: 25}
+
+
+def test_interrupted_pass_resumes_from_the_checkpoint(db):
+    total = db.execute(text("SELECT count(*) FROM vehicle_owner_details")).scalar_one()
+
+    reconcile_wallet(db, "owner", batch_size=2, max_batches=1, restart=True)
+    checkpoint = db.get(ReconciliationCheckpoint, "owner")
+    assert checkpoint.checked == 2 and checkpoint.last_principal_id is not None and checkpoint.finished_at is None
+
+    reconcile_wallet(db, "owner", batch_size=2)
+    db.refresh(checkpoint)
+    # every account is checked exactly once over the two calls
+    assert checkpoint.checked == total and checkpoint.last_principal_id is None and checkpoint.finished_at is not None
@@ -0,0 +1,26 @@
+"""
+Tests for the origin / destination labels derived from pickup_drop_location.
+"""
+
+from app.utils.route_labels import route_labels, origin_label_filter
+
+
+def test_route_labels_sorts_keys_numerically():
+    route = {str(i): f"City {i}" for i in range(12)}
+    assert route_labels(route) == ("City 0", "City 11", 12)
+
+
+def test_route_labels_single_stop():
+    assert route_labels({"0": "Chennai"}) == ("Chennai", "Chennai", 1)
+
+
+def test_route_labels_empty():
+    assert route_labels({}) == (None, None, 0)
+    assert route_labels(None) == (None, None, 0)
+
+
+def test_origin_filter_is_escaped_prefix_match():
+    from app.models.orders import Order
+    clause = origin_label_filter(Order, " Chen_%")
+    assert str(clause.left) == "lower(orders.origin_label)"
+    assert clause.right.value == "chen!_!%%"
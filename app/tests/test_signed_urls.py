@@ -0,0 +1,81 @@
+"""
+Tests for the signed URL cache and batch signing in app/utils/gcs.py (no GCS access, the signer is faked).
+"""
+
+import threading
+
+import pytest
+from cachetools import TLRUCache
+
+from app.utils import gcs
+
+PREFIX = f"https://storage.googleapis.com/{gcs.GCS_BUCKET_NAME}/"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def signer(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_sign(blob_name, expiry_minutes):
+        with lock:
+            calls.append(blob_name)
+            return f"signed:{blob_name}:{len(calls)}"
+
+    clock = Clock()
+    monkeypatch.setattr(gcs, "_sign_blob", fake_sign)
+    monkeypatch.setattr(gcs, "_signed_urls", TLRUCache(
+        maxsize=100,
+        ttu=lambda key, _url, now: now + key[1] * 60 - gcs.SIGNED_URL_REFRESH_MARGIN_SECONDS,
+        timer=clock,
+    ))
+    return calls, clock
+
+
+def test_url_is_reused_until_shortly_before_expiry(signer):
+    calls, clock = signer
+
+    first = gcs.generate_signed_url_from_gcs(PREFIX + "a.jpg", expiry_minutes=2)
+    clock.now = 120 - gcs.SIGNED_URL_REFRESH_MARGIN_SECONDS - 1
+    assert gcs.generate_signed_url_from_gcs(PREFIX + "a.jpg", expiry_minutes=2) == first
+    assert len(calls) == 1
+
+    clock.now += 2
+    assert gcs.generate_signed_url_from_gcs(PREFIX + "a.jpg", expiry_minutes=2) != first
+    assert len(calls) == 2
+
+
+def test_expiry_is_part_of_the_key(signer):
+    calls, _ = signer
+    gcs.generate_signed_url_from_gcs(PREFIX + "a.jpg", expiry_minutes=2)
+    gcs.generate_signed_url_from_gcs(PREFIX + "a.jpg", expiry_minutes=10)
+    assert len(calls) == 2
+
+
+def test_batch_signs_each_missing_url_once(signer):
+    calls, _ = signer
+    cached = gcs.generate_signed_url_from_gcs(PREFIX + "cached.jpg")
+    urls = [PREFIX + "cached.jpg", None, "", PREFIX + "b.jpg", PREFIX + "b.jpg"] + [PREFIX + f"{i}.jpg" for i in range(20)]
+
+    signed = gcs.generate_signed_urls_from_gcs(urls)
+
+    assert signed[PREFIX + "cached.jpg"] == cached
+    assert set(signed) == {url for url in urls if url}
+    assert sorted(calls) == sorted(["cached.jpg", "b.jpg"] + [f"{i}.jpg" for i in range(20)])
+    # The batch filled the cache for single lookups
+    assert gcs.generate_signed_url_from_gcs(PREFIX + "b.jpg") == signed[PREFIX + "b.jpg"]
+
+
+def test_foreign_urls_are_rejected(signer):
+    with pytest.raises(ValueError):
+        gcs.generate_signed_url_from_gcs("https://example.com/a.jpg")
+    with pytest.raises(ValueError):
+        gcs.generate_signed_urls_from_gcs([PREFIX + "a.jpg", "https://example.com/a.jpg"])
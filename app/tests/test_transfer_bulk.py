@@ -0,0 +1,152 @@
+"""
+Tests for bulk approval of vendor transfer requests (process_transfer_requests in
+app/crud/transfer_transactions.py and POST /api/admin/transfers/bulk-process).
+Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.transfer_transactions import process_transfer_requests
+from app.schemas.transfer_transactions import BulkTransferItem
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+SELECT id, 'bulk-' || id, 'x', 'ACTIVE', 0 FROM unnest(CAST(:vendors AS uuid[])) id;
+
+INSERT INTO vendor_details(id, vendor_id, full_name, primary_number, wallet_balance, bank_balance, gpay_number, aadhar_number, address, city, pincode)
+SELECT gen_random_uuid(), id, 'Vendor', 'bulk-' || id, 1000, 0, 'bulk-' || id, 'bulk-' || id, 'Street', 'Chennai', '600001'
+FROM unnest(CAST(:vendors AS uuid[])) id;
+
+INSERT INTO transfer_transactions(id, vendor_id, requested_amount, wallet_balance_before, bank_balance_before, status, created_at)
+SELECT gen_random_uuid(), id, 150, 1000, 0, 'PENDING', now() + g * interval '1 second'
+FROM unnest(CAST(:vendors AS uuid[])) id, generate_series(0, :per_vendor - 1) g
+"""
+
+
+def seed(Session, vendors, per_vendor):
+    """Pending transfers of 150 for vendors with 1000 in the wallet; returns {vendor_id: [transfer ids, oldest first]}"""
+    with Session() as db:
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            db.execute(text(statement), {"vendors": vendors, "per_vendor": per_vendor})
+        rows = db.execute(text(
+            "SELECT vendor_id, id FROM transfer_transactions WHERE vendor_id = ANY(CAST(:vendors AS uuid[])) ORDER BY created_at"
+        ), {"vendors": vendors}).all()
+        db.commit()
+    transfers = {vendor_id: [] for vendor_id in vendors}
+    for vendor_id, transfer_id in rows:
+        transfers[vendor_id].append(transfer_id)
+    return transfers
+
+
+def balances(Session, vendors):
+    with Session() as db:
+        rows = db.execute(text(
+            "SELECT vendor_id, wallet_balance, bank_balance FROM vendor_details WHERE vendor_id = ANY(CAST(:vendors AS uuid[]))"
+        ), {"vendors": vendors}).all()
+    return {vendor_id: (wallet, bank) for vendor_id, wallet, bank in rows}
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    return sessionmaker(bind=pg_engine)
+
+
+def test_thousand_transfers_across_hundred_vendors(Session, query_budget):
+    vendors = [uuid.uuid4() for _ in range(100)]
+    transfers = seed(Session, vendors, per_vendor=10)
+
+    # Round-robin over the vendors: per vendor, 9 approvals (only 6 fit the wallet) and a rejection
+    items = [
+        BulkTransferItem(transaction_id=transfers[vendor_id][k], action="approve" if k < 9 else "reject", notes=f"payout {k}")
+        for k in range(10) for vendor_id in vendors
+    ]
+    with Session() as db:
+        with query_budget(max_queries=4, max_repeats=1):
+            results = process_transfer_requests(db, items)
+
+    assert [result["transaction_id"] for result in results] == [item.transaction_id for item in items]
+    outcomes = [(result["status"], result["detail"]) for result in results]
+    assert outcomes.count(("Approved", None)) == 600
+    assert outcomes.count(("Rejected", None)) == 100
+    assert outcomes.count((None, "Insufficient wallet balance for transfer")) == 300
+
+    first = results[0]
+    assert (first["wallet_balance_after"], first["bank_balance_after"]) == (850, 150)
+    assert set(balances(Session, vendors).values()) == {(100, 900)}
+    with Session() as db:
+        stored = db.execute(text(
+            "SELECT status, count(*), sum(bank_balance_after) FROM transfer_transactions "
+            "WHERE vendor_id = ANY(CAST(:vendors AS uuid[])) GROUP BY status"
+        ), {"vendors": vendors}).all()
+    assert {status: (count, amount) for status, count, amount in stored} == {
+        # each vendor's approvals leave 150, 300, ..., 900 in the bank
+        "APPROVED": (600, 100 * sum(range(150, 901, 150))), "REJECTED": (100, None), "PENDING": (300, None),
+    }
+
+
+def test_overlapping_batches_do_not_deadlock(Session):
+    vendors = [uuid.uuid4() for _ in range(50)]
+    transfers = seed(Session, vendors, per_vendor=2)
+    # Same vendors, opposite order: the vendor rows are locked sorted by vendor_id either way
+    batch = [BulkTransferItem(transaction_id=transfers[vendor_id][0], action="approve") for vendor_id in vendors]
+    reversed_batch = [BulkTransferItem(transaction_id=transfers[vendor_id][1], action="approve") for vendor_id in reversed(vendors)]
+
+    def run(items):
+        with Session() as db:
+            return process_transfer_requests(db, items)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = [result for batch_results in pool.map(run, (batch, reversed_batch)) for result in batch_results]
+    assert all(result["success"] for result in results)
+    assert set(balances(Session, vendors).values()) == {(700, 300)}
+
+
+def test_bulk_endpoint_reports_each_item(Session):
+    from app.api.routes import transfer_transactions
+    from app.core.security import get_current_admin
+    from app.database.session import get_db
+
+    vendor_id = uuid.uuid4()
+    first, second = seed(Session, [vendor_id], per_vendor=2)[vendor_id]
+
+    def db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(transfer_transactions.router, prefix="/api")
+    app.dependency_overrides[get_db] = db
+    app.dependency_overrides[get_current_admin] = lambda: SimpleNamespace(id=uuid.uuid4())
+    client = TestClient(app)
+
+    unknown = str(uuid.uuid4())
+    response = client.post("/api/admin/transfers/bulk-process", json={"items": [
+        {"transaction_id": str(first), "action": "approve", "notes": "month end"},
+        {"transaction_id": str(first), "action": "reject"},
+        {"transaction_id": unknown, "action": "approve"},
+        {"transaction_id": str(second), "action": "Reject"},
+    ]})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["processed"], body["failed"]) == (2, 2)
+    assert [(result["success"], result["status"]) for result in body["results"]] == [
+        (True, "Approved"), (False, None), (False, None), (True, "Rejected"),
+    ]
+    assert body["results"][0]["wallet_balance_after"] == 850
+    assert body["results"][2]["detail"] == "Transfer transaction not found"
+
+    # Processed requests are not processed again
+    response = client.post("/api/admin/transfers/bulk-process", json={"items": [{"transaction_id": str(first), "action": "approve"}]})
+    assert response.json()["results"][0]["detail"] == "Transfer request is already Approved"
+    assert client.post("/api/admin/transfers/bulk-process", json={"items": []}).status_code == 422
@@ -0,0 +1,95 @@
+"""
+Tests for the vendor transfer statistics (get_transfer_statistics in app/crud/transfer_transactions.py).
+Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import uuid
+
+import pytest
+from cachetools import TTLCache
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import transfer_transactions
+from app.schemas.transfer_transactions import AdminTransferAction, TransferRequest
+
+VENDOR_ID = uuid.uuid4()
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:vendor_id, 'stats-vendor', 'x', 'ACTIVE', 0);
+
+INSERT INTO vendor_details(id, vendor_id, full_name, primary_number, wallet_balance, bank_balance, gpay_number, aadhar_number, address, city, pincode)
+VALUES (gen_random_uuid(), :vendor_id, 'Vendor', 'stats-vendor', 500, 100, 'stats-vendor', 'stats-vendor', 'Street', 'Chennai', '600001');
+
+INSERT INTO transfer_transactions(id, vendor_id, requested_amount, wallet_balance_before, bank_balance_before, status)
+SELECT gen_random_uuid(), :vendor_id, g * 10, 500, 100,
+       (ARRAY['APPROVED', 'APPROVED', 'REJECTED', 'APPROVED', 'REJECTED'])[g]::transfer_status_enum
+FROM generate_series(1, 5) g
+"""
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    with pg_engine.begin() as conn:
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement), {"vendor_id": VENDOR_ID})
+    return sessionmaker(bind=pg_engine)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(transfer_transactions, "_transfer_stats_cache", TTLCache(maxsize=100, ttl=60))
+
+
+def test_statistics_and_balance_in_one_cached_query(Session, query_budget):
+    with Session() as db:
+        with query_budget(max_queries=1):
+            statistics = transfer_transactions.get_transfer_statistics(db, VENDOR_ID)
+        assert statistics == {
+            "total_approved": 3, "total_rejected": 2, "total_pending": 0, "total_transferred": 70,
+            "wallet_balance": 500, "bank_balance": 100, "total_balance": 600,
+        }
+        assert "wallet_balance" not in transfer_transactions._transfer_stats_cache[str(VENDOR_ID)]
+        with query_budget(max_queries=1):
+            assert transfer_transactions.get_transfer_statistics(db, str(VENDOR_ID)) == statistics
+
+
+def test_cached_statistics_show_current_balances(Session):
+    from app.crud.vendor_wallet import credit_vendor_wallet
+
+    with Session() as db:
+        before = transfer_transactions.get_transfer_statistics(db, VENDOR_ID)
+        db.execute(text("UPDATE vendor_details SET bank_balance = bank_balance + 7 WHERE vendor_id = :v"), {"v": VENDOR_ID})
+        db.commit()
+        assert transfer_transactions.get_transfer_statistics(db, VENDOR_ID)["bank_balance"] == before["bank_balance"] + 7
+
+        credit_vendor_wallet(db, vendor_id=str(VENDOR_ID), amount=25, notes="Trip settlement")
+        assert str(VENDOR_ID) not in transfer_transactions._transfer_stats_cache
+        db.commit()
+        assert transfer_transactions.get_transfer_statistics(db, VENDOR_ID)["wallet_balance"] == before["wallet_balance"] + 25
+
+
+def test_transfers_invalidate_the_cached_statistics(Session, query_budget):
+    with Session() as db:
+        before = transfer_transactions.get_transfer_statistics(db, VENDOR_ID)
+
+        transfer = transfer_transactions.create_transfer_request(db, str(VENDOR_ID), TransferRequest(amount=50))
+        with query_budget(max_queries=1):
+            pending = transfer_transactions.get_transfer_statistics(db, VENDOR_ID)
+        assert pending["total_pending"] == before["total_pending"] + 1
+
+        transfer_transactions.process_transfer_request(db, str(transfer.id), AdminTransferAction(action="approve"))
+        approved = transfer_transactions.get_transfer_statistics(db, VENDOR_ID)
+    assert approved["total_pending"] == before["total_pending"]
+    assert approved["total_approved"] == before["total_approved"] + 1
+    assert approved["total_transferred"] == before["total_transferred"] + 50
+    assert (approved["wallet_balance"], approved["bank_balance"]) == (before["wallet_balance"] - 50, before["bank_balance"] + 50)
+
+
+def test_vendor_without_details_is_not_found(Session):
+    with Session() as db:
+        with pytest.raises(HTTPException) as error:
+            transfer_transactions.get_transfer_statistics(db, uuid.uuid4())
+    assert error.value.status_code == 404
@@ -0,0 +1,88 @@
+"""
+Tests for the async upload helpers in app/utils/gcs.py (no GCS access, uploads and deletes are faked).
+"""
+
+import asyncio
+import io
+import threading
+import time
+
+import pytest
+from fastapi import UploadFile
+
+from app.utils import gcs
+
+UPLOAD_SECONDS = 0.2
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    uploaded, deleted = [], []
+    lock = threading.Lock()
+
+    def fake_upload(file, folder):
+        time.sleep(UPLOAD_SECONDS)
+        if folder.endswith("broken"):
+            raise RuntimeError("upload failed")
+        url = f"https://storage.googleapis.com/{gcs.GCS_BUCKET_NAME}/{folder}/{file.filename}"
+        with lock:
+            uploaded.append(url)
+        return url
+
+    def fake_delete(url):
+        with lock:
+            deleted.append(url)
+
+    monkeypatch.setattr(gcs, "upload_image_to_gcs", fake_upload)
+    monkeypatch.setattr(gcs, "delete_gcs_file_by_url", fake_delete)
+    return uploaded, deleted
+
+
+def image(name):
+    return UploadFile(io.BytesIO(b"\xff\xd8" + b"0" * 1024), filename=name)
+
+
+def test_uploads_run_concurrently(storage):
+    files = {f"image_{i}": (image(f"{i}.jpg"), "car_details/1") for i in range(5)}
+
+    started = time.perf_counter()
+    urls = asyncio.run(gcs.upload_images_to_gcs(files))
+    elapsed = time.perf_counter() - started
+
+    assert list(urls) == list(files)
+    assert urls["image_3"].endswith("car_details/1/3.jpg")
+    assert elapsed < UPLOAD_SECONDS * 2.5
+
+
+def test_failed_upload_deletes_the_others(storage):
+    uploaded, deleted = storage
+    files = {
+        "front": (image("front.jpg"), "car_details/1"),
+        "rc": (image("rc.jpg"), "car_details/1/broken"),
+        "back": (image("back.jpg"), "car_details/1"),
+    }
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(gcs.upload_images_to_gcs(files))
+
+    assert len(uploaded) == 2
+    assert sorted(deleted) == sorted(uploaded)
+
+
+def test_event_loop_keeps_running_during_uploads(storage):
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await gcs.upload_image_to_gcs_async(image("a.jpg"), "car_driver/1")
+        task.cancel()
+        return ticks
+
+    # A blocking upload would leave the ticker at zero
+    assert asyncio.run(scenario()) >= UPLOAD_SECONDS / 0.01 / 2
@@ -0,0 +1,210 @@
+"""
+Tests for the single-statement wallet credits and debits (app/crud/wallet.py, vendor_wallet.py, admin_wallet.py).
+Requires TEST_DATABASE_URL (see conftest.py).
+"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+VENDOR_ID = uuid.uuid4()
+OWNER_ID = uuid.uuid4()
+ADMIN_ID = uuid.uuid4()
+
+SEED_SQL = """
+INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:vendor_id, 'atomic-vendor', 'x', 'ACTIVE', 0);
+
+INSERT INTO vendor_details(id, vendor_id, full_name, primary_number, wallet_balance, bank_balance, gpay_number, aadhar_number, address, city, pincode)
+VALUES (gen_random_uuid(), :vendor_id, 'Atomic Vendor', 'atomic-vendor', 0, 0, 'atomic-vendor', 'atomic-vendor', 'Street', 'Chennai', '600001');
+
+INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version)
+VALUES (:owner_id, 'atomic-owner', 'x', 'ACTIVE', 0);
+
+INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode)
+VALUES (gen_random_uuid(), :owner_id, 'Atomic Owner', 'atomic-owner', 400, 'atomic-owner', 'Street', 'Chennai', '600001');
+
+INSERT INTO admin(id, username, phone, organization_id, balance)
+VALUES (:admin_id, 'atomic-admin', '9999999999', gen_random_uuid(), 0)
+"""
+
+PARALLEL_OPERATIONS = 500
+
+
+@pytest.fixture(scope="module")
+def Session(pg_engine):
+    with pg_engine.begin() as conn:
+        for statement in SEED_SQL.strip().split(";\n\n"):
+            conn.execute(text(statement), {"vendor_id": VENDOR_ID, "owner_id": OWNER_ID, "admin_id": ADMIN_ID})
+    return sessionmaker(bind=pg_engine)
+
+
+def run_in_parallel(Session, operation):
+    """Run `operation(db)` PARALLEL_OPERATIONS times from a thread pool, one session and commit each."""
+    def run(_):
+        db = Session()
+        try:
+            result = operation(db)
+            db.commit()
+            return result
+        except ValueError as e:
+            db.rollback()
+            return e
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        return list(pool.map(run, range(PARALLEL_OPERATIONS)))
+
+
+def ledger(Session, table, column, account_id):
+    with Session() as db:
+        return db.execute(
+            text(f"SELECT entry_type::text, amount, balance_before, balance_after FROM {table} WHERE {column} = :id ORDER BY balance_after"),
+            {"id": account_id},
+        ).all()
+
+
+def test_parallel_debits_lose_no_updates(Session):
+    from app.crud.wallet import debit_wallet, get_owner_balance
+
+    results = run_in_parallel(Session, lambda db: debit_wallet(db, str(OWNER_ID), 1, None, "TEST", "parallel debit"))
+
+    # 400 of the 500 debits fit in the balance, the rest are refused instead of driving it negative
+    assert sum(not isinstance(result, ValueError) for result in results) == 400
+    assert {str(result) for result in results if isinstance(result, ValueError)} == {"Insufficient balance"}
+    with Session() as db:
+        assert get_owner_balance(db, str(OWNER_ID)) == 0
+
+    # Every debit saw the balance the previous one left: the ledger is one unbroken chain 400 -> 0
+    entries = ledger(Session, "wallet_ledger", "vehicle_owner_id", OWNER_ID)
+    assert [tuple(entry) for entry in entries] == [("DEBIT", 1, after + 1, after) for after in range(400)]
+
+
+def test_parallel_vendor_credits_and_admin_profit_lose_no_updates(Session):
+    from app.crud.vendor_wallet import credit_vendor_wallet, get_vendor_wallet_balance
+    from app.crud.admin_wallet import get_admin_balance
+
+    def credit(db):
+        return credit_vendor_wallet(
+            db, vendor_id=str(VENDOR_ID), amount=10, order_id=1, deduct_admin_profit=True, admin_profit=3, admin_id=str(ADMIN_ID)
+        )
+
+    results = run_in_parallel(Session, credit)
+
+    assert not [result for result in results if isinstance(result, ValueError)]
+    with Session() as db:
+        assert get_vendor_wallet_balance(db, str(VENDOR_ID)) == 10 * PARALLEL_OPERATIONS
+        assert get_admin_balance(db, str(ADMIN_ID)) == 3 * PARALLEL_OPERATIONS
+
+    vendor_entries = ledger(Session, "vendor_wallet_ledger", "vendor_id", VENDOR_ID)
+    assert [entry.balance_after for entry in vendor_entries] == list(range(10, 10 * PARALLEL_OPERATIONS + 1, 10))
+    # Admin credits go to the wallet shards (test_admin_wallet_shards.py): one entry each, no running chain
+    admin_entries = ledger(Session, "admin_wallet_ledger", "admin_id", ADMIN_ID)
+    assert [(entry.entry_type, entry.amount) for entry in admin_entries] == [("CREDIT", 3)] * PARALLEL_OPERATIONS
+
+
+def test_change_and_ledger_entry_are_one_statement(Session, query_budget):
+    from app.crud.vendor_wallet import debit_vendor_wallet
+    from app.crud.admin_wallet import debit_admin_wallet
+
+    with Session() as db:
+        with query_budget(max_queries=1):
+            balance, entry = debit_vendor_wallet(db, vendor_id=str(VENDOR_ID), amount=5, order_id=2, notes="payout")
+
+        assert entry.balance_before - entry.balance_after == 5 and balance == entry.balance_after
+        db.rollback()
+
+    with Session() as db:
+        # fold the admin wallet shards + the debit
+        with query_budget(max_queries=2):
+            balance, entry = debit_admin_wallet(db, admin_id=str(ADMIN_ID), amount=5, order_id=2, notes="payout")
+
+        assert entry.balance_before - entry.balance_after == 5 and balance == entry.balance_after
+        assert entry.entry_type.value == "DEBIT" and entry.order_id == 2 and entry.created_at is not None
+        db.rollback()
+
+
+def test_failed_debit_changes_nothing(Session):
+    from app.crud.vendor_wallet import debit_vendor_wallet, get_vendor_wallet_balance
+
+    with Session() as db:
+        before = get_vendor_wallet_balance(db, str(VENDOR_ID))
+        with pytest.raises(ValueError, match="Insufficient vendor balance"):
+            debit_vendor_wallet(db, vendor_id=str(VENDOR_ID), amount=before + 1)
+        assert get_vendor_wallet_balance(db, str(VENDOR_ID)) == before
+
+
+def test_transfer_approvals_and_admin_top_ups_alongside_credits(Session):
+    from fastapi import HTTPException
+    from app.crud.admin_add_money import create_admin_add_money_transaction
+    from app.crud.transfer_transactions import process_transfer_request
+    from app.crud.vendor_wallet import credit_vendor_wallet
+    from app.crud.wallet import credit_wallet
+    from app.schemas.transfer_transactions import AdminTransferAction
+
+    vendor_id, owner_id = uuid.uuid4(), uuid.uuid4()
+    with Session() as db:
+        db.execute(text(
+            "INSERT INTO vendor(id, primary_number, hashed_password, account_status, token_version) VALUES (:id, 'race-vendor', 'x', 'ACTIVE', 0)"
+        ), {"id": vendor_id})
+        db.execute(text(
+            "INSERT INTO vendor_details(id, vendor_id, full_name, primary_number, wallet_balance, bank_balance, gpay_number, aadhar_number, address, city, pincode) "
+            "VALUES (gen_random_uuid(), :id, 'Race Vendor', 'race-vendor', 1000, 0, 'race-vendor', 'race-vendor', 'Street', 'Chennai', '600001')"
+        ), {"id": vendor_id})
+        transfer_ids = db.execute(text(
+            "INSERT INTO transfer_transactions(id, vendor_id, requested_amount, wallet_balance_before, bank_balance_before, status) "
+            "SELECT gen_random_uuid(), :id, 5, 1000, 0, 'PENDING' FROM generate_series(1, 100) RETURNING id"
+        ), {"id": vendor_id}).scalars().all()
+        db.execute(text(
+            "INSERT INTO vehicle_owner(id, primary_number, hashed_password, account_status, token_version) VALUES (:id, 'race-owner', 'x', 'ACTIVE', 0)"
+        ), {"id": owner_id})
+        db.execute(text(
+            "INSERT INTO vehicle_owner_details(id, vehicle_owner_id, full_name, primary_number, wallet_balance, aadhar_number, address, city, pincode) "
+            "VALUES (gen_random_uuid(), :id, 'Race Owner', 'race-owner', 0, 'race-owner', 'Street', 'Chennai', '600001')"
+        ), {"id": owner_id})
+        db.commit()
+
+    # Each transfer is approved twice (only one may move the money), next to vendor credits, admin top-ups
+    # and owner credits, all interleaved
+    operations = []
+    for i, transfer_id in enumerate(transfer_ids):
+        approve = lambda db, t=transfer_id: process_transfer_request(db, str(t), AdminTransferAction(action="approve"))
+        operations += [
+            approve,
+            lambda db: credit_vendor_wallet(db, vendor_id=str(vendor_id), amount=3, order_id=1),
+            lambda db: create_admin_add_money_transaction(db, str(owner_id), 7, reference_value=f"topup {i}"),
+            lambda db: credit_wallet(db, str(owner_id), 2, None, "TEST", "parallel credit"),
+            approve,
+        ]
+
+    def run(operation):
+        db = Session()
+        try:
+            result = operation(db)
+            db.commit()
+            return result
+        except HTTPException as e:
+            db.rollback()
+            return e
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(run, operations))
+
+    refused = [result.detail for result in results if isinstance(result, HTTPException)]
+    assert len(refused) == 100 and all(detail.startswith("Transfer request is already") for detail in refused)
+    with Session() as db:
+        wallet, bank = db.execute(text("SELECT wallet_balance, bank_balance FROM vendor_details WHERE vendor_id = :id"), {"id": vendor_id}).one()
+        owner_balance = db.execute(text("SELECT wallet_balance FROM vehicle_owner_details WHERE vehicle_owner_id = :id"), {"id": owner_id}).scalar_one()
+    assert (wallet, bank) == (1000 + 3 * 100 - 5 * 100, 5 * 100)
+    assert owner_balance == (7 + 2) * 100
+
+    # No credit was overwritten: the owner ledger is one unbroken chain
+    entries = ledger(Session, "wallet_ledger", "vehicle_owner_id", owner_id)
+    assert [entry.balance_after for entry in entries] == sorted(entry.balance_before + entry.amount for entry in entries)
+    assert all(previous.balance_after == entry.balance_before for previous, entry in zip(entries, entries[1:]))
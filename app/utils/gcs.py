@@ -59,71 +59,241 @@
 
 #     return signed_url
 
-from google.cloud import storage
-from google.auth import default
-from google.auth import impersonated_credentials
-from datetime import timedelta
+# Storage access lives in app/utils/storage.py (GCS or local files, see STORAGE_BACKEND); these helpers keep
+# the URL based API the routes and crud modules use.
+from cachetools import TLRUCache
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+import asyncio
+import io
 import os
 from fastapi import UploadFile
 import uuid
+from app.utils.storage import GCS_BUCKET_NAME, UPLOAD_CHUNK_SIZE, get_storage
+from app.utils.images import InvalidImageError, ProcessedImage, process_image
 
-GCS_BUCKET_NAME = os.getenv("CREDENTIALS_BUCKET") 
-GCS_SIGNER_SERVICE_ACCOUNT = os.getenv("GCS_SIGNER_SERVICE_ACCOUNT")  # should be gcs-access-sa@drop-cars-473714.iam.gserviceaccount.com
+SIGNED_URL_EXPIRY_MINUTES = int(os.getenv("SIGNED_URL_EXPIRY_MINUTES", "2"))
+SIGNED_URL_CACHE_SIZE = int(os.getenv("SIGNED_URL_CACHE_SIZE", "10000"))
+# A cached URL is handed out until this many seconds before it expires
+SIGNED_URL_REFRESH_MARGIN_SECONDS = int(os.getenv("SIGNED_URL_REFRESH_MARGIN_SECONDS", "30"))
+SIGNED_URL_SIGN_WORKERS = int(os.getenv("SIGNED_URL_SIGN_WORKERS", "8"))
 
-# Get default credentials (Cloud Run service account or local user)
-source_credentials, project = default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+# Uploads from async routes run on this many threads (shared by all requests)
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "8"))
+
+# Uploaded photos are validated, stripped, downsized and re-encoded (app/utils/images.py) on this many threads
+IMAGE_PIPELINE_ENABLED = os.getenv("IMAGE_PIPELINE_ENABLED", "true").lower() == "true"
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(os.cpu_count() or 2)))
+
+# Direct (browser/app to bucket) uploads through pre-signed PUT URLs
+DIRECT_UPLOAD_EXPIRY_MINUTES = int(os.getenv("DIRECT_UPLOAD_EXPIRY_MINUTES", "10"))
+DIRECT_UPLOAD_MAX_BYTES = int(os.getenv("DIRECT_UPLOAD_MAX_BYTES", str(5 * 1024 * 1024)))
+DIRECT_UPLOAD_CONTENT_TYPES = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/heic": ".heic"}
+
+# Multipart uploads accept the same photo types, plus PDF (admin payment receipts). JPEG / PNG / WebP go
+# through the image pipeline; HEIC (not decodable here) and PDF are stored as uploaded
+UPLOAD_CONTENT_TYPES = {**DIRECT_UPLOAD_CONTENT_TYPES, "application/pdf": ".pdf"}
+IMAGE_PIPELINE_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp"}
+_CONTENT_TYPES_BY_EXTENSION = {**{ext: content_type for content_type, ext in UPLOAD_CONTENT_TYPES.items()}, ".jpeg": "image/jpeg"}
+
+
+_image_pool = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image-pipeline")
+
+
+def thumbnail_url(public_url: str) -> str:
+    """Thumbnail stored next to a pipeline image (x.opt.webp -> x.thumb.webp); older images are their own thumbnail."""
+    head, sep, name = public_url.rpartition("/")
+    if ".opt." not in name:
+        return public_url
+    return head + sep + name.replace(".opt.", ".thumb.", 1)
+
+
+def _store_processed_image(processed: ProcessedImage, folder: str) -> str:
+    filename = f"{folder}/{uuid.uuid4()}.opt{processed.extension}"
+    storage = get_storage()
+    storage.upload(io.BytesIO(processed.data), filename, processed.content_type, len(processed.data))
+    public_url = storage.public_url(filename)
+    try:
+        storage.upload(io.BytesIO(processed.thumbnail), storage.blob_name(thumbnail_url(public_url)),
+                       processed.content_type, len(processed.thumbnail))
+    except Exception:
+        delete_gcs_file_by_url(public_url)
+        raise
+    return public_url
 
-# If signer SA is provided, impersonate it
-if GCS_SIGNER_SERVICE_ACCOUNT:
-    creds = impersonated_credentials.Credentials(
-        source_credentials=source_credentials,
-        target_principal=GCS_SIGNER_SERVICE_ACCOUNT,
-        target_scopes=["https://www.googleapis.com/auth/cloud-platform"],
-        lifetime=3600
-    )
-else:
-    creds = source_credentials
 
-# Initialize client with credentials (works locally and on Cloud Run)
-client = storage.Client(credentials=creds)
-bucket = client.bucket(GCS_BUCKET_NAME)
+def upload_content_type(file: UploadFile) -> str:
+    """The upload's type (from the file name when the client sent none or a generic one); InvalidImageError if not accepted."""
+    content_type = (file.content_type or "").lower()
+    if content_type not in UPLOAD_CONTENT_TYPES:
+        content_type = _CONTENT_TYPES_BY_EXTENSION.get(os.path.splitext(file.filename or "")[-1].lower(), content_type)
+    if content_type not in UPLOAD_CONTENT_TYPES:
+        raise InvalidImageError("Unsupported file type. Please upload a JPEG, PNG, WebP or HEIC image")
+    return content_type
 
 
 def upload_image_to_gcs(file: UploadFile, folder: str = "vehicle_owner_details/aadhar") -> str:
-    ext = os.path.splitext(file.filename)[-1]
-    filename = f"{folder}/{uuid.uuid4()}{ext}"
+    """
+    Store an uploaded photo (or PDF receipt) and return its public-style URL; raises InvalidImageError
+    (a ValueError) for other files. Blocks for the image pipeline: call upload_image_to_gcs_async from async routes.
+    """
+    content_type = upload_content_type(file)
+    if IMAGE_PIPELINE_ENABLED and content_type in IMAGE_PIPELINE_CONTENT_TYPES:
+        # CPU bound: bounded by the image pool, separately from the upload threads
+        processed = _image_pool.submit(process_image, file.file).result()
+        return _store_processed_image(processed, folder)
+
+    filename = f"{folder}/{uuid.uuid4()}{UPLOAD_CONTENT_TYPES[content_type]}"
 
-    blob = bucket.blob(filename)
-    blob.upload_from_file(file.file, content_type=file.content_type)
-    return f"https://storage.googleapis.com/{GCS_BUCKET_NAME}/{filename}"
+    storage = get_storage()
+    storage.upload(file.file, filename, content_type, file.size)
+    return storage.public_url(filename)
 
 
 def delete_gcs_file_by_url(public_url: str) -> None:
     try:
-        prefix = f"https://storage.googleapis.com/{GCS_BUCKET_NAME}/"
-        if not public_url.startswith(prefix):
-            return
-        blob_name = public_url[len(prefix):]
+        storage = get_storage()
+        blob_name = storage.blob_name(public_url)
         if not blob_name:
             return
-        blob = bucket.blob(blob_name)
-        blob.delete()
+        storage.delete(blob_name)
+        if thumbnail_url(public_url) != public_url:
+            storage.delete(storage.blob_name(thumbnail_url(public_url)))
     except Exception:
         return
 
 
-def generate_signed_url_from_gcs(public_url: str, expiry_minutes: int = 2) -> str:
-    prefix = f"https://storage.googleapis.com/{GCS_BUCKET_NAME}/"
-    if not public_url.startswith(prefix):
-        raise ValueError("Invalid GCS URL format")
+_upload_pool = ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY, thread_name_prefix="gcs-upload")
+
+
+async def upload_image_to_gcs_async(file: UploadFile, folder: str = "vehicle_owner_details/aadhar") -> str:
+    """upload_image_to_gcs off the event loop, on the bounded upload pool."""
+    return await asyncio.get_running_loop().run_in_executor(_upload_pool, upload_image_to_gcs, file, folder)
+
+
+async def delete_gcs_files_by_url(public_urls: Iterable[str]) -> None:
+    """delete_gcs_file_by_url for several files, concurrently and off the event loop (best effort)."""
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(
+        loop.run_in_executor(_upload_pool, delete_gcs_file_by_url, url) for url in public_urls if url
+    ))
+
+
+async def upload_images_to_gcs(files: Dict[str, Tuple[UploadFile, str]]) -> Dict[str, str]:
+    """
+    Upload several files concurrently: {key: (file, folder)} -> {key: public URL}.
+    All or nothing: if one upload fails, the ones that succeeded are deleted and the first error is raised.
+    """
+    keys = list(files)
+    results = await asyncio.gather(
+        *(upload_image_to_gcs_async(file, folder) for file, folder in files.values()),
+        return_exceptions=True
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        await delete_gcs_files_by_url(result for result in results if isinstance(result, str))
+        raise errors[0]
+    return dict(zip(keys, results))
+
+
+def public_url_for(blob_name: str) -> str:
+    return get_storage().public_url(blob_name)
 
-    blob_name = public_url[len(prefix):]
-    blob = bucket.blob(blob_name)
 
-    signed_url = blob.generate_signed_url(
-        version="v4",
-        expiration=timedelta(minutes=expiry_minutes),
-        method="GET"
+def generate_upload_url(folder: str, content_type: str) -> Tuple[str, str, Dict[str, str]]:
+    """
+    Pre-signed PUT URL for a new object under `folder`: (upload URL, public URL, headers the client must send).
+    The signature pins the object name, the content type and the accepted size range.
+    """
+    blob_name = f"{folder}/{uuid.uuid4()}{DIRECT_UPLOAD_CONTENT_TYPES[content_type]}"
+    headers = {
+        "Content-Type": content_type,
+        "x-goog-content-length-range": f"0,{DIRECT_UPLOAD_MAX_BYTES}",
+    }
+    upload_url = get_storage().sign(
+        blob_name,
+        DIRECT_UPLOAD_EXPIRY_MINUTES,
+        method="PUT",
+        content_type=content_type,
+        headers={"x-goog-content-length-range": headers["x-goog-content-length-range"]}
     )
+    return upload_url, public_url_for(blob_name), headers
+
+
+def get_uploaded_object(public_url: str):
+    """Size and content type of the object behind a public-style URL, or None if nothing was uploaded there."""
+    return get_storage().stat(_blob_name(public_url))
+
+
+# (blob name, expiry minutes) -> signed URL, dropped SIGNED_URL_REFRESH_MARGIN_SECONDS before the URL expires
+_signed_urls = TLRUCache(
+    maxsize=SIGNED_URL_CACHE_SIZE,
+    ttu=lambda key, _url, now: now + key[1] * 60 - SIGNED_URL_REFRESH_MARGIN_SECONDS,
+)
+_signed_urls_lock = Lock()
+
+
+def _blob_name(public_url: str) -> str:
+    return get_storage().blob_name(public_url)
+
 
+def _sign_blob(blob_name: str, expiry_minutes: int) -> str:
+    """One signed GET URL (GCS: local with GCS_SIGNING_KEY_FILE, otherwise IAM signBlob when impersonating)."""
+    return get_storage().sign(blob_name, expiry_minutes)
+
+
+def _cached_signed_url(key) -> Optional[str]:
+    with _signed_urls_lock:
+        return _signed_urls.get(key)
+
+
+def _cache_signed_url(key, signed_url: str) -> None:
+    with _signed_urls_lock:
+        _signed_urls[key] = signed_url
+
+
+def generate_signed_url_from_gcs(public_url: str, expiry_minutes: Optional[int] = None) -> str:
+    """Signed GET URL for a private object given its public-style URL, reused until shortly before it expires."""
+    key = (_blob_name(public_url), expiry_minutes or SIGNED_URL_EXPIRY_MINUTES)
+    signed_url = _cached_signed_url(key)
+    if signed_url is None:
+        signed_url = _sign_blob(*key)
+        _cache_signed_url(key, signed_url)
     return signed_url
+
+
+def generate_signed_urls_from_gcs(public_urls: Iterable[Optional[str]], expiry_minutes: Optional[int] = None,
+                                  thumbnails: bool = False) -> Dict[str, str]:
+    """
+    Batch version of generate_signed_url_from_gcs for lists: {public URL: signed URL}.
+    Empty values are skipped, duplicates signed once, cache misses signed in parallel.
+    With thumbnails=True each URL maps to its signed thumbnail (see thumbnail_url).
+    """
+    if thumbnails:
+        thumbnails_of = {url: thumbnail_url(url) for url in public_urls if url}
+        signed = generate_signed_urls_from_gcs(thumbnails_of.values(), expiry_minutes)
+        return {url: signed[thumbnail] for url, thumbnail in thumbnails_of.items()}
+
+    expiry_minutes = expiry_minutes or SIGNED_URL_EXPIRY_MINUTES
+    signed: Dict[str, str] = {}
+    missing = {}
+    for public_url in public_urls:
+        if not public_url or public_url in signed or public_url in missing:
+            continue
+        key = (_blob_name(public_url), expiry_minutes)
+        signed_url = _cached_signed_url(key)
+        if signed_url is None:
+            missing[public_url] = key
+        else:
+            signed[public_url] = signed_url
+
+    if len(missing) > 1:
+        with ThreadPoolExecutor(max_workers=min(SIGNED_URL_SIGN_WORKERS, len(missing))) as pool:
+            results = list(pool.map(lambda key: _sign_blob(*key), missing.values()))
+    else:
+        results = [_sign_blob(*key) for key in missing.values()]
+    for (public_url, key), signed_url in zip(missing.items(), results):
+        signed[public_url] = signed_url
+        _cache_signed_url(key, signed_url)
+    return signed
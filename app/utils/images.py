@@ -0,0 +1,69 @@
+"""
+Image pipeline for uploaded photos (speedometer readings, Aadhaar, licence, RC, ...).
+
+Each upload is checked to be a real JPEG / PNG / WebP image, rotated upright from its EXIF orientation,
+stripped of metadata (EXIF, GPS, ICC), downsized to IMAGE_MAX_DIMENSION and re-encoded as IMAGE_FORMAT.
+A THUMBNAIL_DIMENSION thumbnail is made from the same decode for listings.
+"""
+import io
+import os
+from typing import BinaryIO, NamedTuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+IMAGE_MAX_DIMENSION = int(os.getenv("IMAGE_MAX_DIMENSION", "1600"))
+IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "WEBP").upper()  # WEBP or JPEG
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "80"))
+THUMBNAIL_DIMENSION = int(os.getenv("THUMBNAIL_DIMENSION", "320"))
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "70"))
+
+ACCEPTED_FORMATS = {"JPEG", "PNG", "WEBP", "MPO"}  # MPO: multi-picture JPEG written by some phone cameras
+OUTPUT_TYPES = {"WEBP": ("image/webp", ".webp"), "JPEG": ("image/jpeg", ".jpg")}
+
+
+class InvalidImageError(ValueError):
+    pass
+
+
+class ProcessedImage(NamedTuple):
+    data: bytes
+    thumbnail: bytes
+    content_type: str
+    extension: str
+    width: int
+    height: int
+
+
+def _encode(image: Image.Image, quality: int) -> bytes:
+    out = io.BytesIO()
+    # No exif / icc_profile arguments: the re-encoded file carries no metadata
+    image.save(out, format=IMAGE_FORMAT, quality=quality, **({"method": 4} if IMAGE_FORMAT == "WEBP" else {"optimize": True}))
+    return out.getvalue()
+
+
+def process_image(fileobj: BinaryIO) -> ProcessedImage:
+    """Validate, strip, downsize and re-encode an uploaded photo; raises InvalidImageError for anything else."""
+    try:
+        image = Image.open(fileobj)
+        if image.format not in ACCEPTED_FORMATS:
+            raise InvalidImageError("Unsupported image type. Please upload a JPEG, PNG or WebP image")
+        # Decode at a reduced scale when the photo is much larger than needed (JPEG only, cheap)
+        image.draft("RGB", (IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION), Image.LANCZOS)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise InvalidImageError("Invalid or corrupt image file") from e
+
+    image = image.convert("RGBA" if IMAGE_FORMAT == "WEBP" and image.mode in ("RGBA", "LA", "P") else "RGB")
+    thumbnail = image.copy()
+    thumbnail.thumbnail((THUMBNAIL_DIMENSION, THUMBNAIL_DIMENSION), Image.LANCZOS)
+
+    content_type, extension = OUTPUT_TYPES[IMAGE_FORMAT]
+    return ProcessedImage(
+        data=_encode(image, IMAGE_QUALITY),
+        thumbnail=_encode(thumbnail, THUMBNAIL_QUALITY),
+        content_type=content_type,
+        extension=extension,
+        width=image.width,
+        height=image.height,
+    )
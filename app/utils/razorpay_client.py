@@ -3,30 +3,56 @@ import hmac
 import hashlib
 from typing import Optional, Dict, Any
 
-import requests
+import httpx
+
+RAZORPAY_BASE_URL = os.getenv("RAZORPAY_BASE_URL", "https://api.razorpay.com/v1")
+RAZORPAY_TIMEOUT_SECONDS = float(os.getenv("RAZORPAY_TIMEOUT_SECONDS", "20"))
+RAZORPAY_MAX_CONNECTIONS = int(os.getenv("RAZORPAY_MAX_CONNECTIONS", "20"))
+
+# One connection pool for the process (TLS handshakes are reused between calls), created on first use
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=RAZORPAY_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=RAZORPAY_MAX_CONNECTIONS, max_keepalive_connections=RAZORPAY_MAX_CONNECTIONS),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 class RazorpayClient:
     def __init__(self,
                  key_id: Optional[str] = None,
-                 key_secret: Optional[str] = None):
+                 key_secret: Optional[str] = None,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 base_url: Optional[str] = None):
         self.key_id = key_id or os.getenv("RAZORPAY_KEY_ID", "")
         self.key_secret = key_secret or os.getenv("RAZORPAY_KEY_SECRET", "")
-        self.base_url = "https://api.razorpay.com/v1"
-        print("RazorpayClient initialized with:")
-        print(self.key_id, self.key_secret)
+        self.base_url = base_url or RAZORPAY_BASE_URL
+        self.http_client = http_client
 
     def _auth(self):
         return (self.key_id, self.key_secret)
 
-    def create_order(self, amount_paise: int, currency: str = "INR", notes: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def create_order(self, amount_paise: int, currency: str = "INR", notes: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         payload = {
             "amount": amount_paise*100,
             "currency": currency,
             "payment_capture": 1,
             "notes": notes or {},
         }
-        resp = requests.post(f"{self.base_url}/orders", auth=self._auth(), json=payload, timeout=20)
+        client = self.http_client or get_http_client()
+        resp = await client.post(f"{self.base_url}/orders", auth=self._auth(), json=payload)
         resp.raise_for_status()
         return resp.json()
 
@@ -37,4 +63,11 @@ class RazorpayClient:
         expected = hmac.new(secret.encode(), msg=message, digestmod=hashlib.sha256).hexdigest()
         return hmac.compare_digest(expected, signature)
 
-
+    @staticmethod
+    def verify_webhook_signature(body: bytes, signature: str, webhook_secret: Optional[str] = None) -> bool:
+        """X-Razorpay-Signature of a webhook: HMAC-SHA256 of the raw request body with the webhook secret"""
+        secret = webhook_secret or os.getenv("RAZORPAY_WEBHOOK_SECRET", "")
+        if not secret or not signature:
+            return False
+        expected = hmac.new(secret.encode(), msg=body, digestmod=hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
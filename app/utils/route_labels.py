@@ -0,0 +1,42 @@
+"""
+Origin / destination labels for `pickup_drop_location` route maps.
+
+Routes are stored as {"0": "Chennai", "1": "Vellore", ...}; the labels are copied
+into origin_label / destination_label / stop_count columns on orders, new_orders and
+hourly_rental so listings, notifications and "orders from city X" filters do not
+have to parse the JSON.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, func, inspect
+
+
+def route_labels(pickup_drop_location: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str], int]:
+    """Return (origin, destination, stop_count) for a route map keyed '0', '1', ..."""
+    if not pickup_drop_location:
+        return None, None, 0
+    # keys are numeric-like strings; sort numerically so '10' comes after '9'
+    keys = sorted(pickup_drop_location.keys(), key=lambda k: int(k) if str(k).isdigit() else 0)
+    return pickup_drop_location[keys[0]], pickup_drop_location[keys[-1]], len(keys)
+
+
+def origin_label_filter(model, origin: str):
+    """Case-insensitive prefix match on origin_label, served by ix_orders_origin_label_lower on orders."""
+    prefix = origin.strip().lower().replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return func.lower(model.origin_label).like(f"{prefix}%", escape="!")
+
+
+def _set_route_labels(mapper, connection, target) -> None:
+    target.origin_label, target.destination_label, target.stop_count = route_labels(target.pickup_drop_location)
+
+
+def _update_route_labels(mapper, connection, target) -> None:
+    # Only touch the label columns when the route itself was replaced (or never labelled)
+    if target.stop_count is None or inspect(target).attrs.pickup_drop_location.history.has_changes():
+        _set_route_labels(mapper, connection, target)
+
+
+def track_route_labels(model) -> None:
+    """Keep the label columns of `model` in sync with pickup_drop_location on insert/update."""
+    event.listen(model, "before_insert", _set_route_labels)
+    event.listen(model, "before_update", _update_route_labels)
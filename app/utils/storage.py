@@ -0,0 +1,219 @@
+"""
+Object storage behind the image helpers in app/utils/gcs.py.
+
+STORAGE_BACKEND selects the driver:
+- "gcs" (default): the CREDENTIALS_BUCKET bucket. Credentials and the client are created on first use,
+  so importing the app needs neither GCP credentials nor the google-cloud-storage import.
+- "local": files under LOCAL_STORAGE_ROOT, served by app/api/routes/storage.py through HMAC-signed URLs
+  that behave like GCS signed URLs (for development and offline tests).
+
+Objects are stored in the database by their public-style URL; public_url / blob_name convert between the two.
+"""
+import abc
+import hashlib
+import hmac
+import json
+import mimetypes
+import os
+import secrets
+import shutil
+import threading
+import time
+from datetime import timedelta
+from typing import BinaryIO, Dict, NamedTuple, Optional
+from urllib.parse import quote, urlencode
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "gcs")
+
+GCS_BUCKET_NAME = os.getenv("CREDENTIALS_BUCKET")
+GCS_SIGNER_SERVICE_ACCOUNT = os.getenv("GCS_SIGNER_SERVICE_ACCOUNT")  # should be gcs-access-sa@drop-cars-473714.iam.gserviceaccount.com
+# Service account key (JSON) of the signer; when set, URLs are signed locally instead of one IAM signBlob call each
+GCS_SIGNING_KEY_FILE = os.getenv("GCS_SIGNING_KEY_FILE")
+# Local GCS emulator (e.g. fake-gcs-server at http://localhost:4443); the storage client picks it up as well
+STORAGE_EMULATOR_HOST = os.getenv("STORAGE_EMULATOR_HOST")
+# Files larger than this are sent as a resumable upload in chunks of this size (multiple of 256 KiB)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+LOCAL_STORAGE_ROOT = os.getenv("LOCAL_STORAGE_ROOT", "local_storage")
+LOCAL_STORAGE_BASE_URL = os.getenv("LOCAL_STORAGE_BASE_URL", "http://localhost:8000/api/storage")
+# Set it when running several workers, otherwise each worker signs with its own random key
+LOCAL_STORAGE_SIGNING_KEY = os.getenv("LOCAL_STORAGE_SIGNING_KEY") or secrets.token_hex(32)
+
+
+class StoredObject(NamedTuple):
+    size: int
+    content_type: Optional[str]
+
+
+class StorageBackend(abc.ABC):
+    """One bucket of objects named like car_details/<car id>/rc_front/<uuid>.jpg."""
+
+    url_prefix: str
+
+    def public_url(self, name: str) -> str:
+        return f"{self.url_prefix}{name}"
+
+    def blob_name(self, public_url: str) -> str:
+        if not public_url.startswith(self.url_prefix):
+            raise ValueError("Invalid storage URL format")
+        return public_url[len(self.url_prefix):]
+
+    @abc.abstractmethod
+    def upload(self, fileobj: BinaryIO, name: str, content_type: Optional[str], size: Optional[int] = None) -> None:
+        ...
+
+    @abc.abstractmethod
+    def delete(self, name: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def sign(self, name: str, expiry_minutes: int, method: str = "GET", content_type: Optional[str] = None,
+             headers: Optional[Dict[str, str]] = None) -> str:
+        """Time-limited URL for `method` on the object; a PUT URL pins the content type and extra headers."""
+
+    @abc.abstractmethod
+    def stat(self, name: str) -> Optional[StoredObject]:
+        """Size and content type of the object, None when it does not exist."""
+
+    def exists(self, name: str) -> bool:
+        return self.stat(name) is not None
+
+
+class GCSBackend(StorageBackend):
+    def __init__(self, bucket_name: Optional[str] = GCS_BUCKET_NAME, client=None):
+        self.bucket_name = bucket_name
+        self.url_prefix = f"https://storage.googleapis.com/{bucket_name}/"
+        self._client = client
+        self._bucket = None
+        self._signing_credentials = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        from google.cloud import storage
+        from google.auth import default, impersonated_credentials
+        from google.oauth2 import service_account
+
+        client = self._client
+        if client is None:
+            # Default credentials (Cloud Run service account or local user), impersonating the signer SA if given
+            creds, _ = default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+            if GCS_SIGNER_SERVICE_ACCOUNT:
+                creds = impersonated_credentials.Credentials(
+                    source_credentials=creds,
+                    target_principal=GCS_SIGNER_SERVICE_ACCOUNT,
+                    target_scopes=["https://www.googleapis.com/auth/cloud-platform"],
+                    lifetime=3600
+                )
+            client = storage.Client(credentials=creds)
+        if GCS_SIGNING_KEY_FILE:
+            self._signing_credentials = service_account.Credentials.from_service_account_file(GCS_SIGNING_KEY_FILE)
+        return client.bucket(self.bucket_name)
+
+    @property
+    def bucket(self):
+        if self._bucket is None:
+            with self._lock:
+                if self._bucket is None:
+                    self._bucket = self._connect()
+        return self._bucket
+
+    def upload(self, fileobj, name, content_type, size=None):
+        blob = self.bucket.blob(name)
+        # Stream big files in chunks instead of reading them into memory
+        if size is None or size > UPLOAD_CHUNK_SIZE:
+            blob.chunk_size = UPLOAD_CHUNK_SIZE
+        blob.upload_from_file(fileobj, content_type=content_type, size=size)
+
+    def delete(self, name):
+        self.bucket.blob(name).delete()
+
+    def sign(self, name, expiry_minutes, method="GET", content_type=None, headers=None):
+        if STORAGE_EMULATOR_HOST:
+            # The emulator takes unsigned XML API requests
+            return f"{STORAGE_EMULATOR_HOST.rstrip('/')}/{self.bucket_name}/{name}"
+        return self.bucket.blob(name).generate_signed_url(
+            version="v4",
+            expiration=timedelta(minutes=expiry_minutes),
+            method=method,
+            content_type=content_type,
+            headers=headers,
+            credentials=self._signing_credentials
+        )
+
+    def stat(self, name):
+        blob = self.bucket.get_blob(name)
+        return StoredObject(blob.size, blob.content_type) if blob else None
+
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root: str = LOCAL_STORAGE_ROOT, base_url: str = LOCAL_STORAGE_BASE_URL,
+                 signing_key: str = LOCAL_STORAGE_SIGNING_KEY):
+        self.root = os.path.abspath(root)
+        self.url_prefix = base_url.rstrip("/") + "/"
+        self._signing_key = signing_key.encode()
+
+    def path(self, name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError("Invalid object name")
+        return path
+
+    def upload(self, fileobj, name, content_type, size=None):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".part", "wb") as out:
+            shutil.copyfileobj(fileobj, out, UPLOAD_CHUNK_SIZE)
+        with open(path + ".meta", "w") as meta:
+            json.dump({"content_type": content_type}, meta)
+        os.replace(path + ".part", path)
+
+    def delete(self, name):
+        for path in (self.path(name), self.path(name) + ".meta"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def signature(self, method: str, name: str, expires: int, content_type: Optional[str] = None) -> str:
+        message = f"{method}\n{name}\n{expires}\n{content_type or ''}".encode()
+        return hmac.new(self._signing_key, message, hashlib.sha256).hexdigest()
+
+    def verify(self, method: str, name: str, expires: int, signature: str, content_type: Optional[str] = None) -> bool:
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self.signature(method, name, expires, content_type), signature)
+
+    def sign(self, name, expiry_minutes, method="GET", content_type=None, headers=None):
+        expires = int(time.time()) + expiry_minutes * 60
+        query = urlencode({"expires": expires, "signature": self.signature(method, name, expires, content_type)})
+        return f"{self.url_prefix}{quote(name)}?{query}"
+
+    def stat(self, name):
+        path = self.path(name)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path + ".meta") as meta:
+                content_type = json.load(meta)["content_type"]
+        except FileNotFoundError:
+            content_type = mimetypes.guess_type(path)[0]
+        return StoredObject(os.path.getsize(path), content_type)
+
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_storage() -> StorageBackend:
+    """The configured backend, created on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if STORAGE_BACKEND == "gcs":
+                    _backend = GCSBackend()
+                elif STORAGE_BACKEND == "local":
+                    _backend = LocalStorageBackend()
+                else:
+                    raise ValueError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r}, expected 'gcs' or 'local'")
+    return _backend
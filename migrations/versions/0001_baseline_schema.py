@@ -0,0 +1,456 @@
+"""baseline schema
+
+Schema as created by Base.metadata.create_all before versioned migrations were introduced.
+Existing databases are stamped at this revision instead of running it
+(`alembic stamp 0001`, see Documentation/MIGRATION_README.md).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('admin',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('username', sa.String(), nullable=True),
+    sa.Column('password', sa.String(), nullable=True),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('phone', sa.String(length=10), nullable=False),
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_table('notifications',
+    sa.Column('user', sa.String(), nullable=False),
+    sa.Column('sub', sa.String(), nullable=False),
+    sa.Column('permission1', sa.Boolean(), nullable=True),
+    sa.Column('permission2', sa.Boolean(), nullable=True),
+    sa.Column('token', sa.String(), nullable=True),
+    sa.Column('selected_city', postgresql.ARRAY(sa.String()), nullable=True),
+    sa.PrimaryKeyConstraint('sub')
+    )
+    op.create_index(op.f('ix_notifications_sub'), 'notifications', ['sub'], unique=False)
+    op.create_table('vehicle_owner',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('primary_number', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('account_status', sa.Enum('ACTIVE', 'INACTIVE', 'PENDING', name='account_status_enum'), nullable=False),
+    sa.Column('token_version', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('primary_number')
+    )
+    op.create_index(op.f('ix_vehicle_owner_id'), 'vehicle_owner', ['id'], unique=True)
+    op.create_table('vendor',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('primary_number', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('account_status', sa.Enum('ACTIVE', 'INACTIVE', 'PENDING', name='account_status_enum'), nullable=False),
+    sa.Column('token_version', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('primary_number')
+    )
+    op.create_index(op.f('ix_vendor_id'), 'vendor', ['id'], unique=True)
+    op.create_table('car_details',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('vehicle_owner_id', sa.UUID(), nullable=False),
+    sa.Column('car_name', sa.String(), nullable=False),
+    sa.Column('car_type', sa.Enum('HATCHBACK', 'SEDAN_4_PLUS_1', 'NEW_SEDAN_2022_MODEL', 'ETIOS_4_PLUS_1', 'SUV', 'SUV_6_PLUS_1', 'SUV_7_PLUS_1', 'INNOVA', 'INNOVA_6_PLUS_1', 'INNOVA_7_PLUS_1', 'INNOVA_CRYSTA', 'INNOVA_CRYSTA_6_PLUS_1', 'INNOVA_CRYSTA_7_PLUS_1', name='car_type_enum'), nullable=False),
+    sa.Column('car_number', sa.String(), nullable=False),
+    sa.Column('year_of_the_car', sa.String(), nullable=True),
+    sa.Column('rc_front_img_url', sa.String(), nullable=True),
+    sa.Column('rc_front_status', sa.Enum('PENDING', 'VERIFIED', 'INVALID', name='document_status_enum'), nullable=True),
+    sa.Column('rc_back_img_url', sa.String(), nullable=True),
+    sa.Column('rc_back_status', sa.Enum('PENDING', 'VERIFIED', 'INVALID', name='document_status_enum'), nullable=True),
+    sa.Column('insurance_img_url', sa.String(), nullable=True),
+    sa.Column('insurance_status', sa.Enum('PENDING', 'VERIFIED', 'INVALID', name='document_status_enum'), nullable=True),
+    sa.Column('fc_img_url', sa.String(), nullable=True),
+    sa.Column('fc_status', sa.Enum('PENDING', 'VERIFIED', 'INVALID', name='document_status_enum'), nullable=True),
+    sa.Column('car_img_url', sa.String(), nullable=True),
+    sa.Column('car_img_status', sa.Enum('PENDING', 'VERIFIED', 'INVALID', name='document_status_enum'), nullable=True),
+    sa.Column('permit_img_url', sa.String(), nullable=True),
+    sa.Column('permit_status', sa.Enum('PENDING', 'VERIFIED', 'INVALID', name='document_status_enum'), nullable=True),
+    sa.Column('car_status', sa.Enum('ONLINE', 'DRIVING', 'BLOCKED', 'PROCESSING', name='car_status_enum'), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vehicle_owner_id'], ['vehicle_owner.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('car_img_url'),
+    sa.UniqueConstraint('car_number'),
+    sa.UniqueConstraint('fc_img_url'),
+    sa.UniqueConstraint('insurance_img_url'),
+    sa.UniqueConstraint('permit_img_url'),
+    sa.UniqueConstraint('rc_back_img_url'),
+    sa.UniqueConstraint('rc_front_img_url')
+    )
+    op.create_index(op.f('ix_car_details_id'), 'car_details', ['id'], unique=True)
+    op.create_table('car_driver',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('vehicle_owner_id', sa.UUID(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('primary_number', sa.String(), nullable=False),
+    sa.Column('secondary_number', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('licence_number', sa.String(), nullable=False),
+    sa.Column('licence_front_img', sa.String(), nullable=True),
+    sa.Column('licence_front_status', sa.Enum('PENDING', 'VERIFIED', 'INVALID', name='document_status_enum'), nullable=True),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('city', sa.String(), nullable=False),
+    sa.Column('pincode', sa.String(), nullable=False),
+    sa.Column('driver_status', sa.Enum('ONLINE', 'OFFLINE', 'DRIVING', 'BLOCKED', 'PROCESSING', name='driver_status_enum'), nullable=False),
+    sa.Column('token_version', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vehicle_owner_id'], ['vehicle_owner.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('licence_front_img'),
+    sa.UniqueConstraint('licence_number'),
+    sa.UniqueConstraint('primary_number'),
+    sa.UniqueConstraint('secondary_number')
+    )
+    op.create_index(op.f('ix_car_driver_id'), 'car_driver', ['id'], unique=True)
+    op.create_table('hourly_rental',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('vendor_id', sa.UUID(), nullable=False),
+    sa.Column('trip_type', sa.Enum('ONEWAY', 'ROUND_TRIP', 'HOURLY_RENTAL', 'MULTY_CITY', name='ORDER_TYPE_ENUM'), nullable=False),
+    sa.Column('car_type', sa.Enum('HATCHBACK', 'SEDAN_4_PLUS_1', 'NEW_SEDAN_2022_MODEL', 'ETIOS_4_PLUS_1', 'SUV', 'SUV_6_PLUS_1', 'SUV_7_PLUS_1', 'INNOVA', 'INNOVA_6_PLUS_1', 'INNOVA_7_PLUS_1', 'INNOVA_CRYSTA', 'INNOVA_CRYSTA_6_PLUS_1', 'INNOVA_CRYSTA_7_PLUS_1', name='CAR_TYPE_ENUM'), nullable=False),
+    sa.Column('pickup_drop_location', sa.JSON(), nullable=False),
+    sa.Column('start_date_time', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('customer_name', sa.String(), nullable=False),
+    sa.Column('customer_number', sa.String(), nullable=False),
+    sa.Column('package_hours', sa.JSON(), nullable=False),
+    sa.Column('cost_per_hour', sa.Integer(), nullable=False),
+    sa.Column('extra_cost_per_hour', sa.Integer(), nullable=False),
+    sa.Column('cost_for_addon_km', sa.Integer(), nullable=False),
+    sa.Column('extra_cost_for_addon_km', sa.Integer(), nullable=False),
+    sa.Column('pickup_notes', sa.String(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendor.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('new_orders',
+    sa.Column('order_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('vendor_id', sa.UUID(), nullable=False),
+    sa.Column('trip_type', sa.Enum('ONEWAY', 'ROUND_TRIP', 'HOURLY_RENTAL', 'MULTY_CITY', name='ORDER_TYPE_ENUM'), nullable=False),
+    sa.Column('car_type', sa.Enum('HATCHBACK', 'SEDAN_4_PLUS_1', 'NEW_SEDAN_2022_MODEL', 'ETIOS_4_PLUS_1', 'SUV', 'SUV_6_PLUS_1', 'SUV_7_PLUS_1', 'INNOVA', 'INNOVA_6_PLUS_1', 'INNOVA_7_PLUS_1', 'INNOVA_CRYSTA', 'INNOVA_CRYSTA_6_PLUS_1', 'INNOVA_CRYSTA_7_PLUS_1', name='CAR_TYPE_ENUM'), nullable=False),
+    sa.Column('pickup_drop_location', sa.JSON(), nullable=False),
+    sa.Column('start_date_time', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('customer_name', sa.String(), nullable=False),
+    sa.Column('customer_number', sa.String(), nullable=False),
+    sa.Column('cost_per_km', sa.Integer(), nullable=False),
+    sa.Column('extra_cost_per_km', sa.Integer(), nullable=False),
+    sa.Column('driver_allowance', sa.Integer(), nullable=False),
+    sa.Column('extra_driver_allowance', sa.Integer(), nullable=False),
+    sa.Column('permit_charges', sa.Integer(), nullable=False),
+    sa.Column('extra_permit_charges', sa.Integer(), nullable=False),
+    sa.Column('hill_charges', sa.Integer(), nullable=False),
+    sa.Column('toll_charges', sa.Integer(), nullable=False),
+    sa.Column('pickup_notes', sa.String(), nullable=True),
+    sa.Column('trip_status', sa.String(), nullable=False),
+    sa.Column('pick_near_city', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('trip_distance', sa.Integer(), nullable=False),
+    sa.Column('trip_time', sa.String(), nullable=False),
+    sa.Column('platform_fees_percent', sa.Integer(), nullable=False),
+    sa.Column('estimated_price', sa.Integer(), nullable=True),
+    sa.Column('vendor_price', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendor.id'], ),
+    sa.PrimaryKeyConstraint('order_id')
+    )
+    op.create_table('orders',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('source', sa.Enum('NEW_ORDERS', 'HOURLY_RENTAL', name='ORDER_SOURCE_ENUM'), nullable=False),
+    sa.Column('source_order_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_id', sa.UUID(), nullable=False),
+    sa.Column('trip_type', sa.Enum('ONEWAY', 'ROUND_TRIP', 'HOURLY_RENTAL', 'MULTY_CITY', name='ORDER_TYPE_ENUM'), nullable=False),
+    sa.Column('car_type', sa.Enum('HATCHBACK', 'SEDAN_4_PLUS_1', 'NEW_SEDAN_2022_MODEL', 'ETIOS_4_PLUS_1', 'SUV', 'SUV_6_PLUS_1', 'SUV_7_PLUS_1', 'INNOVA', 'INNOVA_6_PLUS_1', 'INNOVA_7_PLUS_1', 'INNOVA_CRYSTA', 'INNOVA_CRYSTA_6_PLUS_1', 'INNOVA_CRYSTA_7_PLUS_1', name='CAR_TYPE_ENUM'), nullable=False),
+    sa.Column('pickup_drop_location', sa.JSON(), nullable=False),
+    sa.Column('start_date_time', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('customer_name', sa.String(), nullable=False),
+    sa.Column('customer_number', sa.String(), nullable=False),
+    sa.Column('trip_status', sa.Enum('PENDING', 'COMPLETED', 'CANCELLED', name='Trip_status'), nullable=False),
+    sa.Column('pick_near_city', postgresql.ARRAY(sa.String()), nullable=True),
+    sa.Column('trip_distance', sa.Integer(), nullable=True),
+    sa.Column('trip_time', sa.String(), nullable=True),
+    sa.Column('estimated_price', sa.Integer(), nullable=True),
+    sa.Column('vendor_price', sa.Integer(), nullable=True),
+    sa.Column('platform_fees_percent', sa.Integer(), nullable=True),
+    sa.Column('vendor_fees_percent', sa.Integer(), nullable=True),
+    sa.Column('toll_charge_update', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('updated_toll_charges', sa.Integer(), nullable=True),
+    sa.Column('max_time_to_assign_order', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('data_visibility_vehicle_owner', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('closed_vendor_price', sa.Integer(), nullable=True),
+    sa.Column('closed_driver_price', sa.Integer(), nullable=True),
+    sa.Column('commision_amount', sa.Integer(), nullable=True),
+    sa.Column('vendor_profit', sa.Integer(), nullable=True),
+    sa.Column('driver_profit', sa.Integer(), nullable=True),
+    sa.Column('admin_profit', sa.Integer(), nullable=True),
+    sa.Column('night_charges', sa.Integer(), nullable=True),
+    sa.Column('waiting_time', sa.Integer(), nullable=True),
+    sa.Column('cancelled_by', sa.Enum('AUTO_CANCELLED', 'CANCELLED_BY_VENDOR', name='cancelled_by_enum'), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendor.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('razorpay_transactions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('vehicle_owner_id', sa.UUID(), nullable=False),
+    sa.Column('rp_order_id', sa.String(), nullable=False),
+    sa.Column('rp_payment_id', sa.String(), nullable=True),
+    sa.Column('rp_signature', sa.String(), nullable=True),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('currency', sa.String(), nullable=False),
+    sa.Column('status', sa.Enum('CREATED', 'AUTHORIZED', 'CAPTURED', 'FAILED', 'REFUNDED', name='razorpay_payment_status_enum'), nullable=False),
+    sa.Column('captured', sa.Boolean(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vehicle_owner_id'], ['vehicle_owner.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_razorpay_transactions_id'), 'razorpay_transactions', ['id'], unique=True)
+    op.create_index(op.f('ix_razorpay_transactions_rp_order_id'), 'razorpay_transactions', ['rp_order_id'], unique=False)
+    op.create_index(op.f('ix_razorpay_transactions_rp_payment_id'), 'razorpay_transactions', ['rp_payment_id'], unique=False)
+    op.create_table('transfer_transactions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('vendor_id', sa.UUID(), nullable=False),
+    sa.Column('requested_amount', sa.Integer(), nullable=False),
+    sa.Column('wallet_balance_before', sa.Integer(), nullable=False),
+    sa.Column('bank_balance_before', sa.Integer(), nullable=False),
+    sa.Column('wallet_balance_after', sa.Integer(), nullable=True),
+    sa.Column('bank_balance_after', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'REJECTED', name='transfer_status_enum'), nullable=False),
+    sa.Column('admin_notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendor.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transfer_transactions_id'), 'transfer_transactions', ['id'], unique=True)
+    op.create_table('vehicle_owner_details',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('vehicle_owner_id', sa.UUID(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('primary_number', sa.String(), nullable=False),
+    sa.Column('secondary_number', sa.String(), nullable=True),
+    sa.Column('wallet_balance', sa.Integer(), nullable=False),
+    sa.Column('aadhar_number', sa.String(), nullable=False),
+    sa.Column('aadhar_front_img', sa.String(), nullable=True),
+    sa.Column('aadhar_status', sa.Enum('PENDING', 'VERIFIED', 'INVALID', name='document_status_enum'), nullable=True),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('city', sa.String(), nullable=False),
+    sa.Column('pincode', sa.String(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vehicle_owner_id'], ['vehicle_owner.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('aadhar_front_img'),
+    sa.UniqueConstraint('aadhar_number'),
+    sa.UniqueConstraint('primary_number'),
+    sa.UniqueConstraint('secondary_number')
+    )
+    op.create_index(op.f('ix_vehicle_owner_details_id'), 'vehicle_owner_details', ['id'], unique=True)
+    op.create_table('vendor_details',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('vendor_id', sa.UUID(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('primary_number', sa.String(), nullable=False),
+    sa.Column('secondary_number', sa.String(), nullable=True),
+    sa.Column('wallet_balance', sa.Integer(), nullable=False),
+    sa.Column('bank_balance', sa.Integer(), nullable=False),
+    sa.Column('gpay_number', sa.String(), nullable=False),
+    sa.Column('aadhar_number', sa.String(), nullable=False),
+    sa.Column('aadhar_front_img', sa.String(), nullable=True),
+    sa.Column('aadhar_status', sa.Enum('PENDING', 'VERIFIED', 'INVALID', name='document_status_enum'), nullable=True),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('city', sa.String(), nullable=False),
+    sa.Column('pincode', sa.String(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendor.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('aadhar_front_img'),
+    sa.UniqueConstraint('aadhar_number'),
+    sa.UniqueConstraint('gpay_number'),
+    sa.UniqueConstraint('primary_number'),
+    sa.UniqueConstraint('secondary_number')
+    )
+    op.create_index(op.f('ix_vendor_details_id'), 'vendor_details', ['id'], unique=True)
+    op.create_table('wallet_ledger',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('vehicle_owner_id', sa.UUID(), nullable=False),
+    sa.Column('reference_id', sa.String(), nullable=True),
+    sa.Column('reference_type', sa.String(), nullable=True),
+    sa.Column('entry_type', sa.Enum('CREDIT', 'DEBIT', name='wallet_entry_type_enum'), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('balance_before', sa.Integer(), nullable=False),
+    sa.Column('balance_after', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vehicle_owner_id'], ['vehicle_owner.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_wallet_ledger_id'), 'wallet_ledger', ['id'], unique=True)
+    op.create_table('admin_add_money_to_vehicle_owner',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('vehicle_owner_id', sa.UUID(), nullable=False),
+    sa.Column('transaction_value', sa.Integer(), nullable=False),
+    sa.Column('transaction_img', sa.String(), nullable=True),
+    sa.Column('reference_value', sa.String(), nullable=True),
+    sa.Column('vehicle_owner_ledger_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['vehicle_owner_id'], ['vehicle_owner.id'], ),
+    sa.ForeignKeyConstraint(['vehicle_owner_ledger_id'], ['wallet_ledger.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_admin_add_money_to_vehicle_owner_id'), 'admin_add_money_to_vehicle_owner', ['id'], unique=True)
+    op.create_index(op.f('ix_admin_add_money_to_vehicle_owner_vehicle_owner_id'), 'admin_add_money_to_vehicle_owner', ['vehicle_owner_id'], unique=False)
+    op.create_table('admin_wallet_ledger',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('admin_id', sa.UUID(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('entry_type', sa.Enum('CREDIT', 'DEBIT', name='admin_wallet_entry_type_enum'), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('balance_before', sa.Integer(), nullable=False),
+    sa.Column('balance_after', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.String(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['admin_id'], ['admin.id'], ),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_admin_wallet_ledger_admin_id'), 'admin_wallet_ledger', ['admin_id'], unique=False)
+    op.create_index(op.f('ix_admin_wallet_ledger_id'), 'admin_wallet_ledger', ['id'], unique=True)
+    op.create_index(op.f('ix_admin_wallet_ledger_order_id'), 'admin_wallet_ledger', ['order_id'], unique=False)
+    op.create_table('end_records',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('driver_id', sa.UUID(), nullable=False),
+    sa.Column('start_km', sa.Integer(), nullable=False),
+    sa.Column('end_km', sa.Integer(), nullable=False),
+    sa.Column('contact_number', sa.String(), nullable=False),
+    sa.Column('img_url', sa.String(), nullable=False),
+    sa.Column('close_speedometer_image', sa.String(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['driver_id'], ['car_driver.id'], ),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_end_records_order_id'), 'end_records', ['order_id'], unique=False)
+    op.create_table('order_assignments',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('vehicle_owner_id', sa.UUID(), nullable=False),
+    sa.Column('driver_id', sa.UUID(), nullable=True),
+    sa.Column('car_id', sa.UUID(), nullable=True),
+    sa.Column('assignment_status', sa.Enum('PENDING', 'ASSIGNED', 'CANCELLED', 'COMPLETED', 'DRIVING', name='assignmentstatusenum'), nullable=False),
+    sa.Column('assigned_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('expires_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('cancelled_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('completed_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+    sa.ForeignKeyConstraint(['car_id'], ['car_details.id'], ),
+    sa.ForeignKeyConstraint(['driver_id'], ['car_driver.id'], ),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.ForeignKeyConstraint(['vehicle_owner_id'], ['vehicle_owner.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('vendor_wallet_ledger',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('vendor_id', sa.UUID(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('entry_type', sa.Enum('CREDIT', 'DEBIT', name='vendor_wallet_entry_type_enum'), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('balance_before', sa.Integer(), nullable=False),
+    sa.Column('balance_after', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.String(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendor.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendor_wallet_ledger_id'), 'vendor_wallet_ledger', ['id'], unique=True)
+    op.create_index(op.f('ix_vendor_wallet_ledger_order_id'), 'vendor_wallet_ledger', ['order_id'], unique=False)
+    op.create_index(op.f('ix_vendor_wallet_ledger_vendor_id'), 'vendor_wallet_ledger', ['vendor_id'], unique=False)
+
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_vendor_wallet_ledger_vendor_id'), table_name='vendor_wallet_ledger')
+    op.drop_index(op.f('ix_vendor_wallet_ledger_order_id'), table_name='vendor_wallet_ledger')
+    op.drop_index(op.f('ix_vendor_wallet_ledger_id'), table_name='vendor_wallet_ledger')
+    op.drop_table('vendor_wallet_ledger')
+    op.drop_table('order_assignments')
+    op.drop_index(op.f('ix_end_records_order_id'), table_name='end_records')
+    op.drop_table('end_records')
+    op.drop_index(op.f('ix_admin_wallet_ledger_order_id'), table_name='admin_wallet_ledger')
+    op.drop_index(op.f('ix_admin_wallet_ledger_id'), table_name='admin_wallet_ledger')
+    op.drop_index(op.f('ix_admin_wallet_ledger_admin_id'), table_name='admin_wallet_ledger')
+    op.drop_table('admin_wallet_ledger')
+    op.drop_index(op.f('ix_admin_add_money_to_vehicle_owner_vehicle_owner_id'), table_name='admin_add_money_to_vehicle_owner')
+    op.drop_index(op.f('ix_admin_add_money_to_vehicle_owner_id'), table_name='admin_add_money_to_vehicle_owner')
+    op.drop_table('admin_add_money_to_vehicle_owner')
+    op.drop_index(op.f('ix_wallet_ledger_id'), table_name='wallet_ledger')
+    op.drop_table('wallet_ledger')
+    op.drop_index(op.f('ix_vendor_details_id'), table_name='vendor_details')
+    op.drop_table('vendor_details')
+    op.drop_index(op.f('ix_vehicle_owner_details_id'), table_name='vehicle_owner_details')
+    op.drop_table('vehicle_owner_details')
+    op.drop_index(op.f('ix_transfer_transactions_id'), table_name='transfer_transactions')
+    op.drop_table('transfer_transactions')
+    op.drop_index(op.f('ix_razorpay_transactions_rp_payment_id'), table_name='razorpay_transactions')
+    op.drop_index(op.f('ix_razorpay_transactions_rp_order_id'), table_name='razorpay_transactions')
+    op.drop_index(op.f('ix_razorpay_transactions_id'), table_name='razorpay_transactions')
+    op.drop_table('razorpay_transactions')
+    op.drop_table('orders')
+    op.drop_table('new_orders')
+    op.drop_table('hourly_rental')
+    op.drop_index(op.f('ix_car_driver_id'), table_name='car_driver')
+    op.drop_table('car_driver')
+    op.drop_index(op.f('ix_car_details_id'), table_name='car_details')
+    op.drop_table('car_details')
+    op.drop_index(op.f('ix_vendor_id'), table_name='vendor')
+    op.drop_table('vendor')
+    op.drop_index(op.f('ix_vehicle_owner_id'), table_name='vehicle_owner')
+    op.drop_table('vehicle_owner')
+    op.drop_index(op.f('ix_notifications_sub'), table_name='notifications')
+    op.drop_table('notifications')
+    op.drop_table('admin')
+
+    # Enum types are created implicitly with their first table but not dropped with it
+    for enum_name in (
+        'CAR_TYPE_ENUM',
+        'ORDER_SOURCE_ENUM',
+        'ORDER_TYPE_ENUM',
+        'Trip_status',
+        'account_status_enum',
+        'admin_wallet_entry_type_enum',
+        'assignmentstatusenum',
+        'cancelled_by_enum',
+        'car_status_enum',
+        'car_type_enum',
+        'document_status_enum',
+        'driver_status_enum',
+        'razorpay_payment_status_enum',
+        'transfer_status_enum',
+        'vendor_wallet_entry_type_enum',
+        'wallet_entry_type_enum',
+    ):
+        op.execute(f'DROP TYPE IF EXISTS "{enum_name}"')
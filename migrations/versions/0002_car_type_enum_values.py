@@ -0,0 +1,49 @@
+"""car type enum values
+
+Replaces fix_car_type_enum.py and Testing code/run_car_type_enum_migration.py.
+Databases created before the extended car types were added only carry the original
+values; this adds the missing ones to both car type enums. No-op on fresh databases.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CAR_TYPE_ENUMS = ('CAR_TYPE_ENUM', 'car_type_enum')
+
+NEW_CAR_TYPES = (
+    'SEDAN_4_PLUS_1',
+    'NEW_SEDAN_2022_MODEL',
+    'ETIOS_4_PLUS_1',
+    'SUV_6_PLUS_1',
+    'SUV_7_PLUS_1',
+    'INNOVA_6_PLUS_1',
+    'INNOVA_7_PLUS_1',
+    'INNOVA_CRYSTA_6_PLUS_1',
+    'INNOVA_CRYSTA_7_PLUS_1',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # New enum values cannot be used in the transaction that adds them
+    with op.get_context().autocommit_block():
+        for enum_name in CAR_TYPE_ENUMS:
+            for car_type in NEW_CAR_TYPES:
+                op.execute(f'ALTER TYPE "{enum_name}" ADD VALUE IF NOT EXISTS \'{car_type}\'')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # PostgreSQL cannot drop enum values; rows may already reference them
+    pass
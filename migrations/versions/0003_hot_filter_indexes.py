@@ -0,0 +1,50 @@
+"""hot filter indexes
+
+Secondary indexes for the order, assignment, ledger and transfer lookups.
+Built CONCURRENTLY so the upgrade does not block writes on a live database.
+Replaces Testing code/run_index_migration.py.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index('ix_orders_vendor_id_created_at', 'orders', ['vendor_id', sa.literal_column('created_at DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_orders_pending_created_at', 'orders', [sa.literal_column('created_at DESC')], unique=False, postgresql_where=sa.text("trip_status = 'PENDING'"), postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_orders_trip_status', 'orders', ['trip_status'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_order_assignments_order_id_created_at', 'order_assignments', ['order_id', sa.literal_column('created_at DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_order_assignments_driver_id', 'order_assignments', ['driver_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_wallet_ledger_vehicle_owner_id_created_at', 'wallet_ledger', ['vehicle_owner_id', sa.literal_column('created_at DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_transfer_transactions_vendor_id', 'transfer_transactions', ['vendor_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_transfer_transactions_status', 'transfer_transactions', ['status'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_new_orders_vendor_id', 'new_orders', ['vendor_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_new_orders_vendor_id', table_name='new_orders', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transfer_transactions_status', table_name='transfer_transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transfer_transactions_vendor_id', table_name='transfer_transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_wallet_ledger_vehicle_owner_id_created_at', table_name='wallet_ledger', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_order_assignments_driver_id', table_name='order_assignments', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_order_assignments_order_id_created_at', table_name='order_assignments', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_orders_trip_status', table_name='orders', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_orders_pending_created_at', table_name='orders', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_orders_vendor_id_created_at', table_name='orders', postgresql_concurrently=True, if_exists=True)
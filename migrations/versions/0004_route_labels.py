@@ -0,0 +1,53 @@
+"""route labels
+
+pickup_drop_location becomes JSONB on orders, new_orders and hourly_rental, plus
+origin_label / destination_label / stop_count columns filled on insert by the models
+(app/utils/route_labels.py). Existing rows are filled by
+`Testing code/run_route_label_backfill.py` after this migration; the columns stay
+nullable until then. The origin index serves "orders from city X" prefix filters.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('orders', 'new_orders', 'hourly_rental')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, 'pickup_drop_location', type_=postgresql.JSONB(), existing_type=sa.JSON(),
+                        existing_nullable=False, postgresql_using='pickup_drop_location::jsonb')
+        op.add_column(table, sa.Column('origin_label', sa.String(), nullable=True))
+        op.add_column(table, sa.Column('destination_label', sa.String(), nullable=True))
+        op.add_column(table, sa.Column('stop_count', sa.Integer(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_orders_origin_label_lower', 'orders', [sa.literal_column('lower(origin_label) text_pattern_ops')],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_origin_label_lower', table_name='orders', postgresql_concurrently=True, if_exists=True)
+
+    for table in TABLES:
+        op.drop_column(table, 'stop_count')
+        op.drop_column(table, 'destination_label')
+        op.drop_column(table, 'origin_label')
+        op.alter_column(table, 'pickup_drop_location', type_=sa.JSON(), existing_type=postgresql.JSONB(),
+                        existing_nullable=False, postgresql_using='pickup_drop_location::json')
@@ -0,0 +1,32 @@
+"""order assignments created_at not null
+
+created_at is the partition key of the monthly partitions (app/database/partitions.py)
+and part of the partitioned primary key, so it can no longer be NULL. Old rows without
+it get their assignment time, or the migration time.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE order_assignments SET created_at = COALESCE(assigned_at, now()) WHERE created_at IS NULL")
+    op.alter_column('order_assignments', 'created_at', existing_type=sa.TIMESTAMP(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('order_assignments', 'created_at', existing_type=sa.TIMESTAMP(), nullable=True)
@@ -0,0 +1,55 @@
+"""order archive
+
+Archive tables for closed orders and their source orders, assignments and end
+records (app/models/archive.py, moved by app/crud/archive.py). The ledger tables keep
+their order_id after the order is archived, so their foreign keys to orders are dropped.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# hot table -> primary key column
+ARCHIVED_TABLES = {
+    'orders': 'id',
+    'new_orders': 'order_id',
+    'hourly_rental': 'id',
+    'order_assignments': 'id',
+    'end_records': 'id',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, pk in ARCHIVED_TABLES.items():
+        # Same columns and NOT NULLs as the hot table, no foreign keys or sequence defaults
+        op.execute(f'CREATE TABLE {table}_archive (LIKE {table})')
+        op.add_column(f'{table}_archive', sa.Column('archived_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False))
+        op.create_primary_key(f'{table}_archive_pkey', f'{table}_archive', [pk])
+
+    op.create_index('ix_orders_archive_vendor_id_created_at', 'orders_archive', ['vendor_id', sa.literal_column('created_at DESC')], unique=False)
+    op.create_index('ix_order_assignments_archive_order_id', 'order_assignments_archive', ['order_id'], unique=False)
+    op.create_index('ix_end_records_archive_order_id', 'end_records_archive', ['order_id'], unique=False)
+
+    # Already gone when orders was partitioned with --drop-incoming-fks
+    op.execute('ALTER TABLE vendor_wallet_ledger DROP CONSTRAINT IF EXISTS vendor_wallet_ledger_order_id_fkey')
+    op.execute('ALTER TABLE admin_wallet_ledger DROP CONSTRAINT IF EXISTS admin_wallet_ledger_order_id_fkey')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_foreign_key('admin_wallet_ledger_order_id_fkey', 'admin_wallet_ledger', 'orders', ['order_id'], ['id'])
+    op.create_foreign_key('vendor_wallet_ledger_order_id_fkey', 'vendor_wallet_ledger', 'orders', ['order_id'], ['id'])
+    for table in reversed(list(ARCHIVED_TABLES)):
+        op.drop_table(f'{table}_archive')
@@ -0,0 +1,35 @@
+"""account detail indexes
+
+Indexes on vendor_details.vendor_id and vehicle_owner_details.vehicle_owner_id so the
+unified admin accounts listing can walk accounts in id order with a join per row.
+Built CONCURRENTLY like 0003.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index('ix_vendor_details_vendor_id', 'vendor_details', ['vendor_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_vehicle_owner_details_vehicle_owner_id', 'vehicle_owner_details', ['vehicle_owner_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_vehicle_owner_details_vehicle_owner_id', table_name='vehicle_owner_details', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_vendor_details_vendor_id', table_name='vendor_details', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,43 @@
+"""admin wallet shards
+
+Striped accumulator rows for admin wallet credits (AdminWalletShard in
+app/models/admin_wallet_ledger.py), so trip settlements no longer all lock the admin row.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'admin_wallet_shards',
+        sa.Column('admin_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('admin.id'), nullable=False),
+        sa.Column('shard', sa.Integer(), nullable=False),
+        sa.Column('balance', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('admin_id', 'shard'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fold what is still in the shards back into the admin balance first
+    op.execute(
+        'UPDATE admin SET balance = admin.balance + s.total '
+        'FROM (SELECT admin_id, sum(balance) AS total FROM admin_wallet_shards GROUP BY admin_id) s '
+        'WHERE admin.id = s.admin_id'
+    )
+    op.drop_table('admin_wallet_shards')
@@ -0,0 +1,46 @@
+"""ledger keyset indexes
+
+Indexes for the keyset-paginated ledger endpoints: the vendor and admin wallet
+ledgers by (principal, created_at DESC), approved transfers by (vendor_id, updated_at DESC).
+The single-column ix_vendor_wallet_ledger_vendor_id is a prefix of the new vendor index
+and is dropped. Built CONCURRENTLY like 0003; on ledgers that are already partitioned the index is
+built per partition and attached (create_index_concurrently in app/database/partitions.py).
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.database.partitions import create_index_concurrently, is_partitioned
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        create_index_concurrently(conn, 'vendor_wallet_ledger', 'ix_vendor_wallet_ledger_vendor_id_created_at', 'vendor_id, created_at DESC')
+        create_index_concurrently(conn, 'admin_wallet_ledger', 'ix_admin_wallet_ledger_admin_id_created_at', 'admin_id, created_at DESC')
+        create_index_concurrently(conn, 'transfer_transactions', 'ix_transfer_transactions_approved_vendor_id_updated_at', 'vendor_id, updated_at DESC', where="status = 'APPROVED'")
+        # DROP INDEX CONCURRENTLY is not supported on partitioned indexes
+        op.drop_index('ix_vendor_wallet_ledger_vendor_id', table_name='vendor_wallet_ledger', postgresql_concurrently=not is_partitioned(conn, 'vendor_wallet_ledger'), if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        create_index_concurrently(op.get_bind(), 'vendor_wallet_ledger', 'ix_vendor_wallet_ledger_vendor_id', 'vendor_id')
+    # Dropping the parent index drops the attached partition indexes as well
+    op.drop_index('ix_transfer_transactions_approved_vendor_id_updated_at', table_name='transfer_transactions', if_exists=True)
+    op.drop_index('ix_admin_wallet_ledger_admin_id_created_at', table_name='admin_wallet_ledger', if_exists=True)
+    op.drop_index('ix_vendor_wallet_ledger_vendor_id_created_at', table_name='vendor_wallet_ledger', if_exists=True)
@@ -0,0 +1,42 @@
+"""reconciliation checkpoints
+
+Progress rows of the balance reconciliation job (ReconciliationCheckpoint in
+app/models/reconciliation.py), so an interrupted run resumes after its last batch.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'reconciliation_checkpoints',
+        sa.Column('wallet', sa.String(), nullable=False),
+        sa.Column('last_principal_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('checked', sa.Integer(), nullable=False),
+        sa.Column('mismatched', sa.Integer(), nullable=False),
+        sa.Column('fixed', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('finished_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('wallet'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('reconciliation_checkpoints')
@@ -0,0 +1,83 @@
+"""razorpay webhooks
+
+razorpay_webhook_events: queue of received webhook deliveries (RazorpayWebhookEvent in
+app/models/razorpay_transactions.py), and a unique index on wallet_ledger
+(reference_type, reference_id) for Razorpay payments, so a payment is credited at most once
+and the "already processed" lookup no longer scans the ledger.
+
+A unique index on a partitioned table must contain the partition key; when wallet_ledger has
+already been partitioned the index is created without UNIQUE (lookups only) and the
+captured flag on razorpay_transactions remains the only guard.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.database.partitions import create_index_concurrently, is_partitioned
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DUPLICATE_PAYMENTS_SQL = sa.text(
+    "SELECT reference_id, count(*) FROM wallet_ledger WHERE reference_type = 'RAZORPAY_PAYMENT' "
+    "GROUP BY reference_id HAVING count(*) > 1 LIMIT 20"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    status_enum = postgresql.ENUM('PENDING', 'PROCESSED', 'IGNORED', 'FAILED', name='razorpay_webhook_status_enum')
+    op.create_table(
+        'razorpay_webhook_events',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('event_id', sa.String(), nullable=False),
+        sa.Column('event', sa.String(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', status_enum, nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('received_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('processed_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_id'),
+    )
+    op.create_index('ix_razorpay_webhook_events_pending', 'razorpay_webhook_events', ['received_at'], unique=False,
+                    postgresql_where=sa.text("status = 'PENDING'"))
+
+    conn = op.get_bind()
+    duplicates = conn.execute(DUPLICATE_PAYMENTS_SQL).all()
+    if duplicates:
+        listed = ", ".join(f"{reference_id} ({count}x)" for reference_id, count in duplicates)
+        raise RuntimeError(
+            f"wallet_ledger has Razorpay payments credited more than once: {listed}. "
+            "Remove the extra entries (and correct the balances, see run_reconciliation.py) before upgrading."
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        if is_partitioned(conn, 'wallet_ledger'):
+            create_index_concurrently(conn, 'wallet_ledger', 'ux_wallet_ledger_razorpay_payment', 'reference_type, reference_id',
+                                      where="reference_type = 'RAZORPAY_PAYMENT'")
+        else:
+            op.create_index('ux_wallet_ledger_razorpay_payment', 'wallet_ledger', ['reference_type', 'reference_id'], unique=True,
+                            postgresql_where=sa.text("reference_type = 'RAZORPAY_PAYMENT'"),
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_wallet_ledger_razorpay_payment', table_name='wallet_ledger', if_exists=True)
+    op.drop_index('ix_razorpay_webhook_events_pending', table_name='razorpay_webhook_events')
+    op.drop_table('razorpay_webhook_events')
+    postgresql.ENUM(name='razorpay_webhook_status_enum').drop(op.get_bind(), checkfirst=True)